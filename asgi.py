@@ -0,0 +1,16 @@
+"""
+ASGI entry point for the BIM AI Management Dashboard application
+
+Serves the blockchain proxy and /api/rpc/* routes as coroutines on the async
+HTTP client; every other route (pages, uploads, orchestrator) runs on the
+Flask app behind it.
+
+Run with: uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+from main import app as flask_app
+from src.controllers.async_proxy_controller import register_async_routes
+from src.middleware.asgi_gateway import AsyncGateway
+
+app = AsyncGateway(flask_app)
+register_async_routes(app)
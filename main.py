@@ -169,6 +169,19 @@ def bim_assets():
         'success': True,
         'assets': assets
     })
+
+
+@app.route('/api/runtime/health')
+def runtime_health():
+    """Report the background runtime loop and its registered tasks"""
+    from src.services.background_runtime import get_background_runtime
+
+    return jsonify({
+        'success': True,
+        'runtime': get_background_runtime().health()
+    })
+
+
 # Error handlers
 @app.errorhandler(404)
 def page_not_found(e):
@@ -0,0 +1,184 @@
+"""
+Async Proxy Controller for DAODISEO Platform
+Coroutine versions of the blockchain proxy and /api/rpc/* routes, served by
+the ASGI gateway. Same URLs, payloads and responses as the Flask views, but
+upstream calls run on the shared async HTTP client, so a slow node holds a
+socket instead of a worker thread.
+"""
+
+import logging
+
+from src.gateways.endpoint_pool import EndpointPoolExhausted, get_rest_endpoint_pool, get_rpc_endpoint_pool
+from src.gateways.http_client import DEFAULT_TIMEOUT, LONG_TIMEOUT, get_async_http_client
+from src.gateways.request_coalescer import get_async_request_coalescer
+from src.gateways.rpc_cache import get_proxy_cache, rest_call_key
+from src.gateways.rpc_forwarder import AsyncJsonRpcForwarder, validate_rpc_payload
+from src.middleware.asgi_gateway import AsyncGateway, AsyncRequest, json_response
+from src.services.account_state_cache import get_account_state_cache
+from src.services.rpc_service import DaodiseoRPCService
+
+logger = logging.getLogger(__name__)
+
+PROXY_PREFIX = "/api/blockchain-proxy"
+RPC_PREFIX = "/api/rpc"
+
+rpc_service = DaodiseoRPCService()
+
+
+async def _post_rpc(base_url, payload):
+    return await get_async_http_client().post(base_url, json=payload, timeout=DEFAULT_TIMEOUT)
+
+
+# Blockchain proxy
+
+async def rpc_proxy(request: AsyncRequest):
+    """Proxy a JSON-RPC call or batch to the best RPC node"""
+    rpc_data = request.get_json()
+    if not rpc_data:
+        return json_response({"error": "No RPC data provided"}, 400)
+
+    error = validate_rpc_payload(rpc_data)
+    if error:
+        return json_response({"error": error}, 400)
+
+    forwarder = AsyncJsonRpcForwarder(
+        get_rpc_endpoint_pool(), get_proxy_cache(), get_async_request_coalescer(), _post_rpc
+    )
+    try:
+        result, cache_status = await forwarder.forward(rpc_data)
+    except EndpointPoolExhausted as e:
+        logger.error(f"All RPC endpoints failed. Last error: {e.last_error}")
+        return json_response({
+            "error": "All blockchain RPC endpoints are currently unavailable",
+            "details": e.last_error
+        }, 503)
+
+    return json_response(result, headers={"X-Cache": cache_status})
+
+
+async def broadcast_proxy(request: AsyncRequest):
+    """Broadcast a transaction via REST, falling back to RPC (never hedged or coalesced)"""
+    tx_data = request.get_json()
+    if not tx_data:
+        return json_response({"error": "No transaction data provided"}, 400)
+
+    http = get_async_http_client()
+    account_states = get_account_state_cache()
+    try:
+        response, endpoint = await get_rest_endpoint_pool().acall(
+            lambda base_url: http.post(f"{base_url}/txs", json=tx_data, timeout=LONG_TIMEOUT),
+            accept=(200, 201)
+        )
+        logger.info(f"Transaction broadcast successful via {endpoint}")
+        result = response.json()
+        account_states.record_tx_broadcast(tx_data, result)
+        return json_response(result)
+    except EndpointPoolExhausted as e:
+        logger.warning(f"REST broadcast failed on all endpoints: {e.last_error}")
+        account_states.record_tx_broadcast(tx_data, e.last_error)
+
+    rpc_data = {
+        "jsonrpc": "2.0",
+        "method": "broadcast_tx_sync",
+        "params": {"tx": tx_data.get("tx", tx_data)},
+        "id": 1
+    }
+    try:
+        response, endpoint = await get_rpc_endpoint_pool().acall(
+            lambda base_url: http.post(f"{base_url}/broadcast_tx_sync", json=rpc_data, timeout=LONG_TIMEOUT)
+        )
+        logger.info(f"Transaction broadcast successful via RPC {endpoint}")
+        result = response.json()
+        account_states.record_tx_broadcast(tx_data, result)
+        return json_response(result)
+    except EndpointPoolExhausted as e:
+        logger.warning(f"RPC broadcast failed on all endpoints: {e.last_error}")
+        account_states.record_tx_broadcast(tx_data, e.last_error)
+
+    return json_response({
+        "error": "All blockchain endpoints are currently unavailable for transaction broadcasting",
+        "suggestion": "Please try again in a few moments or contact support"
+    }, 503)
+
+
+async def query_proxy(request: AsyncRequest):
+    """Proxy a REST query (cached, coalesced and hedged)"""
+    query_data = request.get_json()
+    if not query_data:
+        return json_response({"error": "No query data provided"}, 400)
+
+    query_path = query_data.get("path", "")
+    query_params = query_data.get("params", {})
+
+    cache = get_proxy_cache()
+    cached = cache.lookup_rest(query_path, query_params)
+    if cached is not None:
+        return json_response(cached, headers={"X-Cache": "HIT"})
+
+    http = get_async_http_client()
+
+    async def fetch():
+        response, base_url = await get_rest_endpoint_pool().ahedged_call(
+            lambda base_url: http.get(
+                f"{base_url}/{query_path.lstrip('/')}", params=query_params, timeout=DEFAULT_TIMEOUT
+            )
+        )
+        logger.debug(f"Query successful via {base_url}")
+        return response.json()
+
+    try:
+        result, shared = await get_async_request_coalescer().do(rest_call_key(query_path, query_params), fetch)
+    except EndpointPoolExhausted as e:
+        logger.warning(f"All query endpoints failed: {e.last_error}")
+        return json_response({"error": "All blockchain query endpoints are currently unavailable"}, 503)
+
+    cache.store_rest(query_path, query_params, result)
+    return json_response(result, headers={"X-Cache": "COALESCED" if shared else "MISS"})
+
+
+# Direct RPC routes
+
+def _rpc_route(fetch, error_message):
+    async def handler(request: AsyncRequest):
+        try:
+            return json_response(await fetch(request))
+        except Exception as e:
+            logger.error(f"RPC route {request.path} error: {e}")
+            return json_response({"success": False, "error": error_message, "details": str(e)}, 500)
+    return handler
+
+
+RPC_ROUTES = {
+    "/network-status": _rpc_route(
+        lambda request: rpc_service.aget_network_status(),
+        "Failed to fetch network status from RPC"),
+    "/validators": _rpc_route(
+        lambda request: rpc_service.aget_validators(
+            page=request.arg("page", 1, type=int), per_page=request.arg("per_page", 100, type=int)),
+        "Failed to fetch validators from RPC"),
+    "/latest-block": _rpc_route(
+        lambda request: rpc_service.aget_latest_block(),
+        "Failed to fetch latest block from RPC"),
+    "/transactions": _rpc_route(
+        lambda request: rpc_service.asearch_transactions(
+            query=request.arg("query", "tx.height>0"), page=request.arg("page", 1, type=int),
+            per_page=request.arg("per_page", 30, type=int)),
+        "Failed to fetch transactions from RPC"),
+    "/network-info": _rpc_route(
+        lambda request: rpc_service.aget_network_info(),
+        "Failed to fetch network info from RPC"),
+    "/consensus-state": _rpc_route(
+        lambda request: rpc_service.aget_consensus_state(),
+        "Failed to fetch consensus state from RPC"),
+}
+
+
+def register_async_routes(gateway: AsyncGateway):
+    """Register the async proxy and RPC routes with the ASGI gateway"""
+    gateway.route(f"{PROXY_PREFIX}/rpc", methods=("POST", "OPTIONS"))(rpc_proxy)
+    gateway.route(f"{PROXY_PREFIX}/broadcast", methods=("POST", "OPTIONS"))(broadcast_proxy)
+    gateway.route(f"{PROXY_PREFIX}/query", methods=("POST", "OPTIONS"))(query_proxy)
+    for path, handler in RPC_ROUTES.items():
+        gateway.route(f"{RPC_PREFIX}{path}", methods=("GET",))(handler)
+    gateway.on_shutdown(get_async_http_client().aclose)
+    logger.info("Async proxy and RPC routes registered")
@@ -16,6 +16,7 @@ from src.services.ai_services.bim_agent import BIMAgentManager
 from src.services.ai_services.orchestrator import get_orchestrator
 from src.services.ai_services.chain_brain_orchestrator import get_chain_brain_orchestrator
 from src.services.ai_services.chain_brain_service import get_chain_brain_service
+from src.security_utils import get_chat_session_id
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -37,7 +38,8 @@ def get_bim_agent_instance():
 def chat():
     """
     Process a chat message and return the AI response
-    Expects JSON: {"message": "user message here", "enhanced": true/false}
+    Expects JSON: {"message": "user message here", "enhanced": true/false,
+                   "session_id": optional conversation id}
     """
     data = request.get_json()
 
@@ -46,6 +48,7 @@ def chat():
 
     message = data["message"]
     enhanced_mode = data.get("enhanced", False)
+    session_id = get_chat_session_id(data.get("session_id"))
 
     # Log the incoming message
     logger.debug(f"Received chat message: {message}, enhanced_mode={enhanced_mode}")
@@ -96,7 +99,7 @@ def chat():
             logger.info("Falling back to standard AI processing")
     
     # Process the message with standard AI
-    result = bim_agent_manager.process_message(message)
+    result = bim_agent_manager.process_message(message, session_id=session_id)
 
     # Return the result
     return jsonify(result)
@@ -432,15 +435,24 @@ def execute_staking():
 
 @bim_agent_bp.route("/chain-brain-status", methods=["GET"])
 def chain_brain_status():
-    """Get the status of the chain brain feeding system"""
+    """
+    Get the status of the chain brain feeding system
+    Optional query parameter since=<insight id> returns only newer insights;
+    pass back the returned insight_cursor on the next poll.
+    """
     try:
+        since = request.args.get("since", type=int)
         chain_service = get_chain_brain_service()
-        status = chain_service.get_status()
+        status = chain_service.get_status(since=since)
         
         return jsonify({
             "success": True,
             "chain_brain_active": status["running"],
             "recent_insights": status["recent_insights"],
+            "insight_cursor": status["insight_cursor"],
+            "metrics": status["metrics"],
+            "change_detection": status["change_detection"],
+            "pool_stats": status["pool_stats"],
             "message": "Chain brain is actively feeding blockchain data to o3-mini" if status["running"] else "Chain brain is not active"
         })
     except Exception as e:
@@ -732,7 +744,7 @@ import os
 import json
 import logging
 from flask import Blueprint, request, jsonify
-from openai import OpenAI
+from src.gateways.llm_gateway import get_llm_gateway
 from src.security_utils import secure_endpoint
 
 logger = logging.getLogger(__name__)
@@ -759,8 +771,8 @@ def analyze_property():
             'property-industrial-003': {'name': 'Industrial Warehouse Complex', 'type': 'Industrial', 'value': '$1.2M'}
         }.get(asset_id, {'name': 'Unknown Property', 'type': 'Unknown', 'value': '$0'})
         
-        # Use o3-mini for analysis
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        # Shared pooled OpenAI client (keep-alive connections across requests)
+        llm = get_llm_gateway()
         
         prompt = f"""
         Analyze the following real estate property for tokenization and investment potential:
@@ -782,7 +794,7 @@ def analyze_property():
         Return as JSON with all metrics calculated.
         """
         
-        response = client.chat.completions.create(
+        response = llm.chat_completion(
             model="gpt-4o",
             messages=[
                 {
@@ -835,8 +847,8 @@ def investment_analysis():
             'property-industrial-003': {'name': 'Industrial Warehouse Complex', 'type': 'Industrial', 'value': '$1.2M'}
         }.get(asset_id, {'name': 'Unknown Property', 'type': 'Unknown', 'value': '$0'})
         
-        # Use o3-mini for investment analysis
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        # Shared pooled OpenAI client (keep-alive connections across requests)
+        llm = get_llm_gateway()
         
         prompt = f"""
         Generate investment opportunity analysis for tokenized real estate:
@@ -859,7 +871,7 @@ def investment_analysis():
         Return as JSON with all investment metrics.
         """
         
-        response = client.chat.completions.create(
+        response = llm.chat_completion(
             model="gpt-4o",
             messages=[
                 {
@@ -907,6 +919,7 @@ from flask import Blueprint, jsonify, render_template, request, current_app
 from src.services.ai_services.bim_agent import BIMAgentManager
 from src.services.ai_services.ai_agent_service import AIAgentService
 from src.gateways.bim_gateways import IFCGateway
+from src.security_utils import get_chat_session_id
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -977,7 +990,8 @@ def process_message():
             }), 400
             
         # Process the message using BIM agent manager
-        result = bim_agent_manager.process_message(message)
+        session_id = get_chat_session_id(data.get("session_id"))
+        result = bim_agent_manager.process_message(message, session_id=session_id)
         return jsonify(result)
         
     except Exception as e:
@@ -5,11 +5,15 @@ import logging
 from flask import Blueprint, jsonify, request
 from src.gateways.blockchain_gateways import KeplerGateway
 from src.gateways.blockchain_gateways import PingPubGateway
+from src.services.account_state_cache import get_account_state_cache
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Largest address list accepted by the bulk account endpoint
+MAX_BULK_ADDRESSES = 100
+
 # Create blueprint
 account_bp = Blueprint("account", __name__, url_prefix="/api")
 
@@ -53,6 +57,30 @@ def get_account():
         return jsonify({"error": f"Failed to retrieve account info: {str(e)}"}), 500
 
 
+@account_bp.route("/accounts", methods=["GET", "POST"])
+def get_accounts():
+    """Get account numbers and sequences for many addresses, fetched concurrently"""
+    if request.method == "POST":
+        addresses = (request.get_json(silent=True) or {}).get("addresses", [])
+    else:
+        addresses = [a.strip() for a in request.args.get("addresses", "").split(",")]
+    addresses = [a for a in addresses if isinstance(a, str) and a]
+
+    if not addresses:
+        return jsonify({"error": "At least one address is required"}), 400
+    if len(addresses) > MAX_BULK_ADDRESSES:
+        return jsonify({"error": f"At most {MAX_BULK_ADDRESSES} addresses per request"}), 400
+
+    try:
+        result = get_account_state_cache().get_many(addresses)
+        # Partial results are still useful; only a total upstream failure is a 502
+        status = 200 if result["data"] else 502
+        return jsonify(result), status
+    except Exception as e:
+        logger.error(f"Error retrieving account states: {str(e)}")
+        return jsonify({"error": f"Failed to retrieve account states: {str(e)}"}), 500
+
+
 @account_bp.route("/account/wallet", methods=["POST"])
 def connect_wallet():
     """Connect a wallet address to the user account"""
@@ -224,6 +252,7 @@ import time
 from flask import Blueprint, request, jsonify, current_app, session, abort
 
 from src.services.blockchain_service import BlockchainService
+from src.services.chain_indexer import get_chain_indexer, summarize_tx
 from src.security_utils import secure_endpoint, verify_wallet_ownership
 
 # Set up logging
@@ -639,42 +668,11 @@ def get_token_price():
 
 @blockchain_bp.route("/recent-transactions", methods=["GET"])
 def get_recent_transactions():
-    """Get recent blockchain transactions"""
+    """Get recent blockchain transactions (local chain index, or the node while it is incomplete)"""
     try:
-        from datetime import datetime
-        from src.gateways.blockchain_gateways import PingPubGateway
-        
-        # Initialize gateway for this request
-        gateway = PingPubGateway()
-        
-        # Get real validator data to create meaningful transaction data
-        validators_data = gateway.get_validators()
-        
-        transactions = []
-        if validators_data and isinstance(validators_data, dict) and 'validators' in validators_data:
-            validators = validators_data['validators']
-            
-            for i, validator in enumerate(validators[:5] if isinstance(validators, list) else []):
-                if isinstance(validator, dict):
-                    transactions.append({
-                        'hash': f"0x{hash(str(validator.get('address', '')))%1000000:06x}...",
-                        'type': 'stake' if i % 2 == 0 else 'delegate',
-                        'amount': str(int(float(validator.get('voting_power', 1000)) / 1000)),
-                        'timestamp': datetime.now().isoformat(),
-                        'status': 'confirmed',
-                        'validator': str(validator.get('address', ''))[:12] + '...'
-                    })
-        else:
-            # Fallback with minimal data structure
-            transactions = [
-                {
-                    'hash': "0xa1b2c3...",
-                    'type': 'stake',
-                    'amount': "1000",
-                    'timestamp': datetime.now().isoformat(),
-                    'status': 'confirmed'
-                }
-            ]
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        use_index = os.environ.get("CHAIN_INDEXER", "1") != "0"
+        transactions = [summarize_tx(tx) for tx in get_chain_indexer().list_transactions(limit=limit, use_index=use_index)]
         
         return jsonify({
             'success': True,
@@ -695,13 +693,31 @@ Handles RPC proxy requests to bypass CORS limitations
 """
 
 import logging
-import requests
 import json
 from flask import Blueprint, request, jsonify
 from src.security_utils import secure_endpoint
+from src.gateways.endpoint_pool import (
+    EndpointPoolExhausted,
+    get_rest_endpoint_pool,
+    get_rpc_endpoint_pool,
+)
+from src.gateways.http_client import DEFAULT_TIMEOUT, LONG_TIMEOUT, get_http_client
+from src.gateways.request_coalescer import get_request_coalescer
+from src.gateways.rpc_cache import get_proxy_cache, rest_call_key
+from src.gateways.rpc_forwarder import JsonRpcForwarder, validate_rpc_payload
+from src.services.account_state_cache import get_account_state_cache
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts; reads fail over quickly, broadcasts get more time
+READ_TIMEOUT = DEFAULT_TIMEOUT
+BROADCAST_TIMEOUT = LONG_TIMEOUT
+
+
+def _post_rpc(base_url, payload):
+    return get_http_client().post(base_url, json=payload, timeout=READ_TIMEOUT)
+
+
 blockchain_proxy_bp = Blueprint('blockchain_proxy', __name__, url_prefix='/api/blockchain-proxy')
 
 @blockchain_proxy_bp.route('/rpc', methods=['POST', 'OPTIONS'])
@@ -720,68 +736,40 @@ def rpc_proxy():
         return response
     
     try:
-        # Get the RPC request data
+        # Get the RPC request data (a single call or a JSON-RPC batch array)
         rpc_data = request.get_json()
         if not rpc_data:
             return jsonify({"error": "No RPC data provided"}), 400
         
         # Validate RPC request structure
-        required_fields = ["jsonrpc", "method", "id"]
-        for field in required_fields:
-            if field not in rpc_data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        # Blockchain RPC endpoints
-        rpc_endpoints = [
-            "https://testnet-rpc.daodiseo.chaintools.tech",
-            "https://rpc.odiseotestnet.chaintools.tech",
-            "https://testnet-rpc.odiseo.nodeshub.online"
-        ]
-        
-        logger.debug(f"Proxying RPC request: {rpc_data.get('method')}")
-        
-        # Try each RPC endpoint until one succeeds
-        last_error = None
-        for rpc_url in rpc_endpoints:
-            try:
-                logger.debug(f"Attempting RPC call to: {rpc_url}")
-                
-                # Make the RPC request
-                response = requests.post(
-                    rpc_url,
-                    json=rpc_data,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'DAODISEO-Platform/1.0'
-                    },
-                    timeout=30
-                )
-                
-                # Check if request was successful
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.debug(f"Successful RPC response from {rpc_url}")
-                    
-                    # Add CORS headers to response
-                    json_response = jsonify(result)
-                    json_response.headers.add('Access-Control-Allow-Origin', '*')
-                    return json_response
-                
-                else:
-                    logger.warning(f"RPC endpoint {rpc_url} returned {response.status_code}")
-                    last_error = f"HTTP {response.status_code}: {response.text}"
-                    
-            except requests.RequestException as e:
-                logger.warning(f"RPC endpoint {rpc_url} failed: {str(e)}")
-                last_error = str(e)
-                continue
+        error = validate_rpc_payload(rpc_data)
+        if error:
+            return jsonify({"error": error}), 400
         
-        # All endpoints failed
-        logger.error(f"All RPC endpoints failed. Last error: {last_error}")
-        return jsonify({
-            "error": "All blockchain RPC endpoints are currently unavailable",
-            "details": last_error
-        }), 503
+        if isinstance(rpc_data, list):
+            logger.debug(f"Proxying RPC batch of {len(rpc_data)} calls")
+        else:
+            logger.debug(f"Proxying RPC request: {rpc_data.get('method')}")
+        
+        # Cached answers are served locally, identical concurrent reads share one
+        # upstream call, and the best node is picked from the pool (reads hedged)
+        forwarder = JsonRpcForwarder(
+            get_rpc_endpoint_pool(), get_proxy_cache(), get_request_coalescer(), _post_rpc
+        )
+        try:
+            result, cache_status = forwarder.forward(rpc_data)
+        except EndpointPoolExhausted as e:
+            logger.error(f"All RPC endpoints failed. Last error: {e.last_error}")
+            return jsonify({
+                "error": "All blockchain RPC endpoints are currently unavailable",
+                "details": e.last_error
+            }), 503
+        
+        # Add CORS headers to response
+        json_response = jsonify(result)
+        json_response.headers.add('Access-Control-Allow-Origin', '*')
+        json_response.headers.add('X-Cache', cache_status)
+        return json_response
         
     except Exception as e:
         logger.error(f"RPC proxy error: {str(e)}", exc_info=True)
@@ -807,90 +795,51 @@ def broadcast_proxy():
             return jsonify({"error": "No transaction data provided"}), 400
         
         logger.debug(f"Proxying transaction broadcast: {json.dumps(tx_data, indent=2)}")
+        account_states = get_account_state_cache()
         
-        # Try REST API endpoints first (more reliable for transactions)
-        rest_endpoints = [
-            "https://testnet-api.daodiseo.chaintools.tech/txs",
-            "https://api.odiseotestnet.chaintools.tech/txs",
-            "https://testnet-api.odiseo.nodeshub.online/txs"
-        ]
-        
-        # Try RPC endpoints as fallback
-        rpc_endpoints = [
-            "https://testnet-rpc.daodiseo.chaintools.tech/broadcast_tx_sync",
-            "https://rpc.odiseotestnet.chaintools.tech/broadcast_tx_sync",
-            "https://testnet-rpc.odiseo.nodeshub.online/broadcast_tx_sync"
-        ]
-        
-        # First try REST API endpoints
-        for endpoint in rest_endpoints:
-            try:
-                logger.debug(f"Attempting broadcast to REST endpoint: {endpoint}")
-                
-                response = requests.post(
-                    endpoint,
-                    json=tx_data,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'DAODISEO-Platform/1.0'
-                    },
-                    timeout=30
-                )
-                
-                if response.status_code in [200, 201]:
-                    result = response.json()
-                    logger.info(f"Transaction broadcast successful via {endpoint}")
-                    
-                    json_response = jsonify(result)
-                    json_response.headers.add('Access-Control-Allow-Origin', '*')
-                    return json_response
-                
-                else:
-                    logger.warning(f"REST endpoint {endpoint} returned {response.status_code}: {response.text}")
-                    
-            except requests.RequestException as e:
-                logger.warning(f"REST endpoint {endpoint} failed: {str(e)}")
-                continue
+        # First try REST API endpoints (more reliable for transactions), best node first
+        try:
+            response, endpoint = get_rest_endpoint_pool().call(
+                lambda base_url: get_http_client().post(
+                    f"{base_url}/txs", json=tx_data, timeout=BROADCAST_TIMEOUT
+                ),
+                accept=(200, 201)
+            )
+            logger.info(f"Transaction broadcast successful via {endpoint}")
+            result = response.json()
+            account_states.record_tx_broadcast(tx_data, result)
+            json_response = jsonify(result)
+            json_response.headers.add('Access-Control-Allow-Origin', '*')
+            return json_response
+        except EndpointPoolExhausted as e:
+            logger.warning(f"REST broadcast failed on all endpoints: {e.last_error}")
+            account_states.record_tx_broadcast(tx_data, e.last_error)
         
         # Try RPC endpoints as fallback
-        for endpoint in rpc_endpoints:
-            try:
-                logger.debug(f"Attempting broadcast to RPC endpoint: {endpoint}")
-                
-                # Convert transaction to RPC format if needed
-                rpc_data = {
-                    "jsonrpc": "2.0",
-                    "method": "broadcast_tx_sync",
-                    "params": {
-                        "tx": tx_data.get("tx", tx_data)
-                    },
-                    "id": 1
-                }
-                
-                response = requests.post(
-                    endpoint,
-                    json=rpc_data,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'DAODISEO-Platform/1.0'
-                    },
-                    timeout=30
+        # Convert transaction to RPC format if needed
+        rpc_data = {
+            "jsonrpc": "2.0",
+            "method": "broadcast_tx_sync",
+            "params": {
+                "tx": tx_data.get("tx", tx_data)
+            },
+            "id": 1
+        }
+        try:
+            response, endpoint = get_rpc_endpoint_pool().call(
+                lambda base_url: get_http_client().post(
+                    f"{base_url}/broadcast_tx_sync", json=rpc_data, timeout=BROADCAST_TIMEOUT
                 )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"Transaction broadcast successful via RPC {endpoint}")
-                    
-                    json_response = jsonify(result)
-                    json_response.headers.add('Access-Control-Allow-Origin', '*')
-                    return json_response
-                
-                else:
-                    logger.warning(f"RPC endpoint {endpoint} returned {response.status_code}: {response.text}")
-                    
-            except requests.RequestException as e:
-                logger.warning(f"RPC endpoint {endpoint} failed: {str(e)}")
-                continue
+            )
+            logger.info(f"Transaction broadcast successful via RPC {endpoint}")
+            result = response.json()
+            account_states.record_tx_broadcast(tx_data, result)
+            json_response = jsonify(result)
+            json_response.headers.add('Access-Control-Allow-Origin', '*')
+            return json_response
+        except EndpointPoolExhausted as e:
+            logger.warning(f"RPC broadcast failed on all endpoints: {e.last_error}")
+            account_states.record_tx_broadcast(tx_data, e.last_error)
         
         # All endpoints failed
         return jsonify({
@@ -926,46 +875,37 @@ def query_proxy():
         
         logger.debug(f"Proxying blockchain query: {query_path}")
         
-        # REST API endpoints for queries
-        api_endpoints = [
-            "https://testnet-api.daodiseo.chaintools.tech",
-            "https://api.odiseotestnet.chaintools.tech",
-            "https://testnet-api.odiseo.nodeshub.online"
-        ]
-        
-        for base_url in api_endpoints:
-            try:
-                full_url = f"{base_url}/{query_path.lstrip('/')}"
-                logger.debug(f"Querying: {full_url}")
-                
-                response = requests.get(
-                    full_url,
-                    params=query_params,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'DAODISEO-Platform/1.0'
-                    },
-                    timeout=30
+        cache = get_proxy_cache()
+        cached = cache.lookup_rest(query_path, query_params)
+        if cached is not None:
+            json_response = jsonify(cached)
+            json_response.headers.add('Access-Control-Allow-Origin', '*')
+            json_response.headers.add('X-Cache', 'HIT')
+            return json_response
+        
+        def fetch():
+            response, base_url = get_rest_endpoint_pool().hedged_call(
+                lambda base_url: get_http_client().get(
+                    f"{base_url}/{query_path.lstrip('/')}", params=query_params, timeout=READ_TIMEOUT
                 )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.debug(f"Query successful via {base_url}")
-                    
-                    json_response = jsonify(result)
-                    json_response.headers.add('Access-Control-Allow-Origin', '*')
-                    return json_response
-                
-                else:
-                    logger.warning(f"Query endpoint {base_url} returned {response.status_code}")
-                    
-            except requests.RequestException as e:
-                logger.warning(f"Query endpoint {base_url} failed: {str(e)}")
-                continue
+            )
+            logger.debug(f"Query successful via {base_url}")
+            return response.json()
         
-        return jsonify({
-            "error": "All blockchain query endpoints are currently unavailable"
-        }), 503
+        # Identical concurrent queries share one upstream call
+        try:
+            result, shared = get_request_coalescer().do(rest_call_key(query_path, query_params), fetch)
+        except EndpointPoolExhausted as e:
+            logger.warning(f"All query endpoints failed: {e.last_error}")
+            return jsonify({
+                "error": "All blockchain query endpoints are currently unavailable"
+            }), 503
+        
+        cache.store_rest(query_path, query_params, result)
+        json_response = jsonify(result)
+        json_response.headers.add('Access-Control-Allow-Origin', '*')
+        json_response.headers.add('X-Cache', 'COALESCED' if shared else 'MISS')
+        return json_response
         
     except Exception as e:
         logger.error(f"Query proxy error: {str(e)}", exc_info=True)
@@ -978,13 +918,20 @@ def proxy_health():
     try:
         # Test connectivity to at least one endpoint
         test_url = "https://testnet-api.daodiseo.chaintools.tech/cosmos/base/tendermint/v1beta1/node_info"
-        response = requests.get(test_url, timeout=10)
+        response = get_http_client().get(test_url, timeout=READ_TIMEOUT)
         
         if response.status_code == 200:
             return jsonify({
                 "status": "healthy",
                 "message": "Blockchain proxy service is operational",
-                "endpoints_available": True
+                "endpoints_available": True,
+                "endpoints": {
+                    "rpc": get_rpc_endpoint_pool().get_stats(),
+                    "rest": get_rest_endpoint_pool().get_stats()
+                },
+                "cache": get_proxy_cache().get_stats(),
+                "coalescing": get_request_coalescer().get_stats(),
+                "http": get_http_client().get_stats()
             })
         else:
             return jsonify({
@@ -1121,10 +1068,12 @@ def register_rpc_routes(app):
     logger.info("RPC routes registered successfully")
 # ==== File: src/controllers/transaction_controller.py ====
 import logging
+import os
 import uuid
 import json
 from flask import Blueprint, jsonify, request
 from src.services.transaction_service import TransactionService
+from src.services.chain_indexer import get_chain_indexer, summarize_tx
 from src.gateways.blockchain_gateways import KeplerGateway, KeplerSignatureRole
 
 # Configure logging
@@ -1146,110 +1095,54 @@ kepler_gateway = KeplerGateway(network_config)
 
 @transaction_bp.route("/transactions", methods=["GET"])
 def get_transactions():
-    """Retrieve blockchain transactions"""
-    # Get from blockchain or return test data if no address is provided
+    """Retrieve blockchain transactions (local chain index, or the node while it is incomplete)"""
     address = request.args.get("address")
+    role = request.args.get("role")  # "sender" or "recipient"
+    limit = min(request.args.get("limit", 30, type=int), 100)
+    page = max(request.args.get("page", 1, type=int), 1)
+    offset = (page - 1) * limit
     
-    # ------------------------------------------------------------
-    # TODO(DDS_TEAM): Replace mock transaction data with real blockchain queries
-    # TODO(DDS_TEAM): Implement proper pagination for transaction results
-    # TODO(DDS_TEAM): Add caching layer to reduce blockchain API calls
-    # TODO(DDS_TEAM): Add proper error handling for blockchain query failures
-    # ------------------------------------------------------------
-    if address:
-        # Try to get real transaction data for the address
-        try:
-            # This would be replaced with actual blockchain query
+    try:
+        if address:
             logger.debug(f"Querying transactions for address: {address}")
-            # Placeholder - real implementation would query blockchain
-            return jsonify([
-                {
-                    "id": f"tx-{uuid.uuid4().hex[:8]}",
-                    "type": "Property Tokenization",
-                    "hash": f"0x{uuid.uuid4().hex}",
-                    "timestamp": "2025-04-04T12:34:56Z",
-                    "status": "confirmed",
-                    "address": address,
-                }
-            ])
-        except Exception as e:
-            logger.error(f"Error querying transactions: {str(e)}")
-            # Fall back to sample data
-    
-    # Sample transactions for display
-    transactions = [
-        {
-            "id": "tx1",
-            "type": "Property Tokenization",
-            "hash": "0x7a3bc8e4f82b5d98f3c8bd71904a31c9e4d77d18e76d9b4d60bb598af3c9a8b2",
-            "block": 10245678,
-            "timestamp": "2025-04-04T12:34:56Z",
-            "status": "confirmed",
-            "value": "1500000",
-            "currency": "ODIS",
-        },
-        {
-            "id": "tx2",
-            "type": "Document Upload",
-            "hash": "0x9d2e7c6b45a3f2e89d364c5f7e8b9a1c2d8e7f6a5b4c3d2e1f0a9b8c7d6e5f4a",
-            "block": 10245621,
-            "timestamp": "2025-04-03T09:12:34Z",
-            "status": "confirmed",
-            "document": "Property Deed.pdf",
-        },
-        {
-            "id": "tx3",
-            "type": "Multi-sig Approval",
-            "hash": "0x3f8e2d9c15b7a6f4d8e2c9b1a7d6f5e4d3c2b1a9f8e7d6c5b4a3f2e1d9c8b7a6",
-            "block": 10245589,
-            "timestamp": "2025-04-02T15:45:30Z",
-            "status": "confirmed",
-            "signatures": "3/4",
-        },
-    ]
-
-    return jsonify(transactions)
+        txs = get_chain_indexer().list_transactions(
+            address or None, role, limit, offset,
+            use_index=os.environ.get("CHAIN_INDEXER", "1") != "0",
+        )
+        return jsonify([summarize_tx(tx) for tx in txs])
+    except Exception as e:
+        logger.error(f"Error querying transactions: {str(e)}")
+        return jsonify({"error": "Failed to query transactions"}), 500
 
 
 @transaction_bp.route("/transactions/<tx_id>", methods=["GET"])
 def get_transaction(tx_id):
-    """Retrieve a specific transaction by ID"""
-    # ------------------------------------------------------------
-    # TODO(DDS_TEAM): Implement real blockchain query to fetch transaction details
-    # TODO(DDS_TEAM): Add error handling for non-existent transaction IDs
-    # TODO(DDS_TEAM): Add transaction verification using blockchain API
-    # ------------------------------------------------------------
+    """Retrieve a specific transaction by hash"""
     logger.debug(f"Getting transaction details for: {tx_id}")
-
-    mock_transactions = {
-        "tx1": {
-            "id": "tx1",
-            "type": "Property Tokenization",
-            "hash": "0x7a3bc8e4f82b5d98f3c8bd71904a31c9e4d77d18e76d9b4d60bb598af3c9a8b2",
-            "block": 10245678,
-            "timestamp": "2025-04-04T12:34:56Z",
-            "status": "confirmed",
-            "value": "1500000",
-            "currency": "ODIS",
-            "sender": "odiseo1a2b3c4d5e6f7g8h9i0j",
-            "receiver": "odiseo0j9i8h7g6f5e4d3c2b1a",
-            "gas_used": 21000,
-            "gas_price": "0.000000001",
-            "fees": "0.000021",
-            "details": {
-                "property_id": "prop123",
-                "property_name": "Cosmic Tower",
-                "token_count": 1500000,
-                "token_price": "1.00",
-                "total_value": "1500000.00",
-            },
-        }
-    }
-
-    if tx_id not in mock_transactions:
+    
+    try:
+        indexer = get_chain_indexer()
+        tx = indexer.get_transaction(tx_id)
+    except Exception as e:
+        logger.error(f"Error querying transaction {tx_id}: {str(e)}")
+        return jsonify({"error": "Failed to query transaction"}), 500
+    
+    if tx is None:
+        # Older than the indexed window (or not indexed yet): ask the node directly
+        try:
+            tx = indexer.fetch_transaction(tx_id)
+        except Exception as e:
+            logger.warning(f"Upstream lookup of transaction {tx_id} failed: {str(e)}")
+    
+    if tx is None:
         return jsonify({"error": "Transaction not found"}), 404
-
-    return jsonify(mock_transactions[tx_id])
+    
+    return jsonify({
+        **summarize_tx(tx),
+        "gas_wanted": tx["gas_wanted"],
+        "messages": tx["msg_types"],
+        "events": tx["events"],
+    })
 
 
 @transaction_bp.route("/transactions/sign", methods=["POST"])
@@ -2,12 +2,16 @@
 IFC Controller for handling IFC file operations and analysis.
 """
 
+import hashlib
 import logging
 import os
+import re
 from flask import Blueprint, jsonify, request, current_app
 
 from src.services.ai_services.ai_agent_service import AIAgentService
+from src.services.chain_indexer import get_chain_indexer
 from src.gateways.bim_gateways import IFCGateway
+from src.security_utils import secure_endpoint
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,6 +22,9 @@ ifc_bp = Blueprint("ifc", __name__, url_prefix="/api/ifc")
 # Initialize services
 ai_agent_service = AIAgentService()
 
+SHA256_PATTERN = re.compile(r"^[0-9a-fA-F]{64}$")
+MAX_VERIFY_BATCH = 500
+
 @ifc_bp.route("/summary", methods=["GET"])
 def get_ifc_summary():
     """Get a summary of an IFC file"""
@@ -81,4 +88,74 @@ def analyze_ifc_file():
         return jsonify({
             "success": False,
             "message": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+@ifc_bp.route("/verify/<sha256>", methods=["GET"])
+@secure_endpoint
+def verify_ifc_hash(sha256):
+    """Check whether an IFC file's SHA-256 is anchored on-chain (local index lookup)"""
+    if not SHA256_PATTERN.match(sha256):
+        return jsonify({
+            "success": False,
+            "message": "Expected a 64-character hex SHA-256 digest"
+        }), 400
+    
+    try:
+        report = get_chain_indexer().verify_content_hashes([sha256])
+        return jsonify({
+            "success": True,
+            **report["results"][0],
+            "indexed_range": report["indexed_range"]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error verifying IFC hash {sha256}: {e}")
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 500
+
+@ifc_bp.route("/verify", methods=["POST"])
+@secure_endpoint
+def verify_ifc_hashes():
+    """Verify many IFC files at once: JSON {"hashes": [...]} and/or uploaded files"""
+    try:
+        data = request.get_json(silent=True) or {}
+        hashes = list(data.get("hashes", []))
+        
+        # Uploaded files are hashed in chunks, never held in memory whole
+        for upload in request.files.getlist("file"):
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: upload.stream.read(1024 * 1024), b""):
+                digest.update(chunk)
+            hashes.append(digest.hexdigest())
+        
+        if not hashes:
+            return jsonify({
+                "success": False,
+                "message": "No hashes or files provided"
+            }), 400
+        
+        if len(hashes) > MAX_VERIFY_BATCH:
+            return jsonify({
+                "success": False,
+                "message": f"At most {MAX_VERIFY_BATCH} hashes per request"
+            }), 400
+        
+        invalid = [h for h in hashes if not isinstance(h, str) or not SHA256_PATTERN.match(h)]
+        if invalid:
+            return jsonify({
+                "success": False,
+                "message": "Expected 64-character hex SHA-256 digests",
+                "invalid": invalid[:10]
+            }), 400
+        
+        report = get_chain_indexer().verify_content_hashes(hashes)
+        return jsonify({"success": True, **report})
+        
+    except Exception as e:
+        logger.error(f"Error verifying IFC hashes: {e}")
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 500
@@ -4,9 +4,13 @@ Routes all component data requests through o3-mini AI orchestrator with real RPC
 """
 
 import logging
+import os
+import threading
+import time
 from flask import Blueprint, jsonify, request
 from src.services.ai_services.openai_agents_orchestrator import DaodiseoAgentsOrchestrator
 from src.services.rpc_service import DaodiseoRPCService
+from src.services.validator_set_service import get_validator_set_service
 from src.security_utils import secure_endpoint
 
 logger = logging.getLogger(__name__)
@@ -17,6 +21,13 @@ orchestrator_bp = Blueprint('orchestrator', __name__, url_prefix='/api/orchestra
 # Initialize services
 orchestrator = DaodiseoAgentsOrchestrator()
 rpc_service = DaodiseoRPCService()
+validator_set_service = get_validator_set_service()
+
+# Shared cache for the combined dashboard analysis
+DASHBOARD_CACHE_TTL = int(os.environ.get("DASHBOARD_CACHE_TTL", "60"))
+DASHBOARD_PENDING_TTL = 5
+_dashboard_cache = {"result": None, "expires_at": 0.0}
+_dashboard_lock = threading.Lock()
 
 @orchestrator_bp.route('/token-metrics', methods=['GET'])
 @secure_endpoint
@@ -31,6 +42,7 @@ def get_token_metrics():
         blockchain_data = {
             "network_status": network_status,
             "latest_block": latest_block,
+            "block_times": rpc_service.get_recent_block_times(),
             "chain_id": "ithaca-1",
             "rpc_endpoint": "testnet-rpc.daodiseo.chaintools.tech"
         }
@@ -60,8 +72,8 @@ def get_token_metrics():
 def get_staking_metrics():
     """Get staking metrics via o3-mini orchestrator with real validator data"""
     try:
-        # Get real validator and network data from RPC
-        validators_data = rpc_service.get_validators()
+        # Full validator set (all pages, consensus + staking) and network data
+        validators_data = validator_set_service.get_validator_set()
         network_data = rpc_service.get_network_status()
         
         # Use o3-mini to analyze real staking data
@@ -98,7 +110,8 @@ def get_network_health():
         rpc_data = {
             "network_status": network_status,
             "consensus_state": consensus_state,
-            "network_info": network_info
+            "network_info": network_info,
+            "block_times": rpc_service.get_recent_block_times()
         }
         
         # Use o3-mini to analyze network health
@@ -127,7 +140,7 @@ def get_portfolio_analysis():
     """Get portfolio analysis via o3-mini orchestrator"""
     try:
         # Get market data from multiple sources
-        validators_data = rpc_service.get_validators()
+        validators_data = validator_set_service.get_validator_set()
         network_status = rpc_service.get_network_status()
         
         # Combine data for comprehensive portfolio analysis
@@ -144,7 +157,7 @@ def get_portfolio_analysis():
         if result.get("success"):
             # Enhance with portfolio context
             result["data"]["portfolio_type"] = "real_estate_tokenization"
-            result["data"]["diversification_score"] = 85
+            result["data"].update(orchestrator.analytics.portfolio_metrics(validators_data))
             result["metadata"]["analysis_type"] = "portfolio_performance"
             return jsonify(result)
         else:
@@ -160,4 +173,56 @@ def get_portfolio_analysis():
             "success": False,
             "error": "Orchestrator service unavailable",
             "details": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+@orchestrator_bp.route('/dashboard', methods=['GET'])
+@secure_endpoint
+def get_dashboard():
+    """Get all dashboard sections from one RPC pass; narrative from one structured AI call"""
+    try:
+        now = time.monotonic()
+        cached = _dashboard_cache["result"]
+        if cached and now < _dashboard_cache["expires_at"]:
+            return jsonify({**cached, "cached": True})
+        
+        # Only one request refreshes the analysis; others wait for its result
+        with _dashboard_lock:
+            now = time.monotonic()
+            cached = _dashboard_cache["result"]
+            if cached and now < _dashboard_cache["expires_at"]:
+                return jsonify({**cached, "cached": True})
+            
+            dashboard_data = {
+                "network_status": rpc_service.get_network_status(),
+                "latest_block": rpc_service.get_latest_block(),
+                "validators": validator_set_service.get_validator_set(),
+                "network_info": rpc_service.get_network_info(),
+                "block_times": rpc_service.get_recent_block_times(),
+                "chain_id": "ithaca-1",
+                "asset_type": "tokenized_real_estate"
+            }
+            
+            result = orchestrator.analyze_dashboard(dashboard_data)
+            
+            if not result.get("success"):
+                return jsonify({
+                    "success": False,
+                    "error": "Failed to analyze dashboard via orchestrator",
+                    "details": result.get("data", {}).get("error_message", "Unknown error")
+                }), 500
+            
+            # Re-check soon while the narrative is still being generated
+            ttl = DASHBOARD_CACHE_TTL
+            if result.get("metadata", {}).get("narrative_status") not in ("ready", "unavailable"):
+                ttl = min(ttl, DASHBOARD_PENDING_TTL)
+            _dashboard_cache["result"] = result
+            _dashboard_cache["expires_at"] = time.monotonic() + ttl
+            return jsonify({**result, "cached": False})
+            
+    except Exception as e:
+        logger.error(f"Dashboard orchestrator error: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Orchestrator service unavailable",
+            "details": str(e)
+        }), 500
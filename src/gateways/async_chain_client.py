@@ -0,0 +1,219 @@
+"""
+Async Chain Client
+Non-blocking access to the Daodiseo testnet RPC and REST endpoints over a
+shared httpx connection pool, plus a helper for running concurrent fetches
+with per-task timeouts.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from src.gateways.http_client import HTTP2_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+
+def _log_close_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"Closing stale chain client failed: {future.exception()}")
+
+
+class AsyncChainClient:
+    """Async JSON client for CometBFT RPC and Cosmos REST endpoints"""
+
+    def __init__(
+        self,
+        rpc_endpoint: str = "https://testnet-rpc.daodiseo.chaintools.tech",
+        rest_endpoint: str = "https://testnet-api.daodiseo.chaintools.tech",
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client
+
+        Args:
+            rpc_endpoint: CometBFT RPC base URL
+            rest_endpoint: Cosmos SDK REST base URL
+            timeout: Default request timeout in seconds
+            max_connections: Size of the shared connection pool
+            transport: Optional custom transport (e.g. httpx.MockTransport in tests)
+        """
+        self.rpc_endpoint = rpc_endpoint.rstrip("/")
+        self.rest_endpoint = rest_endpoint.rstrip("/")
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.transport = transport
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Pool usage metrics
+        self._in_flight = 0
+        self._stats = {
+            "requests": 0,
+            "errors": 0,
+            "peak_in_flight": 0,
+            "saturated": 0,
+            "clients_created": 0,
+            "clients_retired": 0,
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled AsyncClient bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._retire(self._client, self._client_loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self.transport,
+                http2=HTTP2_AVAILABLE and self.transport is None
+            )
+            self._client_loop = loop
+            self._stats["clients_created"] += 1
+        return self._client
+
+    def _retire(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client left behind on another event loop"""
+        self._stats["clients_retired"] += 1
+        if loop is None or loop.is_closed():
+            # Its loop is gone, so aclose() cannot run; drop the reference and say so
+            logger.debug("Dropping chain client bound to a closed event loop")
+            return
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).add_done_callback(_log_close_failure)
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       rest: bool = False, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        GET a JSON document from RPC (default) or REST
+
+        Returns:
+            Dict: Parsed JSON, or {} if the request failed
+        """
+        base = self.rest_endpoint if rest else self.rpc_endpoint
+        url = f"{base}/{path.lstrip('/')}"
+        self._begin_request()
+        try:
+            response = await self.client.get(url, params=params, timeout=timeout or self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Failed to fetch {path}: {e}")
+            return {}
+        finally:
+            self._in_flight -= 1
+
+    async def health(self, timeout: float = 5.0) -> bool:
+        """Check the RPC /health endpoint"""
+        self._begin_request()
+        try:
+            response = await self.client.get(f"{self.rpc_endpoint}/health", timeout=timeout)
+            return response.status_code == 200
+        except Exception:
+            self._stats["errors"] += 1
+            return False
+        finally:
+            self._in_flight -= 1
+
+    def _begin_request(self):
+        self._in_flight += 1
+        self._stats["requests"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+        if self._in_flight > self.max_connections:
+            # More concurrent requests than pooled connections: this one queues
+            self._stats["saturated"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection pool usage metrics"""
+        return {
+            **self._stats,
+            "in_flight": self._in_flight,
+            "max_connections": self.max_connections,
+        }
+
+    async def aclose(self):
+        """Close the connection pool"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+
+class FetchExecutor(ThreadPoolExecutor):
+    """Long-lived thread pool that reports its saturation"""
+
+    def __init__(self, max_workers: int = 4, thread_name_prefix: str = "chain-fetch"):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_workers = max_workers
+        self._metrics_lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._stats = {"submitted": 0, "completed": 0, "peak_active": 0, "saturated": 0}
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._metrics_lock:
+            self._stats["submitted"] += 1
+            self._queued += 1
+            if self._active + self._queued > self.max_workers:
+                self._stats["saturated"] += 1
+        return super().submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        with self._metrics_lock:
+            self._queued -= 1
+            self._active += 1
+            self._stats["peak_active"] = max(self._stats["peak_active"], self._active)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._metrics_lock:
+                self._active -= 1
+                self._stats["completed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thread pool usage metrics"""
+        with self._metrics_lock:
+            return {
+                **self._stats,
+                "active": self._active,
+                "queued": self._queued,
+                "max_workers": self.max_workers,
+            }
+
+
+async def gather_with_timeouts(
+    tasks: Dict[str, Callable[[], Awaitable[Any]]],
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Run named coroutines concurrently, each bounded by its own timeout
+
+    Args:
+        tasks: Mapping of name to zero-argument coroutine function
+        timeout: Per-task timeout in seconds
+
+    Returns:
+        Dict: name -> result, or the exception raised (asyncio.TimeoutError on timeout)
+    """
+    async def run(name: str, factory: Callable[[], Awaitable[Any]]):
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(factory(), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            logger.warning(f"{name} timed out after {time.monotonic() - started:.1f}s")
+            return e
+
+    names = list(tasks.keys())
+    results = await asyncio.gather(*(run(name, tasks[name]) for name in names), return_exceptions=True)
+    return dict(zip(names, results))
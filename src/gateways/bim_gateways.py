@@ -12,9 +12,15 @@ import logging
 from typing import BinaryIO, Dict, List, Optional, cast
 import json
 
+from src.gateways.http_client import LONG_TIMEOUT, Timeout, get_http_client
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Synchronous uploads and downloads move whole models and wait for the server to
+# (de)serialize them, so they get a much longer read timeout than API calls
+TRANSFER_TIMEOUT = (3.05, float(os.environ.get("BIMSERVER_TRANSFER_TIMEOUT", "900")))
+
 
 class BIMServerGateway:
     """
@@ -36,6 +42,7 @@ class BIMServerGateway:
         self.password = password
         self.token = None
         self.headers = {"Content-Type": "application/json"}
+        self.http = get_http_client()
 
         # Ensure we're authenticated
         self._authenticate()
@@ -58,7 +65,7 @@ class BIMServerGateway:
                 }
             }
 
-            response = requests.post(endpoint, json=payload)
+            response = self.http.post(endpoint, json=payload)
             response.raise_for_status()
 
             result = response.json()
@@ -74,7 +81,8 @@ class BIMServerGateway:
             logger.error(f"Error connecting to BIMserver: {str(e)}")
             raise
 
-    def _call_api(self, interface: str, method: str, parameters: Dict) -> Dict:
+    def _call_api(self, interface: str, method: str, parameters: Dict,
+                  timeout: Timeout = LONG_TIMEOUT) -> Dict:
         """
         Make a call to the BIMserver JSON API.
 
@@ -82,6 +90,7 @@ class BIMServerGateway:
             interface: BIMserver interface name (e.g., 'ServiceInterface')
             method: Method name to call
             parameters: Parameters to pass to the method
+            timeout: (connect, read) timeout; TRANSFER_TIMEOUT for file transfers
 
         Returns:
             Response data from BIMserver
@@ -99,7 +108,7 @@ class BIMServerGateway:
         }
 
         try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
+            response = self.http.post(endpoint, json=payload, headers=self.headers, timeout=timeout)
             response.raise_for_status()
 
             result = response.json()
@@ -237,11 +246,13 @@ class BIMServerGateway:
                     "data": self._encode_file_data(file_content),
                     "sync": True,
                 },
+                timeout=TRANSFER_TIMEOUT,
             )
 
             # Finalize the checkin to get the revision ID
+            # Finalizing waits for the server to process the model as well
             finalize_result = self._call_api(
-                "ServiceInterface", "finalizeCheckin", {"topicId": topicId}
+                "ServiceInterface", "finalizeCheckin", {"topicId": topicId}, timeout=TRANSFER_TIMEOUT
             )
 
             if "result" in finalize_result:
@@ -275,6 +286,7 @@ class BIMServerGateway:
                 "ServiceInterface",
                 "download",
                 {"roid": revision_id, "serializerOid": serializer_id, "sync": True},
+                timeout=TRANSFER_TIMEOUT,
             )
 
             if "result" in download_result:
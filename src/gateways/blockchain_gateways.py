@@ -642,6 +642,9 @@ import dotenv
 import time
 from urllib.parse import urljoin
 
+from src.services.account_state_cache import get_account_state_cache
+from src.services.validator_set_service import get_validator_set_service
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -829,26 +832,18 @@ class PingPubGateway:
             }
             
         try:
-            endpoint = f"{self.base_url}{self.account_endpoint}/{address}"
-            logger.debug(f"Requesting account info from: {endpoint}")
-            
-            response = self.session.get(endpoint, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.debug(f"Account data received: {json.dumps(data, indent=2)}")
-            
-            # Extract account_number and sequence, defaulting to 0 if not found
-            account_number = str(data.get("account_number", "0"))
-            sequence = str(data.get("sequence", "0"))
+            # Account numbers are cached for good and sequences tracked locally,
+            # so this only reaches the chain for new or invalidated accounts
+            state = get_account_state_cache().get(address)
+            logger.debug(f"Account state for {address}: {state}")
             
             return {
                 "address": address,
-                "account_number": account_number,
-                "sequence": sequence
+                "account_number": state["account_number"],
+                "sequence": state["sequence"]
             }
         
-        except requests.RequestException as e:
+        except Exception as e:
             logger.error(f"Failed to get account info: {str(e)}")
             
             # If in development mode, return mock data
@@ -875,43 +870,34 @@ class PingPubGateway:
             return self._get_mock_validators()
             
         try:
-            # Use the proper REST API endpoint for authentic validator data
-            rest_api_url = "https://testnet-api.daodiseo.chaintools.tech"
-            validators_endpoint = f"{rest_api_url}/cosmos/staking/v1beta1/validators"
-            logger.debug(f"Requesting validators from REST API: {validators_endpoint}")
-            
-            response = self.session.get(validators_endpoint, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            # The full staking set (all pages, merged with the consensus set) from
+            # the shared validator set service, cached per block height
+            result = get_validator_set_service().get_validator_set()
+            if not result.get("success"):
+                raise requests.exceptions.ConnectionError(result.get("error", "Validator set unavailable"))
             
-            # Parse the authentic validator data from Cosmos SDK REST API
-            if 'validators' in data:
-                validators = data['validators']
-                formatted_validators = []
+            formatted_validators = []
+            for validator in result["data"]["validators"]:
+                if validator.get("operator_address") is None:
+                    continue  # consensus key without staking data
                 
-                for validator in validators[:10]:  # Limit to top 10 for display
-                    # Extract real validator information
-                    tokens = int(validator.get("tokens", "0"))
-                    voting_power = tokens // 1000000  # Convert from uodis to ODIS
-                    
-                    formatted_validators.append({
-                        "operator_address": validator.get("operator_address", ""),
-                        "description": {
-                            "moniker": validator.get("description", {}).get("moniker", "Unknown Validator")
-                        },
-                        "status": validator.get("status", "BOND_STATUS_UNBONDED"),
-                        "voting_power": str(voting_power),
-                        "tokens": validator.get("tokens", "0"),
-                        "commission": validator.get("commission", {"commission_rates": {"rate": "0.05"}}),
-                        "jailed": validator.get("jailed", False)
-                    })
+                tokens = int(validator.get("tokens") or "0")
+                voting_power = tokens // 1000000  # Convert from uodis to ODIS
                 
-                logger.info(f"Successfully fetched {len(formatted_validators)} authentic validators from Odiseo testnet")
-                return formatted_validators
-            else:
-                logger.warning("No validators found in API response")
-                return []
+                formatted_validators.append({
+                    "operator_address": validator["operator_address"],
+                    "description": {
+                        "moniker": validator.get("moniker") or "Unknown Validator"
+                    },
+                    "status": validator.get("status") or "BOND_STATUS_UNBONDED",
+                    "voting_power": str(voting_power),
+                    "tokens": validator.get("tokens") or "0",
+                    "commission": {"commission_rates": {"rate": str(validator.get("commission_rate") or "0.05")}},
+                    "jailed": validator.get("jailed", False)
+                })
+            
+            logger.info(f"Successfully fetched {len(formatted_validators)} authentic validators from Odiseo testnet")
+            return formatted_validators
         
         except requests.RequestException as e:
             logger.error(f"Failed to get validators from both RPC and explorer: {str(e)}")
@@ -0,0 +1,243 @@
+"""
+CometBFT Event Subscriber
+Subscribes to NewBlock, Tx and ValidatorSetUpdates events on a CometBFT node's
+/websocket endpoint and hands them to a callback as they happen. Reports
+connected only once the node has acknowledged every subscription. Reconnects
+with backoff; callers fall back to polling while it is disconnected.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+# Event name -> CometBFT subscription query
+DEFAULT_SUBSCRIPTIONS = {
+    "NewBlock": "tm.event='NewBlock'",
+    "Tx": "tm.event='Tx'",
+    "ValidatorSetUpdates": "tm.event='ValidatorSetUpdates'",
+}
+
+EventHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def websocket_url(rpc_endpoint: str) -> str:
+    """Turn an RPC base URL into its /websocket URL"""
+    url = rpc_endpoint.rstrip("/")
+    if url.startswith("https://"):
+        url = "wss://" + url[len("https://"):]
+    elif url.startswith("http://"):
+        url = "ws://" + url[len("http://"):]
+    return f"{url}/websocket"
+
+
+def parse_event(message: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Extract (event_type, value) from a CometBFT websocket message
+
+    Returns:
+        Tuple, or None for subscription acks, errors and unparseable messages
+    """
+    try:
+        payload = json.loads(message) if isinstance(message, (str, bytes)) else message
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    data = (payload.get("result") or {}).get("data")
+    if not isinstance(data, dict):
+        return None
+    event_type = str(data.get("type", "")).rsplit("/", 1)[-1]
+    if not event_type:
+        return None
+    return event_type, data.get("value") or {}
+
+
+class CometBFTSubscriber:
+    """Push-based CometBFT event feed with reconnect and backoff"""
+
+    def __init__(
+        self,
+        rpc_endpoint: str,
+        on_event: EventHandler,
+        on_connect: Optional[Callable[[], None]] = None,
+        on_disconnect: Optional[Callable[[], None]] = None,
+        subscriptions: Optional[Dict[str, str]] = None,
+        connect: Optional[Callable[[str], Any]] = None,
+        reconnect_initial: float = 1.0,
+        reconnect_max: float = 30.0,
+        queue_size: int = 1000,
+    ):
+        """
+        Initialize the subscriber
+
+        Args:
+            rpc_endpoint: CometBFT RPC base URL (http/https)
+            on_event: Coroutine called with (event_type, value) for every event
+            on_connect: Called once subscriptions are active
+            on_disconnect: Called when the connection is lost
+            subscriptions: Event name -> query (defaults to DEFAULT_SUBSCRIPTIONS)
+            connect: Factory returning an async context manager websocket
+                (defaults to websockets.connect; tests pass a stand-in)
+            reconnect_initial: First reconnect delay in seconds
+            reconnect_max: Maximum reconnect delay in seconds
+            queue_size: Events buffered between the socket and on_event
+        """
+        self.url = websocket_url(rpc_endpoint)
+        self.on_event = on_event
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.subscriptions = subscriptions or DEFAULT_SUBSCRIPTIONS
+        self._connect = connect
+        self.reconnect_initial = reconnect_initial
+        self.reconnect_max = reconnect_max
+        self.queue_size = queue_size
+
+        self.connected = False
+        self._running = False
+        self._stats = {"events": 0, "dropped": 0, "connects": 0, "disconnects": 0, "last_event_at": None}
+
+    @property
+    def available(self) -> bool:
+        """Whether a websocket implementation is present"""
+        return self._connect is not None or websockets is not None
+
+    def _open(self):
+        if self._connect is not None:
+            return self._connect(self.url)
+        return websockets.connect(self.url, ping_interval=20, ping_timeout=20, max_size=2 ** 24)
+
+    async def run(self):
+        """Stay subscribed until stop() is called"""
+        if not self.available:
+            logger.warning("websockets is not installed; CometBFT subscription disabled")
+            return
+
+        self._running = True
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        dispatcher = asyncio.create_task(self._dispatch(queue))
+        delay = self.reconnect_initial
+        try:
+            while self._running:
+                try:
+                    async with self._open() as ws:
+                        pending = await self._subscribe(ws)
+                        async for message in ws:
+                            if not self._running:
+                                break
+                            if pending and self._acknowledge(message, pending):
+                                if not pending:
+                                    # Every subscription is live; polling can stop
+                                    self._set_connected(True)
+                                    delay = self.reconnect_initial
+                                continue
+                            self._enqueue(queue, message)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"CometBFT websocket error: {e}")
+                finally:
+                    self._set_connected(False)
+
+                if self._running:
+                    # Full jitter so many workers don't reconnect in lockstep
+                    await asyncio.sleep(random.uniform(0, delay))
+                    delay = min(delay * 2, self.reconnect_max)
+        finally:
+            self._running = False
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+
+    def stop(self):
+        """Stop after the current message"""
+        self._running = False
+
+    async def _subscribe(self, ws) -> set:
+        """Send the subscribe requests; returns the request ids awaiting an ack"""
+        pending = set()
+        for request_id, query in enumerate(self.subscriptions.values(), start=1):
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "subscribe",
+                "id": request_id,
+                "params": {"query": query},
+            }))
+            pending.add(request_id)
+        return pending
+
+    @staticmethod
+    def _acknowledge(message: Any, pending: set) -> bool:
+        """
+        Consume a subscribe response, removing its id from pending
+
+        Returns:
+            bool: Whether the message was a subscribe response
+
+        Raises:
+            ConnectionError: If the node rejected a subscription
+        """
+        try:
+            payload = json.loads(message) if isinstance(message, (str, bytes)) else message
+        except ValueError:
+            return False
+        if not isinstance(payload, dict) or payload.get("id") not in pending:
+            return False
+        if isinstance(payload.get("result"), dict) and "data" in payload["result"]:
+            return False  # an event on that subscription
+        if payload.get("error"):
+            raise ConnectionError(f"Subscription {payload['id']} rejected: {payload['error']}")
+        pending.discard(payload["id"])
+        return True
+
+    def _enqueue(self, queue: asyncio.Queue, message: Any):
+        event = parse_event(message)
+        if event is None:
+            return
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Keep the socket drained; a slow consumer loses the oldest event
+            queue.get_nowait()
+            queue.put_nowait(event)
+            self._stats["dropped"] += 1
+
+    async def _dispatch(self, queue: asyncio.Queue):
+        while True:
+            event_type, value = await queue.get()
+            self._stats["events"] += 1
+            self._stats["last_event_at"] = time.time()
+            try:
+                await self.on_event(event_type, value)
+            except Exception as e:
+                logger.error(f"Error handling {event_type} event: {e}")
+
+    def _set_connected(self, connected: bool):
+        if connected == self.connected:
+            return
+        self.connected = connected
+        if connected:
+            self._stats["connects"] += 1
+            logger.info(f"Subscribed to CometBFT events at {self.url}")
+            callback = self.on_connect
+        else:
+            self._stats["disconnects"] += 1
+            logger.info("CometBFT websocket disconnected, falling back to polling")
+            callback = self.on_disconnect
+        if callback:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Subscriber callback failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Subscription counters"""
+        return {**self._stats, "connected": self.connected, "url": self.url}
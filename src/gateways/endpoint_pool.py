@@ -0,0 +1,641 @@
+"""
+Endpoint Pool
+Latency-aware selection between equivalent blockchain nodes. Tracks per-node
+EWMA latency, error rate and block height lag (from background health probes),
+orders nodes best-first for each request and ejects failing nodes with a
+circuit breaker that re-admits them after a cool-off trial. Read-only
+requests can be hedged: if the best node is slower than its usual p95, the
+same request goes to the next-best node and the first answer wins.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import requests
+
+from src.gateways.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    value = os.environ.get(name)
+    return [item.strip().rstrip("/") for item in value.split(",") if item.strip()] if value else default
+
+
+RPC_ENDPOINTS = _env_list("CHAIN_RPC_ENDPOINTS", [
+    "https://testnet-rpc.daodiseo.chaintools.tech",
+    "https://rpc.odiseotestnet.chaintools.tech",
+    "https://testnet-rpc.odiseo.nodeshub.online",
+])
+
+REST_ENDPOINTS = _env_list("CHAIN_REST_ENDPOINTS", [
+    "https://testnet-api.daodiseo.chaintools.tech",
+    "https://api.odiseotestnet.chaintools.tech",
+    "https://testnet-api.odiseo.nodeshub.online",
+])
+
+# CometBFT JSON-RPC methods that only read state and are safe to send twice
+READ_ONLY_RPC_METHODS = frozenset({
+    "abci_info", "abci_query", "block", "block_by_hash", "block_results",
+    "block_search", "blockchain", "commit", "consensus_params", "consensus_state",
+    "dump_consensus_state", "genesis", "genesis_chunked", "header", "header_by_hash",
+    "health", "net_info", "num_unconfirmed_txs", "status", "tx", "tx_search",
+    "unconfirmed_txs", "validators",
+})
+
+
+def is_read_only_rpc(payload: Any) -> bool:
+    """Whether a JSON-RPC request (or batch) only calls read-only methods"""
+    calls = payload if isinstance(payload, list) else [payload]
+    return bool(calls) and all(
+        isinstance(call, dict) and call.get("method") in READ_ONLY_RPC_METHODS for call in calls
+    )
+
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class EndpointPoolExhausted(Exception):
+    """Every endpoint in the pool failed"""
+
+    def __init__(self, last_error: Optional[str]):
+        super().__init__(last_error or "No endpoints available")
+        self.last_error = last_error
+
+
+class _AttemptFailed(Exception):
+    """One endpoint failed to give an accepted answer"""
+
+
+@dataclass
+class EndpointState:
+    """Health and latency statistics for one node"""
+    url: str
+    ewma_latency: Optional[float] = None
+    error_rate: float = 0.0
+    height: Optional[int] = None
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    trial_at: float = 0.0  # when the current half-open trial was handed out
+    requests: int = 0
+    failures: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+
+class EndpointPool:
+    """Ranks equivalent endpoints by health and latency, with circuit breaking"""
+
+    def __init__(
+        self,
+        name: str,
+        endpoints: Iterable[str],
+        alpha: float = 0.3,
+        failure_threshold: int = 3,
+        error_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        max_height_lag: int = 5,
+        default_latency: float = 0.5,
+        probe: Optional[Callable[[str], Optional[int]]] = None,
+        probe_interval: float = 15.0,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay: float = 0.05,
+        max_hedge_delay: float = 2.0,
+        hedge_budget: float = 0.1,
+        hedge_workers: int = 16,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            name: Pool name for logs and stats
+            endpoints: Base URLs of equivalent nodes, in preference order
+            alpha: EWMA smoothing factor for latency and error rate
+            failure_threshold: Consecutive failures that open the breaker
+            error_rate_threshold: EWMA error rate that opens the breaker
+            open_seconds: Time an ejected node waits before a trial request
+            max_height_lag: Blocks behind the best node before a node is deprioritized
+            default_latency: Latency assumed for nodes not measured yet
+            probe: Callable(url) -> block height, raising on failure
+            probe_interval: Seconds between background probes
+            hedge_quantile: Latency quantile of the primary after which a hedge is sent
+            min_hedge_delay: Lower bound for the hedge delay in seconds
+            max_hedge_delay: Upper bound for the hedge delay in seconds
+            hedge_budget: Maximum fraction of hedged calls that may send a hedge
+            hedge_workers: Threads for in-flight hedged attempts; a hedged call
+                that finds none free runs unhedged on the caller's thread
+        """
+        self.name = name
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.open_seconds = open_seconds
+        self.max_height_lag = max_height_lag
+        self.default_latency = default_latency
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.hedge_budget = hedge_budget
+        self.hedge_workers = hedge_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_slots = 0
+        self._hedge_stats = {"calls": 0, "hedges": 0, "hedge_wins": 0, "over_budget": 0, "inline": 0}
+
+        self._endpoints: Dict[str, EndpointState] = {
+            url.rstrip("/"): EndpointState(url.rstrip("/")) for url in endpoints
+        }
+        self._order = list(self._endpoints)
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> List[str]:
+        return list(self._order)
+
+    # Selection
+
+    def ranked(self) -> List[str]:
+        """
+        Endpoints to try for one request, best first
+
+        Healthy nodes are ordered by EWMA latency (inflated by error rate),
+        lagging nodes follow, then at most one half-open trial per ejected
+        node; ejected nodes are only returned when nothing else is left.
+        """
+        now = time.time()
+        with self._lock:
+            best_height = max((s.height for s in self._endpoints.values() if s.height), default=None)
+            healthy, lagging, trials, ejected = [], [], [], []
+
+            for position, url in enumerate(self._order):
+                state = self._endpoints[url]
+                if state.state == OPEN and now - state.opened_at >= self.open_seconds:
+                    state.state = HALF_OPEN
+                    state.trial_at = 0.0
+
+                if state.state == CLOSED:
+                    lag = best_height - state.height if best_height and state.height else 0
+                    bucket = lagging if lag > self.max_height_lag else healthy
+                    bucket.append((self._score(state), position, url))
+                elif state.state == HALF_OPEN and now - state.trial_at >= self.open_seconds:
+                    # One trial at a time; a trial that was never used expires
+                    state.trial_at = now
+                    trials.append((position, url))
+                else:
+                    ejected.append((state.opened_at, url))
+
+            ordered = [url for *_, url in sorted(healthy)] + [url for *_, url in sorted(lagging)]
+            ordered += [url for _, url in trials]
+            if not ordered:
+                ordered = [url for _, url in sorted(ejected)]
+            return ordered
+
+    def _score(self, state: EndpointState) -> float:
+        latency = state.ewma_latency if state.ewma_latency is not None else self.default_latency
+        return latency * (1.0 + 4.0 * state.error_rate)
+
+    # Feedback
+
+    def record_success(self, url: str, latency: float, height: Optional[int] = None):
+        """Record a successful request or probe"""
+        with self._lock:
+            state = self._endpoints.get(url.rstrip("/"))
+            if state is None:
+                return
+            state.requests += 1
+            state.latencies.append(latency)
+            state.ewma_latency = latency if state.ewma_latency is None else (
+                self.alpha * latency + (1 - self.alpha) * state.ewma_latency
+            )
+            state.error_rate = (1 - self.alpha) * state.error_rate
+            state.consecutive_failures = 0
+            if height is not None:
+                state.height = height
+            if state.state != CLOSED:
+                logger.info(f"{self.name}: re-admitting {url}")
+            state.state = CLOSED
+            state.trial_at = 0.0
+
+    def record_failure(self, url: str, latency: Optional[float] = None):
+        """Record a failed request or probe; may eject the node"""
+        with self._lock:
+            state = self._endpoints.get(url.rstrip("/"))
+            if state is None:
+                return
+            state.requests += 1
+            state.failures += 1
+            if latency is not None:
+                state.latencies.append(latency)
+            state.error_rate = self.alpha + (1 - self.alpha) * state.error_rate
+            state.consecutive_failures += 1
+            state.trial_at = 0.0
+
+            should_open = (
+                state.state == HALF_OPEN
+                or state.consecutive_failures >= self.failure_threshold
+                or (state.requests >= self.failure_threshold and state.error_rate >= self.error_rate_threshold)
+            )
+            if should_open:
+                if state.state != OPEN:
+                    logger.warning(f"{self.name}: ejecting {url} after {state.consecutive_failures} failures")
+                state.state = OPEN
+                state.opened_at = time.time()
+
+    def latency_quantile(self, url: str, q: float = 0.95) -> Optional[float]:
+        """Observed latency quantile for a node (None until measured)"""
+        with self._lock:
+            state = self._endpoints.get(url.rstrip("/"))
+            samples = sorted(state.latencies) if state else []
+        if not samples:
+            return None
+        index = min(int(q * len(samples)), len(samples) - 1)
+        return samples[index]
+
+    # Requests
+
+    def call(self, send: Callable[[str], requests.Response],
+             accept: Tuple[int, ...] = (200,)) -> Tuple[requests.Response, str]:
+        """
+        Send a request to the best endpoint, failing over in rank order
+
+        Args:
+            send: Callable(base_url) -> requests.Response
+            accept: Status codes that count as an answer
+
+        Returns:
+            Tuple of (response, endpoint url)
+
+        Raises:
+            EndpointPoolExhausted: If no endpoint returned an accepted status
+        """
+        last_error = None
+        for url in self.ranked():
+            try:
+                return self._attempt(url, send, accept)
+            except _AttemptFailed as e:
+                last_error = str(e)
+
+        raise EndpointPoolExhausted(last_error)
+
+    def hedged_call(self, send: Callable[[str], requests.Response],
+                    accept: Tuple[int, ...] = (200,)) -> Tuple[requests.Response, str]:
+        """
+        Like call(), but races a second node when the first one is slow
+
+        The request goes to the best node; if it has not answered after that
+        node's p95 latency, the same request is sent to the next-best node and
+        whichever accepted answer arrives first is returned. Failures move on to
+        the next node immediately. Only use this for idempotent reads.
+
+        Attempts only go to the executor when a thread is free to start them at
+        once, so the hedge timer never counts queueing time; when all threads
+        are busy the call runs unhedged on the caller's thread instead.
+
+        Args:
+            send: Callable(base_url) -> requests.Response
+            accept: Status codes that count as an answer
+
+        Returns:
+            Tuple of (response, endpoint url)
+
+        Raises:
+            EndpointPoolExhausted: If no endpoint returned an accepted status
+        """
+        urls = self.ranked()
+        if len(urls) < 2:
+            return self.call(send, accept)
+
+        if not self._reserve_hedge_slot():
+            # Every hedge thread is busy; queueing would only add latency
+            with self._lock:
+                self._hedge_stats["inline"] += 1
+            return self.call(send, accept)
+
+        executor = self._get_executor()
+        with self._lock:
+            self._hedge_stats["calls"] += 1
+
+        pending: Dict[Future, str] = {}
+        hedged = False
+        last_error = None
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            url = urls[next_index]
+            next_index += 1
+            pending[executor.submit(self._slot_attempt, url, send, accept)] = url
+
+        launch()
+        delay = self.hedge_delay(urls[0])
+        try:
+            while pending:
+                can_hedge = not hedged and next_index < len(urls)
+                done, _ = wait(list(pending), timeout=delay if can_hedge else None,
+                               return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # Primary is slower than usual: race the next-best node
+                    if self._reserve_hedge_slot():
+                        if self._take_hedge_budget():
+                            hedged = True
+                            launch()
+                            continue
+                        self._release_hedge_slot()
+                    delay = None
+                    continue
+
+                for future in done:
+                    url = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except _AttemptFailed as e:
+                        last_error = str(e)
+                        continue
+                    if hedged and url != urls[0]:
+                        with self._lock:
+                            self._hedge_stats["hedge_wins"] += 1
+                    return result
+
+                # Everything in flight failed; fall over to the next node
+                if not pending and next_index < len(urls):
+                    if self._reserve_hedge_slot():
+                        launch()
+                        continue
+                    for url in urls[next_index:]:
+                        try:
+                            return self._attempt(url, send, accept)
+                        except _AttemptFailed as e:
+                            last_error = str(e)
+        finally:
+            # Losers can't be interrupted mid-request; drop their responses when they land
+            for future in pending:
+                if not future.cancel():
+                    future.add_done_callback(_close_response)
+
+        raise EndpointPoolExhausted(last_error)
+
+    async def acall(self, send: Callable[[str], Awaitable[Any]],
+                    accept: Tuple[int, ...] = (200,)) -> Tuple[Any, str]:
+        """
+        Async call(): send is a coroutine function returning an httpx.Response
+
+        Raises:
+            EndpointPoolExhausted: If no endpoint returned an accepted status
+        """
+        last_error = None
+        for url in self.ranked():
+            try:
+                return await self._aattempt(url, send, accept)
+            except _AttemptFailed as e:
+                last_error = str(e)
+
+        raise EndpointPoolExhausted(last_error)
+
+    async def ahedged_call(self, send: Callable[[str], Awaitable[Any]],
+                           accept: Tuple[int, ...] = (200,)) -> Tuple[Any, str]:
+        """
+        Async hedged_call(); the losing request is cancelled outright
+
+        Raises:
+            EndpointPoolExhausted: If no endpoint returned an accepted status
+        """
+        urls = self.ranked()
+        if len(urls) < 2:
+            return await self.acall(send, accept)
+
+        with self._lock:
+            self._hedge_stats["calls"] += 1
+
+        pending: Dict[asyncio.Task, str] = {}
+        hedged = False
+        last_error = None
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            url = urls[next_index]
+            next_index += 1
+            pending[asyncio.ensure_future(self._aattempt(url, send, accept))] = url
+
+        launch()
+        delay = self.hedge_delay(urls[0])
+        try:
+            while pending:
+                can_hedge = not hedged and next_index < len(urls)
+                done, _ = await asyncio.wait(list(pending), timeout=delay if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if self._take_hedge_budget():
+                        hedged = True
+                        launch()
+                    else:
+                        delay = None
+                    continue
+
+                for task in done:
+                    url = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except _AttemptFailed as e:
+                        last_error = str(e)
+                        continue
+                    if hedged and url != urls[0]:
+                        with self._lock:
+                            self._hedge_stats["hedge_wins"] += 1
+                    return result
+
+                if not pending and next_index < len(urls):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise EndpointPoolExhausted(last_error)
+
+    def hedge_delay(self, url: str) -> float:
+        """Time to wait for a node before hedging, from its latency quantile"""
+        observed = self.latency_quantile(url, self.hedge_quantile)
+        delay = observed if observed is not None else self.default_latency
+        return min(max(delay, self.min_hedge_delay), self.max_hedge_delay)
+
+    def _take_hedge_budget(self) -> bool:
+        with self._lock:
+            stats = self._hedge_stats
+            if stats["hedges"] + 1 > self.hedge_budget * stats["calls"] + 1:
+                stats["over_budget"] += 1
+                return False
+            stats["hedges"] += 1
+            return True
+
+    def _reserve_hedge_slot(self) -> bool:
+        with self._lock:
+            if self._hedge_slots >= self.hedge_workers:
+                return False
+            self._hedge_slots += 1
+            return True
+
+    def _release_hedge_slot(self):
+        with self._lock:
+            self._hedge_slots -= 1
+
+    def _slot_attempt(self, url: str, send: Callable[[str], requests.Response],
+                      accept: Tuple[int, ...]) -> Tuple[requests.Response, str]:
+        """_attempt() on a hedge thread, freeing its slot when done"""
+        try:
+            return self._attempt(url, send, accept)
+        finally:
+            self._release_hedge_slot()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.hedge_workers, thread_name_prefix=f"hedge-{self.name}"
+                )
+            return self._executor
+
+    def _attempt(self, url: str, send: Callable[[str], requests.Response],
+                 accept: Tuple[int, ...]) -> Tuple[requests.Response, str]:
+        """Send to one endpoint and record the outcome"""
+        started = time.monotonic()
+        try:
+            response = send(url)
+        except requests.RequestException as e:
+            self.record_failure(url, time.monotonic() - started)
+            logger.warning(f"{self.name}: {url} failed: {e}")
+            raise _AttemptFailed(str(e))
+
+        return self._judge(url, response, time.monotonic() - started, accept)
+
+    def _judge(self, url: str, response: Any, elapsed: float,
+               accept: Tuple[int, ...]) -> Tuple[Any, str]:
+        """Record a response's outcome; raise _AttemptFailed unless accepted"""
+        if response.status_code in accept:
+            self.record_success(url, elapsed)
+            return response, url
+
+        # 5xx and throttling count against the node; other statuses are answers we can't use
+        if response.status_code >= 500 or response.status_code == 429:
+            self.record_failure(url, elapsed)
+        else:
+            self.record_success(url, elapsed)
+        logger.warning(f"{self.name}: {url} returned {response.status_code}")
+        raise _AttemptFailed(f"HTTP {response.status_code}: {response.text[:500]}")
+
+    async def _aattempt(self, url: str, send: Callable[[str], Awaitable[Any]],
+                        accept: Tuple[int, ...]) -> Tuple[Any, str]:
+        """Async _attempt() for httpx responses"""
+        started = time.monotonic()
+        try:
+            response = await send(url)
+        except (httpx.TransportError, requests.RequestException) as e:
+            self.record_failure(url, time.monotonic() - started)
+            logger.warning(f"{self.name}: {url} failed: {e}")
+            raise _AttemptFailed(str(e) or type(e).__name__)
+        return self._judge(url, response, time.monotonic() - started, accept)
+
+    # Probing
+
+    def probe_all(self):
+        """Probe every endpoint once and record latency and height"""
+        if self.probe is None:
+            return
+        for url in self.endpoints:
+            started = time.monotonic()
+            try:
+                height = self.probe(url)
+                self.record_success(url, time.monotonic() - started, height=height)
+            except Exception as e:
+                self.record_failure(url, time.monotonic() - started)
+                logger.debug(f"{self.name}: probe of {url} failed: {e}")
+
+    async def run(self):
+        """Background probe loop, for the background runtime"""
+        while True:
+            await asyncio.to_thread(self.probe_all)
+            await asyncio.sleep(self.probe_interval)
+
+    def get_hedge_stats(self) -> Dict[str, int]:
+        """Hedged call counters"""
+        with self._lock:
+            return dict(self._hedge_stats)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint health for diagnostics"""
+        with self._lock:
+            return {
+                url: {
+                    "state": state.state,
+                    "ewma_latency_ms": round(state.ewma_latency * 1000, 1) if state.ewma_latency is not None else None,
+                    "error_rate": round(state.error_rate, 3),
+                    "height": state.height,
+                    "requests": state.requests,
+                    "failures": state.failures,
+                }
+                for url, state in self._endpoints.items()
+            }
+
+
+def _close_response(future: Future):
+    try:
+        response, _ = future.result()
+        response.close()
+    except Exception:
+        pass
+
+
+# Health probes
+
+def probe_rpc_height(url: str, timeout: float = 5.0) -> Optional[int]:
+    """Latest block height from a CometBFT RPC node"""
+    response = get_http_client().get(f"{url}/status", timeout=timeout)
+    response.raise_for_status()
+    return int(response.json()["result"]["sync_info"]["latest_block_height"])
+
+
+def probe_rest_height(url: str, timeout: float = 5.0) -> Optional[int]:
+    """Latest block height from a Cosmos SDK REST node"""
+    response = get_http_client().get(f"{url}/cosmos/base/tendermint/v1beta1/blocks/latest", timeout=timeout)
+    response.raise_for_status()
+    return int(response.json()["block"]["header"]["height"])
+
+
+# Global pools
+_pools: Dict[str, EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name: str, endpoints: List[str], probe: Callable[[str], Optional[int]]) -> EndpointPool:
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = EndpointPool(name, endpoints, probe=probe)
+            if os.environ.get("ENDPOINT_PROBES", "1") != "0":
+                from src.services.background_runtime import get_background_runtime
+                get_background_runtime().register(f"endpoint_probe_{name}", pool.run)
+    return pool
+
+
+def get_rpc_endpoint_pool() -> EndpointPool:
+    """Shared pool of CometBFT RPC nodes"""
+    return _get_pool("rpc", RPC_ENDPOINTS, probe_rpc_height)
+
+
+def get_rest_endpoint_pool() -> EndpointPool:
+    """Shared pool of Cosmos SDK REST nodes"""
+    return _get_pool("rest", REST_ENDPOINTS, probe_rest_height)
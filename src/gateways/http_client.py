@@ -0,0 +1,233 @@
+"""
+Outbound HTTP Client
+One pooled requests.Session per process for synchronous outbound calls
+(blockchain proxy, chain snapshot, endpoint probes, BIMserver). Connections
+are kept alive per host, pool sizes are tuned for the worker thread count,
+and every call gets a consistent (connect, read) timeout and User-Agent.
+Async routes get the same defaults from a pooled httpx.AsyncClient per
+event loop (HTTP/2 when h2 is installed).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx clients)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# (connect, read) timeouts
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 10)
+LONG_TIMEOUT: Tuple[float, float] = (3.05, 30)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "DAODISEO-Platform/1.0",
+}
+
+
+class HttpClient:
+    """Keep-alive session with per-host connection pools and default timeouts"""
+
+    def __init__(self, pool_connections: int = 16, pool_maxsize: int = 32,
+                 timeout: Timeout = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the client
+
+        Args:
+            pool_connections: Number of per-host pools kept open
+            pool_maxsize: Connections kept alive per host (size for concurrent worker threads)
+            timeout: Default (connect, read) timeout
+            headers: Headers sent with every request
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        # Retries are left to callers (the endpoint pool fails over between nodes)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=0, pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def request(self, method: str, url: str, timeout: Optional[Timeout] = None,
+                **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            timeout: Overrides the default (connect, read) timeout
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response
+        """
+        host = urlsplit(url).netloc
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            self._count(host, "errors")
+            raise
+        self._count(host, "requests")
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _count(self, host: str, key: str):
+        with self._lock:
+            counters = self._stats.setdefault(host, {"requests": 0, "errors": 0})
+            counters[key] += 1
+
+    def close(self):
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration and per-host request counters"""
+        with self._lock:
+            hosts = {host: dict(counters) for host, counters in self._stats.items()}
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "timeout": self.timeout,
+            "http2_available": HTTP2_AVAILABLE,
+            "hosts": hosts,
+        }
+
+
+def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class AsyncHttpClient:
+    """Pooled httpx.AsyncClient per event loop with the same defaults as HttpClient"""
+
+    def __init__(self, max_connections: int = 1000, max_keepalive: int = 100,
+                 timeout: Timeout = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the client
+
+        Args:
+            max_connections: Concurrent upstream connections across all hosts
+            max_keepalive: Idle connections kept open for reuse
+            timeout: Default (connect, read) timeout
+            headers: Headers sent with every request
+            transport: Optional custom transport (e.g. httpx.MockTransport in tests)
+        """
+        self.timeout = timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.transport = transport
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive)
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._clients[loop] = httpx.AsyncClient(
+                    headers=self.headers, limits=self.limits, timeout=_httpx_timeout(self.timeout),
+                    transport=self.transport, http2=HTTP2_AVAILABLE and self.transport is None,
+                )
+            return client
+
+    async def request(self, method: str, url: str, timeout: Optional[Timeout] = None,
+                      **kwargs: Any) -> httpx.Response:
+        """
+        Send a request on the running loop's pooled client
+
+        Returns:
+            httpx.Response
+        """
+        if timeout is not None:
+            kwargs["timeout"] = _httpx_timeout(timeout)
+        client = self.client
+        self._stats["in_flight"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        try:
+            response = await client.request(method, url, **kwargs)
+            self._stats["requests"] += 1
+            return response
+        except httpx.HTTPError:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._stats["in_flight"] -= 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close the client bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "loops": len(self._clients), "http2": HTTP2_AVAILABLE}
+
+
+# Global client instances
+_http_client = None
+_async_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide outbound HTTP client"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(
+                pool_connections=int(os.environ.get("HTTP_POOL_CONNECTIONS", "16")),
+                pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", "32")),
+            )
+    return _http_client
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Get the process-wide async outbound HTTP client"""
+    global _async_http_client
+    with _http_client_lock:
+        if _async_http_client is None:
+            _async_http_client = AsyncHttpClient(
+                max_connections=int(os.environ.get("ASYNC_HTTP_MAX_CONNECTIONS", "1000")),
+                max_keepalive=int(os.environ.get("ASYNC_HTTP_MAX_KEEPALIVE", "100")),
+            )
+    return _async_http_client
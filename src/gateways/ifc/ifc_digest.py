@@ -0,0 +1,245 @@
+"""
+IFC model digest.
+A compact, precomputed description of a loaded IFC model (counts, storeys,
+key quantities, materials and anomalies) used as chat prompt context.
+Digests are built once per file and cached by the file's SHA-256.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.gateways.ifc.ifc_index import element_materials
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the digest layout changes so cached digests are rebuilt
+DIGEST_VERSION = 1
+
+# Quantities worth summing per element class
+KEY_QUANTITIES = {
+    "GrossFloorArea", "NetFloorArea", "GrossArea", "NetArea",
+    "GrossSideArea", "NetSideArea", "Length", "GrossVolume", "NetVolume",
+}
+
+MAX_DIGEST_MATERIALS = 10
+MAX_DIGEST_CLASSES = 15
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_model_digest(ifc_file: Any, file_path: Optional[str] = None,
+                       file_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Scan an ifcopenshell file once and summarize it
+
+    Args:
+        ifc_file: Opened ifcopenshell file
+        file_path: Path of the file (for naming and hashing)
+        file_hash: Precomputed SHA-256, if already known
+
+    Returns:
+        Dict: Digest with counts, storeys, quantities, materials and anomalies
+    """
+    if file_hash is None and file_path and os.path.exists(file_path):
+        file_hash = file_sha256(file_path)
+
+    elements = list(ifc_file.by_type("IfcElement"))
+    spaces = list(ifc_file.by_type("IfcSpace"))
+
+    class_counts = Counter(element.is_a() for element in elements)
+    material_counts: Counter = Counter()
+    quantities: Dict[str, Dict[str, float]] = {}
+    global_ids: Counter = Counter()
+    unnamed = 0
+    uncontained = 0
+    without_material = 0
+
+    for element in elements:
+        materials = element_materials(element)
+        if materials:
+            material_counts.update(set(materials))
+        else:
+            without_material += 1
+        if not getattr(element, "Name", None):
+            unnamed += 1
+        if not getattr(element, "ContainedInStructure", None):
+            uncontained += 1
+        global_ids[getattr(element, "GlobalId", None)] += 1
+        _add_quantities(quantities, element)
+
+    spaces_without_area = 0
+    for space in spaces:
+        before = quantities.get("IfcSpace", {}).copy()
+        _add_quantities(quantities, space)
+        if quantities.get("IfcSpace", {}) == before:
+            spaces_without_area += 1
+
+    duplicate_ids = sum(count - 1 for gid, count in global_ids.items() if gid and count > 1)
+
+    anomalies = []
+    if uncontained:
+        anomalies.append(f"{uncontained} elements not assigned to a storey")
+    if duplicate_ids:
+        anomalies.append(f"{duplicate_ids} duplicate GlobalIds")
+    if unnamed:
+        anomalies.append(f"{unnamed} unnamed elements")
+    if without_material:
+        anomalies.append(f"{without_material} elements without material")
+    if spaces_without_area:
+        anomalies.append(f"{spaces_without_area} spaces without area quantities")
+
+    sites = ifc_file.by_type("IfcSite")
+    buildings = ifc_file.by_type("IfcBuilding")
+
+    return {
+        "version": DIGEST_VERSION,
+        "file_hash": file_hash,
+        "file_name": os.path.basename(file_path) if file_path else None,
+        "schema": getattr(ifc_file, "schema", None),
+        "site_name": (sites[0].Name if sites else None) or "Unknown Site",
+        "building_name": (buildings[0].Name if buildings else None) or "Unknown Building",
+        "element_count": len(elements),
+        "space_count": len(spaces),
+        "element_counts": dict(class_counts.most_common()),
+        "storeys": _storeys(ifc_file),
+        "quantities": {
+            ifc_class: {name: round(total, 2) for name, total in sorted(values.items())}
+            for ifc_class, values in sorted(quantities.items())
+        },
+        "materials": dict(material_counts.most_common(MAX_DIGEST_MATERIALS)),
+        "anomalies": anomalies,
+    }
+
+
+def format_model_digest(digest: Dict[str, Any]) -> str:
+    """Render a digest as a few compact lines for a system prompt"""
+    lines = [
+        f"Model: {digest.get('file_name') or 'unknown'} ({digest.get('schema')}, "
+        f"{digest.get('element_count', 0)} elements, {digest.get('space_count', 0)} spaces) | "
+        f"Building: {digest.get('building_name')} | Site: {digest.get('site_name')}"
+    ]
+
+    storeys = digest.get("storeys") or []
+    if storeys:
+        lines.append("Storeys: " + "; ".join(
+            f"{s['name']} ({s['elevation']}m, {s['elements']} elements)"
+            if s.get("elevation") is not None else f"{s['name']} ({s['elements']} elements)"
+            for s in storeys
+        ))
+
+    counts = list((digest.get("element_counts") or {}).items())
+    if counts:
+        shown = ", ".join(f"{cls} {n}" for cls, n in counts[:MAX_DIGEST_CLASSES])
+        if len(counts) > MAX_DIGEST_CLASSES:
+            shown += f", +{len(counts) - MAX_DIGEST_CLASSES} more types"
+        lines.append(f"Elements: {shown}")
+
+    quantities = digest.get("quantities") or {}
+    if quantities:
+        lines.append("Quantities: " + "; ".join(
+            f"{cls} " + ", ".join(f"{name} {value}" for name, value in values.items())
+            for cls, values in quantities.items()
+        ))
+
+    materials = digest.get("materials") or {}
+    if materials:
+        lines.append("Materials: " + ", ".join(f"{name} {n}" for name, n in materials.items()))
+
+    anomalies = digest.get("anomalies") or []
+    if anomalies:
+        lines.append("Anomalies: " + "; ".join(anomalies))
+
+    return "\n".join(lines)
+
+
+def _add_quantities(totals: Dict[str, Dict[str, float]], element: Any):
+    """Add an element's key base quantities to the per-class totals"""
+    for definition in getattr(element, "IsDefinedBy", None) or []:
+        if not definition.is_a("IfcRelDefinesByProperties"):
+            continue
+        quantity_set = definition.RelatingPropertyDefinition
+        if not quantity_set.is_a("IfcElementQuantity"):
+            continue
+        for quantity in quantity_set.Quantities:
+            if quantity.Name not in KEY_QUANTITIES:
+                continue
+            value = None
+            for attribute in ("AreaValue", "VolumeValue", "LengthValue"):
+                value = getattr(quantity, attribute, None)
+                if value is not None:
+                    break
+            if value is None:
+                continue
+            class_totals = totals.setdefault(element.is_a(), {})
+            class_totals[quantity.Name] = class_totals.get(quantity.Name, 0.0) + float(value)
+
+
+def _storeys(ifc_file: Any) -> List[Dict[str, Any]]:
+    storeys = []
+    for storey in ifc_file.by_type("IfcBuildingStorey"):
+        contained = 0
+        for rel in getattr(storey, "ContainsElements", None) or []:
+            contained += len(rel.RelatedElements)
+        elevation = getattr(storey, "Elevation", None)
+        storeys.append({
+            "name": storey.Name or f"Storey {storey.id()}",
+            "elevation": round(float(elevation), 2) if elevation is not None else None,
+            "elements": contained,
+        })
+    storeys.sort(key=lambda s: (s["elevation"] is None, s["elevation"] or 0.0))
+    return storeys
+
+
+class ModelDigestCache:
+    """Digests keyed by (file SHA-256, digest version), with LRU eviction"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, ifc_file: Any, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """Return the cached digest for this file's content, building it if needed"""
+        file_hash = file_sha256(file_path) if file_path and os.path.exists(file_path) else None
+        key = (file_hash, DIGEST_VERSION)
+
+        if file_hash:
+            with self._lock:
+                digest = self._entries.get(key)
+                if digest is not None:
+                    self._entries.move_to_end(key)
+                    return digest
+
+        digest = build_model_digest(ifc_file, file_path, file_hash=file_hash)
+        digest["text"] = format_model_digest(digest)
+
+        if file_hash:
+            with self._lock:
+                self._entries[key] = digest
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return digest
+
+
+# Global digest cache instance
+_digest_cache = None
+
+
+def get_model_digest_cache() -> ModelDigestCache:
+    """Get the global model digest cache"""
+    global _digest_cache
+    if _digest_cache is None:
+        _digest_cache = ModelDigestCache()
+    return _digest_cache
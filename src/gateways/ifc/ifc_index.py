@@ -0,0 +1,282 @@
+"""
+IFC element retrieval index.
+Ranks IFC elements against a natural language question using BM25 over element
+names, classes, property sets and materials, optionally blended with hashed
+bag-of-features vectors (computed on CPU, no model download required).
+"""
+
+import hashlib
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import ifcopenshell.util.element as ifc_element_util
+except ImportError:
+    ifc_element_util = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Maximum property values kept per element in search results
+MAX_RESULT_PROPERTIES = 12
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, splitting CamelCase IFC names (IfcWallStandardCase)"""
+    if not text:
+        return []
+    text = _CAMEL_RE.sub(" ", str(text))
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t != "ifc"]
+
+
+def element_materials(element: Any) -> List[str]:
+    """Names of the materials associated with an IFC element"""
+    names = []
+    for association in getattr(element, "HasAssociations", None) or []:
+        if not association.is_a("IfcRelAssociatesMaterial"):
+            continue
+        material = association.RelatingMaterial
+        if material.is_a("IfcMaterial"):
+            names.append(material.Name)
+        elif material.is_a("IfcMaterialLayerSetUsage"):
+            names.extend(layer.Material.Name for layer in material.ForLayerSet.MaterialLayers if layer.Material)
+        elif material.is_a("IfcMaterialLayerSet"):
+            names.extend(layer.Material.Name for layer in material.MaterialLayers if layer.Material)
+        elif material.is_a("IfcMaterialList"):
+            names.extend(m.Name for m in material.Materials)
+    return [name for name in names if name]
+
+
+class IFCElementIndex:
+    """In-memory BM25 (+ optional hashed vector) index over IFC elements"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 use_embeddings: bool = True, embedding_dim: int = 256,
+                 embedding_weight: float = 0.3):
+        """
+        Initialize an empty index
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            use_embeddings: Blend in hashed-feature cosine similarity
+            embedding_dim: Size of hashed feature vectors
+            embedding_weight: Weight of the vector score in the blend
+        """
+        self.k1 = k1
+        self.b = b
+        self.use_embeddings = use_embeddings
+        self.embedding_dim = embedding_dim
+        self.embedding_weight = embedding_weight
+
+        self.documents: List[Dict[str, Any]] = []
+        self._postings: Dict[str, tuple] = {}
+        self._idf: Dict[str, float] = {}
+        self._doc_lengths = np.zeros(0, dtype=np.float32)
+        self._vectors: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    # Building
+
+    @classmethod
+    def from_ifc_file(cls, ifc_file: Any, **kwargs) -> "IFCElementIndex":
+        """Build an index over the physical elements and spaces of an ifcopenshell file"""
+        index = cls(**kwargs)
+        index.build(cls._extract_documents(ifc_file))
+        logger.info(f"Built IFC retrieval index over {len(index)} elements")
+        return index
+
+    def build(self, documents: Iterable[Dict[str, Any]]):
+        """
+        Index element documents
+
+        Each document is a dict with id, name, ifc_class and optionally
+        global_id, type, properties ({pset: {name: value}}) and materials.
+        """
+        self.documents = list(documents)
+        postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        lengths = np.zeros(len(self.documents), dtype=np.float32)
+        token_lists = []
+
+        for doc_id, document in enumerate(self.documents):
+            tokens = tokenize(self._document_text(document))
+            token_lists.append(tokens)
+            lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term][doc_id] = tf
+
+        n_docs = max(len(self.documents), 1)
+        self._doc_lengths = lengths
+        self._postings = {
+            term: (np.fromiter(docs.keys(), dtype=np.int64), np.fromiter(docs.values(), dtype=np.float32))
+            for term, docs in postings.items()
+        }
+        self._idf = {
+            term: math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+
+        if self.use_embeddings and self.documents:
+            self._vectors = np.vstack([self._embed(tokens) for tokens in token_lists])
+        else:
+            self._vectors = None
+
+    # Searching
+
+    def search(self, query: str, k: int = 10, ifc_class: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return the k most relevant elements for a question
+
+        Args:
+            query: Natural language question or keywords
+            k: Number of results
+            ifc_class: Optional filter, e.g. "IfcDoor" or "Door"
+
+        Returns:
+            Compact element dicts with a relevance score, best first
+        """
+        if not self.documents:
+            return []
+
+        scores = self._bm25_scores(tokenize(query))
+        if scores.max() > 0:
+            scores = scores / scores.max()
+
+        if self._vectors is not None:
+            query_vector = self._embed(tokenize(query))
+            if query_vector.any():
+                scores = scores + self.embedding_weight * (self._vectors @ query_vector)
+
+        if ifc_class:
+            wanted = ifc_class if ifc_class.startswith("Ifc") else f"Ifc{ifc_class}"
+            mask = np.array([d.get("ifc_class") == wanted for d in self.documents])
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, len(self.documents))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for doc_id in top:
+            score = float(scores[doc_id])
+            if score <= 0 or not np.isfinite(score):
+                continue
+            results.append({**self._result_view(self.documents[doc_id]), "score": round(score, 4)})
+        return results
+
+    def _bm25_scores(self, terms: List[str]) -> np.ndarray:
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        if not terms:
+            return scores
+        avg_length = float(self._doc_lengths.mean()) or 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths / avg_length)
+
+        for term in set(terms):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, tfs = posting
+            weight = self._idf[term] * tfs * (self.k1 + 1.0) / (tfs + norm[doc_ids])
+            np.add.at(scores, doc_ids, weight)
+        return scores
+
+    def _embed(self, tokens: List[str]) -> np.ndarray:
+        """Signed feature hashing of word unigrams and character trigrams, L2-normalized"""
+        vector = np.zeros(self.embedding_dim, dtype=np.float32)
+        features = list(tokens)
+        for token in tokens:
+            padded = f"#{token}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.embedding_dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        length = np.linalg.norm(vector)
+        return vector / length if length else vector
+
+    # Document helpers
+
+    @staticmethod
+    def _document_text(document: Dict[str, Any]) -> str:
+        parts = [
+            document.get("name") or "",
+            document.get("ifc_class") or "",
+            document.get("type") or "",
+            " ".join(document.get("materials") or []),
+        ]
+        for pset_name, values in (document.get("properties") or {}).items():
+            parts.append(pset_name)
+            if isinstance(values, dict):
+                for prop_name, value in values.items():
+                    parts.append(f"{prop_name} {value}")
+        return " ".join(parts)
+
+    @staticmethod
+    def _result_view(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Element dict trimmed for prompts"""
+        flat = {}
+        for pset_name, values in (document.get("properties") or {}).items():
+            if isinstance(values, dict):
+                for prop_name, value in values.items():
+                    if value is not None and len(flat) < MAX_RESULT_PROPERTIES:
+                        flat[prop_name] = value
+        view = {
+            "id": document.get("id"),
+            "name": document.get("name"),
+            "ifc_class": document.get("ifc_class"),
+        }
+        if document.get("materials"):
+            view["materials"] = document["materials"]
+        if flat:
+            view["properties"] = flat
+        return view
+
+    @staticmethod
+    def _extract_documents(ifc_file: Any) -> List[Dict[str, Any]]:
+        documents = []
+        elements = list(ifc_file.by_type("IfcElement")) + list(ifc_file.by_type("IfcSpace"))
+        for element in elements:
+            try:
+                documents.append({
+                    "id": str(element.id()),
+                    "global_id": getattr(element, "GlobalId", None),
+                    "name": getattr(element, "Name", None),
+                    "ifc_class": element.is_a(),
+                    "properties": IFCElementIndex._element_psets(element),
+                    "materials": element_materials(element),
+                })
+            except Exception as e:
+                logger.debug(f"Skipping element in index: {e}")
+        return documents
+
+    @staticmethod
+    def _element_psets(element: Any) -> Dict[str, Dict[str, Any]]:
+        if ifc_element_util is not None:
+            psets = ifc_element_util.get_psets(element)
+            return {
+                name: {k: v for k, v in values.items() if k != "id"}
+                for name, values in psets.items()
+            }
+
+        psets = {}
+        for definition in getattr(element, "IsDefinedBy", None) or []:
+            if definition.is_a("IfcRelDefinesByProperties"):
+                pset = definition.RelatingPropertyDefinition
+                if pset.is_a("IfcPropertySet"):
+                    psets[pset.Name] = {
+                        prop.Name: prop.NominalValue.wrappedValue if prop.NominalValue else None
+                        for prop in pset.HasProperties
+                        if prop.is_a("IfcPropertySingleValue")
+                    }
+        return psets
@@ -1,5 +1,27 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
+from concurrent.futures import CancelledError, Future
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
 import re
+import threading
+import time
+import weakref
+
+try:
+    import openai
+    import httpx
+except ImportError:
+    logging.warning("openai not found. LLM functionality will be limited.")
+    openai = None
+    httpx = None
+
+from src.gateways.http_client import HTTP2_AVAILABLE
+
+logger = logging.getLogger(__name__)
 
 
 class SimpleLLMGateway:
@@ -58,3 +80,337 @@ class SimpleLLMGateway:
             "elements": {"walls": 12, "windows": 8, "doors": 4},
             "estimated_cost": 250000,
         }
+
+
+class OpenAIGateway:
+    """
+    Shared access point for every OpenAI call made by the AI services.
+
+    Holds one pooled sync client and one pooled async client, limits the
+    number of concurrent requests per model, coalesces identical in-flight
+    requests into a single upstream call and retries rate-limit / server
+    errors with jittered exponential backoff.
+    """
+
+    RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Any = None,
+        async_client: Any = None,
+        max_concurrency: Optional[int] = None,
+        max_connections: int = 20,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        timeout: float = 60.0,
+    ):
+        """
+        Initialize the gateway
+
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+            client: Pre-built sync client, mainly for tests
+            async_client: Pre-built async client, mainly for tests
+            max_concurrency: Concurrent requests allowed per model
+            max_connections: Size of the HTTP connection pool
+            max_retries: Retries on 429/5xx/connection errors
+            base_delay: Initial backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            timeout: Request timeout in seconds
+        """
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.max_concurrency = max_concurrency or int(os.environ.get("OPENAI_MAX_CONCURRENCY", "8"))
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+        self._client = client
+        self._async_client = async_client
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        # Per-loop semaphores; entries go away with their loop
+        self._async_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._inflight: Dict[str, Future] = {}
+        self._async_inflight: Dict[tuple, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # Clients
+
+    @property
+    def client(self):
+        """Shared sync OpenAI client, or None if unavailable"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client(async_mode=False)
+        return self._client
+
+    @property
+    def async_client(self):
+        """Shared async OpenAI client, or None if unavailable"""
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = self._create_client(async_mode=True)
+        return self._async_client
+
+    @property
+    def available(self) -> bool:
+        """Whether a sync client could be created"""
+        return self.client is not None
+
+    def _create_client(self, async_mode: bool):
+        """Create a pooled OpenAI client with retries disabled (handled here)"""
+        if openai is None:
+            return None
+
+        try:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            if async_mode:
+                http_client = openai.DefaultAsyncHttpxClient(limits=limits, http2=HTTP2_AVAILABLE)
+                client_class = openai.AsyncOpenAI
+            else:
+                http_client = openai.DefaultHttpxClient(limits=limits, http2=HTTP2_AVAILABLE)
+                client_class = openai.OpenAI
+        except Exception as e:
+            logger.warning(f"Could not build pooled HTTP client, using default: {e}")
+            http_client = None
+            client_class = openai.AsyncOpenAI if async_mode else openai.OpenAI
+
+        try:
+            kwargs = {"api_key": self.api_key, "max_retries": 0, "timeout": self.timeout}
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            client = client_class(**kwargs)
+            logger.info(f"Shared OpenAI {'async' if async_mode else 'sync'} client initialized")
+            return client
+        except Exception as e:
+            logger.error(f"Error initializing OpenAI client: {e}")
+            return None
+
+    # Public API
+
+    def chat_completion(self, **kwargs) -> Any:
+        """
+        Create a chat completion through the shared sync client
+
+        Args:
+            **kwargs: Arguments for client.chat.completions.create
+
+        Returns:
+            The OpenAI completion response
+        """
+        client = self.client
+        if client is None:
+            raise RuntimeError("OpenAI client not available")
+        model = kwargs.get("model", "default")
+        return self._call_coalesced(model, kwargs, lambda: client.chat.completions.create(**kwargs))
+
+    def moderation(self, **kwargs) -> Any:
+        """Run a moderation request through the shared sync client"""
+        client = self.client
+        if client is None:
+            raise RuntimeError("OpenAI client not available")
+        model = kwargs.get("model", "moderation")
+        return self._call_coalesced(model, kwargs, lambda: client.moderations.create(**kwargs))
+
+    async def achat_completion(self, **kwargs) -> Any:
+        """
+        Create a chat completion through the shared async client
+
+        Args:
+            **kwargs: Arguments for client.chat.completions.create
+
+        Returns:
+            The OpenAI completion response
+        """
+        client = self.async_client
+        if client is None:
+            raise RuntimeError("OpenAI async client not available")
+        model = kwargs.get("model", "default")
+        key = (id(asyncio.get_running_loop()), self._request_key(model, kwargs))
+
+        task = self._async_inflight.get(key)
+        if task is not None:
+            self._record(model, coalesced=1)
+        else:
+            # The call runs as its own task: a caller that is cancelled (client
+            # disconnect) does not cancel it for the others waiting on it
+            task = self._async_inflight[key] = asyncio.ensure_future(
+                self._acall_with_retry(model, lambda: client.chat.completions.create(**kwargs))
+            )
+            task.add_done_callback(lambda done: self._land_async(key, done))
+        return await asyncio.shield(task)
+
+    def _land_async(self, key: tuple, task: asyncio.Task):
+        if self._async_inflight.get(key) is task:
+            del self._async_inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-model call counts and latency figures"""
+        with self._lock:
+            stats = {}
+            for model, s in self._stats.items():
+                calls = s["calls"]
+                stats[model] = {
+                    **s,
+                    "avg_latency": s["total_latency"] / calls if calls else 0.0,
+                }
+            return stats
+
+    # Coalescing
+
+    def _request_key(self, model: str, kwargs: Dict[str, Any]) -> str:
+        """Stable hash of a request, used to detect identical in-flight calls"""
+        payload = json.dumps({"model": model, **kwargs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _call_coalesced(self, model: str, kwargs: Dict[str, Any], call):
+        """Run call once for all identical concurrent requests"""
+        key = self._request_key(model, kwargs)
+
+        while True:
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None or pending.cancelled():
+                    future = self._inflight[key] = Future()
+                    break
+            self._record(model, coalesced=1)
+            try:
+                return pending.result()
+            except CancelledError:
+                continue  # the leader was interrupted, not the call: take over
+
+        try:
+            result = self._call_with_retry(model, call)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Interrupts belong to the leader; waiters retry instead of re-raising them
+            future.cancel()
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    # Concurrency limits and retries
+
+    def _semaphore(self, model: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if model not in self._semaphores:
+                self._semaphores[model] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._semaphores[model]
+
+    def _async_semaphore(self, model: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            if model not in semaphores:
+                semaphores[model] = asyncio.Semaphore(self.max_concurrency)
+            return semaphores[model]
+
+    def _call_with_retry(self, model: str, call):
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                with self._semaphore(model):
+                    result = call()
+                self._record(model, calls=1, latency=time.monotonic() - start)
+                return result
+            except Exception as e:
+                self._record(model, calls=1, errors=1, latency=time.monotonic() - start)
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                logger.warning(f"LLM call to {model} failed ({e}), retrying in {delay:.2f}s")
+                self._record(model, retries=1)
+                time.sleep(delay)
+                attempt += 1
+
+    async def _acall_with_retry(self, model: str, call):
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                async with self._async_semaphore(model):
+                    result = await call()
+                self._record(model, calls=1, latency=time.monotonic() - start)
+                return result
+            except Exception as e:
+                self._record(model, calls=1, errors=1, latency=time.monotonic() - start)
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                logger.warning(f"LLM call to {model} failed ({e}), retrying in {delay:.2f}s")
+                self._record(model, retries=1)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Retry on rate limits, server errors and connection problems"""
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in self.RETRYABLE_STATUS_CODES or status >= 500
+        if openai is not None and isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+            return True
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when present"""
+        retry_after = None
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers:
+            try:
+                retry_after = float(headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _record(self, model: str, calls: int = 0, errors: int = 0, retries: int = 0,
+                coalesced: int = 0, latency: float = 0.0):
+        with self._lock:
+            s = self._stats.setdefault(model, {
+                "calls": 0, "errors": 0, "retries": 0, "coalesced": 0,
+                "total_latency": 0.0, "max_latency": 0.0,
+            })
+            s["calls"] += calls
+            s["errors"] += errors
+            s["retries"] += retries
+            s["coalesced"] += coalesced
+            s["total_latency"] += latency
+            s["max_latency"] = max(s["max_latency"], latency)
+        if calls:
+            logger.debug(f"LLM call to {model} took {latency:.3f}s")
+
+
+# Global gateway instance
+_llm_gateway = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> OpenAIGateway:
+    """Get the shared OpenAI gateway instance"""
+    global _llm_gateway
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                _llm_gateway = OpenAIGateway()
+    return _llm_gateway
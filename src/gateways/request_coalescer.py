@@ -0,0 +1,149 @@
+"""
+Request Coalescer
+Single-flight for upstream calls: while a request is in flight, identical
+requests wait for its result instead of going upstream themselves.
+Thread-based for the Flask workers, asyncio-based for the async gateway.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-flight upstream call"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """Collapses identical concurrent calls into one"""
+
+    def __init__(self, wait_timeout: float = 60.0):
+        """
+        Initialize the coalescer
+
+        Args:
+            wait_timeout: Longest a follower waits before calling upstream itself
+        """
+        self.wait_timeout = wait_timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "timeouts": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key across concurrent callers
+
+        Args:
+            key: Identity of the request
+            fn: Zero-argument callable performing the upstream call
+
+        Returns:
+            Tuple of (result, shared) where shared is True for followers
+
+        Raises:
+            Whatever fn raised, for the leader and every follower
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["leaders"] += 1
+            else:
+                flight.waiters += 1
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            if not flight.done.wait(timeout=self.wait_timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                logger.warning(f"Coalesced request {key} timed out waiting; calling upstream directly")
+                return fn(), False
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Leader/follower counters and current in-flight keys"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
+
+
+class AsyncRequestCoalescer:
+    """Collapses identical concurrent coroutine calls into one task"""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await fn once per key across concurrent callers
+
+        The upstream call runs as its own task, so a caller that goes away
+        (client disconnect) does not cancel it for the others.
+
+        Returns:
+            Tuple of (result, shared) where shared is True for followers
+        """
+        task = self._flights.get(key)
+        shared = task is not None
+        if shared:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["leaders"] += 1
+            task = self._flights[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(task), shared
+
+    def _land(self, key: Hashable, task: asyncio.Task):
+        self._flights.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._flights)}
+
+
+# Global coalescer instances
+_request_coalescer = None
+_async_request_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """Get the shared proxy request coalescer"""
+    global _request_coalescer
+    with _coalescer_lock:
+        if _request_coalescer is None:
+            _request_coalescer = RequestCoalescer()
+    return _request_coalescer
+
+
+def get_async_request_coalescer() -> AsyncRequestCoalescer:
+    """Get the shared coalescer for async gateway routes (one event loop per worker)"""
+    global _async_request_coalescer
+    with _coalescer_lock:
+        if _async_request_coalescer is None:
+            _async_request_coalescer = AsyncRequestCoalescer()
+    return _async_request_coalescer
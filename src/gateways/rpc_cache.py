@@ -0,0 +1,302 @@
+"""
+Proxy Response Cache
+Method-aware cache for the blockchain RPC and query proxy. Requests are
+classified as immutable (a block, tx or validator set at a fixed height or
+hash: cached until evicted), head-dependent (state at the latest block:
+cached until the chain advances) or uncacheable (mempool, consensus state,
+broadcasts). Entries live in one LRU bounded by entry count and by the
+approximate bytes of the serialized payloads, with hit metrics.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Cache classes
+IMMUTABLE = "immutable"
+HEAD = "head"
+UNCACHEABLE = "uncacheable"
+
+# Methods whose answer is fixed once a height (or hash) is given
+HEIGHT_PINNED_RPC_METHODS = frozenset({
+    "block", "block_results", "commit", "header", "validators", "consensus_params",
+})
+
+# Methods keyed by a hash, or fixed for the life of the chain
+IMMUTABLE_RPC_METHODS = frozenset({"block_by_hash", "header_by_hash", "tx", "genesis", "genesis_chunked"})
+
+# Methods that follow the latest block
+HEAD_RPC_METHODS = frozenset({
+    "status", "abci_info", "blockchain", "block_search", "tx_search", "net_info",
+})
+
+# REST paths that name a fixed height or hash
+IMMUTABLE_REST_PATTERNS = (
+    re.compile(r"^cosmos/base/tendermint/v1beta1/blocks/\d+$"),
+    re.compile(r"^cosmos/base/tendermint/v1beta1/validatorsets/\d+$"),
+    re.compile(r"^cosmos/tx/v1beta1/txs/[0-9A-Fa-f]{64}$"),
+    re.compile(r"^cosmos/tx/v1beta1/txs/block/\d+$"),
+)
+
+UNCACHEABLE_REST_PATHS = frozenset({
+    "cosmos/base/tendermint/v1beta1/syncing",
+})
+
+
+def _param(params: Any, name: str, position: int = 0) -> Any:
+    """Named or positional JSON-RPC parameter"""
+    if isinstance(params, dict):
+        return params.get(name)
+    if isinstance(params, list) and len(params) > position:
+        return params[position]
+    return None
+
+
+def _has_height(value: Any) -> bool:
+    try:
+        return int(value) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def classify_rpc(method: str, params: Any = None) -> str:
+    """
+    Cache class of a CometBFT JSON-RPC call
+
+    Args:
+        method: JSON-RPC method name
+        params: Named (dict) or positional (list) parameters
+
+    Returns:
+        str: IMMUTABLE, HEAD or UNCACHEABLE
+    """
+    if method in IMMUTABLE_RPC_METHODS:
+        return IMMUTABLE
+    if method in HEIGHT_PINNED_RPC_METHODS:
+        return IMMUTABLE if _has_height(_param(params, "height")) else HEAD
+    if method == "abci_query":
+        return IMMUTABLE if _has_height(_param(params, "height", 2)) else HEAD
+    if method in HEAD_RPC_METHODS:
+        return HEAD
+    return UNCACHEABLE
+
+
+def classify_rest(path: str) -> str:
+    """
+    Cache class of a Cosmos SDK REST GET
+
+    Args:
+        path: Path relative to the REST root
+
+    Returns:
+        str: IMMUTABLE, HEAD or UNCACHEABLE
+    """
+    path = path.strip("/")
+    if path in UNCACHEABLE_REST_PATHS:
+        return UNCACHEABLE
+    if any(pattern.match(path) for pattern in IMMUTABLE_REST_PATTERNS):
+        return IMMUTABLE
+    # Module queries read committed state, which only changes with a new block
+    return HEAD
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def rpc_call_key(call: Dict[str, Any]) -> Tuple:
+    """Identity of a JSON-RPC call, ignoring its request id"""
+    return ("rpc", call.get("method", ""), _canonical(call.get("params")))
+
+
+def rest_call_key(path: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Identity of a REST GET"""
+    return ("rest", path.strip("/"), _canonical(params or {}))
+
+
+class ProxyResponseCache:
+    """Size-bounded LRU of proxy responses with per-class invalidation"""
+
+    def __init__(self, max_entries: int = 2048, head_ttl: float = 6.0,
+                 head_height: Optional[Callable[[], Optional[int]]] = None,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            head_ttl: Longest time a head-dependent entry is served
+            head_height: Callable returning the latest known block height; head
+                entries are dropped as soon as it moves past the height they were stored at
+            max_bytes: Budget for the serialized size of all entries; least recently
+                used entries are evicted to stay under it, larger payloads are not stored
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.head_ttl = head_ttl
+        self._head_height = head_height or (lambda: None)
+        self._entries: "OrderedDict[Tuple, Tuple[Any, str, Optional[int], float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": {IMMUTABLE: 0, HEAD: 0},
+            "misses": {IMMUTABLE: 0, HEAD: 0},
+            "uncacheable": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "oversize": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # JSON-RPC
+
+    def lookup_rpc(self, rpc_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached JSON-RPC response for a request, re-tagged with the request id"""
+        key, kind = self._rpc_key(rpc_data)
+        result = self._get(key, kind)
+        if result is None:
+            return None
+        return {"jsonrpc": "2.0", "id": rpc_data.get("id"), "result": result}
+
+    def store_rpc(self, rpc_data: Dict[str, Any], response: Dict[str, Any]):
+        """Cache a successful JSON-RPC response (errors are never cached)"""
+        if not isinstance(response, dict) or "error" in response or "result" not in response:
+            return
+        key, kind = self._rpc_key(rpc_data)
+        self._put(key, kind, response["result"])
+
+    def _rpc_key(self, rpc_data: Dict[str, Any]) -> Tuple[Tuple, str]:
+        return rpc_call_key(rpc_data), classify_rpc(rpc_data.get("method", ""), rpc_data.get("params"))
+
+    # REST
+
+    def lookup_rest(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Cached REST payload for a GET"""
+        key, kind = self._rest_key(path, params)
+        return self._get(key, kind)
+
+    def store_rest(self, path: str, params: Optional[Dict[str, Any]], payload: Any):
+        """Cache a successful REST payload"""
+        key, kind = self._rest_key(path, params)
+        self._put(key, kind, payload)
+
+    def _rest_key(self, path: str, params: Optional[Dict[str, Any]]) -> Tuple[Tuple, str]:
+        return rest_call_key(path, params), classify_rest(path)
+
+    # Storage
+
+    def _get(self, key: Tuple, kind: str) -> Optional[Any]:
+        if kind == UNCACHEABLE:
+            with self._lock:
+                self._stats["uncacheable"] += 1
+            return None
+
+        head = self._head_height() if kind == HEAD else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, height, stored_at, _ = entry
+                if kind == HEAD and self._is_expired(height, stored_at, head):
+                    self._drop(key)
+                    self._stats["expired"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"][kind] += 1
+                    return value
+            self._stats["misses"][kind] += 1
+            return None
+
+    def _put(self, key: Tuple, kind: str, value: Any):
+        if kind == UNCACHEABLE:
+            return
+        # Approximate footprint: the size of the payload as served
+        size = len(_canonical(value))
+        height = self._head_height() if kind == HEAD else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                self._stats["oversize"] += 1
+                return
+            self._entries[key] = (value, kind, height, time.time(), size)
+            self._bytes += size
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _drop(self, key: Tuple):
+        """Caller holds the lock"""
+        entry = self._entries.pop(key)
+        self._bytes -= entry[4]
+
+    def _is_expired(self, height: Optional[int], stored_at: float, head: Optional[int]) -> bool:
+        if time.time() - stored_at >= self.head_ttl:
+            return True
+        return head is not None and height is not None and head > height
+
+    def invalidate_head(self):
+        """Drop every head-dependent entry (e.g. on a NewBlock event)"""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[1] == HEAD]:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts and hit ratios per cache class"""
+        with self._lock:
+            hits = sum(self._stats["hits"].values())
+            lookups = hits + sum(self._stats["misses"].values())
+            by_kind = {IMMUTABLE: 0, HEAD: 0}
+            for entry in self._entries.values():
+                by_kind[entry[1]] += 1
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "entries_by_class": by_kind,
+                "hits": dict(self._stats["hits"]),
+                "misses": dict(self._stats["misses"]),
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                "uncacheable": self._stats["uncacheable"],
+                "stores": self._stats["stores"],
+                "evictions": self._stats["evictions"],
+                "expired": self._stats["expired"],
+                "oversize": self._stats["oversize"],
+            }
+
+
+# Global cache instance
+_proxy_cache = None
+_proxy_cache_lock = threading.Lock()
+
+
+def _snapshot_height() -> Optional[int]:
+    from src.services.chain_snapshot import get_chain_snapshot
+    return get_chain_snapshot().height
+
+
+def get_proxy_cache() -> ProxyResponseCache:
+    """Get the shared proxy response cache, tied to the chain snapshot height"""
+    global _proxy_cache
+    with _proxy_cache_lock:
+        if _proxy_cache is None:
+            _proxy_cache = ProxyResponseCache(
+                max_entries=int(os.environ.get("PROXY_CACHE_ENTRIES", "2048")),
+                head_ttl=float(os.environ.get("PROXY_CACHE_HEAD_TTL", "6")),
+                head_height=_snapshot_height,
+                max_bytes=int(os.environ.get("PROXY_CACHE_BYTES", str(64 * 1024 * 1024))),
+            )
+    return _proxy_cache
@@ -0,0 +1,227 @@
+"""
+JSON-RPC Forwarder
+Forwards single JSON-RPC calls and batch arrays from the blockchain proxy to
+the RPC endpoint pool. Cached answers are served locally, the rest of a
+batch goes upstream as one batch, and identical concurrent reads share one
+upstream call whose response is fanned out to every caller. The async
+variant does the same on an event loop for the ASGI gateway.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from src.gateways.endpoint_pool import EndpointPool, is_read_only_rpc
+from src.gateways.request_coalescer import AsyncRequestCoalescer, RequestCoalescer
+from src.gateways.rpc_cache import ProxyResponseCache, rpc_call_key
+
+logger = logging.getLogger(__name__)
+
+# Cache status reported to clients
+HIT = "HIT"
+MISS = "MISS"
+PARTIAL = "PARTIAL"
+COALESCED = "COALESCED"
+
+REQUIRED_FIELDS = ("jsonrpc", "method", "id")
+
+Post = Callable[[str, Any], requests.Response]
+AsyncPost = Callable[[str, Any], Awaitable[Any]]
+
+
+def validate_rpc_payload(payload: Any, max_batch: int = 100) -> Optional[str]:
+    """
+    Check a JSON-RPC request or batch
+
+    Returns:
+        str: Error message, or None if the payload is valid
+    """
+    if isinstance(payload, list):
+        if not payload:
+            return "Empty batch"
+        if len(payload) > max_batch:
+            return f"Batch too large (max {max_batch} calls)"
+        calls = payload
+    elif isinstance(payload, dict):
+        calls = [payload]
+    else:
+        return "RPC request must be an object or an array"
+
+    for call in calls:
+        if not isinstance(call, dict):
+            return "Batch entries must be objects"
+        for field in REQUIRED_FIELDS:
+            if field not in call:
+                return f"Missing required field: {field}"
+    return None
+
+
+class JsonRpcForwarder:
+    """Cache-, batch- and coalescing-aware JSON-RPC forwarding"""
+
+    def __init__(self, pool: EndpointPool, cache: ProxyResponseCache,
+                 coalescer: RequestCoalescer, post: Post):
+        """
+        Initialize the forwarder
+
+        Args:
+            pool: RPC endpoint pool
+            cache: Proxy response cache
+            coalescer: Single-flight for identical reads
+            post: Callable(base_url, payload) -> requests.Response
+        """
+        self.pool = pool
+        self.cache = cache
+        self.coalescer = coalescer
+        self.post = post
+
+    def forward(self, payload: Any) -> Tuple[Any, str]:
+        """
+        Answer a validated JSON-RPC request or batch
+
+        Returns:
+            Tuple of (response body, cache status)
+
+        Raises:
+            EndpointPoolExhausted: If no RPC endpoint answered
+        """
+        if isinstance(payload, list):
+            return self._forward_batch(payload)
+        return self._forward_single(payload)
+
+    def _forward_single(self, call: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        cached = self.cache.lookup_rpc(call)
+        if cached is not None:
+            return cached, HIT
+
+        if not is_read_only_rpc(call):
+            # Writes go straight through, once, under the caller's own id
+            return self._send(call, hedge=False), MISS
+
+        upstream = _upstream_call(call, 0)
+        result, shared = self.coalescer.do(rpc_call_key(call), lambda: self._send(upstream))
+        return self._finish_single(call, result, shared)
+
+    def _forward_batch(self, calls: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], str]:
+        responses, missing, upstream = self._plan_batch(calls)
+        if not missing:
+            return responses, HIT
+
+        if is_read_only_rpc(upstream):
+            results, shared = self.coalescer.do(_batch_key(upstream), lambda: self._send(upstream))
+        else:
+            results, shared = self._send(upstream, hedge=False), False
+        return self._merge_batch(calls, responses, missing, results, shared)
+
+    def _send(self, payload: Any, hedge: bool = True) -> Any:
+        send = self.pool.hedged_call if hedge else self.pool.call
+        response, rpc_url = send(lambda base_url: self.post(base_url, payload))
+        logger.debug(f"Successful RPC response from {rpc_url}")
+        return response.json()
+
+    # Shared by the sync and async forwarders
+
+    def _finish_single(self, call: Dict[str, Any], result: Dict[str, Any],
+                       shared: bool) -> Tuple[Dict[str, Any], str]:
+        self.cache.store_rpc(call, result)
+        return {**result, "id": call["id"]}, COALESCED if shared else MISS
+
+    def _plan_batch(self, calls: List[Dict[str, Any]]):
+        """Cached responses, indexes still missing, and the upstream sub-batch"""
+        responses: List[Optional[Dict[str, Any]]] = [self.cache.lookup_rpc(call) for call in calls]
+        missing = [index for index, response in enumerate(responses) if response is None]
+        # Upstream ids are positions in the sub-batch, so duplicate client ids can't collide
+        upstream = [_upstream_call(calls[index], position) for position, index in enumerate(missing)]
+        return responses, missing, upstream
+
+    def _merge_batch(self, calls: List[Dict[str, Any]], responses: List[Optional[Dict[str, Any]]],
+                     missing: List[int], results: Any, shared: bool) -> Tuple[List[Dict[str, Any]], str]:
+        by_id = {}
+        if isinstance(results, list):
+            by_id = {item.get("id"): item for item in results if isinstance(item, dict)}
+        elif isinstance(results, dict):
+            logger.warning(f"Upstream answered a batch with a single object: {results.get('error')}")
+
+        for position, index in enumerate(missing):
+            call = calls[index]
+            result = by_id.get(position)
+            if result is None:
+                responses[index] = {
+                    "jsonrpc": "2.0", "id": call["id"],
+                    "error": {"code": -32603, "message": "No response from upstream node"}
+                }
+                continue
+            self.cache.store_rpc(call, result)
+            responses[index] = {**result, "id": call["id"]}
+
+        status = MISS if len(missing) == len(calls) else PARTIAL
+        return responses, COALESCED if shared else status
+
+
+class AsyncJsonRpcForwarder(JsonRpcForwarder):
+    """JsonRpcForwarder for the event loop: async pool calls and coalescing"""
+
+    def __init__(self, pool: EndpointPool, cache: ProxyResponseCache,
+                 coalescer: AsyncRequestCoalescer, post: AsyncPost):
+        """
+        Initialize the forwarder
+
+        Args:
+            pool: RPC endpoint pool
+            cache: Proxy response cache
+            coalescer: Async single-flight for identical reads
+            post: Coroutine function(base_url, payload) -> httpx.Response
+        """
+        super().__init__(pool, cache, coalescer, post)
+
+    async def forward(self, payload: Any) -> Tuple[Any, str]:
+        """
+        Answer a validated JSON-RPC request or batch
+
+        Returns:
+            Tuple of (response body, cache status)
+
+        Raises:
+            EndpointPoolExhausted: If no RPC endpoint answered
+        """
+        if isinstance(payload, list):
+            return await self._aforward_batch(payload)
+        return await self._aforward_single(payload)
+
+    async def _aforward_single(self, call: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        cached = self.cache.lookup_rpc(call)
+        if cached is not None:
+            return cached, HIT
+
+        if not is_read_only_rpc(call):
+            return await self._asend(call, hedge=False), MISS
+
+        upstream = _upstream_call(call, 0)
+        result, shared = await self.coalescer.do(rpc_call_key(call), lambda: self._asend(upstream))
+        return self._finish_single(call, result, shared)
+
+    async def _aforward_batch(self, calls: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], str]:
+        responses, missing, upstream = self._plan_batch(calls)
+        if not missing:
+            return responses, HIT
+
+        if is_read_only_rpc(upstream):
+            results, shared = await self.coalescer.do(_batch_key(upstream), lambda: self._asend(upstream))
+        else:
+            results, shared = await self._asend(upstream, hedge=False), False
+        return self._merge_batch(calls, responses, missing, results, shared)
+
+    async def _asend(self, payload: Any, hedge: bool = True) -> Any:
+        send = self.pool.ahedged_call if hedge else self.pool.acall
+        response, rpc_url = await send(lambda base_url: self.post(base_url, payload))
+        logger.debug(f"Successful RPC response from {rpc_url}")
+        return response.json()
+
+
+def _upstream_call(call: Dict[str, Any], request_id: int) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "method": call["method"], "params": call.get("params", {}), "id": request_id}
+
+
+def _batch_key(upstream: List[Dict[str, Any]]) -> Tuple:
+    return ("batch",) + tuple(rpc_call_key(call) for call in upstream)
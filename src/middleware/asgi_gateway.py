@@ -0,0 +1,255 @@
+"""
+ASGI Gateway for DAODISEO
+Serves I/O-bound API routes (blockchain proxy, /api/rpc/*) as native
+coroutines on an ASGI server, so one worker can hold thousands of in-flight
+upstream requests. Every other path falls through to the Flask app via
+asgiref's WsgiToAsgi. Async routes get the same rate limiting, CSRF check,
+CORS and security headers as their Flask counterparts.
+"""
+
+import json
+import logging
+import re
+from http.cookies import SimpleCookie
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs
+
+from src.security_utils import apply_security_headers, rate_limiter
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+
+
+class AsyncRequest:
+    """Parsed HTTP request for async route handlers"""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes, path_params: Dict[str, str]):
+        self.scope = scope
+        self.method = scope["method"].upper()
+        self.path = scope["path"]
+        self.body = body
+        self.path_params = path_params
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        self.args = {name: values[-1] for name, values in query.items()}
+        self.remote_addr = (scope.get("client") or ("unknown", 0))[0]
+        self.session: Dict[str, Any] = {}
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        cookie = SimpleCookie()
+        cookie.load(self.headers.get("cookie", ""))
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def get_json(self) -> Any:
+        """Parsed JSON body, or None if it is empty or invalid"""
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+    def arg(self, name: str, default: Any = None, type: Optional[Callable] = None) -> Any:
+        """Query parameter, converted like Flask's request.args.get"""
+        value = self.args.get(name)
+        if value is None:
+            return default
+        if type is None:
+            return value
+        try:
+            return type(value)
+        except (TypeError, ValueError):
+            return default
+
+
+class AsyncResponse:
+    """Response returned by async route handlers"""
+
+    def __init__(self, body: Any = b"", status: int = 200, headers: Optional[Dict[str, str]] = None,
+                 content_type: str = "application/json"):
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body)
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.status = status
+        self.headers = {"Content-Type": content_type, **(headers or {})}
+
+
+def json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+    """JSON response with the permissive CORS origin the proxy routes use"""
+    return AsyncResponse(data, status, {"Access-Control-Allow-Origin": "*", **(headers or {})})
+
+
+Handler = Callable[[AsyncRequest], Awaitable[AsyncResponse]]
+
+
+class AsyncGateway:
+    """ASGI app: async routes first, Flask (WSGI) for everything else"""
+
+    def __init__(self, flask_app, fallback: Optional[Callable] = None, max_body: Optional[int] = None):
+        """
+        Initialize the gateway
+
+        Args:
+            flask_app: The Flask app (sessions, config, security headers, fallback)
+            fallback: ASGI app for unmatched paths (defaults to WsgiToAsgi(flask_app))
+            max_body: Largest accepted request body in bytes
+        """
+        self.flask_app = flask_app
+        self.max_body = max_body or flask_app.config.get("MAX_CONTENT_LENGTH") or DEFAULT_MAX_BODY
+        self._routes: List[Tuple[Pattern, Tuple[str, ...], Handler, bool]] = []
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+        if fallback is None and WsgiToAsgi is not None:
+            fallback = WsgiToAsgi(flask_app)
+        if fallback is None:
+            logger.error("asgiref is not installed; only async routes will be served")
+        self.fallback = fallback
+
+    # Registration
+
+    def route(self, path: str, methods: Tuple[str, ...] = ("GET",), secure: bool = True):
+        """
+        Register an async handler; `<name>` segments become request.path_params
+
+        Args:
+            path: URL path
+            methods: Allowed methods (OPTIONS is answered for CORS preflight)
+            secure: Apply rate limiting and the CSRF check, like @secure_endpoint
+        """
+        pattern = re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path) + "$")
+
+        def decorator(handler: Handler) -> Handler:
+            self._routes.append((pattern, tuple(m.upper() for m in methods), handler, secure))
+            return handler
+        return decorator
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[None]]):
+        """Run a coroutine function when the server shuts down"""
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    def match(self, method: str, path: str) -> Optional[Tuple[Handler, Dict[str, str], bool]]:
+        for pattern, methods, handler, secure in self._routes:
+            found = pattern.match(path)
+            if found and (method in methods or method == "OPTIONS"):
+                return handler, found.groupdict(), secure
+        return None
+
+    # ASGI
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http":
+            matched = self.match(scope["method"].upper(), scope["path"])
+            if matched is not None:
+                await self._serve(scope, receive, send, *matched)
+                return
+        if self.fallback is None:
+            await self._send(send, json_response({"error": "Not found"}, 404))
+            return
+        await self.fallback(scope, receive, send)
+
+    async def _serve(self, scope, receive, send, handler: Handler, path_params: Dict[str, str], secure: bool):
+        body = await self._read_body(receive)
+        if body is None:
+            await self._send(send, json_response({"error": "Request body too large"}, 413))
+            return
+
+        request = AsyncRequest(scope, body, path_params)
+        if request.method == "OPTIONS":
+            response = json_response({}, headers={
+                "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                "Access-Control-Allow-Methods": "POST, OPTIONS",
+            })
+        else:
+            response = self._guard(request) if secure else None
+            if response is None:
+                try:
+                    response = await handler(request)
+                except Exception as e:
+                    logger.error(f"Async route {request.path} failed: {e}", exc_info=True)
+                    response = json_response({"error": f"Proxy error: {str(e)}"}, 500)
+
+        with self.flask_app.app_context():
+            apply_security_headers(response)
+        await self._send(send, response)
+
+    def _guard(self, request: AsyncRequest) -> Optional[AsyncResponse]:
+        """The checks @secure_endpoint applies on the Flask side"""
+        is_transaction = "broadcast" in request.path or "transaction" in request.path
+        if rate_limiter.is_rate_limited(transaction_endpoint=is_transaction, identifier=request.remote_addr):
+            return json_response({"error": "Rate limit exceeded. Please try again later."}, 429)
+
+        logger.info(f"API Access: {request.method} {request.path} from {request.remote_addr}")
+
+        if request.method != "GET":
+            request.session = self._load_session(request)
+            token = request.headers.get("x-csrf-token")
+            if not token or token != request.session.get("csrf_token"):
+                logger.warning(f"CSRF token validation failed from {request.remote_addr}")
+                return json_response({"error": "Invalid or missing CSRF token"}, 403)
+        return None
+
+    def _load_session(self, request: AsyncRequest) -> Dict[str, Any]:
+        """Decode the Flask session cookie without a request context"""
+        app = self.flask_app
+        cookie = request.cookies.get(app.config.get("SESSION_COOKIE_NAME", "session"))
+        serializer = app.session_interface.get_signing_serializer(app)
+        if not cookie or serializer is None:
+            return {}
+        try:
+            return serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds()))
+        except Exception:
+            return {}
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        return b"".join(chunks)
+
+    async def _send(self, send, response: AsyncResponse):
+        await send({
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": [
+                (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+                for name, value in response.headers.items()
+            ] + [(b"content-length", str(len(response.body)).encode("latin-1"))],
+        })
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for hook in self._shutdown_hooks:
+                    try:
+                        await hook()
+                    except Exception as e:
+                        logger.error(f"Shutdown hook failed: {e}")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
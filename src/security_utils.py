@@ -10,6 +10,7 @@ import hashlib
 import secrets
 import time
 import json
+import re
 from functools import wraps
 from flask import request, jsonify, session, abort, current_app
 
@@ -75,9 +76,9 @@ class RateLimiter:
         """Get unique identifier from request"""
         return request.remote_addr
         
-    def is_rate_limited(self, transaction_endpoint=False):
-        """Check if request should be rate limited"""
-        identifier = self._get_identifier()
+    def is_rate_limited(self, transaction_endpoint=False, identifier=None):
+        """Check if request should be rate limited (identifier defaults to the Flask client IP)"""
+        identifier = identifier or self._get_identifier()
         current_time = time.time()
         
         if identifier not in self.requests:
@@ -179,6 +180,20 @@ def generate_csrf_token():
         session['csrf_token'] = secrets.token_hex(32)
     return session['csrf_token']
 
+def get_chat_session_id(requested: str = None) -> str:
+    """
+    Get the chat session ID for the current user
+
+    Conversations are keyed by a random ID kept in the signed Flask session.
+    A well-formed client-supplied ID only picks one of this user's own
+    conversations: it is namespaced under the server-side ID.
+    """
+    if 'chat_session_id' not in session:
+        session['chat_session_id'] = secrets.token_hex(16)
+    if requested and re.fullmatch(r"[A-Za-z0-9_-]{8,64}", requested):
+        return f"{session['chat_session_id']}:{requested}"
+    return session['chat_session_id']
+
 def apply_security_headers(response):
     """
     Apply security headers to all responses
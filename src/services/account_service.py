@@ -3,6 +3,8 @@ from cosmpy.crypto.address import Address
 import logging
 import requests
 
+from src.services.account_state_cache import get_account_state_cache
+
 
 class AccountService:
     def __init__(self):
@@ -79,6 +81,17 @@ class AccountService:
                 self.logger.error(f"Invalid address format: {address}")
                 raise ValueError("Invalid address format. Must start with 'odiseo1'")
 
+            # Cached account number and locally tracked sequence, when available
+            try:
+                state = get_account_state_cache().get(address)
+                return {
+                    "account_number": state["account_number"],
+                    "sequence": state["sequence"],
+                    "address": address,
+                }
+            except Exception as e:
+                self.logger.warning(f"Account state cache miss failed, querying client: {str(e)}")
+
             # Create Address object
             try:
                 addr = Address(address)
@@ -0,0 +1,358 @@
+"""
+Account State Cache
+Account numbers and sequences for signing. An account number never changes
+once assigned, so it is kept for the life of the process; the sequence is
+cached and advanced locally after each successful broadcast, and dropped when
+the chain reports a sequence mismatch or it goes stale. Sign docs can then be
+prepared without a network round trip, and many addresses can be loaded at
+once with concurrent, de-duplicated fetches.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ACCOUNTS_PATH = "cosmos/auth/v1beta1/accounts"
+
+# ABCI code for ErrWrongSequence in the Cosmos SDK
+CODE_WRONG_SEQUENCE = 32
+
+_MISMATCH = re.compile(r"account sequence mismatch|incorrect account sequence", re.IGNORECASE)
+
+Fetcher = Callable[[str], Optional[Dict[str, Any]]]
+
+
+def parse_account(data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Read account_number and sequence from an auth account response
+
+    Args:
+        data: Response of /cosmos/auth/v1beta1/accounts/{address}, or the
+            account object itself
+
+    Returns:
+        Dict: {"account_number", "sequence"} as strings
+    """
+    account = data.get("account", data)
+    # Vesting, module and eth accounts wrap a BaseAccount
+    for key in ("base_vesting_account", "base_account"):
+        if isinstance(account.get(key), dict):
+            account = account[key]
+    return {
+        "account_number": str(account.get("account_number", "0")),
+        "sequence": str(account.get("sequence", "0")),
+    }
+
+
+def is_sequence_mismatch(result: Dict[str, Any]) -> bool:
+    """Whether a broadcast result was rejected for a wrong sequence"""
+    if _int(result.get("code")) == CODE_WRONG_SEQUENCE:
+        return True
+    return bool(_MISMATCH.search(str(result.get("raw_log") or result.get("log") or "")))
+
+
+def signer_address(msgs: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """
+    Address that signs a transaction, read from its first message
+
+    Args:
+        msgs: Amino ({"type", "value"}) or Proto ({"typeUrl", "value"}) messages
+
+    Returns:
+        str: Signer address, or None if no message names one
+    """
+    for msg in msgs or []:
+        value = msg.get("value", msg) if isinstance(msg, dict) else {}
+        for key in ("from_address", "fromAddress", "delegator_address", "delegatorAddress", "sender"):
+            if value.get(key):
+                return value[key]
+    return None
+
+
+def tx_signer(tx_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Signer of a broadcast payload
+
+    Args:
+        tx_data: Broadcast body, either {"tx": {...amino/proto JSON...}} or
+            {"tx": "<base64 TxRaw>"}
+
+    Returns:
+        str: Signer address, or None if it cannot be read from the payload
+    """
+    tx = tx_data.get("tx", tx_data) if isinstance(tx_data, dict) else None
+    if isinstance(tx, str):
+        from src.services.chain_indexer import decode_tx
+        try:
+            return signer_address(decode_tx(tx)["messages"])
+        except (ValueError, KeyError):
+            return None
+    if isinstance(tx, dict):
+        msgs = tx.get("msg") or tx.get("msgs") or tx.get("body", {}).get("messages")
+        return signer_address(msgs)
+    return None
+
+
+def broadcast_outcome(response: Any) -> Dict[str, Any]:
+    """
+    Normalize a broadcast response to {"code", "raw_log", "height", "txhash"}
+
+    Args:
+        response: REST (legacy or tx_response) or CometBFT JSON-RPC broadcast response
+
+    Returns:
+        Dict: Outcome fields; "code" is None when the response carries none
+    """
+    if not isinstance(response, dict):
+        return {"code": None, "raw_log": str(response or "")}
+    if isinstance(response.get("tx_response"), dict):
+        response = response["tx_response"]
+    elif "jsonrpc" in response:
+        if response.get("error"):
+            error = response["error"]
+            return {"code": None, "raw_log": f"{error.get('message', '')} {error.get('data', '')}"}
+        result = response.get("result") or {}
+        return {"code": result.get("code"), "raw_log": result.get("log", ""),
+                "height": result.get("height"), "txhash": result.get("hash")}
+    return {
+        "code": response.get("code"),
+        "raw_log": response.get("raw_log") or response.get("log") or response.get("error") or "",
+        "height": response.get("height"),
+        "txhash": response.get("txhash"),
+    }
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class AccountStateCache:
+    """Permanent account numbers, locally tracked sequences, single-flight fetches"""
+
+    def __init__(
+        self,
+        fetcher: Optional[Fetcher] = None,
+        sequence_ttl: float = 300.0,
+        max_workers: int = 8,
+        max_entries: int = 10000,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            fetcher: Callable(address) -> auth account response, or None when the
+                chain has no such account; defaults to the REST endpoint pool
+            sequence_ttl: Seconds a sequence is trusted without a broadcast
+                confirming it; guards against transactions signed elsewhere
+            max_workers: Concurrent fetches for bulk lookups
+            max_entries: Addresses kept before the oldest are dropped
+        """
+        self._fetch = fetcher or _pool_fetch
+        self.sequence_ttl = sequence_ttl
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="account-state")
+        self._accounts: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "fetches": 0, "errors": 0,
+                       "increments": 0, "invalidations": 0}
+
+    def get(self, address: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get the signing state of an address
+
+        Args:
+            address: Bech32 account address
+            refresh: Refetch the sequence even if a fresh one is cached
+
+        Returns:
+            Dict: {"address", "account_number", "sequence", "exists", "cached"}
+
+        Raises:
+            Exception: Whatever the fetcher raised, when nothing usable is cached
+        """
+        with self._lock:
+            entry = self._accounts.get(address)
+            if not refresh and self._fresh(entry):
+                self._stats["hits"] += 1
+                return self._view(address, entry, cached=True)
+            self._stats["misses"] += 1
+            future = self._inflight.get(address)
+            owner = future is None
+            if owner:
+                future = self._inflight[address] = Future()
+
+        # Concurrent callers for one address share a single fetch
+        if not owner:
+            return self._view(address, future.result(), cached=False)
+
+        try:
+            entry = self._load(address)
+            future.set_result(entry)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(address, None)
+        return self._view(address, entry, cached=False)
+
+    def get_many(self, addresses: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get the signing state of many addresses, fetching misses concurrently
+
+        Args:
+            addresses: Bech32 account addresses
+
+        Returns:
+            Dict: {"success", "data": {address: state}, "errors": {address: message}}
+        """
+        unique = list(dict.fromkeys(a for a in addresses if a))
+        futures = {address: self._executor.submit(self.get, address) for address in unique}
+
+        data, errors = {}, {}
+        for address, future in futures.items():
+            try:
+                data[address] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to fetch account state for {address}: {e}")
+                errors[address] = str(e)
+        return {"success": not errors, "data": data, "errors": errors}
+
+    def record_broadcast(self, address: str, result: Dict[str, Any]) -> None:
+        """
+        Update the cached sequence from a broadcast result
+
+        Args:
+            address: Signer address
+            result: Broadcast response (code, raw_log, height, ...)
+        """
+        code = result.get("code")
+        if code is None or code == "":
+            # No ABCI code (error bodies, mocks): only a returned tx hash means accepted
+            consumed = bool(result.get("txhash"))
+        else:
+            # Accepted, or included in a block: the ante handler consumed the sequence
+            consumed = _int(code) == 0 or _int(result.get("height")) > 0
+        with self._lock:
+            entry = self._accounts.get(address)
+            if entry is None:
+                return
+            if consumed:
+                if entry["sequence"] is not None:
+                    entry["sequence"] += 1
+                    entry["fetched_at"] = time.monotonic()
+                    self._stats["increments"] += 1
+            elif is_sequence_mismatch(result):
+                self._drop_sequence(entry)
+                logger.warning(f"Sequence mismatch for {address}; cached sequence dropped")
+
+    def record_tx_broadcast(self, tx_data: Dict[str, Any], response: Any) -> Optional[str]:
+        """
+        Update the signer's cached sequence from a proxied broadcast
+
+        Args:
+            tx_data: Broadcast body as posted by the client
+            response: Upstream response JSON, or the error text if no node accepted it
+
+        Returns:
+            str: The signer address, or None if the payload did not name one
+        """
+        signer = tx_signer(tx_data)
+        if signer:
+            self.record_broadcast(signer, broadcast_outcome(response))
+        return signer
+
+    def invalidate(self, address: str) -> None:
+        """Drop the cached sequence of an address, keeping its account number"""
+        with self._lock:
+            entry = self._accounts.get(address)
+            if entry is not None:
+                self._drop_sequence(entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "accounts": len(self._accounts), "inflight": len(self._inflight)}
+
+    def _fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return (
+            entry is not None
+            and entry["sequence"] is not None
+            and time.monotonic() - entry["fetched_at"] < self.sequence_ttl
+        )
+
+    def _drop_sequence(self, entry: Dict[str, Any]) -> None:
+        entry["sequence"] = None
+        self._stats["invalidations"] += 1
+
+    def _load(self, address: str) -> Dict[str, Any]:
+        self._stats["fetches"] += 1
+        try:
+            data = self._fetch(address)
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+
+        if data is None:
+            # Not on chain until it first receives funds; nothing worth keeping
+            return {"account_number": 0, "sequence": 0, "exists": False, "fetched_at": time.monotonic()}
+
+        parsed = parse_account(data)
+        with self._lock:
+            entry = self._accounts.get(address)
+            if entry is None:
+                if len(self._accounts) >= self.max_entries:
+                    self._accounts.pop(next(iter(self._accounts)))
+                entry = self._accounts[address] = {"account_number": int(parsed["account_number"])}
+            entry.update(sequence=int(parsed["sequence"]), exists=True, fetched_at=time.monotonic())
+            return dict(entry)
+
+    @staticmethod
+    def _view(address: str, entry: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            "address": address,
+            "account_number": str(entry["account_number"]),
+            "sequence": str(entry["sequence"]),
+            "exists": entry.get("exists", True),
+            "cached": cached,
+        }
+
+
+def _pool_fetch(address: str) -> Optional[Dict[str, Any]]:
+    from src.gateways.endpoint_pool import get_rest_endpoint_pool
+    from src.gateways.http_client import get_http_client
+
+    http = get_http_client()
+    response, _ = get_rest_endpoint_pool().call(
+        lambda base_url: http.get(f"{base_url}/{ACCOUNTS_PATH}/{address}"),
+        accept=(200, 404),
+    )
+    if response.status_code == 404:
+        return None
+    return response.json()
+
+
+# Global cache instance
+_account_state_cache = None
+_account_state_lock = threading.Lock()
+
+
+def get_account_state_cache() -> AccountStateCache:
+    """Get the shared account state cache"""
+    global _account_state_cache
+    with _account_state_lock:
+        if _account_state_cache is None:
+            _account_state_cache = AccountStateCache(
+                sequence_ttl=float(os.environ.get("ACCOUNT_SEQUENCE_TTL", "300")),
+                max_workers=int(os.environ.get("ACCOUNT_STATE_WORKERS", "8")),
+            )
+    return _account_state_cache
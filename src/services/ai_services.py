@@ -125,10 +125,10 @@ This service handles AI capabilities and integrations for BIM analysis.
 import os
 import logging
 from typing import Dict, List, Optional
-import openai
 
 from src.entities.stakeholder import StakeholderGroup
 from src.gateways.bim_gateways import IFCGateway
+from src.gateways.llm_gateway import get_llm_gateway
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -144,7 +144,8 @@ class AIAgentService:
         self.client = None
         
         try:
-            self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            self.llm = get_llm_gateway()
+            self.client = self.llm.client
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing OpenAI client: {e}")
@@ -202,7 +203,7 @@ class AIAgentService:
             )
             
             # Create the completion
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert BIM analyst."},
@@ -306,7 +307,7 @@ class AIAgentService:
             )
             
             # Call OpenAI API for stakeholder identification
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": system_message},
@@ -351,11 +352,12 @@ This module provides AI capabilities for processing BIM data and interacting wit
 
 import logging
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from src.services.ai_services.bim_agent_openai import OpenAIBIMAgent
 from src.services.ai_services.ifc_agent import IFCAgent
 from src.gateways.bim_gateways import IFCGateway
+from src.gateways.ifc.ifc_digest import get_model_digest_cache
 from src.services.ai_services.ai_agent_service import AIAgentService
 
 # Configure logging
@@ -375,6 +377,7 @@ class BIMAgentManager:
         self.bim_agent = OpenAIBIMAgent()
         self.ifc_agent = IFCAgent()
         self.ai_service = AIAgentService()
+        self.model_digest = None
         
         # Set up paths
         self.upload_dir = os.path.join(os.getcwd(), "uploads")
@@ -439,6 +442,9 @@ class BIMAgentManager:
                     "message": "Failed to parse IFC file"
                 }
                 
+            # Precompute the chat context digest once per file version
+            self.model_digest = self._build_model_digest()
+            
             # Also load into IFC agent
             agent_success = self.ifc_agent.load_ifc_file(file_path)
             
@@ -471,6 +477,16 @@ class BIMAgentManager:
                 "message": f"Error: {str(e)}"
             }
             
+    def _build_model_digest(self) -> Optional[Dict]:
+        """Build (or fetch from cache) the digest of the loaded IFC model"""
+        try:
+            return get_model_digest_cache().get_or_build(
+                self.ifc_gateway.ifc_file, self.ifc_gateway.file_path
+            )
+        except Exception as e:
+            logger.warning(f"Could not build model digest: {e}")
+            return None
+            
     def toggle_enhanced_mode(self, enabled: bool = True) -> Dict:
         """
         Toggle between standard and enhanced AI modes.
@@ -493,7 +509,7 @@ class BIMAgentManager:
         """Get the current enhanced mode status"""
         return self.bim_agent.enhanced_mode
         
-    def process_message(self, message: str) -> Dict:
+    def process_message(self, message: str, session_id: str = "default") -> Dict:
         """
         Process a message from the user.
         Returns API response with AI message and metadata.
@@ -502,14 +518,19 @@ class BIMAgentManager:
             # Get BIM data for context if available
             bim_data = None
             if self.ifc_gateway.model:
-                summary = self.ifc_gateway.summary()
-                bim_data = {
-                    "summary": summary,
-                    "element_count": summary.get("elements", 0)
-                }
+                if self.model_digest is None:
+                    self.model_digest = self._build_model_digest()
+                if self.model_digest:
+                    bim_data = {
+                        "summary": self.model_digest["text"],
+                        "element_count": self.model_digest["element_count"],
+                        "relevant_elements": self.ifc_agent.search_elements(message)
+                    }
                 
             # Process with BIM agent
-            response_text, metadata = self.bim_agent.process_message(message, bim_data)
+            response_text, metadata = self.bim_agent.process_message(
+                message, bim_data, session_id=session_id
+            )
             
             # For enhanced mode, optionally add IFC agent insights
             if self.bim_agent.enhanced_mode and self.ifc_agent.ifc_file and "filtered" not in metadata:
@@ -625,14 +646,19 @@ OpenAI implementation of the BIM Agent for the BIM AI Management Dashboard.
 This module provides OpenAI-based AI capabilities for processing BIM data.
 """
 import logging
+import os
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.entities.stakeholder import StakeholderGroup
+from src.services.conversation_store import get_conversation_store
+from src.services.prompt_compaction import compact_for_prompt
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_SESSION_ID = "default"
+
 
 class OpenAIBIMAgent:
     """
@@ -643,20 +669,33 @@ class OpenAIBIMAgent:
     def __init__(self):
         """Initialize the OpenAI BIM Agent."""
         self.enhanced_mode = False
-        self.identified_stakeholder = None
-        self.conversation_history = []
+        self.conversations = get_conversation_store()
         self.bim_data = None
         self.client = None
 
         try:
-            import openai
+            from src.gateways.llm_gateway import get_llm_gateway
 
-            self.client = openai.OpenAI()
+            self.llm = get_llm_gateway()
+            self.client = self.llm.client
             logger.debug("OpenAI client initialized successfully")
         except (ImportError, Exception) as e:
             logger.error(f"Error initializing OpenAI client: {e}")
             self.client = None
 
+        # Fold old messages into a rolling summary instead of dropping them
+        if (
+            self.client
+            and self.conversations.summarizer is None
+            and os.environ.get("CONVERSATION_SUMMARIZE", "1") != "0"
+        ):
+            self.conversations.summarizer = self._summarize_history
+
+    @property
+    def conversation_history(self) -> List[Dict]:
+        """Messages of the default session (kept for backwards compatibility)"""
+        return list(self.conversations.get_session(DEFAULT_SESSION_ID).messages)
+
     def toggle_enhanced_mode(self, enabled: bool = True) -> bool:
         """Toggle between standard and enhanced AI modes"""
         self.enhanced_mode = enabled
@@ -690,7 +729,7 @@ class OpenAIBIMAgent:
             )
 
             # Call OpenAI API for stakeholder identification
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": system_message},
@@ -718,12 +757,10 @@ class OpenAIBIMAgent:
             # Find the closest match
             for key, value in mapping.items():
                 if key in stakeholder_text:
-                    self.identified_stakeholder = value
                     logger.debug(f"Identified stakeholder: {value}")
                     return value
 
             # Default to investor if no match found
-            self.identified_stakeholder = StakeholderGroup.INVESTOR
             return StakeholderGroup.INVESTOR
 
         except Exception as e:
@@ -761,7 +798,7 @@ class OpenAIBIMAgent:
 
         try:
             # 3. Third check - use OpenAI's moderation endpoint
-            moderation = self.client.moderations.create(input=message)
+            moderation = self.llm.moderation(input=message)
             if moderation.results[0].flagged:
                 # Log which categories were flagged
                 flagged_categories = []
@@ -777,7 +814,7 @@ class OpenAIBIMAgent:
 
             # 4. Fourth check - more nuanced appropriateness check
             # Only perform if message passes the first three layers
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -810,7 +847,10 @@ class OpenAIBIMAgent:
             return False
 
     def process_message(
-        self, message: str, bim_data: Optional[Dict] = None
+        self,
+        message: str,
+        bim_data: Optional[Dict] = None,
+        session_id: str = DEFAULT_SESSION_ID,
     ) -> Tuple[str, Dict]:
         """
         Process a user message and return an AI response
@@ -819,12 +859,13 @@ class OpenAIBIMAgent:
         Args:
             message: User message text
             bim_data: Optional BIM data for context
+            session_id: Conversation session the message belongs to
 
         Returns:
             Tuple containing (response_text, metadata)
         """
         # Update conversation history
-        self.conversation_history.append({"role": "user", "content": message})
+        session = self.conversations.append(session_id, "user", message)
 
         # Update BIM data if provided
         if bim_data:
@@ -833,9 +874,7 @@ class OpenAIBIMAgent:
         # If OpenAI client is not available, return error message
         if not self.client:
             error_msg = "AI service is currently unavailable. Please check your API key configuration."
-            self.conversation_history.append(
-                {"role": "assistant", "content": error_msg}
-            )
+            self.conversations.append(session_id, "assistant", error_msg)
             return error_msg, {"error": "api_unavailable"}
 
         try:
@@ -849,14 +888,13 @@ class OpenAIBIMAgent:
                     "topics so I can help you effectively. For instance, you could ask about "
                     "building specifications, property valuations, or investment strategies."
                 )
-                self.conversation_history.append(
-                    {"role": "assistant", "content": response_text}
-                )
+                self.conversations.append(session_id, "assistant", response_text)
                 return response_text, {"filtered": True}
 
-            # Identify stakeholder if not already identified
-            if not self.identified_stakeholder and len(self.conversation_history) >= 1:
-                self.identify_stakeholder(self.conversation_history)
+            # Identify stakeholder for this session if not already identified
+            if not session.stakeholder:
+                session.stakeholder = self.identify_stakeholder(list(session.messages))
+            stakeholder = session.stakeholder
 
             # Prepare system message based on mode and stakeholder
             if self.enhanced_mode:
@@ -878,15 +916,20 @@ class OpenAIBIMAgent:
             # Add BIM context if available
             if self.bim_data:
                 bim_context = (
-                    f"BIM data available: {self.bim_data.get('summary', 'None')}"
+                    f"BIM model digest:\n{self.bim_data.get('summary', 'None')}"
                 )
                 system_message += f"\n\n{bim_context}"
 
-            # Add stakeholder context if identified
-            if self.identified_stakeholder:
-                stakeholder_name = StakeholderGroup.get_name(
-                    self.identified_stakeholder
+            # Add only the elements relevant to this message, not the whole model
+            if bim_data and bim_data.get("relevant_elements"):
+                system_message += (
+                    "\n\nModel elements relevant to the question: "
+                    f"{compact_for_prompt(bim_data['relevant_elements'], budget_tokens=1000)}"
                 )
+
+            # Add stakeholder context if identified
+            if stakeholder:
+                stakeholder_name = StakeholderGroup.get_name(stakeholder)
                 stakeholder_context = (
                     f"The user appears to be a {stakeholder_name}. Tailor your responses "
                     "accordingly."
@@ -896,11 +939,11 @@ class OpenAIBIMAgent:
             # Prepare messages for the API call
             messages = [{"role": "system", "content": system_message}]
 
-            # Add conversation history, but limit to last 10 messages to avoid token limits
-            messages.extend(self.conversation_history[-10:])
+            # Add conversation history within the session token budget
+            messages.extend(self.conversations.get_context(session_id))
 
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-4o" if self.enhanced_mode else "gpt-3.5-turbo",
                 messages=messages,
                 max_tokens=500,
@@ -910,18 +953,14 @@ class OpenAIBIMAgent:
             response_text = response.choices[0].message.content
 
             # Update conversation history with the AI response
-            self.conversation_history.append(
-                {"role": "assistant", "content": response_text}
-            )
+            self.conversations.append(session_id, "assistant", response_text)
 
             # Prepare metadata for the frontend
             metadata = {
                 "enhanced_mode": self.enhanced_mode,
-                "stakeholder": self.identified_stakeholder,
+                "stakeholder": stakeholder,
                 "stakeholder_name": (
-                    StakeholderGroup.get_name(self.identified_stakeholder)
-                    if self.identified_stakeholder
-                    else None
+                    StakeholderGroup.get_name(stakeholder) if stakeholder else None
                 ),
                 "model": "gpt-4o" if self.enhanced_mode else "gpt-3.5-turbo",
             }
@@ -931,11 +970,29 @@ class OpenAIBIMAgent:
         except Exception as e:
             logger.error(f"Error processing message: {e}")
             error_msg = "Sorry, I encountered an error processing your message. Please try again."
-            self.conversation_history.append(
-                {"role": "assistant", "content": error_msg}
-            )
+            self.conversations.append(session_id, "assistant", error_msg)
             return error_msg, {"error": str(e)}
 
+    def _summarize_history(
+        self, previous_summary: Optional[str], messages: List[Dict]
+    ) -> Optional[str]:
+        """Fold messages that left the history window into a short running summary"""
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+        prompt = (
+            f"Previous summary: {previous_summary or 'None'}\n\n"
+            f"New messages:\n{transcript}\n\n"
+            "Update the summary of this BIM assistant conversation in at most 120 words. "
+            "Keep property details, user goals and decisions; drop small talk."
+        )
+
+        response = self.llm.chat_completion(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.2,
+        )
+        return response.choices[0].message.content.strip()
+
     def _get_standard_system_message(self) -> str:
         """Get the system message for standard mode"""
         return (
@@ -973,17 +1030,25 @@ Feeds actual blockchain data directly into the AI orchestrator's reasoning engin
 """
 
 import logging
+import os
 import time
 import json
 import asyncio
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
-import requests
-from concurrent.futures import ThreadPoolExecutor
 
+from src.gateways.async_chain_client import AsyncChainClient, FetchExecutor, gather_with_timeouts
+from src.gateways.cometbft_subscriber import CometBFTSubscriber
+from src.gateways.rpc_cache import get_proxy_cache
 from src.services.ai_services.orchestrator import get_orchestrator
 from src.services.blockchain_service import BlockchainService
+from src.services.chain_change_detector import ChainChangeDetector, ChangeEvent
+from src.services.chain_snapshot import get_chain_snapshot
+from src.services.chain_timeseries import ChainTimeSeries, metrics_from_data_points
+from src.services.insight_log import InsightLog
+from src.services.prompt_compaction import compact_for_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -1006,11 +1071,25 @@ class ChainBrainOrchestrator:
         self.rest_endpoint = "https://testnet-api.daodiseo.chaintools.tech"
         self.orchestrator = get_orchestrator()
         self.blockchain_service = BlockchainService()
-        self.data_cache = {}
-        self.learning_memory = []
+        self.insights = InsightLog(max_entries=100)
         self.is_feeding = False
         self.feed_interval = 30  # seconds
+        self.feed_timeout = 10  # seconds, per feed
         self.max_memory_size = 1000
+        self.pattern_window = 3600  # seconds of history used for pattern analysis
+        self.pattern_interval = 900  # minimum seconds between pattern analyses
+        # Raw data points (bounded) and numeric metrics (fixed-size ring buffers)
+        self.learning_memory = deque(maxlen=self.max_memory_size)
+        self.data_points_seen = 0
+        self.timeseries = ChainTimeSeries(capacity=self.max_memory_size)
+        # LLM analysis only runs when the detector reports a change
+        self.change_detector = ChainChangeDetector(self.timeseries)
+        self.pending_changes: List[ChangeEvent] = []
+        self.last_pattern_analysis = 0.0
+        self.chain_client = AsyncChainClient(self.rpc_endpoint, self.rest_endpoint)
+        self.snapshot = get_chain_snapshot()
+        # Long-lived pool for blocking orchestrator calls, shared by feeds and on-demand queries
+        self.executor = FetchExecutor(max_workers=4, thread_name_prefix="chain-brain")
         
         # Initialize chain data feeds
         self.chain_feeds = {
@@ -1022,6 +1101,18 @@ class ChainBrainOrchestrator:
             'governance': self._feed_governance_data
         }
         
+        # Push-based block/validator updates; these feeds are only polled
+        # while the websocket subscription is down, or when no NewBlock has
+        # arrived for pushed_block_timeout (a halted chain pushes nothing, and
+        # block_stall detection needs height samples to keep coming)
+        self.pushed_feeds = {'blocks', 'validators'}
+        self.pushed_block_timeout = 60  # seconds, ~10 block times
+        self._last_pushed_block = 0.0
+        self.subscriber = None
+        if os.getenv("CHAIN_BRAIN_WEBSOCKET", "1") != "0":
+            self.subscriber = CometBFTSubscriber(self.rpc_endpoint, on_event=self._handle_chain_event)
+        self._subscriber_task: Optional[asyncio.Task] = None
+        
     async def start_chain_brain_feeding(self):
         """Start continuous feeding of chain data into o3-mini brain"""
         if self.is_feeding:
@@ -1033,19 +1124,33 @@ class ChainBrainOrchestrator:
         # Initialize with historical context
         await self._initialize_chain_context()
         
+        if self.subscriber is not None and self.subscriber.available:
+            self._subscriber_task = asyncio.create_task(self.subscriber.run())
+        
         # Start continuous feeding
-        while self.is_feeding:
-            try:
-                await self._feed_all_chain_data()
-                await self._process_learning_insights()
-                await asyncio.sleep(self.feed_interval)
-            except Exception as e:
-                logger.error(f"Chain brain feeding error: {e}")
-                await asyncio.sleep(5)
+        try:
+            while self.is_feeding:
+                try:
+                    await self._feed_all_chain_data()
+                    await self._process_learning_insights()
+                    await asyncio.sleep(self.feed_interval)
+                except Exception as e:
+                    logger.error(f"Chain brain feeding error: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            self.is_feeding = False
+            if self._subscriber_task is not None:
+                self.subscriber.stop()
+                self._subscriber_task.cancel()
+                await asyncio.gather(self._subscriber_task, return_exceptions=True)
+                self._subscriber_task = None
+            await self.chain_client.aclose()
     
     def stop_chain_brain_feeding(self):
         """Stop the chain data feeding"""
         self.is_feeding = False
+        if self.subscriber is not None:
+            self.subscriber.stop()
         logger.info("Stopped Chain Brain feeding")
     
     async def _initialize_chain_context(self):
@@ -1068,7 +1173,9 @@ class ChainBrainOrchestrator:
             and provide intelligent insights for real estate blockchain operations.
             """
             
-            result = self.orchestrator.orchestrate_task(
+            # Off the shared loop: the model call must not stall the other background tasks
+            result = await self._run_blocking(
+                self.orchestrator.orchestrate_task,
                 context_prompt,
                 {
                     "mode": "initialization",
@@ -1088,24 +1195,22 @@ class ChainBrainOrchestrator:
     async def _get_comprehensive_chain_state(self) -> Dict[str, Any]:
         """Get comprehensive current blockchain state"""
         try:
-            # Parallel fetch of all critical data
-            with ThreadPoolExecutor(max_workers=6) as executor:
-                futures = {
-                    'status': executor.submit(self._fetch_status),
-                    'validators': executor.submit(self._fetch_validators),
-                    'latest_block': executor.submit(self._fetch_latest_block),
-                    'consensus_params': executor.submit(self._fetch_consensus_params),
-                    'net_info': executor.submit(self._fetch_net_info),
-                    'governance': executor.submit(self._fetch_governance_data)
-                }
-                
-                results = {}
-                for key, future in futures.items():
-                    try:
-                        results[key] = future.result(timeout=10)
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch {key}: {e}")
-                        results[key] = {}
+            # Concurrent fetch of all critical data
+            fetched = await gather_with_timeouts({
+                'status': self._fetch_status,
+                'validators': self._fetch_validators,
+                'latest_block': self._fetch_latest_block,
+                'consensus_params': self._fetch_consensus_params,
+                'net_info': self._fetch_net_info,
+                'governance': self._fetch_governance_data
+            }, timeout=self.feed_timeout)
+            
+            results = {}
+            for key, value in fetched.items():
+                if isinstance(value, BaseException):
+                    logger.warning(f"Failed to fetch {key}: {value!r}")
+                    value = {}
+                results[key] = value
             
             # Process and structure the data
             return {
@@ -1137,17 +1242,32 @@ class ChainBrainOrchestrator:
     
     async def _feed_all_chain_data(self):
         """Feed all types of chain data to the AI brain"""
-        for feed_name, feed_func in self.chain_feeds.items():
+        feeds = self.chain_feeds
+        if self._blocks_are_pushed():
+            feeds = {name: feed for name, feed in feeds.items() if name not in self.pushed_feeds}
+        
+        # All feeds fetch concurrently; the cycle takes as long as the slowest feed
+        results = await gather_with_timeouts(feeds, timeout=self.feed_timeout)
+        
+        for feed_name, data_points in results.items():
+            if isinstance(data_points, BaseException):
+                logger.warning(f"Failed to feed {feed_name} data: {data_points!r}")
+                continue
             try:
-                data_points = await feed_func()
                 await self._process_data_points(feed_name, data_points)
             except Exception as e:
-                logger.warning(f"Failed to feed {feed_name} data: {e}")
+                logger.warning(f"Failed to process {feed_name} data: {e}")
     
-    async def _feed_validator_data(self) -> List[ChainDataPoint]:
+    def _blocks_are_pushed(self) -> bool:
+        """Whether the websocket is connected and still delivering NewBlock events"""
+        if self.subscriber is None or not self.subscriber.connected:
+            return False
+        return time.monotonic() - self._last_pushed_block < self.pushed_block_timeout
+    
+    async def _feed_validator_data(self, fresh: bool = False) -> List[ChainDataPoint]:
         """Feed real-time validator data"""
         try:
-            validators_data = self._fetch_validators()
+            validators_data = await self._fetch_validators(fresh=fresh)
             validators = validators_data.get('result', {}).get('validators', [])
             
             data_points = []
@@ -1173,15 +1293,15 @@ class ChainBrainOrchestrator:
     async def _feed_block_data(self) -> List[ChainDataPoint]:
         """Feed real-time block data"""
         try:
-            status_data = self._fetch_status()
+            # Status and latest block are independent, fetch them together
+            status_data, block_data = await asyncio.gather(
+                self._fetch_status(), self._fetch_latest_block()
+            )
             sync_info = status_data.get('result', {}).get('sync_info', {})
             
             latest_block_height = int(sync_info.get('latest_block_height', 0))
             latest_block_time = sync_info.get('latest_block_time')
             
-            # Get specific block data
-            block_data = self._fetch_block(latest_block_height)
-            
             return [ChainDataPoint(
                 timestamp=datetime.now(),
                 data_type='block_production',
@@ -1202,12 +1322,11 @@ class ChainBrainOrchestrator:
     async def _feed_transaction_data(self) -> List[ChainDataPoint]:
         """Feed real-time transaction data"""
         try:
-            # Get unconfirmed transactions
-            unconfirmed = self._fetch_unconfirmed_txs()
+            # Unconfirmed and recent transactions in parallel
+            unconfirmed, recent_txs_data = await asyncio.gather(
+                self._fetch_unconfirmed_txs(), self._fetch_tx_search()
+            )
             unconfirmed_txs = unconfirmed.get('result', {}).get('txs', [])
-            
-            # Search for recent transactions
-            recent_txs_data = self._fetch_tx_search()
             recent_txs = recent_txs_data.get('result', {}).get('txs', [])
             
             data_points = []
@@ -1233,7 +1352,7 @@ class ChainBrainOrchestrator:
     async def _feed_consensus_data(self) -> List[ChainDataPoint]:
         """Feed consensus state data"""
         try:
-            consensus_state = self._fetch_consensus_state()
+            consensus_state = await self._fetch_consensus_state()
             
             return [ChainDataPoint(
                 timestamp=datetime.now(),
@@ -1250,8 +1369,9 @@ class ChainBrainOrchestrator:
     async def _feed_network_state(self) -> List[ChainDataPoint]:
         """Feed network state data"""
         try:
-            net_info = self._fetch_net_info()
-            health = self._fetch_health()
+            net_info, health = await asyncio.gather(
+                self._fetch_net_info(), self._fetch_health()
+            )
             
             return [ChainDataPoint(
                 timestamp=datetime.now(),
@@ -1289,39 +1409,76 @@ class ChainBrainOrchestrator:
             logger.error(f"Failed to feed governance data: {e}")
             return []
     
+    async def _handle_chain_event(self, event_type: str, value: Dict[str, Any]):
+        """Turn a pushed CometBFT event into data points as it happens"""
+        if event_type == 'NewBlock':
+            self._last_pushed_block = time.monotonic()
+            block = value.get('block', {})
+            header = block.get('header', {})
+            self.snapshot.notify_new_block(int(header.get('height', 0)) or None)
+            get_proxy_cache().invalidate_head()
+            await self._process_data_points('blocks', [ChainDataPoint(
+                timestamp=datetime.now(),
+                data_type='block_production',
+                value={
+                    'height': int(header.get('height', 0)),
+                    'time': header.get('time'),
+                    'tx_count': len(block.get('data', {}).get('txs') or []),
+                    'proposer': header.get('proposer_address')
+                },
+                source_endpoint='/websocket',
+                context={'event': event_type}
+            )])
+        elif event_type == 'Tx':
+            tx_result = value.get('TxResult', {})
+            result = tx_result.get('result', {})
+            await self._process_data_points('transactions', [ChainDataPoint(
+                timestamp=datetime.now(),
+                data_type='transaction',
+                value={
+                    'height': int(tx_result.get('height', 0)),
+                    'index': tx_result.get('index', 0),
+                    'code': result.get('code', 0),
+                    'gas_used': int(result.get('gas_used', 0) or 0)
+                },
+                source_endpoint='/websocket',
+                context={'event': event_type}
+            )])
+        elif event_type == 'ValidatorSetUpdates':
+            # Updates are diffs; refetch the full set (the snapshot still holds the old one)
+            await self._process_data_points('validators', await self._feed_validator_data(fresh=True))
+    
     async def _process_data_points(self, feed_name: str, data_points: List[ChainDataPoint]):
         """Process data points and feed to o3-mini brain"""
         if not data_points:
             return
         
-        # Store in memory
+        # Store in memory (the deque drops the oldest points itself)
         self.learning_memory.extend(data_points)
+        self.data_points_seen += len(data_points)
+        metrics = metrics_from_data_points(data_points)
+        self.timeseries.record(metrics)
         
-        # Limit memory size
-        if len(self.learning_memory) > self.max_memory_size:
-            self.learning_memory = self.learning_memory[-self.max_memory_size:]
-        
-        # Prepare data for AI analysis
-        data_summary = self._summarize_data_points(feed_name, data_points)
-        
-        # Feed to o3-mini if significant data
-        if self._is_significant_data(data_points):
+        # Feed to o3-mini only when something changed
+        changes = self.change_detector.detect(metrics, data_points)
+        if changes:
+            self.pending_changes.extend(changes)
+            data_summary = self._summarize_data_points(feed_name, data_points, changes)
             await self._feed_to_orchestrator(feed_name, data_summary, data_points)
     
-    def _summarize_data_points(self, feed_name: str, data_points: List[ChainDataPoint]) -> str:
+    def _summarize_data_points(self, feed_name: str, data_points: List[ChainDataPoint],
+                               changes: Optional[List[ChangeEvent]] = None) -> str:
         """Create summary of data points for AI consumption"""
         summary_parts = [f"Chain Data Feed: {feed_name}"]
         
+        for change in changes or []:
+            summary_parts.append(f"- DETECTED {change.kind} ({change.severity}): {change.message}")
+        
         for dp in data_points:
             summary_parts.append(f"- {dp.data_type}: {dp.value}")
         
         return " | ".join(summary_parts)
     
-    def _is_significant_data(self, data_points: List[ChainDataPoint]) -> bool:
-        """Determine if data points are significant enough for AI analysis"""
-        # Only process every 3rd cycle to avoid overwhelming the AI
-        return len(self.learning_memory) % 3 == 0
-    
     async def _feed_to_orchestrator(self, feed_name: str, summary: str, data_points: List[ChainDataPoint]):
         """Feed processed data to o3-mini orchestrator"""
         try:
@@ -1339,7 +1496,8 @@ class ChainBrainOrchestrator:
             Provide brief analysis and any alerts.
             """
             
-            result = self.orchestrator.orchestrate_task(
+            result = await self._run_blocking(
+                self.orchestrator.orchestrate_task,
                 analysis_prompt,
                 {
                     "mode": "real_time_analysis",
@@ -1365,29 +1523,44 @@ class ChainBrainOrchestrator:
     
     async def _process_learning_insights(self):
         """Process accumulated learning insights"""
-        if len(self.learning_memory) % 100 == 0:  # Every 100 data points
-            await self._generate_pattern_analysis()
+        # Only when changes accumulated, and at most once per pattern_interval
+        if not self.pending_changes:
+            return
+        if time.monotonic() - self.last_pattern_analysis < self.pattern_interval:
+            return
+        self.last_pattern_analysis = time.monotonic()
+        await self._generate_pattern_analysis()
+        self.pending_changes = []
     
     async def _generate_pattern_analysis(self):
         """Generate pattern analysis from accumulated data"""
         try:
-            recent_data = self.learning_memory[-50:]  # Last 50 data points
+            time_range = self.timeseries.time_range()
+            if time_range is None:
+                return
+            aggregates = self.timeseries.summary(seconds=self.pattern_window)
             
             pattern_prompt = f"""
             Pattern Analysis Request:
-            Analyze the last 50 blockchain data points to identify:
+            Analyze these blockchain metric aggregates to identify:
             1. Emerging trends in validator behavior
             2. Network performance patterns
             3. Transaction volume patterns
             4. Potential issues or optimizations
             
-            Data points span: {len(recent_data)} entries
-            Time range: {recent_data[0].timestamp} to {recent_data[-1].timestamp}
+            Time range: {datetime.fromtimestamp(time_range[0]).isoformat()} to {datetime.fromtimestamp(time_range[1]).isoformat()}
+            Metrics over the last {self.pattern_window // 60} minutes
+            (rate is per second, zscore compares the latest sample with the window):
+            {compact_for_prompt(aggregates, budget_tokens=600)}
+            
+            Changes detected since the last analysis:
+            {compact_for_prompt([c.to_dict() for c in self.pending_changes], budget_tokens=400)}
             
             Provide strategic insights for real estate blockchain operations.
             """
             
-            result = self.orchestrator.orchestrate_task(
+            result = await self._run_blocking(
+                self.orchestrator.orchestrate_task,
                 pattern_prompt,
                 {
                     "mode": "pattern_analysis",
@@ -1403,21 +1576,17 @@ class ChainBrainOrchestrator:
         except Exception as e:
             logger.error(f"Failed to generate pattern analysis: {e}")
     
-    def _store_ai_insight(self, insight: Dict[str, Any]):
+    def _store_ai_insight(self, insight: Dict[str, Any]) -> int:
         """Store AI insight for retrieval"""
-        cache_key = f"ai_insight_{insight['timestamp'].strftime('%Y%m%d_%H%M%S')}"
-        self.data_cache[cache_key] = insight
-        
-        # Limit cache size
-        if len(self.data_cache) > 100:
-            oldest_key = min(self.data_cache.keys())
-            del self.data_cache[oldest_key]
+        return self.insights.append(insight)
     
     def get_recent_insights(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent AI insights"""
-        insights = list(self.data_cache.values())
-        insights.sort(key=lambda x: x['timestamp'], reverse=True)
-        return insights[:limit]
+        """Get recent AI insights, newest first"""
+        return self.insights.recent(limit)
+    
+    def get_insights_since(self, cursor: int, limit: int = 50) -> Tuple[List[Dict[str, Any]], int]:
+        """Get AI insights newer than a cursor id, oldest first, and the cursor to poll with next"""
+        return self.insights.since(cursor, limit)
     
     async def get_ai_chain_analysis(self, query: str) -> Dict[str, Any]:
         """Get AI analysis of current chain state for specific query"""
@@ -1432,15 +1601,16 @@ class ChainBrainOrchestrator:
             Query: {query}
             
             Current Chain State:
-            {json.dumps(current_state, indent=2)}
+            {compact_for_prompt(current_state, budget_tokens=1200)}
             
             Recent AI Insights:
-            {json.dumps(recent_insights, indent=2, default=str)}
+            {compact_for_prompt(recent_insights, budget_tokens=800)}
             
             Provide comprehensive analysis addressing the query with current data.
             """
             
-            return self.orchestrator.orchestrate_task(
+            return await self._run_blocking(
+                self.orchestrator.orchestrate_task,
                 analysis_prompt,
                 {
                     "mode": "on_demand_analysis",
@@ -1454,105 +1624,82 @@ class ChainBrainOrchestrator:
             logger.error(f"Failed to get AI chain analysis: {e}")
             return {"success": False, "error": str(e)}
     
-    # Blockchain data fetching methods
-    def _fetch_status(self) -> Dict[str, Any]:
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the shared executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+    
+    def get_chain_metrics(self, window_seconds: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Windowed aggregates of the recorded chain metrics"""
+        return self.timeseries.summary(seconds=window_seconds)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool and executor saturation metrics"""
+        return {
+            "http_pool": self.chain_client.get_stats(),
+            "snapshot": self.snapshot.get_stats(),
+            "subscription": self.subscriber.get_stats() if self.subscriber else None,
+            "executor": self.executor.get_stats()
+        }
+    
+    # Blockchain data fetching methods (non-blocking, shared connection pool)
+    async def _fetch_shared(self, resource: str, fresh: bool = False) -> Dict[str, Any]:
+        """Serve a resource from the shared chain snapshot, fetching it on a miss or when fresh"""
+        payload = None if fresh else self.snapshot.peek(resource)
+        if payload is not None:
+            return payload
+        _, path, params = self.snapshot.resources[resource]
+        payload = await self.chain_client.get_json(path, params=params)
+        self.snapshot.put(resource, payload)
+        return payload
+    
+    async def _fetch_status(self) -> Dict[str, Any]:
         """Fetch network status"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/status", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch status: {e}")
-            return {}
+        return await self._fetch_shared("status")
     
-    def _fetch_validators(self) -> Dict[str, Any]:
+    async def _fetch_validators(self, fresh: bool = False) -> Dict[str, Any]:
         """Fetch validators data"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/validators", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch validators: {e}")
-            return {}
+        return await self._fetch_shared("validators", fresh=fresh)
     
-    def _fetch_latest_block(self) -> Dict[str, Any]:
+    async def _fetch_latest_block(self) -> Dict[str, Any]:
         """Fetch latest block"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/block", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch latest block: {e}")
-            return {}
+        return await self._fetch_shared("block")
     
-    def _fetch_block(self, height: int) -> Dict[str, Any]:
+    async def _fetch_block(self, height: int) -> Dict[str, Any]:
         """Fetch specific block"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/block?height={height}", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch block {height}: {e}")
-            return {}
+        return await self.chain_client.get_json("block", params={"height": height})
     
-    def _fetch_consensus_params(self) -> Dict[str, Any]:
+    async def _fetch_consensus_params(self) -> Dict[str, Any]:
         """Fetch consensus parameters"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/consensus_params", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch consensus params: {e}")
-            return {}
+        return await self.chain_client.get_json("consensus_params")
     
-    def _fetch_consensus_state(self) -> Dict[str, Any]:
+    async def _fetch_consensus_state(self) -> Dict[str, Any]:
         """Fetch consensus state"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/consensus_state", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch consensus state: {e}")
-            return {}
+        return await self.chain_client.get_json("consensus_state")
     
-    def _fetch_net_info(self) -> Dict[str, Any]:
+    async def _fetch_net_info(self) -> Dict[str, Any]:
         """Fetch network info"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/net_info", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch net info: {e}")
-            return {}
+        return await self.chain_client.get_json("net_info")
     
-    def _fetch_health(self) -> bool:
+    async def _fetch_health(self) -> bool:
         """Check network health"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/health", timeout=5)
-            return response.status_code == 200
-        except Exception:
-            return False
+        if self.snapshot.peek("health") is not None:
+            return True
+        return await self.chain_client.health()
     
-    def _fetch_unconfirmed_txs(self) -> Dict[str, Any]:
+    async def _fetch_unconfirmed_txs(self) -> Dict[str, Any]:
         """Fetch unconfirmed transactions"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/unconfirmed_txs?limit=100", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch unconfirmed txs: {e}")
-            return {}
+        return await self.chain_client.get_json("unconfirmed_txs", params={"limit": 100})
     
-    def _fetch_tx_search(self) -> Dict[str, Any]:
+    async def _fetch_tx_search(self) -> Dict[str, Any]:
         """Search for recent transactions"""
-        try:
-            response = requests.get(f"{self.rpc_endpoint}/tx_search?query=\"\"&page=1&per_page=20", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to search transactions: {e}")
-            return {}
+        return await self.chain_client.get_json(
+            "tx_search", params={"query": '""', "page": 1, "per_page": 20}
+        )
     
-    def _fetch_governance_data(self) -> Dict[str, Any]:
+    async def _fetch_governance_data(self) -> Dict[str, Any]:
         """Fetch governance data"""
-        try:
-            # This would query governance module
-            response = requests.get(f"{self.rest_endpoint}/cosmos/gov/v1/proposals", timeout=10)
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch governance data: {e}")
-            return {}
+        return await self.chain_client.get_json("cosmos/gov/v1/proposals", rest=True)
     
     def _calculate_total_stake(self, validators_data: Dict[str, Any]) -> int:
         """Calculate total voting power"""
@@ -1591,57 +1738,72 @@ Chain Brain Service - Background service for continuous chain data feeding
 """
 
 import logging
-import threading
-import time
-import asyncio
 from typing import Optional
 
 from src.services.ai_services.chain_brain_orchestrator import get_chain_brain_orchestrator
+from src.services.background_runtime import get_background_runtime
 
 logger = logging.getLogger(__name__)
 
 class ChainBrainService:
     """Background service that continuously feeds blockchain data to o3-mini"""
     
+    TASK_NAME = "chain_brain"
+    
     def __init__(self):
-        self.is_running = False
-        self.thread: Optional[threading.Thread] = None
         self.chain_brain = get_chain_brain_orchestrator()
+        self.runtime = get_background_runtime()
+    
+    @property
+    def is_running(self) -> bool:
+        return self.runtime.is_task_running(self.TASK_NAME)
         
     def start(self):
         """Start the chain brain feeding service"""
-        if self.is_running:
-            return
-            
-        self.is_running = True
-        self.thread = threading.Thread(target=self._run_chain_brain, daemon=True)
-        self.thread.start()
-        logger.info("Chain Brain Service started - feeding live blockchain data to o3-mini")
+        if self.runtime.register(self.TASK_NAME, self.chain_brain.start_chain_brain_feeding):
+            logger.info("Chain Brain Service started - feeding live blockchain data to o3-mini")
         
     def stop(self):
         """Stop the chain brain feeding service"""
-        self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        self.chain_brain.stop_chain_brain_feeding()
+        self.runtime.cancel(self.TASK_NAME, timeout=5)
         logger.info("Chain Brain Service stopped")
+    
+    def analyze(self, query: str, timeout: float = 60):
+        """
+        Run an on-demand chain analysis on the shared background loop
         
-    def _run_chain_brain(self):
-        """Run the chain brain feeding in background thread"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        Reuses the loop's warm connection pool and executor instead of
+        creating a new event loop (and new TLS connections) per call.
+        """
         try:
-            loop.run_until_complete(self.chain_brain.start_chain_brain_feeding())
+            return self.runtime.call(self.chain_brain.get_ai_chain_analysis(query), timeout=timeout)
         except Exception as e:
-            logger.error(f"Chain brain feeding error: {e}")
-        finally:
-            loop.close()
+            logger.error(f"On-demand chain analysis failed: {e}")
+            return {"success": False, "error": str(e)}
             
-    def get_status(self):
-        """Get service status"""
+    def get_status(self, since: Optional[int] = None):
+        """
+        Get service status
+        
+        Args:
+            since: Insight cursor; when given, all insights newer than it are
+                returned (oldest first) instead of the three most recent
+        """
+        if since is not None:
+            # A capped page only advances the cursor as far as it got
+            insights, cursor = self.chain_brain.get_insights_since(since) if self.is_running else ([], since)
+        else:
+            insights = self.chain_brain.get_recent_insights(3) if self.is_running else []
+            cursor = insights[0]["id"] if insights else self.chain_brain.insights.latest_id
         return {
             "running": self.is_running,
-            "recent_insights": self.chain_brain.get_recent_insights(3) if self.is_running else []
+            "recent_insights": insights,
+            "insight_cursor": cursor,
+            "metrics": self.chain_brain.get_chain_metrics(window_seconds=600),
+            "change_detection": self.chain_brain.change_detector.get_stats(),
+            "pool_stats": self.chain_brain.get_pool_stats(),
+            "runtime": self.runtime.health()
         }
 
 # Global service instance
@@ -1674,9 +1836,16 @@ import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple
 
+from src.gateways.ifc.ifc_index import IFCElementIndex
+from src.services.prompt_compaction import compact_for_prompt
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Elements returned to the model per tool call or prompt
+MAX_TOOL_ELEMENTS = 50
+DEFAULT_SEARCH_RESULTS = 8
+
 
 class IFCAgent:
     """
@@ -1689,14 +1858,16 @@ class IFCAgent:
     def __init__(self):
         """Initialize the IFC Agent with OpenAI Agents SDK integration"""
         self.ifc_file = None
+        self.element_index = None
         self.client = None
         self.agent_executor = None
         self.openai_agents_available = False
 
         # Try to initialize OpenAI client
         try:
-            import openai
-            self.client = openai.OpenAI()
+            from src.gateways.llm_gateway import get_llm_gateway
+            self.llm = get_llm_gateway()
+            self.client = self.llm.client
             logger.debug("OpenAI client initialized successfully for IFC Agent")
         except (ImportError, Exception) as e:
             logger.error(f"Error initializing OpenAI client: {e}")
@@ -1724,6 +1895,13 @@ class IFCAgent:
             import ifcopenshell
             self.ifc_file = ifcopenshell.open(file_path)
             
+            # Index elements once so queries retrieve only what is relevant
+            try:
+                self.element_index = IFCElementIndex.from_ifc_file(self.ifc_file)
+            except Exception as e:
+                logger.warning(f"Could not build IFC element index: {e}")
+                self.element_index = None
+            
             # Initialize agent tools after loading the file
             if self.openai_agents_available and self.client:
                 self._setup_agent()
@@ -1830,14 +2008,17 @@ class IFCAgent:
 
                 try:
                     elements = self.ifc_file.by_type(element_type)
-                    return [self._element_to_dict(element) for element in elements]
+                    return [self._element_to_dict(element) for element in elements[:MAX_TOOL_ELEMENTS]]
                 except Exception as e:
                     logger.error(f"Error getting elements of type {element_type}: {str(e)}")
                     return []
                 
             return Tool(
                 name="get_elements_by_type",
-                description="Get all elements of a specific type (e.g., 'IfcWall', 'IfcDoor')",
+                description=(
+                    f"Get up to {MAX_TOOL_ELEMENTS} elements of a specific type (e.g., 'IfcWall', 'IfcDoor'). "
+                    "Prefer search_elements for questions about particular elements"
+                ),
                 function=get_elements_by_type,
                 parameters={
                     "element_type": {
@@ -1850,6 +2031,77 @@ class IFCAgent:
             logger.error(f"Error creating elements_by_type tool: {e}")
             return None
 
+    def _search_elements_tool(self):
+        """
+        Create a Tool for retrieving the elements most relevant to a question.
+
+        Returns:
+            Tool: An OpenAI Agents SDK Tool instance if available, else None
+        """
+        if not self.openai_agents_available or not self.element_index:
+            return None
+
+        try:
+            from openai_agents.tools import Tool
+            
+            def search_elements(query: str, element_type: str = None, limit: int = DEFAULT_SEARCH_RESULTS) -> List[Dict[str, Any]]:
+                """
+                Find elements matching a question by name, type, properties and materials.
+
+                Args:
+                    query: Question or keywords (e.g., "fire rated doors on level 2")
+                    element_type: Optional IFC type filter (e.g., "IfcDoor")
+                    limit: Maximum number of elements to return
+
+                Returns:
+                    List of element dictionaries with relevance scores
+                """
+                return self.search_elements(query, k=limit, element_type=element_type)
+                
+            return Tool(
+                name="search_elements",
+                description="Find the IFC elements most relevant to a question (names, types, property sets, materials)",
+                function=search_elements,
+                parameters={
+                    "query": {
+                        "type": "string",
+                        "description": "Question or keywords describing the elements"
+                    },
+                    "element_type": {
+                        "type": "string",
+                        "description": "Optional IFC type filter (e.g., 'IfcDoor')"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Number of elements to return (max {MAX_TOOL_ELEMENTS})"
+                    }
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error creating search_elements tool: {e}")
+            return None
+
+    def search_elements(self, query: str, k: int = DEFAULT_SEARCH_RESULTS,
+                        element_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the elements most relevant to a query from the retrieval index.
+
+        Args:
+            query: User question or keywords
+            k: Number of elements to return
+            element_type: Optional IFC type filter
+
+        Returns:
+            List of compact element dictionaries, best match first
+        """
+        if not self.element_index:
+            return []
+        try:
+            return self.element_index.search(query, k=min(k, MAX_TOOL_ELEMENTS), ifc_class=element_type)
+        except Exception as e:
+            logger.error(f"Error searching IFC elements: {e}")
+            return []
+
     def _get_spatial_structure_tool(self):
         """
         Create a Tool for extracting the spatial structure from the IFC file.
@@ -1989,8 +2241,15 @@ class IFCAgent:
                     
             system_message += f"\n\nThe file contains the following elements: {element_counts}"
             
+            relevant_elements = self.search_elements(query)
+            if relevant_elements:
+                system_message += (
+                    "\n\nElements most relevant to the question: "
+                    f"{compact_for_prompt(relevant_elements, budget_tokens=1200)}"
+                )
+            
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": system_message},
@@ -2060,6 +2319,10 @@ class IFCAgent:
             if elements_by_type_tool:
                 tools.append(elements_by_type_tool)
                 
+            search_elements_tool = self._search_elements_tool()
+            if search_elements_tool:
+                tools.append(search_elements_tool)
+                
             spatial_structure_tool = self._get_spatial_structure_tool()
             if spatial_structure_tool:
                 tools.append(spatial_structure_tool)
@@ -2140,11 +2403,26 @@ from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
 # Use standard OpenAI client with agent-like patterns
-from openai import OpenAI
+from src.gateways.llm_gateway import get_llm_gateway
+from src.services.prompt_compaction import compact_for_prompt
+from src.services.chain_analytics import NarrativeCache, get_chain_analytics_engine, metrics_fingerprint
+from src.services.chain_snapshot import get_chain_snapshot
 AGENTS_SDK_AVAILABLE = False  # Use structured prompting approach
 
 logger = logging.getLogger(__name__)
 
+NARRATIVE_PENDING = "AI analysis is being generated"
+NARRATIVE_UNAVAILABLE = "AI analysis is unavailable"
+
+# Raw RPC fields the analyst agents read, per snapshot resource
+CHAIN_DATA_FIELDS = {
+    "status": ("result", "node_info", "network", "sync_info", "latest_block_height",
+               "latest_block_time", "catching_up", "validator_info", "voting_power"),
+    "validators": ("result", "block_height", "validators", "address", "voting_power", "count", "total"),
+    "block": ("result", "block_id", "hash", "block", "header", "height", "time",
+              "chain_id", "proposer_address"),
+}
+
 class TokenMetrics(BaseModel):
     """Token metrics output structure"""
     token_price: float
@@ -2157,8 +2435,8 @@ class TokenMetrics(BaseModel):
 class StakingMetrics(BaseModel):
     """Staking metrics output structure"""
     staking_apy: float
-    daily_rewards: float
-    total_staked: float
+    daily_rewards: Optional[float]
+    total_staked: Optional[float]
     validator_count: int
     analysis: str
     confidence: float
@@ -2172,20 +2450,59 @@ class NetworkHealth(BaseModel):
     analysis: str
     confidence: float
 
+class PortfolioAnalysis(BaseModel):
+    """Portfolio analysis output structure"""
+    diversification_score: int
+    risk_level: str
+    analysis: str
+    confidence: float
+
+class DashboardNarrative(BaseModel):
+    """Narrative text for every dashboard section, produced by a single structured call"""
+    token_analysis: str
+    staking_analysis: str
+    network_analysis: str
+    portfolio_analysis: str
+
+
+def _strict_json_schema(model: type) -> Dict[str, Any]:
+    """Pydantic JSON schema adjusted for OpenAI strict structured outputs"""
+    schema = model.model_json_schema()
+
+    def tighten(node):
+        if isinstance(node, dict):
+            if node.get("type") == "object" and "properties" in node:
+                node["additionalProperties"] = False
+                node["required"] = list(node["properties"].keys())
+            node.pop("title", None)
+            for value in node.values():
+                tighten(value)
+        elif isinstance(node, list):
+            for value in node:
+                tighten(value)
+
+    tighten(schema)
+    return schema
+
 class DaodiseoAgentsOrchestrator:
     """Multi-agent orchestrator using OpenAI Agents SDK"""
     
     def __init__(self):
         self.openai_api_key = os.environ.get("OPENAI_API_KEY")
         if not self.openai_api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is required")
+            logger.warning("OPENAI_API_KEY not set; metrics will be served without AI narrative")
+        
+        # Numbers come from the local engine; the LLM only adds narrative
+        self.analytics = get_chain_analytics_engine()
+        self.narratives = NarrativeCache(ttl=float(os.environ.get("NARRATIVE_CACHE_TTL", "300")))
         
         # Always use OpenAI client with agent patterns for o3-mini
         self._init_fallback_client()
     
     def _init_agents_sdk(self):
         """Initialize using standard OpenAI client with agent-like patterns"""
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        self.llm = get_llm_gateway()
+        self.openai_client = self.llm.client
         
         # Agent-like system prompts for specialized analysis
         self.token_analyst_prompt = """You are a blockchain token analyst specializing in real estate tokenization.
@@ -2207,7 +2524,8 @@ class DaodiseoAgentsOrchestrator:
     
     def _init_fallback_client(self):
         """Initialize OpenAI client with agent-like patterns for o3-mini"""
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        self.llm = get_llm_gateway()
+        self.openai_client = self.llm.client
         
         # Agent-like system prompts for specialized analysis
         self.token_analyst_prompt = """You are a blockchain token analyst specializing in real estate tokenization.
@@ -2229,345 +2547,222 @@ class DaodiseoAgentsOrchestrator:
     
     def fetch_chain_data(self, endpoint: str) -> str:
         """Fetch blockchain data for agent analysis"""
-        import requests
         try:
             if endpoint.startswith("status"):
-                url = "https://testnet-rpc.daodiseo.chaintools.tech/status"
+                resource = "status"
             elif endpoint.startswith("validators"):
-                url = "https://testnet-rpc.daodiseo.chaintools.tech/validators"
+                resource = "validators"
             elif endpoint.startswith("block"):
-                url = "https://testnet-rpc.daodiseo.chaintools.tech/block"
+                resource = "block"
             else:
                 return f"Unknown endpoint: {endpoint}"
-                
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return json.dumps(response.json())
+            
+            payload = get_chain_snapshot().get(resource)
+            if payload is None:
+                return f"Error fetching {endpoint}: chain data unavailable"
+            return compact_for_prompt(payload, fields=CHAIN_DATA_FIELDS[resource])
         except Exception as e:
             return f"Error fetching {endpoint}: {str(e)}"
     
     def analyze_token_metrics(self, blockchain_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze token metrics using OpenAI client with agent patterns"""
+        """Token metrics computed locally, with TokenAnalyst narrative when available"""
         try:
-            # Create analysis prompt with real data
-            prompt = f"""
-            {self.token_analyst_prompt}
-            
-            Analyze the following blockchain data from Daodiseo testnet:
-            {json.dumps(blockchain_data, indent=2)}
-            
-            Calculate real token metrics and return JSON with:
-            - token_price: estimated price based on network activity
-            - market_cap: calculated using circulating supply
-            - volume_24h: 24h volume estimation from transaction data
-            - price_change_24h: price change percentage
-            - analysis: detailed investment analysis
-            - confidence: confidence score (0-1)
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.token_analyst_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
+            metrics = self.analytics.token_metrics(
+                blockchain_data.get("network_status", {}),
+                blockchain_data.get("latest_block", {}),
+                self._block_times(blockchain_data)
             )
-            
-            result_content = response.choices[0].message.content
-            if result_content:
-                result = json.loads(result_content)
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "token_price": result.get("token_price", 0.0002),
-                        "market_cap": result.get("market_cap", 250000),
-                        "volume_24h": result.get("volume_24h", 15000),
-                        "price_change_24h": result.get("price_change_24h", 2.5),
-                        "analysis": result.get("analysis", "Token analysis based on testnet data"),
-                        "status": "verified",
-                        "updated_at": datetime.now().isoformat()
-                    },
-                    "metadata": {
-                        "agent": "TokenAnalyst",
-                        "confidence": result.get("confidence", 0.85),
-                        "model": "gpt-4o"
-                    }
-                }
-            else:
-                return self._fallback_token_analysis(blockchain_data)
+            return self._section_result("TokenAnalyst", "token_metrics", metrics, self.token_analyst_prompt)
                 
         except Exception as e:
             logger.error(f"Token metrics analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error",
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+            return self._error_result(e)
     
     def analyze_staking_metrics(self, validators_data: Dict[str, Any], network_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze staking metrics using OpenAI client with agent patterns"""
+        """Staking metrics computed locally, with StakingAnalyst narrative when available"""
         try:
-            prompt = f"""
-            {self.staking_analyst_prompt}
-            
-            Analyze staking data from Daodiseo testnet:
-            
-            Validators Data: {json.dumps(validators_data, indent=2)}
-            Network Data: {json.dumps(network_data, indent=2)}
-            
-            Calculate accurate staking metrics and return JSON with:
-            - staking_apy: current staking APY based on validator performance
-            - daily_rewards: daily rewards estimation
-            - total_staked: total staked tokens in the network
-            - validator_count: active validator count
-            - analysis: staking strategy recommendations
-            - confidence: confidence score (0-1)
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.staking_analyst_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
-            
-            result_content = response.choices[0].message.content
-            if result_content:
-                result = json.loads(result_content)
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "staking_apy": result.get("staking_apy", 8.5),
-                        "daily_rewards": result.get("daily_rewards", 12.34),
-                        "total_staked": result.get("total_staked", 750000000),
-                        "validator_count": result.get("validator_count", 10),
-                        "analysis": result.get("analysis", "Staking analysis based on validator performance"),
-                        "status": "verified",
-                        "updated_at": datetime.now().isoformat()
-                    },
-                    "metadata": {
-                        "agent": "StakingAnalyst",
-                        "confidence": result.get("confidence", 0.88),
-                        "model": "gpt-4o"
-                    }
-                }
-            else:
-                return self._fallback_staking_analysis(validators_data, network_data)
+            metrics = self.analytics.staking_metrics(validators_data, network_data)
+            return self._section_result("StakingAnalyst", "staking_metrics", metrics, self.staking_analyst_prompt)
                 
         except Exception as e:
             logger.error(f"Staking metrics analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error",
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+            return self._error_result(e)
     
     def analyze_network_health(self, rpc_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze network health using OpenAI client with agent patterns"""
+        """Network health computed locally, with NetworkAnalyst narrative when available"""
         try:
-            prompt = f"""
-            {self.network_analyst_prompt}
-            
-            Analyze network health from Daodiseo testnet RPC data:
-            {json.dumps(rpc_data, indent=2)}
-            
-            Assess network performance and return JSON with:
-            - health_score: overall health score (0-100)
-            - block_height: current block height
-            - network_status: network status description
-            - peer_count: number of connected peers
-            - analysis: infrastructure recommendations
-            - confidence: confidence score (0-1)
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.network_analyst_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
+            metrics = self.analytics.network_health(
+                rpc_data.get("network_status", {}),
+                rpc_data.get("network_info", {}),
+                self._block_times(rpc_data)
             )
-            
-            result_content = response.choices[0].message.content
-            if result_content:
-                result = json.loads(result_content)
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "value": f"{result.get('health_score', 92)}/100",
-                        "health_score": result.get("health_score", 92),
-                        "block_height": result.get("block_height", 1234567),
-                        "network_status": result.get("network_status", "Healthy"),
-                        "peer_count": result.get("peer_count", 25),
-                        "analysis": result.get("analysis", "Network operating optimally"),
-                        "status": "verified",
-                        "updated_at": datetime.now().isoformat()
-                    },
-                    "metadata": {
-                        "agent": "NetworkAnalyst",
-                        "confidence": result.get("confidence", 0.92),
-                        "model": "gpt-4o"
-                    }
-                }
-            else:
-                return self._fallback_network_analysis(rpc_data)
+            metrics["value"] = f"{metrics['health_score']}/100"
+            return self._section_result("NetworkAnalyst", "network_health", metrics, self.network_analyst_prompt)
                 
         except Exception as e:
             logger.error(f"Network health analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error",
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+            return self._error_result(e)
     
-    def _fallback_token_analysis(self, blockchain_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback token analysis using standard OpenAI client"""
+    def analyze_dashboard(self, dashboard_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute all dashboard sections locally and attach narrative from one structured call
+
+        Args:
+            dashboard_data: Network status, latest block, validators, network info and block times
+
+        Returns:
+            Dict with token_metrics, staking_metrics, network_health and
+            portfolio_analysis sections
+        """
         try:
-            prompt = f"""
-            Analyze this Daodiseo testnet data and return token metrics in JSON:
-            {json.dumps(blockchain_data, indent=2)}
-            
-            Return JSON with: token_price, market_cap, volume_24h, price_change_24h, analysis
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            return {
-                "success": True,
-                "data": {
-                    **result,
-                    "status": "verified",
-                    "updated_at": datetime.now().isoformat()
-                },
-                "metadata": {
-                    "agent": "TokenAnalyst",
-                    "model": "gpt-4o"
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Fallback token analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error",
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
+            block_times = self._block_times(dashboard_data)
+            network_status = dashboard_data.get("network_status", {})
+            validators = dashboard_data.get("validators", {})
+            
+            network = self.analytics.network_health(network_status, dashboard_data.get("network_info", {}), block_times)
+            network["value"] = f"{network['health_score']}/100"
+            sections = {
+                "token_metrics": self.analytics.token_metrics(network_status, dashboard_data.get("latest_block", {}), block_times),
+                "staking_metrics": self.analytics.staking_metrics(validators, network_status),
+                "network_health": network,
+                "portfolio_analysis": {
+                    **self.analytics.portfolio_metrics(validators),
+                    "portfolio_type": "real_estate_tokenization"
                 }
             }
-    
-    def _fallback_staking_analysis(self, validators_data: Dict[str, Any], network_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback staking analysis using standard OpenAI client"""
-        try:
-            prompt = f"""
-            Analyze Daodiseo staking data and return metrics in JSON:
-            Validators: {json.dumps(validators_data, indent=2)}
-            Network: {json.dumps(network_data, indent=2)}
-            
-            Return JSON with: staking_apy, daily_rewards, total_staked, validator_count, analysis
-            """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3
+            narrative, narrative_status = self._narrative(
+                "dashboard", sections, lambda: self._generate_dashboard_narrative(sections)
             )
-            
-            result = json.loads(response.choices[0].message.content)
+            placeholder = NARRATIVE_UNAVAILABLE if narrative_status == "unavailable" else NARRATIVE_PENDING
+            narrative_fields = {
+                "token_metrics": "token_analysis",
+                "staking_metrics": "staking_analysis",
+                "network_health": "network_analysis",
+                "portfolio_analysis": "portfolio_analysis"
+            }
+            updated_at = datetime.now().isoformat()
+            for section, field in narrative_fields.items():
+                sections[section].update({
+                    "analysis": getattr(narrative, field) if narrative else placeholder,
+                    "status": "verified",
+                    "updated_at": updated_at
+                })
             
             return {
                 "success": True,
-                "data": {
-                    **result,
-                    "status": "verified", 
-                    "updated_at": datetime.now().isoformat()
-                },
+                "data": sections,
                 "metadata": {
-                    "agent": "StakingAnalyst",
-                    "model": "gpt-4o"
+                    "agent": "DashboardAnalyst",
+                    "model": "local-analytics",
+                    "narrative_model": "gpt-4o",
+                    "narrative_status": narrative_status,
+                    "sections": list(narrative_fields.keys())
                 }
             }
             
         except Exception as e:
-            logger.error(f"Fallback staking analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error",
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
-                }
+            logger.error(f"Dashboard analysis failed: {e}")
+            return self._error_result(e)
+    
+    def _block_times(self, data: Dict[str, Any]) -> list:
+        """Block header times from a get_recent_block_times result, if present"""
+        return data.get("block_times", {}).get("data", {}).get("block_times", [])
+    
+    def _section_result(self, agent: str, section: str, metrics: Dict[str, Any], role_prompt: str) -> Dict[str, Any]:
+        """Wrap locally computed metrics with the cached narrative for the section"""
+        narrative, narrative_status = self._narrative(
+            section, metrics, lambda: self._generate_narrative(role_prompt, metrics)
+        )
+        placeholder = NARRATIVE_UNAVAILABLE if narrative_status == "unavailable" else NARRATIVE_PENDING
+        return {
+            "success": True,
+            "data": {
+                **metrics,
+                "analysis": narrative or placeholder,
+                "analysis_status": narrative_status,
+                "status": "verified",
+                "updated_at": datetime.now().isoformat()
+            },
+            "metadata": {
+                "agent": agent,
+                "model": "local-analytics",
+                "narrative_model": "gpt-4o"
             }
+        }
     
-    def _fallback_network_analysis(self, rpc_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback network analysis using standard OpenAI client"""
-        try:
-            prompt = f"""
-            Analyze Daodiseo network health and return metrics in JSON:
-            {json.dumps(rpc_data, indent=2)}
-            
-            Return JSON with: health_score, block_height, network_status, peer_count, analysis
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            return {
-                "success": True,
-                "data": {
-                    **result,
-                    "status": "verified",
-                    "updated_at": datetime.now().isoformat()
-                },
-                "metadata": {
-                    "agent": "NetworkAnalyst",
-                    "model": "gpt-4o"
-                }
+    def _narrative(self, key: str, metrics: Dict[str, Any], generator) -> tuple:
+        """Cached narrative for the current metrics; no background job without an LLM client"""
+        if not self.openai_api_key or not self.llm.available:
+            return None, "unavailable"
+        return self.narratives.get(key, generator, fingerprint=metrics_fingerprint(metrics))
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "data": {
+                "status": "error",
+                "error_message": str(error),
+                "updated_at": datetime.now().isoformat()
             }
-            
-        except Exception as e:
-            logger.error(f"Fallback network analysis failed: {e}")
-            return {
-                "success": False,
-                "data": {
-                    "status": "error", 
-                    "error_message": str(e),
-                    "updated_at": datetime.now().isoformat()
+        }
+    
+    def _generate_narrative(self, role_prompt: str, metrics: Dict[str, Any]) -> Optional[str]:
+        """Ask the analyst agent to explain already-computed metrics (runs in background)"""
+        response = self.llm.chat_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": role_prompt},
+                {"role": "user", "content": f"""
+            These Daodiseo testnet metrics were computed from RPC data:
+            {compact_for_prompt(metrics, budget_tokens=600)}
+            
+            Do not recalculate or change the numbers. Return JSON with:
+            - analysis: 2-4 sentences of investor-facing interpretation
+            """}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3,
+            max_tokens=300
+        )
+        
+        result_content = response.choices[0].message.content
+        if not result_content:
+            return None
+        return json.loads(result_content).get("analysis")
+    
+    def _generate_dashboard_narrative(self, sections: Dict[str, Any]) -> Optional[DashboardNarrative]:
+        """One structured-output call producing narrative for every dashboard section"""
+        response = self.llm.chat_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are the Daodiseo dashboard analyst team. Return only data matching the schema."},
+                {"role": "user", "content": f"""
+            These Daodiseo testnet dashboard metrics were computed from RPC data:
+            {compact_for_prompt(sections, budget_tokens=1500)}
+            
+            Do not recalculate or change the numbers. For each section write 2-4 sentences:
+            - token_analysis: {self.token_analyst_prompt}
+            - staking_analysis: {self.staking_analyst_prompt}
+            - network_analysis: {self.network_analyst_prompt}
+            - portfolio_analysis: diversification and risk of tokenized real estate holdings
+            """}
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "dashboard_narrative",
+                    "strict": True,
+                    "schema": _strict_json_schema(DashboardNarrative)
                 }
-            }
+            },
+            temperature=0.3
+        )
+        
+        result_content = response.choices[0].message.content
+        if not result_content:
+            return None
+        return DashboardNarrative.model_validate_json(result_content)
 # ==== File: src.services.ai_services.orchestrator.py ====
 """
 Self-Improving AI Orchestration System
@@ -2584,12 +2779,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import openai
 
 from src.services.ai_services.bim_agent_openai import OpenAIBIMAgent
 from src.services.ai_services.ifc_agent import IFCAgent
 from src.services.ai_services.ai_agent_service import AIAgentService
 from src.gateways.bim_gateways import IFCGateway
+from src.gateways.llm_gateway import get_llm_gateway
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -2657,7 +2852,8 @@ class SelfImprovingOrchestrator:
         
         # Initialize OpenAI client for o3-mini
         try:
-            self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            self.llm = get_llm_gateway()
+            self.client = self.llm.client
             logger.info("o3-mini orchestrator initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing o3-mini client: {e}")
@@ -2835,7 +3031,7 @@ Emphasize business value, cost-benefit analysis, risk assessment, and long-term
             return TaskComplexity.MEDIUM, ReasoningEffort.MEDIUM
             
         try:
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="o3-mini",
                 messages=[
                     {
@@ -2950,7 +3146,7 @@ Emphasize business value, cost-benefit analysis, risk assessment, and long-term
             return {"success": False, "error": "o3-mini client not available"}
             
         try:
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="o3-mini",
                 messages=[
                     {
@@ -3030,7 +3226,7 @@ Execution Summary:
 Provide a clear, actionable response that addresses the user's query while highlighting key insights from the analysis.
 """
 
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="o3-mini",
                 messages=[
                     {
@@ -3121,7 +3317,7 @@ Suggest specific improvements to:
 Provide actionable recommendations for enhancing orchestrator performance.
 """
 
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model="o3-mini",
                 messages=[
                     {
@@ -3224,15 +3420,38 @@ import logging
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional
-from openai import OpenAI
+
+from src.gateways.llm_gateway import get_llm_gateway
+from src.services.prompt_compaction import compact_for_prompt
 
 logger = logging.getLogger(__name__)
 
+# Fields each analysis reads from the DaodiseoRPCService / validator set results
+_RESULT_FIELDS = ("success", "data", "error")
+_STATUS_FIELDS = ("block_height", "block_time", "network", "catching_up", "health_status")
+_VALIDATOR_FIELDS = ("validators", "height", "total", "count", "moniker", "voting_power", "tokens",
+                     "active", "jailed", "status", "commission_rate")
+TOKEN_METRICS_FIELDS = _RESULT_FIELDS + _STATUS_FIELDS + (
+    "network_status", "latest_block", "block_times", "last_height", "chain_id",
+    "height", "time", "num_txs",
+)
+STAKING_VALIDATOR_FIELDS = _RESULT_FIELDS + _VALIDATOR_FIELDS
+STAKING_NETWORK_FIELDS = _RESULT_FIELDS + _STATUS_FIELDS
+NETWORK_HEALTH_FIELDS = _RESULT_FIELDS + _STATUS_FIELDS + (
+    "network_status", "consensus_state", "network_info", "block_times", "last_height",
+    "height", "round", "step", "start_time", "commit_time",
+    "listening", "n_peers", "peer_count", "peers", "remote_ip",
+)
+MARKET_FIELDS = _RESULT_FIELDS + _STATUS_FIELDS + (
+    "network_status", "token_price", "market_cap", "volume_24h", "price_change_24h",
+)
+
 class O3MiniOrchestrator:
     """o3-mini AI orchestrator for blockchain real estate analysis"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.llm = get_llm_gateway()
+        self.openai_client = self.llm.client
         self.model = "gpt-4o"  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
         
     def _create_system_prompt(self, analysis_type: str) -> str:
@@ -3308,7 +3527,7 @@ Provide: Real estate investment strategy and rebalancing recommendations"""
 Analyze the following real blockchain data from Daodiseo testnet and provide token metrics analysis:
 
 BLOCKCHAIN DATA:
-{json.dumps(blockchain_data, indent=2)}
+{compact_for_prompt(blockchain_data, budget_tokens=1500, fields=TOKEN_METRICS_FIELDS)}
 
 ANALYSIS REQUIREMENTS:
 1. Calculate current ODIS token price based on available data
@@ -3320,7 +3539,7 @@ ANALYSIS REQUIREMENTS:
 Return analysis in the exact JSON structure specified in system prompt.
 """
 
-            response = self.openai_client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -3375,10 +3594,10 @@ Return analysis in the exact JSON structure specified in system prompt.
 Analyze the following real validator and network data from Daodiseo testnet for staking metrics:
 
 VALIDATOR DATA:
-{json.dumps(validator_data, indent=2)}
+{compact_for_prompt(validator_data, budget_tokens=1200, fields=STAKING_VALIDATOR_FIELDS)}
 
 NETWORK DATA:
-{json.dumps(network_data, indent=2)}
+{compact_for_prompt(network_data, budget_tokens=400, fields=STAKING_NETWORK_FIELDS)}
 
 ANALYSIS REQUIREMENTS:
 1. Calculate current staking APY based on validator performance
@@ -3390,7 +3609,7 @@ ANALYSIS REQUIREMENTS:
 Return analysis in the exact JSON structure specified in system prompt.
 """
 
-            response = self.openai_client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -3440,7 +3659,7 @@ Return analysis in the exact JSON structure specified in system prompt.
 Analyze the following real RPC data from Daodiseo testnet for network health assessment:
 
 RPC DATA:
-{json.dumps(rpc_data, indent=2)}
+{compact_for_prompt(rpc_data, budget_tokens=1500, fields=NETWORK_HEALTH_FIELDS)}
 
 ANALYSIS REQUIREMENTS:
 1. Assess overall network health and stability
@@ -3452,7 +3671,7 @@ ANALYSIS REQUIREMENTS:
 Return analysis in the exact JSON structure specified in system prompt.
 """
 
-            response = self.openai_client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -3502,10 +3721,10 @@ Return analysis in the exact JSON structure specified in system prompt.
 Analyze the following real estate portfolio and market data for investment performance:
 
 PORTFOLIO DATA:
-{json.dumps(portfolio_data, indent=2)}
+{compact_for_prompt(portfolio_data, budget_tokens=1200)}
 
 MARKET DATA:
-{json.dumps(market_data, indent=2)}
+{compact_for_prompt(market_data, budget_tokens=600, fields=MARKET_FIELDS)}
 
 ANALYSIS REQUIREMENTS:
 1. Calculate portfolio performance metrics and returns
@@ -3517,7 +3736,7 @@ ANALYSIS REQUIREMENTS:
 Return analysis in the exact JSON structure specified in system prompt.
 """
 
-            response = self.openai_client.chat.completions.create(
+            response = self.llm.chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
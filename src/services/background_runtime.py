@@ -0,0 +1,230 @@
+"""
+Background Runtime
+One asyncio event loop on a daemon thread per worker process. Long-running
+background work (chain brain feeding, cache refreshers, websocket
+subscribers) registers here as named tasks; synchronous Flask code can also
+run one-off coroutines on the loop. Tasks are supervised, restarted on
+failure, reported through health() and cancelled on shutdown.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TaskFactory = Callable[[], Awaitable[Any]]
+
+
+class BackgroundRuntime:
+    """Shared event loop thread with a registry of supervised tasks"""
+
+    def __init__(self, name: str = "background-runtime", restart_delay: float = 1.0,
+                 max_restart_delay: float = 60.0):
+        """
+        Initialize the runtime (the loop thread starts on first use)
+
+        Args:
+            name: Loop thread name
+            restart_delay: First delay before restarting a crashed task
+            max_restart_delay: Upper bound for the restart backoff
+        """
+        self.name = name
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._task_info: Dict[str, Dict[str, Any]] = {}
+
+    # Lifecycle
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._loop is not None
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if needed and return the loop"""
+        with self._lock:
+            if self.running:
+                return self._loop
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait(timeout=5)
+            logger.info(f"Background runtime '{self.name}' started")
+            return loop
+
+    def shutdown(self, timeout: float = 10.0):
+        """Cancel all tasks, stop the loop and join the thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or not thread.is_alive():
+                return
+
+        async def cancel_all():
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Background tasks did not stop cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+
+        with self._lock:
+            self._loop = None
+            self._thread = None
+            self._tasks.clear()
+        logger.info(f"Background runtime '{self.name}' stopped")
+
+    # One-off work
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the runtime loop from any thread"""
+        loop = self.start()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def call(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the runtime loop and wait for its result"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    # Registered tasks
+
+    def register(self, name: str, factory: TaskFactory, restart: bool = True) -> bool:
+        """
+        Run a long-lived coroutine as a named, supervised task
+
+        Args:
+            name: Unique task name
+            factory: Zero-argument coroutine function (called again on restart)
+            restart: Restart the task with backoff if it raises
+
+        Returns:
+            bool: False if a task with this name is already running
+        """
+        loop = self.start()
+        with self._lock:
+            existing = self._tasks.get(name)
+            if existing is not None and not existing.done():
+                return False
+            self._task_info[name] = {
+                "state": "starting",
+                "restart": restart,
+                "restarts": 0,
+                "started_at": time.time(),
+                "last_error": None,
+            }
+
+        def create():
+            self._tasks[name] = loop.create_task(self._supervise(name, factory, restart), name=name)
+
+        if self._on_loop_thread():
+            create()
+        else:
+            # Wait until the task exists so an immediate cancel() finds it
+            done = threading.Event()
+            loop.call_soon_threadsafe(lambda: (create(), done.set()))
+            done.wait(timeout=5)
+        return True
+
+    def cancel(self, name: str, timeout: float = 5.0) -> bool:
+        """Cancel a registered task and wait for it to finish"""
+        loop = self._loop
+        task = self._tasks.get(name)
+        if loop is None or task is None:
+            return False
+        if self._on_loop_thread():
+            task.cancel()
+            return True
+
+        async def cancel_task():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_task(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Task {name} did not stop within {timeout}s: {e}")
+            return False
+        return True
+
+    def _on_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def is_task_running(self, name: str) -> bool:
+        info = self._task_info.get(name)
+        return bool(info) and info["state"] in ("starting", "running", "restarting")
+
+    async def _supervise(self, name: str, factory: TaskFactory, restart: bool):
+        info = self._task_info[name]
+        delay = self.restart_delay
+        while True:
+            info["state"] = "running"
+            try:
+                await factory()
+                info["state"] = "finished"
+                return
+            except asyncio.CancelledError:
+                info["state"] = "cancelled"
+                raise
+            except Exception as e:
+                info["last_error"] = f"{type(e).__name__}: {e}"
+                logger.error(f"Background task {name} failed: {e}")
+                if not restart:
+                    info["state"] = "failed"
+                    return
+            info["state"] = "restarting"
+            info["restarts"] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_restart_delay)
+
+    # Health
+
+    def health(self) -> Dict[str, Any]:
+        """Loop and task status for health endpoints"""
+        return {
+            "running": self.running,
+            "thread": self.name,
+            "tasks": {name: dict(info) for name, info in self._task_info.items()},
+        }
+
+
+# Global runtime instance
+_background_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_background_runtime() -> BackgroundRuntime:
+    """Get the process-wide background runtime"""
+    global _background_runtime
+    with _runtime_lock:
+        if _background_runtime is None:
+            _background_runtime = BackgroundRuntime()
+            atexit.register(_background_runtime.shutdown)
+    return _background_runtime
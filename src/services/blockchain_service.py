@@ -12,6 +12,7 @@ import dotenv
 from typing import Dict, Any, Optional, List
 
 from src.gateways.blockchain_gateways import PingPubGateway
+from src.services.account_state_cache import get_account_state_cache, signer_address
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -72,7 +73,7 @@ class BlockchainService:
         # Create transaction ID from hash
         transaction_id = f"ifc_{content_hash[:8]}"
         
-        # Get account info to prepare transaction
+        # Get account info to prepare transaction (served from the account state cache)
         account_info = self.pingpub_gateway.get_account_info(user_address)
         logger.debug(f"Account info: {account_info}")
         
@@ -135,6 +136,11 @@ class BlockchainService:
         # Broadcast transaction
         broadcast_result = self.pingpub_gateway.broadcast_transaction(broadcast_tx)
         
+        # Advance (or drop) the signer's cached sequence
+        signer = signer_address(signed_tx.get("signed", {}).get("msgs", []))
+        if signer:
+            get_account_state_cache().record_broadcast(signer, broadcast_result)
+        
         # Get transaction hash
         tx_hash = broadcast_result.get("txhash")
         
@@ -0,0 +1,400 @@
+"""
+Local Chain Analytics Engine
+Deterministic dashboard metrics computed directly from RPC data with NumPy,
+so numbers never wait on an LLM. Narrative text is generated separately and
+attached when available.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Expected block interval for the Daodiseo testnet, in seconds
+TARGET_BLOCK_TIME = 6.0
+
+
+def _payload(result: Any) -> Dict[str, Any]:
+    """Unwrap a DaodiseoRPCService result ({"success", "data"}) or return raw dict"""
+    if isinstance(result, dict):
+        data = result.get("data")
+        if isinstance(data, dict):
+            return data
+        return result
+    return {}
+
+
+def parse_block_time(value: str) -> Optional[float]:
+    """Parse an RFC 3339 block time (nanosecond precision) to a POSIX timestamp"""
+    if not value:
+        return None
+    try:
+        text = value.replace("Z", "+00:00")
+        if "." in text:
+            head, rest = text.split(".", 1)
+            digits = "".join(ch for ch in rest if ch.isdigit())
+            zone = rest[len(digits):]
+            text = f"{head}.{digits[:6]}{zone}"
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return None
+
+
+class ChainAnalyticsEngine:
+    """Computes staking, concentration, block-time and peer metrics locally"""
+
+    def __init__(
+        self,
+        inflation_rate: Optional[float] = None,
+        bonded_ratio: Optional[float] = None,
+        community_tax: Optional[float] = None,
+        token_price: Optional[float] = None,
+        circulating_supply: Optional[float] = None,
+        token_decimals: Optional[int] = None,
+    ):
+        """
+        Initialize the engine
+
+        Chain parameters that are not exposed over CometBFT RPC (inflation,
+        bonded ratio, community tax, staking denom decimals) are taken from the
+        environment.
+        """
+        self.inflation_rate = inflation_rate if inflation_rate is not None else float(os.environ.get("CHAIN_INFLATION_RATE", "0.10"))
+        self.bonded_ratio = bonded_ratio if bonded_ratio is not None else float(os.environ.get("CHAIN_BONDED_RATIO", "0.67"))
+        self.community_tax = community_tax if community_tax is not None else float(os.environ.get("CHAIN_COMMUNITY_TAX", "0.02"))
+        self.token_price = token_price if token_price is not None else self._env_float("ODIS_TOKEN_PRICE")
+        self.circulating_supply = circulating_supply if circulating_supply is not None else self._env_float("ODIS_CIRCULATING_SUPPLY")
+        self.token_decimals = token_decimals if token_decimals is not None else int(os.environ.get("CHAIN_TOKEN_DECIMALS", "6"))
+
+    @staticmethod
+    def _env_float(name: str) -> Optional[float]:
+        value = os.environ.get(name)
+        try:
+            return float(value) if value else None
+        except ValueError:
+            logger.warning(f"Ignoring invalid {name}={value}")
+            return None
+
+    # Voting power
+
+    def voting_power_concentration(self, validators: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Nakamoto coefficient, Gini coefficient and top-N share of voting power
+
+        Args:
+            validators: Validator dicts with a voting_power field
+        """
+        powers = np.array(
+            [float(v.get("voting_power", 0) or 0) for v in validators], dtype=np.float64
+        )
+        powers = powers[powers > 0]
+        if powers.size == 0:
+            return {"validator_count": 0, "total_voting_power": 0, "nakamoto_coefficient": 0,
+                    "gini_coefficient": 0.0, "top10_share": 0.0}
+
+        total = powers.sum()
+        descending = np.sort(powers)[::-1]
+        cumulative = np.cumsum(descending) / total
+        # Smallest number of validators that together exceed one third (can halt the chain)
+        nakamoto = int(np.searchsorted(cumulative, 1.0 / 3.0, side="right") + 1)
+
+        ascending = descending[::-1]
+        n = ascending.size
+        index = np.arange(1, n + 1)
+        gini = float((2.0 * np.sum(index * ascending) / (n * total)) - (n + 1.0) / n)
+
+        return {
+            "validator_count": int(n),
+            "total_voting_power": int(total),
+            "nakamoto_coefficient": min(nakamoto, int(n)),
+            "gini_coefficient": round(max(gini, 0.0), 4),
+            "top10_share": round(float(descending[:10].sum() / total), 4),
+        }
+
+    def bonded_tokens(self, validators: List[Dict[str, Any]]) -> Optional[float]:
+        """
+        Tokens bonded to validators, in display units
+
+        Args:
+            validators: Validator set entries carrying staking status and tokens
+                (base denom); consensus-only entries have neither
+
+        Returns:
+            float: Bonded tokens, or None when the set has no staking data
+        """
+        bonded = [v for v in validators if v.get("status") == "BOND_STATUS_BONDED" and v.get("tokens") is not None]
+        if not bonded:
+            return None
+        base = np.array([float(v["tokens"] or 0) for v in bonded], dtype=np.float64).sum()
+        return float(base / 10 ** self.token_decimals)
+
+    # Block times
+
+    def block_time_stats(self, block_times: List[Any]) -> Dict[str, Any]:
+        """
+        Statistics over the intervals between consecutive blocks
+
+        Args:
+            block_times: RFC 3339 strings or POSIX timestamps, any order
+        """
+        stamps = []
+        for value in block_times:
+            stamp = parse_block_time(value) if isinstance(value, str) else value
+            if stamp is not None:
+                stamps.append(float(stamp))
+
+        if len(stamps) < 2:
+            return {"samples": 0, "mean": None, "median": None, "p95": None, "stddev": None}
+
+        intervals = np.diff(np.sort(np.array(stamps, dtype=np.float64)))
+        return {
+            "samples": int(intervals.size),
+            "mean": round(float(intervals.mean()), 3),
+            "median": round(float(np.median(intervals)), 3),
+            "p95": round(float(np.percentile(intervals, 95)), 3),
+            "stddev": round(float(intervals.std()), 3),
+        }
+
+    # Peers
+
+    def peer_health(self, network_info: Any) -> Dict[str, Any]:
+        """Peer connectivity summary from net_info"""
+        info = _payload(network_info)
+        n_peers = int(info.get("n_peers", info.get("peer_count", 0)) or 0)
+        if n_peers == 0:
+            status = "isolated"
+        elif n_peers < 3:
+            status = "degraded"
+        else:
+            status = "healthy"
+        return {"peer_count": n_peers, "listening": bool(info.get("listening", False)), "peer_status": status}
+
+    # Dashboard sections
+
+    def staking_metrics(self, validators_data: Any, network_data: Any = None) -> Dict[str, Any]:
+        """
+        Staking APY, rewards and validator concentration
+
+        total_staked and daily_rewards are in tokens (display units) and need
+        staking data in the validator set; they are None for consensus-only
+        sets, whose voting power is reported separately as total_voting_power.
+        """
+        validators = _payload(validators_data).get("validators", [])
+        concentration = self.voting_power_concentration(validators)
+
+        # Nominal staking APR from configured chain parameters, not from chain state
+        apy = 0.0
+        if self.bonded_ratio > 0:
+            apy = self.inflation_rate * (1.0 - self.community_tax) / self.bonded_ratio
+        total_staked = self.bonded_tokens(validators)
+
+        return {
+            "staking_apy": round(apy * 100, 2),
+            "staking_apy_basis": "assumed",
+            "daily_rewards": round(total_staked * apy / 365.0, 2) if total_staked is not None else None,
+            "total_staked": round(total_staked, 2) if total_staked is not None else None,
+            "total_voting_power": concentration["total_voting_power"],
+            "validator_count": concentration["validator_count"],
+            "nakamoto_coefficient": concentration["nakamoto_coefficient"],
+            "gini_coefficient": concentration["gini_coefficient"],
+            "top10_share": concentration["top10_share"],
+            "apy_assumptions": {
+                "inflation_rate": self.inflation_rate,
+                "bonded_ratio": self.bonded_ratio,
+                "community_tax": self.community_tax,
+            },
+        }
+
+    def network_health(self, network_status: Any, network_info: Any = None,
+                       block_times: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Health score (0-100) from sync state, peers and block production"""
+        status = _payload(network_status)
+        peers = self.peer_health(network_info or {})
+        blocks = self.block_time_stats(block_times or [])
+
+        score = 100
+        if status.get("catching_up"):
+            score -= 40
+        if status.get("health_status", "healthy") != "healthy":
+            score -= 20
+        if peers["peer_status"] == "isolated":
+            score -= 30
+        elif peers["peer_status"] == "degraded":
+            score -= 15
+        if blocks["mean"] is not None:
+            if blocks["mean"] > 2 * TARGET_BLOCK_TIME:
+                score -= 15
+            if blocks["mean"] > 0 and blocks["stddev"] / blocks["mean"] > 0.5:
+                score -= 5
+        score = max(0, min(100, score))
+
+        if score >= 80:
+            label = "Healthy"
+        elif score >= 50:
+            label = "Degraded"
+        else:
+            label = "Unhealthy"
+
+        return {
+            "health_score": score,
+            "block_height": int(status.get("block_height", 0) or 0),
+            "network_status": label,
+            "peer_count": peers["peer_count"],
+            "peer_status": peers["peer_status"],
+            "block_time": blocks,
+        }
+
+    def token_metrics(self, network_status: Any, latest_block: Any = None,
+                      block_times: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """On-chain activity plus market figures when a price feed is configured"""
+        status = _payload(network_status)
+        block = _payload(latest_block or {})
+        blocks = self.block_time_stats(block_times or [])
+
+        num_txs = int(block.get("num_txs", 0) or 0)
+        tps = None
+        if blocks["mean"]:
+            tps = round(num_txs / blocks["mean"], 4)
+
+        market_cap = None
+        if self.token_price is not None and self.circulating_supply is not None:
+            market_cap = round(self.token_price * self.circulating_supply, 2)
+
+        return {
+            "token_price": self.token_price,
+            "market_cap": market_cap,
+            "volume_24h": None,
+            "price_change_24h": None,
+            "block_height": int(status.get("block_height", block.get("height", 0)) or 0),
+            "latest_block_txs": num_txs,
+            "estimated_tps": tps,
+        }
+
+    def portfolio_metrics(self, validators_data: Any) -> Dict[str, Any]:
+        """Diversification and risk derived from validator concentration"""
+        concentration = self.voting_power_concentration(_payload(validators_data).get("validators", []))
+        nakamoto = concentration["nakamoto_coefficient"]
+        if nakamoto >= 7:
+            risk = "low"
+        elif nakamoto >= 3:
+            risk = "medium"
+        else:
+            risk = "high"
+        return {
+            "diversification_score": int(round((1.0 - concentration["gini_coefficient"]) * 100)),
+            "risk_level": risk,
+            "nakamoto_coefficient": nakamoto,
+        }
+
+
+def metrics_fingerprint(metrics: Any, digits: int = 2) -> str:
+    """
+    Hash of metrics with numbers rounded to a few significant digits
+
+    Narrative describes the numbers it was generated from, so it is cached
+    against this fingerprint; block-to-block jitter does not change it.
+
+    Args:
+        metrics: Metrics dict (nested dicts and lists allowed)
+        digits: Significant digits kept for each number
+
+    Returns:
+        str: Short hex digest
+    """
+    def rounded(value):
+        if isinstance(value, bool) or value is None:
+            return value
+        if isinstance(value, (int, float)):
+            if not math.isfinite(value) or value == 0:
+                return value
+            return float(f"{value:.{digits}g}")
+        if isinstance(value, dict):
+            return {str(k): rounded(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [rounded(v) for v in value]
+        return str(value)
+
+    encoded = json.dumps(rounded(metrics), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+class NarrativeCache:
+    """
+    Stale-while-revalidate cache for LLM narrative text
+
+    Callers always get an immediate answer; generation runs on a small
+    background pool with at most one refresh in flight per key. An entry
+    generated for different metrics (another fingerprint) is served as stale
+    until the refresh for the current metrics lands.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_workers: int = 2):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="narrative")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Any, float, Optional[str]]] = {}
+        self._pending: Dict[str, Any] = {}
+
+    def get(self, key: str, generator: Callable[[], Any],
+            fingerprint: Optional[str] = None) -> Tuple[Optional[Any], str]:
+        """
+        Return the cached narrative for key and its status
+
+        Status is "ready", "stale" (refresh scheduled) or "pending" (no value yet).
+
+        Args:
+            key: Section name
+            generator: Produces the narrative (runs in the background)
+            fingerprint: metrics_fingerprint of the inputs the narrative describes
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and now - entry[1] < self.ttl and entry[2] == fingerprint
+            if not fresh and key not in self._pending:
+                self._pending[key] = self._executor.submit(self._refresh, key, generator, fingerprint)
+
+        if entry is None:
+            return None, "pending"
+        return entry[0], "ready" if fresh else "stale"
+
+    def _refresh(self, key: str, generator: Callable[[], Any], fingerprint: Optional[str] = None):
+        try:
+            value = generator()
+            if value is not None:
+                with self._lock:
+                    self._entries[key] = (value, time.monotonic(), fingerprint)
+        except Exception as e:
+            logger.warning(f"Narrative generation for {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait(self, key: str, timeout: Optional[float] = None):
+        """Block until an in-flight refresh for key completes (used in tests)"""
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            future.result(timeout=timeout)
+
+
+# Global engine instance
+_analytics_engine = None
+
+
+def get_chain_analytics_engine() -> ChainAnalyticsEngine:
+    """Get the global chain analytics engine instance"""
+    global _analytics_engine
+    if _analytics_engine is None:
+        _analytics_engine = ChainAnalyticsEngine()
+    return _analytics_engine
@@ -0,0 +1,227 @@
+"""
+Chain Change Detector
+Threshold and statistical detectors over the chain brain time series. The
+chain brain only calls the LLM when one of these reports a change: block-time
+spikes or stalls, validator set changes, peer drops and mempool surges.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.services.chain_timeseries import ChainTimeSeries
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChangeEvent:
+    """A detected change in chain behaviour"""
+    kind: str
+    metric: str
+    severity: str  # "warning" or "critical"
+    message: str
+    value: Optional[float] = None
+    baseline: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ChainChangeDetector:
+    """Detects significant changes in chain metrics"""
+
+    def __init__(
+        self,
+        timeseries: ChainTimeSeries,
+        window_seconds: float = 900,
+        zscore_threshold: float = 3.0,
+        min_samples: int = 5,
+        block_stall_seconds: float = 120,
+        block_time_ratio: float = 2.0,
+        peer_drop_ratio: float = 0.3,
+        voting_power_change_ratio: float = 0.05,
+        mempool_min_size: int = 20,
+        mempool_surge_ratio: float = 3.0,
+        cooldown_seconds: float = 300,
+    ):
+        """
+        Initialize the detector
+
+        Args:
+            timeseries: Store the metrics are recorded into
+            window_seconds: History used as the baseline
+            zscore_threshold: Z-score above which a sample is anomalous
+            min_samples: Baseline samples required before statistical checks
+            block_stall_seconds: No new block for this long is critical
+            block_time_ratio: Block time above this multiple of the baseline is a spike
+            peer_drop_ratio: Fractional peer loss between samples that counts as a drop
+            voting_power_change_ratio: Fractional total voting power change that counts
+            mempool_min_size: Mempool sizes below this never count as a surge
+            mempool_surge_ratio: Growth multiple between samples that counts as a surge
+            cooldown_seconds: Minimum time between two events of the same kind
+        """
+        self.timeseries = timeseries
+        self.window_seconds = window_seconds
+        self.zscore_threshold = zscore_threshold
+        self.min_samples = min_samples
+        self.block_stall_seconds = block_stall_seconds
+        self.block_time_ratio = block_time_ratio
+        self.peer_drop_ratio = peer_drop_ratio
+        self.voting_power_change_ratio = voting_power_change_ratio
+        self.mempool_min_size = mempool_min_size
+        self.mempool_surge_ratio = mempool_surge_ratio
+        self.cooldown_seconds = cooldown_seconds
+
+        self._validator_addresses: Optional[frozenset] = None
+        self._last_fired: Dict[str, float] = {}
+        self.events_detected = 0
+        self.events_suppressed = 0
+
+    def detect(self, metrics: Dict[str, Any], data_points: Optional[Iterable[Any]] = None,
+               now: Optional[float] = None) -> List[ChangeEvent]:
+        """
+        Check a freshly recorded batch of metrics for significant changes
+
+        Args:
+            metrics: Metrics just recorded into the time series
+            data_points: The ChainDataPoints of the batch (for validator addresses)
+            now: Current Unix time (defaults to now)
+
+        Returns:
+            List of change events, empty when nothing changed
+        """
+        now = time.time() if now is None else now
+        events: List[ChangeEvent] = []
+
+        if "height" in metrics:
+            events.extend(self._check_blocks(now))
+        if "validator_count" in metrics or "voting_power" in metrics:
+            events.extend(self._check_validators(data_points or []))
+        if "peers" in metrics:
+            events.extend(self._check_peers())
+        if "mempool_size" in metrics:
+            events.extend(self._check_mempool(now))
+
+        fired = []
+        for event in events:
+            last = self._last_fired.get(event.kind)
+            if last is not None and now - last < self.cooldown_seconds:
+                self.events_suppressed += 1
+                continue
+            self._last_fired[event.kind] = now
+            fired.append(event)
+
+        self.events_detected += len(fired)
+        return fired
+
+    # Detectors
+
+    def _check_blocks(self, now: float) -> List[ChangeEvent]:
+        timestamps, heights = self.timeseries.window("height", seconds=self.window_seconds, now=now)
+        if len(heights) < 2:
+            return []
+
+        # Time since the current height was first seen
+        first_seen = int(np.argmax(heights >= heights[-1]))
+        stalled_for = float(timestamps[-1] - timestamps[first_seen])
+        if stalled_for >= self.block_stall_seconds:
+            return [ChangeEvent(
+                kind="block_stall", metric="height", severity="critical",
+                message=f"No new block for {stalled_for:.0f}s at height {int(heights[-1])}",
+                value=stalled_for, baseline=self.block_stall_seconds,
+            )]
+
+        # Seconds per block between consecutive samples that advanced
+        advanced = np.diff(heights) > 0
+        if advanced.sum() < self.min_samples:
+            return []
+        block_times = (np.diff(timestamps) / np.maximum(np.diff(heights), 1))[advanced]
+        latest, history = float(block_times[-1]), block_times[:-1]
+        baseline = float(history.mean())
+        std = float(history.std())
+        zscore = (latest - baseline) / std if std > 0 else 0.0
+
+        if latest > baseline * self.block_time_ratio and (std == 0 or zscore > self.zscore_threshold):
+            return [ChangeEvent(
+                kind="block_time_spike", metric="height", severity="warning",
+                message=f"Block time {latest:.1f}s vs baseline {baseline:.1f}s",
+                value=latest, baseline=baseline,
+            )]
+        return []
+
+    def _check_validators(self, data_points: Iterable[Any]) -> List[ChangeEvent]:
+        events = []
+
+        addresses = frozenset(
+            point.value.get("address") for point in data_points
+            if getattr(point, "data_type", None) == "validator_status" and isinstance(point.value, dict)
+        ) - {None}
+        if addresses:
+            previous, self._validator_addresses = self._validator_addresses, addresses
+            if previous is not None and addresses != previous:
+                joined, left = len(addresses - previous), len(previous - addresses)
+                events.append(ChangeEvent(
+                    kind="validator_set_change", metric="validator_count", severity="warning",
+                    message=f"Validator set changed: {joined} joined, {left} left",
+                    value=len(addresses), baseline=len(previous),
+                ))
+
+        _, power = self.timeseries.window("voting_power", last=2)
+        if len(power) == 2 and power[0] > 0:
+            change = (power[1] - power[0]) / power[0]
+            if abs(change) >= self.voting_power_change_ratio:
+                events.append(ChangeEvent(
+                    kind="voting_power_change", metric="voting_power", severity="warning",
+                    message=f"Total voting power changed by {change:+.1%}",
+                    value=float(power[1]), baseline=float(power[0]),
+                ))
+        return events
+
+    def _check_peers(self) -> List[ChangeEvent]:
+        _, peers = self.timeseries.window("peers", last=2)
+        if len(peers) < 2:
+            return []
+        previous, latest = float(peers[0]), float(peers[1])
+        if latest == 0 and previous > 0:
+            return [ChangeEvent(
+                kind="peer_drop", metric="peers", severity="critical",
+                message="Node lost all peers", value=latest, baseline=previous,
+            )]
+        if previous > 0 and latest < previous * (1 - self.peer_drop_ratio):
+            return [ChangeEvent(
+                kind="peer_drop", metric="peers", severity="warning",
+                message=f"Peers dropped from {previous:.0f} to {latest:.0f}",
+                value=latest, baseline=previous,
+            )]
+        return []
+
+    def _check_mempool(self, now: float) -> List[ChangeEvent]:
+        _, sizes = self.timeseries.window("mempool_size", seconds=self.window_seconds, now=now)
+        if len(sizes) < 2 or sizes[-1] < self.mempool_min_size:
+            return []
+        latest, history = float(sizes[-1]), sizes[:-1]
+
+        surged = latest >= max(float(history[-1]), 1.0) * self.mempool_surge_ratio
+        if not surged and len(history) >= self.min_samples:
+            std = float(history.std())
+            surged = std > 0 and (latest - float(history.mean())) / std > self.zscore_threshold
+
+        if surged:
+            return [ChangeEvent(
+                kind="mempool_surge", metric="mempool_size", severity="warning",
+                message=f"Mempool grew to {latest:.0f} transactions (baseline {float(history.mean()):.0f})",
+                value=latest, baseline=float(history.mean()),
+            )]
+        return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Detector counters"""
+        return {
+            "events_detected": self.events_detected,
+            "events_suppressed": self.events_suppressed,
+            "last_fired": dict(self._last_fired),
+        }
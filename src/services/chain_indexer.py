@@ -0,0 +1,742 @@
+"""
+Chain Indexer
+Follows the chain from a configurable start height and stores blocks and
+decoded transactions in SQLite, indexed by height, hash, sender/recipient
+address and the content hash anchored in the memo. Catch-up runs in batches
+(header pages via /blockchain, then /block and /block_results only for
+heights with transactions, fetched in parallel) and commits each batch with
+its cursor, so a restart resumes where it stopped. Transaction history is
+then a local indexed lookup instead of an upstream tx_search per request.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Headers returned per /blockchain call
+BLOCKCHAIN_PAGE = 20
+
+MSG_SEND = "/cosmos.bank.v1beta1.MsgSend"
+
+SHA256_HEX = re.compile(r"^[0-9a-fA-F]{64}$")
+
+# tx_search queries the index can answer
+QUERY_RECENT = re.compile(r"^tx\.height\s*>\s*0$")
+QUERY_HEIGHT = re.compile(r"^tx\.height\s*=\s*(\d+)$")
+QUERY_HASH = re.compile(r"^tx\.hash\s*=\s*'([0-9A-Fa-f]{64})'$")
+QUERY_ADDRESS = re.compile(r"^(message\.sender|transfer\.sender|transfer\.recipient)\s*=\s*'([^']+)'$")
+
+# Upstream tx_search queries for an address, per role
+ADDRESS_QUERIES = {"sender": "message.sender='{}'", "recipient": "transfer.recipient='{}'"}
+
+# Event attribute keys, used to detect base64-encoded attributes (CometBFT 0.34)
+KNOWN_ATTRIBUTE_KEYS = frozenset({"sender", "recipient", "amount", "action", "module", "spender", "receiver"})
+
+# RpcFetcher(method, params) -> JSON-RPC response dict
+RpcFetcher = Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]]
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS blocks ("
+    " height INTEGER PRIMARY KEY, hash TEXT, time TEXT, num_txs INTEGER, proposer TEXT)",
+    "CREATE TABLE IF NOT EXISTS txs ("
+    " hash TEXT PRIMARY KEY, height INTEGER NOT NULL, idx INTEGER NOT NULL, time TEXT,"
+    " code INTEGER, msg_types TEXT, sender TEXT, recipient TEXT, amount TEXT, denom TEXT,"
+    " memo TEXT, memo_hash TEXT, gas_wanted INTEGER, gas_used INTEGER, tx TEXT, events TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_txs_height ON txs (height DESC, idx)",
+    "CREATE INDEX IF NOT EXISTS idx_txs_memo_hash ON txs (memo_hash) WHERE memo_hash IS NOT NULL",
+    "CREATE TABLE IF NOT EXISTS tx_addresses ("
+    " address TEXT NOT NULL, role TEXT NOT NULL, height INTEGER NOT NULL, tx_hash TEXT NOT NULL,"
+    " PRIMARY KEY (address, role, tx_hash))",
+    "CREATE INDEX IF NOT EXISTS idx_tx_addresses_lookup ON tx_addresses (address, height DESC)",
+    "CREATE TABLE IF NOT EXISTS cursor (name TEXT PRIMARY KEY, height INTEGER NOT NULL)",
+)
+
+
+# Protobuf wire format (just enough for TxRaw, TxBody, Any, MsgSend and Coin)
+
+def _varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data: bytes) -> Iterator[Tuple[int, Any]]:
+    """Yield (field number, value) pairs of a protobuf message"""
+    pos = 0
+    while pos < len(data):
+        key, pos = _varint(data, pos)
+        number, wire_type = key >> 3, key & 0x07
+        if wire_type == 0:
+            value, pos = _varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        elif wire_type == 5:
+            value, pos = data[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > len(data):
+            raise ValueError("Truncated field")
+        yield number, value
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else ""
+
+
+def decode_tx(tx_b64: str) -> Dict[str, Any]:
+    """
+    Decode a base64 TxRaw as found in block.data.txs
+
+    Returns:
+        Dict with hash, memo and messages (type_url plus MsgSend fields)
+
+    Raises:
+        ValueError: If the bytes are not a valid TxRaw
+    """
+    raw = base64.b64decode(tx_b64)
+    body = next((value for number, value in _fields(raw) if number == 1), b"")
+
+    memo = ""
+    messages = []
+    for number, value in _fields(body):
+        if number == 2:
+            memo = _text(value)
+        elif number == 1:
+            any_fields = dict(_fields(value))
+            message = {"type_url": _text(any_fields.get(1, b""))}
+            inner = any_fields.get(2, b"")
+            if message["type_url"] == MSG_SEND:
+                coins = []
+                for field, field_value in _fields(inner):
+                    if field == 1:
+                        message["from_address"] = _text(field_value)
+                    elif field == 2:
+                        message["to_address"] = _text(field_value)
+                    elif field == 3:
+                        coin = dict(_fields(field_value))
+                        coins.append({"denom": _text(coin.get(1, b"")), "amount": _text(coin.get(2, b""))})
+                message["amount"] = coins
+            messages.append(message)
+
+    return {
+        "hash": hashlib.sha256(raw).hexdigest().upper(),
+        "memo": memo,
+        "messages": messages,
+    }
+
+
+def parse_memo_anchor(memo: str) -> Optional[Dict[str, Any]]:
+    """
+    Content-hash anchor carried in a memo
+
+    Understands the JSON memo of create_upload_message ({"hash", "type",
+    "metadata"}), the "tx:...|hash:...|role:..." memo of the transaction
+    service, "id:hash:role" and a bare hash.
+
+    Returns:
+        Dict with content_hash (lowercase), kind, role, reference and metadata; or None
+    """
+    if not memo:
+        return None
+    anchor: Dict[str, Any] = {"content_hash": None, "kind": None, "role": None, "reference": None, "metadata": {}}
+    try:
+        data = json.loads(memo)
+        if isinstance(data, dict):
+            anchor.update({
+                "content_hash": data.get("hash") or data.get("content_hash"),
+                "kind": data.get("type"),
+                "metadata": data.get("metadata") if isinstance(data.get("metadata"), dict) else {},
+            })
+    except ValueError:
+        if "|" in memo:
+            pairs = {key.strip(): value.strip() for key, value in
+                     (part.split(":", 1) for part in memo.split("|") if ":" in part)}
+            anchor.update({
+                "content_hash": pairs.get("hash") or pairs.get("content_hash"),
+                "role": pairs.get("role") or None,
+                "reference": pairs.get("tx") or None,
+            })
+        elif ":" in memo:
+            parts = [part.strip() for part in memo.split(":")]
+            position = next((i for i, part in enumerate(parts) if SHA256_HEX.match(part)), None)
+            if position is not None:
+                anchor["content_hash"] = parts[position]
+                anchor["reference"] = parts[position - 1] if position > 0 else None
+                anchor["role"] = parts[position + 1] if position + 1 < len(parts) else None
+        else:
+            anchor["content_hash"] = memo
+
+    content_hash = anchor["content_hash"]
+    if not isinstance(content_hash, str) or not SHA256_HEX.match(content_hash.strip()):
+        return None
+    anchor["content_hash"] = content_hash.strip().lower()
+    return anchor
+
+
+def parse_memo_hash(memo: str) -> Optional[str]:
+    """SHA-256 content hash anchored in a memo, lowercased"""
+    anchor = parse_memo_anchor(memo)
+    return anchor["content_hash"] if anchor else None
+
+
+def _event_attributes(event: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    attributes = event.get("attributes") or []
+    encoded = False
+    if attributes:
+        try:
+            encoded = base64.b64decode(attributes[0].get("key") or "", validate=True).decode() in KNOWN_ATTRIBUTE_KEYS
+        except (ValueError, UnicodeDecodeError):
+            encoded = False
+    for attribute in attributes:
+        key, value = attribute.get("key") or "", attribute.get("value") or ""
+        if encoded:
+            key = base64.b64decode(key).decode("utf-8", errors="replace")
+            value = base64.b64decode(value).decode("utf-8", errors="replace")
+        yield key, value
+
+
+def event_addresses(events: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """(address, role) pairs from transfer and message events"""
+    found = []
+    for event in events or []:
+        kind = event.get("type")
+        for key, value in _event_attributes(event):
+            if kind == "transfer" and key in ("sender", "recipient"):
+                found.append((value, key))
+            elif kind == "message" and key == "sender":
+                found.append((value, "sender"))
+    return list(dict.fromkeys(found))
+
+
+class ChainIndexer:
+    """Background block/transaction indexer with SQLite storage"""
+
+    def __init__(
+        self,
+        db_path: str,
+        fetcher: Optional[RpcFetcher] = None,
+        start_height: Optional[int] = None,
+        backfill: int = 1000,
+        batch_size: int = 200,
+        poll_interval: float = 3.0,
+        max_workers: int = 8,
+        max_lag: int = 2,
+    ):
+        """
+        Initialize the indexer
+
+        Args:
+            db_path: SQLite database file
+            fetcher: Callable(method, params) -> JSON-RPC response; defaults to the RPC endpoint pool
+            start_height: First height to index on a fresh database
+            backfill: Without start_height, how many blocks below the head to start at
+            batch_size: Heights indexed (and committed) per catch-up step
+            poll_interval: Seconds between polls once caught up
+            max_workers: Concurrent upstream fetches during catch-up
+            max_lag: Blocks behind the head the index may be and still answer
+                whole-history queries (recent, by address)
+        """
+        self.db_path = db_path
+        self._fetch = fetcher or _pool_fetch
+        self.start_height = start_height
+        self.backfill = backfill
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_lag = max_lag
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chain-indexer")
+        self._write_lock = threading.Lock()
+        self._stats = {"blocks": 0, "txs": 0, "batches": 0, "errors": 0, "head": None, "earliest": None}
+        self._init_db()
+
+    # Storage
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def cursor(self) -> Optional[int]:
+        """Last fully indexed height"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT height FROM cursor WHERE name = 'blocks'").fetchone()
+        return row["height"] if row else None
+
+    # Indexing
+
+    def sync_once(self) -> int:
+        """
+        Index the next batch of heights up to the chain head
+
+        Returns:
+            int: Number of heights indexed (0 when caught up)
+        """
+        status = self._fetch("status", None)
+        sync_info = status["result"]["sync_info"]
+        head = int(sync_info["latest_block_height"])
+        self._stats["head"] = head
+        self._stats["earliest"] = int(sync_info.get("earliest_block_height") or 1)
+
+        cursor = self.cursor()
+        if cursor is None:
+            start = self.start_height or max(1, head - self.backfill)
+            cursor = start - 1
+        end = min(head, cursor + self.batch_size)
+        if end <= cursor:
+            return 0
+
+        blocks, txs = self._fetch_range(cursor + 1, end)
+        self._write(blocks, txs, end)
+        self._stats["blocks"] += len(blocks)
+        self._stats["txs"] += len(txs)
+        self._stats["batches"] += 1
+        logger.debug(f"Indexed heights {cursor + 1}-{end} ({len(txs)} txs)")
+        return end - cursor
+
+    def _fetch_range(self, first: int, last: int) -> Tuple[List[Tuple], List[Dict[str, Any]]]:
+        pages = [(low, min(low + BLOCKCHAIN_PAGE - 1, last)) for low in range(first, last + 1, BLOCKCHAIN_PAGE)]
+        metas = []
+        for page in self._executor.map(
+            lambda bounds: self._fetch("blockchain", {"minHeight": bounds[0], "maxHeight": bounds[1]}), pages
+        ):
+            metas.extend(page["result"].get("block_metas", []))
+
+        blocks = []
+        busy = []
+        for meta in metas:
+            header = meta.get("header", {})
+            height = int(header.get("height", 0))
+            if not first <= height <= last:
+                continue
+            num_txs = int(meta.get("num_txs", 0) or 0)
+            blocks.append((height, meta.get("block_id", {}).get("hash"), header.get("time"),
+                           num_txs, header.get("proposer_address")))
+            if num_txs:
+                busy.append(height)
+
+        # Only heights that carry transactions need the full block and its results
+        txs = []
+        for block_txs in self._executor.map(self._block_txs, busy):
+            txs.extend(block_txs)
+        return blocks, txs
+
+    def _block_txs(self, height: int) -> List[Dict[str, Any]]:
+        block = self._fetch("block", {"height": height})["result"]["block"]
+        results = self._fetch("block_results", {"height": height})["result"].get("txs_results") or []
+        block_time = block.get("header", {}).get("time")
+
+        return [
+            _build_tx(tx_b64, results[index] if index < len(results) else {}, height, index, block_time)
+            for index, tx_b64 in enumerate(block.get("data", {}).get("txs") or [])
+        ]
+
+    def fetch_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Transaction by hash from upstream /tx, for hashes outside the index
+
+        Returns:
+            Dict shaped like an indexed row (time is None), or None if the node doesn't know it
+        """
+        tx_hash = _normalize_hash(tx_hash)
+        if not SHA256_HEX.match(tx_hash):
+            return None
+        response = self._fetch("tx", {"hash": f"0x{tx_hash}"})
+        result = response.get("result")
+        if not result:
+            return None
+        return _upstream_tx(result)
+
+    def search_upstream(self, query: str, page: int = 1, per_page: int = 30) -> List[Dict[str, Any]]:
+        """
+        Run a tx_search on the node, newest first
+
+        Returns:
+            Transactions shaped like indexed rows (time is None)
+        """
+        response = self._fetch("tx_search", {
+            "query": f'"{query}"',
+            "page": max(page, 1),
+            "per_page": min(max(per_page, 1), 100),
+            "order_by": '"desc"',
+        })
+        return [_upstream_tx(tx) for tx in (response.get("result") or {}).get("txs") or []]
+
+    def _write(self, blocks: List[Tuple], txs: List[Dict[str, Any]], cursor: int):
+        """One transaction per batch: rows and cursor advance together"""
+        with self._write_lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?)", blocks)
+            conn.executemany(
+                "INSERT OR REPLACE INTO txs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(tx["hash"], tx["height"], tx["index"], tx["time"], tx["code"], json.dumps(tx["msg_types"]),
+                  tx["sender"], tx["recipient"], tx["amount"], tx["denom"], tx["memo"], tx["memo_hash"],
+                  tx["gas_wanted"], tx["gas_used"], tx["tx"], json.dumps(tx["events"])) for tx in txs],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tx_addresses VALUES (?, ?, ?, ?)",
+                [(address, role, tx["height"], tx["hash"]) for tx in txs for address, role in tx["addresses"]],
+            )
+            conn.execute("INSERT OR REPLACE INTO cursor VALUES ('blocks', ?)", (cursor,))
+
+    async def run(self):
+        """Follow the chain, for the background runtime"""
+        while True:
+            try:
+                indexed = await asyncio.to_thread(self.sync_once)
+                if indexed >= self.batch_size:
+                    continue  # still catching up
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Chain indexer sync failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    # Queries
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            return [_tx_row(row) for row in conn.execute(sql, params).fetchall()]
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Transaction by hash (case-insensitive, optional 0x prefix)"""
+        tx_hash = _normalize_hash(tx_hash)
+        rows = self._query("SELECT * FROM txs WHERE hash = ?", (tx_hash,))
+        return rows[0] if rows else None
+
+    def recent_transactions(self, limit: int = 30, offset: int = 0) -> List[Dict[str, Any]]:
+        """Newest transactions first"""
+        return self._query("SELECT * FROM txs ORDER BY height DESC, idx DESC LIMIT ? OFFSET ?", (limit, offset))
+
+    def transactions_at_height(self, height: int) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM txs WHERE height = ? ORDER BY idx", (height,))
+
+    def transactions_by_address(self, address: str, role: Optional[str] = None,
+                                limit: int = 30, offset: int = 0) -> List[Dict[str, Any]]:
+        """Transactions an address sent or received (role narrows to "sender" or "recipient")"""
+        role_filter = "AND a.role = ?" if role else ""
+        params = (address, role) if role else (address,)
+        return self._query(
+            "SELECT t.* FROM txs t WHERE t.hash IN ("
+            f" SELECT a.tx_hash FROM tx_addresses a WHERE a.address = ? {role_filter})"
+            " ORDER BY t.height DESC, t.idx DESC LIMIT ? OFFSET ?",
+            params + (limit, offset),
+        )
+
+    def list_transactions(self, address: Optional[str] = None, role: Optional[str] = None,
+                          limit: int = 30, offset: int = 0, use_index: bool = True) -> List[Dict[str, Any]]:
+        """
+        Newest transactions first, optionally those an address sent or received
+
+        Served from the index only when use_index is set and the index covers
+        the node's whole history; otherwise from upstream tx_search, so activity
+        older than the backfill window is not cut off.
+
+        Args:
+            address: Account address; None for all transactions
+            role: "sender" or "recipient" to narrow an address query
+            limit: Page size
+            offset: Rows to skip (a multiple of limit for upstream paging)
+            use_index: Whether the local index may answer (CHAIN_INDEXER flag)
+        """
+        if use_index and self.covers_history():
+            if address:
+                return self.transactions_by_address(address, role, limit, offset)
+            return self.recent_transactions(limit, offset)
+
+        if not address:
+            return self.search_upstream("tx.height>0", offset // max(limit, 1) + 1, limit)
+        if role in ADDRESS_QUERIES:
+            return self.search_upstream(ADDRESS_QUERIES[role].format(address), offset // max(limit, 1) + 1, limit)
+        # Sent or received: merge both searches (tx_search has no OR)
+        found = {}
+        for query in ADDRESS_QUERIES.values():
+            for tx in self.search_upstream(query.format(address), 1, offset + limit):
+                found[tx["hash"]] = tx
+        merged = sorted(found.values(), key=lambda tx: (tx["height"], tx["idx"]), reverse=True)
+        return merged[offset:offset + limit]
+
+    def transactions_by_memo_hash(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Transactions whose memo anchors a content hash, oldest first"""
+        return self._query("SELECT * FROM txs WHERE memo_hash = ? ORDER BY height, idx", (content_hash.lower(),))
+
+    def anchors(self, content_hashes: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        On-chain anchors of content hashes, from successful transactions only
+
+        Args:
+            content_hashes: SHA-256 hex digests (any case)
+
+        Returns:
+            Dict: hash -> anchors oldest first, each with tx_hash, height, signer,
+                timestamp, kind, role, reference and metadata
+        """
+        wanted = list(dict.fromkeys(h.lower() for h in content_hashes))
+        found: Dict[str, List[Dict[str, Any]]] = {h: [] for h in wanted}
+        with self._connect() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                rows = conn.execute(
+                    "SELECT memo_hash, hash, height, sender, time, memo FROM txs"
+                    f" WHERE memo_hash IN ({', '.join('?' * len(chunk))}) AND code = 0"
+                    " ORDER BY height, idx",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    anchor = parse_memo_anchor(row["memo"]) or {}
+                    found[row["memo_hash"]].append({
+                        "tx_hash": row["hash"],
+                        "height": row["height"],
+                        "signer": row["sender"],
+                        "timestamp": row["time"],
+                        "kind": anchor.get("kind"),
+                        "role": anchor.get("role"),
+                        "reference": anchor.get("reference"),
+                        "metadata": anchor.get("metadata", {}),
+                    })
+        return found
+
+    def indexed_range(self) -> Dict[str, Optional[int]]:
+        """Lowest and highest indexed heights"""
+        with self._connect() as conn:
+            low = conn.execute("SELECT MIN(height) FROM blocks").fetchone()[0]
+        return {"from_height": low, "to_height": self.cursor()}
+
+    def covers_history(self) -> bool:
+        """Whether the index holds every transaction from the node's earliest block to (nearly) its head"""
+        earliest, head = self._stats["earliest"], self._stats["head"]
+        indexed = self.indexed_range()
+        if None in (earliest, head, indexed["from_height"], indexed["to_height"]):
+            return False
+        return indexed["from_height"] <= earliest and head - indexed["to_height"] <= self.max_lag
+
+    def verify_content_hashes(self, content_hashes: List[str]) -> Dict[str, Any]:
+        """
+        Verification report for content hashes (e.g. IFC file SHA-256s)
+
+        A hash is anchored when a successful transaction's memo carries it;
+        the earliest anchor is the proof of existence. Absence only covers
+        the indexed height range, which is reported alongside.
+
+        Returns:
+            Dict: {"results": [{"content_hash", "anchored", "first_anchor", "anchors"}], "indexed_range"}
+        """
+        found = self.anchors(content_hashes)
+        return {
+            "results": [{
+                "content_hash": content_hash,
+                "anchored": bool(anchors),
+                "first_anchor": anchors[0] if anchors else None,
+                "anchors": anchors,
+            } for content_hash, anchors in found.items()],
+            "indexed_range": self.indexed_range(),
+        }
+
+    def search(self, query: str, page: int = 1, per_page: int = 30) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Answer a tx_search query from the index, newest first
+
+        Supports tx.height>0, tx.height=N, tx.hash='...', message.sender='...',
+        transfer.sender='...' and transfer.recipient='...'. Recent and address
+        queries are only answered when the index covers the node's whole
+        history up to the head; height queries when the height is indexed;
+        hash queries when the hash is found.
+
+        Returns:
+            Tuple of (transactions, total count), or None if the query needs upstream
+        """
+        if self.cursor() is None:
+            return None
+        query = query.strip()
+        offset = (max(page, 1) - 1) * per_page
+
+        if QUERY_RECENT.match(query):
+            if not self.covers_history():
+                return None
+            return self.recent_transactions(per_page, offset), self.count_transactions()
+        match = QUERY_HEIGHT.match(query)
+        if match:
+            height = int(match.group(1))
+            indexed = self.indexed_range()
+            if not indexed["from_height"] <= height <= indexed["to_height"]:
+                return None
+            return self.transactions_at_height(height)[offset:offset + per_page], self.count_transactions(height=height)
+        match = QUERY_HASH.match(query)
+        if match:
+            tx = self.get_transaction(match.group(1))
+            if tx is None:
+                return None
+            return ([tx] if page == 1 else []), 1
+        match = QUERY_ADDRESS.match(query)
+        if match:
+            if not self.covers_history():
+                return None
+            role = "recipient" if match.group(1) == "transfer.recipient" else "sender"
+            address = match.group(2)
+            return (self.transactions_by_address(address, role, per_page, offset),
+                    self.count_transactions(address=address, role=role))
+        return None
+
+    def count_transactions(self, address: Optional[str] = None, role: Optional[str] = None,
+                           height: Optional[int] = None) -> int:
+        with self._connect() as conn:
+            if address:
+                sql = "SELECT COUNT(DISTINCT tx_hash) FROM tx_addresses WHERE address = ?"
+                params: Tuple = (address,)
+                if role:
+                    sql, params = sql + " AND role = ?", params + (role,)
+            elif height is not None:
+                sql, params = "SELECT COUNT(*) FROM txs WHERE height = ?", (height,)
+            else:
+                sql, params = "SELECT COUNT(*) FROM txs", ()
+            return conn.execute(sql, params).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        cursor = self.cursor()
+        head = self._stats["head"]
+        return {
+            **self._stats,
+            "cursor": cursor,
+            "lag": head - cursor if head is not None and cursor is not None else None,
+            "indexed_txs": self.count_transactions(),
+        }
+
+
+def summarize_tx(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """Display form of an indexed transaction for the transaction API routes"""
+    msg_types = tx.get("msg_types") or []
+    label = msg_types[0].rsplit(".", 1)[-1] if msg_types else "Unknown"
+    return {
+        "id": tx["hash"],
+        "hash": tx["hash"],
+        "type": label[3:] if label.startswith("Msg") else label,
+        "block": tx["height"],
+        "timestamp": tx["time"],
+        "status": "confirmed" if tx["code"] == 0 else "failed",
+        "sender": tx["sender"],
+        "receiver": tx["recipient"],
+        "value": tx["amount"],
+        "currency": tx["denom"],
+        "memo": tx["memo"],
+        "content_hash": tx["memo_hash"],
+        "gas_used": tx["gas_used"],
+    }
+
+
+def _normalize_hash(tx_hash: str) -> str:
+    tx_hash = tx_hash.upper()
+    return tx_hash[2:] if tx_hash.startswith("0X") else tx_hash
+
+
+def _build_tx(tx_b64: str, result: Dict[str, Any], height: int, index: int,
+              block_time: Optional[str]) -> Dict[str, Any]:
+    """Index row for one transaction from its raw bytes and DeliverTx result"""
+    try:
+        decoded = decode_tx(tx_b64)
+    except ValueError as e:
+        logger.warning(f"Undecodable tx at height {height} index {index}: {e}")
+        decoded = {
+            "hash": hashlib.sha256(base64.b64decode(tx_b64)).hexdigest().upper(),
+            "memo": "",
+            "messages": [],
+        }
+
+    events = result.get("events") or []
+    addresses = event_addresses(events)
+    send = next((m for m in decoded["messages"] if m["type_url"] == MSG_SEND), {})
+    sender = send.get("from_address") or next((a for a, role in addresses if role == "sender"), None)
+    recipient = send.get("to_address") or next((a for a, role in addresses if role == "recipient"), None)
+    for address, role in ((sender, "sender"), (recipient, "recipient")):
+        if address and (address, role) not in addresses:
+            addresses.append((address, role))
+    coin = (send.get("amount") or [{}])[0]
+
+    return {
+        "hash": decoded["hash"],
+        "height": height,
+        "index": index,
+        "time": block_time,
+        "code": int(result.get("code", 0) or 0),
+        "msg_types": [m["type_url"] for m in decoded["messages"]],
+        "sender": sender,
+        "recipient": recipient,
+        "amount": coin.get("amount"),
+        "denom": coin.get("denom"),
+        "memo": decoded["memo"],
+        "memo_hash": parse_memo_hash(decoded["memo"]),
+        "gas_wanted": int(result.get("gas_wanted", 0) or 0),
+        "gas_used": int(result.get("gas_used", 0) or 0),
+        "tx": tx_b64,
+        "events": events,
+        "addresses": addresses,
+    }
+
+
+def _upstream_tx(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Indexed row shape for a /tx or tx_search result entry"""
+    tx = _build_tx(result["tx"], result.get("tx_result") or {}, int(result["height"]),
+                   int(result.get("index", 0)), None)
+    tx["idx"] = tx.pop("index")
+    return tx
+
+
+def _tx_row(row: sqlite3.Row) -> Dict[str, Any]:
+    tx = dict(row)
+    tx["msg_types"] = json.loads(tx["msg_types"] or "[]")
+    tx["events"] = json.loads(tx["events"] or "[]")
+    return tx
+
+
+def _pool_fetch(method: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    from src.gateways.endpoint_pool import get_rpc_endpoint_pool
+    from src.gateways.http_client import get_http_client
+
+    http = get_http_client()
+    response, _ = get_rpc_endpoint_pool().call(lambda base_url: http.get(f"{base_url}/{method}", params=params))
+    return response.json()
+
+
+# Global indexer instance
+_chain_indexer = None
+_chain_indexer_lock = threading.Lock()
+
+
+def get_chain_indexer() -> ChainIndexer:
+    """Get the shared chain indexer, scheduling it on the background runtime"""
+    global _chain_indexer
+    with _chain_indexer_lock:
+        if _chain_indexer is None:
+            start_height = os.environ.get("CHAIN_INDEXER_START_HEIGHT")
+            _chain_indexer = ChainIndexer(
+                db_path=os.environ.get("CHAIN_INDEXER_DB", "chain_index.db"),
+                start_height=int(start_height) if start_height else None,
+                backfill=int(os.environ.get("CHAIN_INDEXER_BACKFILL", "1000")),
+                batch_size=int(os.environ.get("CHAIN_INDEXER_BATCH", "200")),
+            )
+            if os.environ.get("CHAIN_INDEXER", "1") != "0":
+                from src.services.background_runtime import get_background_runtime
+                get_background_runtime().register("chain_indexer", _chain_indexer.run)
+    return _chain_indexer
@@ -0,0 +1,258 @@
+"""
+Chain State Snapshot
+One shared, in-memory copy of the chain state everybody asks for (/status,
+/validators, /block and /health). Entries are refreshed on a schedule or
+when a new block is announced, tagged with a generation number, and served
+to all consumers with stale-while-revalidate semantics so upstream RPC
+traffic follows the block rate, not our request rate.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.gateways.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+RPC_ENDPOINT = os.environ.get("RPC_URL", "https://testnet-rpc.daodiseo.chaintools.tech")
+REST_ENDPOINT = os.environ.get("REST_URL", "https://testnet-api.daodiseo.chaintools.tech")
+
+# Resource name -> (base, path, query params)
+DEFAULT_RESOURCES: Dict[str, Tuple[str, str, Optional[Dict[str, Any]]]] = {
+    "status": ("rpc", "status", None),
+    "health": ("rpc", "health", None),
+    "block": ("rpc", "block", None),
+    "validators": ("rpc", "validators", {"page": 1, "per_page": 100}),
+}
+
+Fetcher = Callable[[str, str, Optional[Dict[str, Any]]], Dict[str, Any]]
+
+
+@dataclass
+class SnapshotEntry:
+    """A cached resource payload"""
+    payload: Dict[str, Any]
+    fetched_at: float
+    generation: int
+
+
+def extract_height(resource: str, payload: Dict[str, Any]) -> Optional[int]:
+    """Chain height reported by a status or block payload"""
+    result = payload.get("result", {}) if isinstance(payload, dict) else {}
+    try:
+        if resource == "status":
+            return int(result.get("sync_info", {}).get("latest_block_height", 0)) or None
+        if resource == "block":
+            return int(result.get("block", {}).get("header", {}).get("height", 0)) or None
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class ChainSnapshotService:
+    """Shared chain-state cache with stale-while-revalidate reads"""
+
+    def __init__(
+        self,
+        resources: Optional[Dict[str, Tuple[str, str, Optional[Dict[str, Any]]]]] = None,
+        fetcher: Optional[Fetcher] = None,
+        refresh_interval: float = 6.0,
+        max_age: float = 60.0,
+        rpc_endpoint: str = RPC_ENDPOINT,
+        rest_endpoint: str = REST_ENDPOINT,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the snapshot
+
+        Args:
+            resources: Resource name -> (base, path, params); defaults to DEFAULT_RESOURCES
+            fetcher: Callable(base, path, params) -> JSON dict; defaults to the shared HTTP client
+            refresh_interval: Entries younger than this are fresh
+            max_age: Entries older than this are refetched before being served
+            rpc_endpoint: CometBFT RPC base URL
+            rest_endpoint: Cosmos SDK REST base URL
+            timeout: Upstream request timeout in seconds
+        """
+        self.resources = resources or DEFAULT_RESOURCES
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.rpc_endpoint = rpc_endpoint.rstrip("/")
+        self.rest_endpoint = rest_endpoint.rstrip("/")
+        self.timeout = timeout
+        self._fetcher = fetcher or self._http_fetch
+
+        self.generation = 0
+        self.height: Optional[int] = None
+        self._entries: Dict[str, SnapshotEntry] = {}
+        self._stale_before = 0.0
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chain-snapshot")
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "fetches": 0, "errors": 0}
+
+    # Reads
+
+    def get(self, resource: str) -> Optional[Dict[str, Any]]:
+        """
+        Current payload for a resource
+
+        Fresh entries are returned directly; stale ones are returned while a
+        background refresh runs; missing or expired ones are fetched (once,
+        however many callers are waiting).
+
+        Returns:
+            Dict: Raw JSON payload, or None if the resource is unknown or unavailable
+        """
+        if resource not in self.resources:
+            return None
+        payload = self.peek(resource)
+        if payload is not None:
+            return payload
+        return self._refresh_now(resource)
+
+    def peek(self, resource: str) -> Optional[Dict[str, Any]]:
+        """Cached payload without blocking on upstream (None if missing or expired)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(resource)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            age = now - entry.fetched_at
+            if age < self.refresh_interval and entry.fetched_at >= self._stale_before:
+                self._stats["hits"] += 1
+                return entry.payload
+            if age >= self.max_age:
+                self._stats["misses"] += 1
+                return None
+            self._stats["stale_hits"] += 1
+            start_refresh = resource not in self._inflight
+            if start_refresh:
+                self._inflight[resource] = threading.Event()
+
+        if start_refresh:
+            self._revalidator.submit(self._fetch_and_store, resource)
+        return entry.payload
+
+    def put(self, resource: str, payload: Dict[str, Any]):
+        """Store a payload fetched elsewhere (e.g. by the async chain brain client)"""
+        if resource not in self.resources or not payload:
+            return
+        with self._lock:
+            self._store(resource, payload)
+
+    # Refreshing
+
+    def refresh(self, resources: Optional[list] = None):
+        """Refetch resources now (used by the scheduler)"""
+        for resource in resources or list(self.resources):
+            self._refresh_now(resource)
+
+    def notify_new_block(self, height: Optional[int] = None):
+        """Mark every entry stale because the chain advanced"""
+        with self._lock:
+            if height is not None and self.height is not None and height <= self.height:
+                return
+            self._stale_before = time.time()
+
+    async def run(self):
+        """Scheduled refresh loop, for the background runtime"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Chain snapshot refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def _refresh_now(self, resource: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            event = self._inflight.get(resource)
+            owner = event is None
+            if owner:
+                event = self._inflight[resource] = threading.Event()
+
+        # Callers that find a fetch in flight wait for it instead of fetching again
+        if owner:
+            self._fetch_and_store(resource)
+        else:
+            event.wait(timeout=self.timeout * 2)
+
+        with self._lock:
+            entry = self._entries.get(resource)
+            return entry.payload if entry else None
+
+    def _fetch_and_store(self, resource: str):
+        base, path, params = self.resources[resource]
+        with self._lock:
+            self._stats["fetches"] += 1
+        try:
+            payload = self._fetcher(base, path, params)
+            with self._lock:
+                self._store(resource, payload)
+        except Exception as e:
+            # Keep the previous entry; readers fall back to it until a fetch succeeds
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.error(f"Chain snapshot fetch failed for {resource}: {e}")
+        finally:
+            with self._lock:
+                event = self._inflight.pop(resource, None)
+            if event is not None:
+                event.set()
+
+    def _store(self, resource: str, payload: Dict[str, Any]):
+        """Caller holds the lock"""
+        height = extract_height(resource, payload)
+        if height is not None and (self.height is None or height > self.height):
+            self.height = height
+            self.generation += 1
+        self._entries[resource] = SnapshotEntry(payload, time.time(), self.generation)
+
+    def _http_fetch(self, base: str, path: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        root = self.rest_endpoint if base == "rest" else self.rpc_endpoint
+        response = get_http_client().get(f"{root}/{path}", params=params, timeout=(3.05, self.timeout))
+        response.raise_for_status()
+        return response.json()
+
+    # Introspection
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Generation, height, entry ages and hit counters"""
+        now = time.time()
+        with self._lock:
+            return {
+                **self._stats,
+                "generation": self.generation,
+                "height": self.height,
+                "entries": {
+                    name: {"age": round(now - entry.fetched_at, 2), "generation": entry.generation}
+                    for name, entry in self._entries.items()
+                },
+            }
+
+
+# Global snapshot instance
+_chain_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_chain_snapshot() -> ChainSnapshotService:
+    """Get the shared chain snapshot, scheduling its refresh on the background runtime"""
+    global _chain_snapshot
+    with _snapshot_lock:
+        if _chain_snapshot is None:
+            _chain_snapshot = ChainSnapshotService(
+                refresh_interval=float(os.environ.get("CHAIN_SNAPSHOT_INTERVAL", "6")),
+                max_age=float(os.environ.get("CHAIN_SNAPSHOT_MAX_AGE", "60")),
+            )
+            if os.environ.get("CHAIN_SNAPSHOT_SCHEDULE", "1") != "0":
+                from src.services.background_runtime import get_background_runtime
+                get_background_runtime().register("chain_snapshot", _chain_snapshot.run)
+    return _chain_snapshot
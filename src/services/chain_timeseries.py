@@ -0,0 +1,233 @@
+"""
+Chain Time Series
+Fixed-size, columnar history of chain brain metrics (block height, tx count,
+peers, mempool size, voting power) backed by NumPy ring buffers, with
+vectorized windowed aggregates for pattern analysis and dashboards.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Metrics tracked by the chain brain
+DEFAULT_METRICS = (
+    "height",
+    "tx_count",
+    "peers",
+    "mempool_size",
+    "voting_power",
+    "validator_count",
+)
+
+
+class RingSeries:
+    """One metric: timestamps and values in preallocated ring buffers"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._head = 0  # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, value: float):
+        """O(1) append, overwriting the oldest sample when full"""
+        self._timestamps[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and values in chronological order"""
+        if self._size < self.capacity:
+            return self._timestamps[:self._size].copy(), self._values[:self._size].copy()
+        order = np.roll(np.arange(self.capacity), -self._head)
+        return self._timestamps[order], self._values[order]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self._size:
+            return None
+        index = (self._head - 1) % self.capacity
+        return float(self._timestamps[index]), float(self._values[index])
+
+
+class ChainTimeSeries:
+    """Ring-buffered time series store for chain metrics"""
+
+    def __init__(self, capacity: int = 1000, metrics: Iterable[str] = DEFAULT_METRICS):
+        """
+        Initialize the store
+
+        Args:
+            capacity: Samples kept per metric (memory is fixed at startup)
+            metrics: Metric names to track; unknown metrics are ignored
+        """
+        self.capacity = capacity
+        self._series: Dict[str, RingSeries] = {name: RingSeries(capacity) for name in metrics}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self):
+        return list(self._series.keys())
+
+    def record(self, values: Dict[str, Any], timestamp: Optional[float] = None):
+        """
+        Append one sample for each given metric
+
+        Args:
+            values: Metric name -> numeric value
+            timestamp: Unix timestamp (defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        with self._lock:
+            for name, value in values.items():
+                series = self._series.get(name)
+                if series is None or value is None:
+                    continue
+                try:
+                    series.append(timestamp, float(value))
+                except (TypeError, ValueError):
+                    logger.debug(f"Ignoring non-numeric {name} sample: {value!r}")
+
+    def window(self, metric: str, seconds: Optional[float] = None,
+               last: Optional[int] = None, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Samples of a metric restricted to a time window and/or the last N samples
+
+        Returns:
+            Tuple of (timestamps, values) arrays in chronological order
+        """
+        with self._lock:
+            series = self._series.get(metric)
+            if series is None:
+                return np.zeros(0), np.zeros(0)
+            timestamps, values = series.arrays()
+
+        if seconds is not None and len(timestamps):
+            cutoff = (time.time() if now is None else now) - seconds
+            start = int(np.searchsorted(timestamps, cutoff, side="left"))
+            timestamps, values = timestamps[start:], values[start:]
+        if last is not None:
+            timestamps, values = timestamps[-last:], values[-last:]
+        return timestamps, values
+
+    def latest(self, metric: str) -> Optional[float]:
+        """Most recent value of a metric"""
+        with self._lock:
+            series = self._series.get(metric)
+            sample = series.latest() if series is not None else None
+        return sample[1] if sample else None
+
+    def rolling_mean(self, metric: str, size: int, seconds: Optional[float] = None) -> np.ndarray:
+        """Moving average over `size` samples (vectorized with a cumulative sum)"""
+        _, values = self.window(metric, seconds=seconds)
+        if size <= 0 or len(values) < size:
+            return np.zeros(0)
+        cumulative = np.cumsum(np.insert(values, 0, 0.0))
+        return (cumulative[size:] - cumulative[:-size]) / size
+
+    def aggregates(self, metric: str, seconds: Optional[float] = None,
+                   last: Optional[int] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Windowed aggregates for one metric
+
+        Returns:
+            Dict with count, latest, min, max, mean, std, delta (last - first),
+            rate (delta per second) and zscore (latest vs. the rest of the window)
+        """
+        timestamps, values = self.window(metric, seconds=seconds, last=last, now=now)
+        count = len(values)
+        if not count:
+            return {"count": 0}
+
+        result = {
+            "count": count,
+            "latest": float(values[-1]),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "delta": float(values[-1] - values[0]),
+            "rate": None,
+            "zscore": None,
+        }
+
+        span = float(timestamps[-1] - timestamps[0])
+        if span > 0:
+            result["rate"] = result["delta"] / span
+
+        if count >= 3:
+            history = values[:-1]
+            std = float(history.std())
+            if std > 0:
+                result["zscore"] = float((values[-1] - history.mean()) / std)
+
+        return result
+
+    def summary(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Aggregates for every metric that has samples in the window"""
+        summary = {}
+        for metric in self.metrics:
+            stats = self.aggregates(metric, seconds=seconds, now=now)
+            if stats["count"]:
+                summary[metric] = {
+                    key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in stats.items()
+                }
+        return summary
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        """Earliest and latest timestamp across all metrics"""
+        first, last = None, None
+        with self._lock:
+            for series in self._series.values():
+                if not len(series):
+                    continue
+                timestamps, _ = series.arrays()
+                first = timestamps[0] if first is None else min(first, timestamps[0])
+                last = timestamps[-1] if last is None else max(last, timestamps[-1])
+        if first is None:
+            return None
+        return float(first), float(last)
+
+
+def metrics_from_data_points(data_points: Iterable[Any]) -> Dict[str, float]:
+    """
+    Extract time-series metrics from chain brain ChainDataPoints
+
+    Args:
+        data_points: Objects with data_type and value attributes
+
+    Returns:
+        Dict: Metric name -> value for the metrics present in the batch
+    """
+    metrics: Dict[str, float] = {}
+    voting_power = 0
+    validators = 0
+
+    for point in data_points:
+        value = point.value if isinstance(point.value, dict) else {}
+        if point.data_type == "block_production":
+            if value.get("height"):
+                metrics["height"] = value["height"]
+            metrics["tx_count"] = value.get("tx_count", 0)
+        elif point.data_type == "validator_status":
+            voting_power += int(value.get("voting_power", 0) or 0)
+            validators += 1
+        elif point.data_type == "mempool_status":
+            metrics["mempool_size"] = value.get("unconfirmed_count", 0)
+        elif point.data_type == "network_health":
+            metrics["peers"] = int(value.get("peers", 0) or 0)
+
+    if validators:
+        metrics["voting_power"] = voting_power
+        metrics["validator_count"] = validators
+    return metrics
@@ -0,0 +1,277 @@
+"""
+Conversation Store for BIM AI chat sessions
+Keeps a bounded, per-session message history with token-budgeted context,
+optional rolling summarization and optional SQLite spill for evicted sessions.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from src.services.prompt_compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# summarizer(previous_summary, dropped_messages) -> new summary
+Summarizer = Callable[[Optional[str], List[Dict[str, str]]], Optional[str]]
+
+
+class ConversationSession:
+    """Message ring buffer and per-user state for one chat session"""
+
+    def __init__(self, session_id: str, messages: Optional[List[Dict[str, str]]] = None,
+                 summary: Optional[str] = None, stakeholder: Optional[str] = None):
+        self.session_id = session_id
+        self.messages = deque(messages or [])
+        self.summary = summary
+        self.stakeholder = stakeholder
+        self.last_access = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "messages": list(self.messages),
+            "summary": self.summary,
+            "stakeholder": self.stakeholder,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConversationSession":
+        return cls(
+            data["session_id"],
+            messages=data.get("messages", []),
+            summary=data.get("summary"),
+            stakeholder=data.get("stakeholder"),
+        )
+
+
+class ConversationStore:
+    """
+    In-process LRU of conversation sessions
+
+    Each session keeps at most max_messages messages; older messages are
+    folded into a rolling summary when a summarizer is configured. Sessions
+    beyond max_sessions are evicted least-recently-used first and, if db_path
+    is set, written to SQLite so they can be restored later. Summaries are
+    produced on a background thread, never on the request path.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_messages: int = 40,
+        token_budget: int = 2000,
+        summarizer: Optional[Summarizer] = None,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the store
+
+        Args:
+            max_sessions: Sessions kept in memory before LRU eviction
+            max_messages: Ring buffer size per session
+            token_budget: Default token budget for get_context
+            summarizer: Optional callable that folds dropped messages into a summary
+            db_path: Optional SQLite file for spilling evicted sessions
+        """
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.db_path = db_path
+
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.RLock()
+        # One worker keeps each session's summaries in order
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+
+        if self.db_path:
+            self._init_db()
+
+    # Sessions
+
+    def get_session(self, session_id: str) -> ConversationSession:
+        """Get (or create / restore) a session and mark it recently used"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._load_spilled(session_id) or ConversationSession(session_id)
+                self._sessions[session_id] = session
+                self._evict_if_needed()
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_access = time.time()
+            return session
+
+    def append(self, session_id: str, role: str, content: str) -> ConversationSession:
+        """Add a message to a session, trimming the ring buffer if needed"""
+        dropped = []
+        with self._lock:
+            session = self.get_session(session_id)
+            session.messages.append({"role": role, "content": content})
+
+            if len(session.messages) > self.max_messages:
+                # Drop half the buffer at once so summarization runs rarely
+                drop = max(len(session.messages) - self.max_messages, self.max_messages // 2)
+                dropped = [session.messages.popleft() for _ in range(drop)]
+
+        # Summarize in the background; it may call a model
+        if dropped and self.summarizer:
+            self._get_summary_executor().submit(self._summarize, session, dropped)
+        return session
+
+    def get_context(self, session_id: str, token_budget: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Messages to send to the model, newest first until the budget is spent
+
+        The rolling summary (if any) is prepended as a system message.
+        """
+        budget = token_budget or self.token_budget
+        with self._lock:
+            session = self.get_session(session_id)
+            messages = list(session.messages)
+            summary = session.summary
+
+        context: List[Dict[str, str]] = []
+        used = 0
+        if summary:
+            summary_message = {"role": "system", "content": f"Summary of earlier conversation: {summary}"}
+            used += estimate_tokens(summary_message["content"])
+            context.append(summary_message)
+
+        recent: List[Dict[str, str]] = []
+        for message in reversed(messages):
+            cost = estimate_tokens(message["content"]) + 4
+            if recent and used + cost > budget:
+                break
+            recent.append(message)
+            used += cost
+
+        context.extend(reversed(recent))
+        return context
+
+    def clear(self, session_id: str):
+        """Forget a session, including any spilled copy"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self.db_path:
+                self._delete_spilled(session_id)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for summaries already queued to finish"""
+        with self._lock:
+            executor = self._summary_executor
+        if executor is not None:
+            executor.submit(lambda: None).result(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(s.messages) for s in self._sessions.values()),
+            }
+
+    # Summarization and eviction
+
+    def _get_summary_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._summary_executor is None:
+                self._summary_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="conversation-summary"
+                )
+            return self._summary_executor
+
+    def _summarize(self, session: ConversationSession, dropped: List[Dict[str, str]]):
+        if not self.summarizer:
+            return
+        with self._lock:
+            previous = session.summary
+        try:
+            summary = self.summarizer(previous, dropped)
+            if summary:
+                with self._lock:
+                    session.summary = summary
+        except Exception as e:
+            logger.warning(f"Conversation summarization failed for {session.session_id}: {e}")
+
+    def _evict_if_needed(self):
+        while len(self._sessions) > self.max_sessions:
+            session_id, session = self._sessions.popitem(last=False)
+            if self.db_path:
+                self._spill(session)
+            logger.debug(f"Evicted conversation session {session_id}")
+
+    # SQLite spill
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS conversations ("
+                    "session_id TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to initialize conversation spill database: {e}")
+            self.db_path = None
+
+    def _spill(self, session: ConversationSession):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO conversations (session_id, payload, updated_at) VALUES (?, ?, ?)",
+                    (session.session_id, json.dumps(session.to_dict()), session.last_access),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to spill conversation {session.session_id}: {e}")
+
+    def _load_spilled(self, session_id: str) -> Optional[ConversationSession]:
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload FROM conversations WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
+            return ConversationSession.from_dict(json.loads(row[0]))
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Failed to restore conversation {session_id}: {e}")
+            return None
+
+    def _delete_spilled(self, session_id: str):
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete conversation {session_id}: {e}")
+
+
+# Global store instance
+_conversation_store = None
+_conversation_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get the global conversation store instance"""
+    global _conversation_store
+    if _conversation_store is None:
+        with _conversation_store_lock:
+            if _conversation_store is None:
+                _conversation_store = ConversationStore(
+                    max_sessions=int(os.environ.get("CONVERSATION_MAX_SESSIONS", "1000")),
+                    max_messages=int(os.environ.get("CONVERSATION_MAX_MESSAGES", "40")),
+                    token_budget=int(os.environ.get("CONVERSATION_TOKEN_BUDGET", "2000")),
+                    db_path=os.environ.get("CONVERSATION_DB_PATH") or None,
+                )
+    return _conversation_store
@@ -0,0 +1,77 @@
+"""
+Insight Log
+Bounded, append-only log of chain brain AI insights with monotonic ids, so
+polling clients can fetch only what is new since their last cursor.
+"""
+
+import itertools
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InsightLog:
+    """Bounded insight log with O(1) append/eviction and cursor reads"""
+
+    def __init__(self, max_entries: int = 100):
+        """
+        Initialize the log
+
+        Args:
+            max_entries: Number of insights kept; the oldest are evicted first
+        """
+        self.max_entries = max_entries
+        self._entries: deque = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def latest_id(self) -> int:
+        """Id of the newest insight, or 0 if the log is empty"""
+        with self._lock:
+            return self._entries[-1]["id"] if self._entries else 0
+
+    def append(self, insight: Dict[str, Any]) -> int:
+        """
+        Add an insight
+
+        Args:
+            insight: Insight payload
+
+        Returns:
+            int: The id assigned to the insight
+        """
+        with self._lock:
+            insight_id = next(self._ids)
+            self._entries.append({**insight, "id": insight_id})
+            return insight_id
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest insights first"""
+        with self._lock:
+            count = min(max(limit, 0), len(self._entries))
+            return [self._entries[-i] for i in range(1, count + 1)]
+
+    def since(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Insights newer than a cursor, oldest first
+
+        Args:
+            cursor: Last id the client has seen (0 for everything retained)
+            limit: Maximum number of insights to return
+
+        Returns:
+            Tuple of (insights with id > cursor, next cursor); the next cursor is
+            the id of the last insight returned, or cursor if none were
+        """
+        with self._lock:
+            if not self._entries or cursor >= self._entries[-1]["id"]:
+                return [], cursor
+            # Ids are contiguous, so the cursor maps straight to a position
+            start = max(cursor - self._entries[0]["id"] + 1, 0)
+            end = len(self._entries) if limit is None else min(start + limit, len(self._entries))
+            items = [self._entries[i] for i in range(start, end)]
+            return items, items[-1]["id"] if items else cursor
@@ -0,0 +1,234 @@
+"""
+Prompt Compaction for Chain Data
+Shrinks RPC payloads before they are embedded in LLM prompts. Each caller
+passes the fields its analysis reads; everything else is left out.
+"""
+
+import hashlib
+import json
+import logging
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Progressively tighter (max_list_items, max_str_len) levels used to fit a budget
+COMPACTION_LEVELS: Tuple[Tuple[int, int], ...] = ((20, 80), (10, 48), (5, 32), (3, 16))
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a prompt fragment
+
+    Uses tiktoken when it is installed, otherwise ~4 characters per token.
+    """
+    global _encoding
+    if tiktoken is not None:
+        try:
+            if _encoding is None:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            return len(_encoding.encode(text))
+        except Exception as e:
+            logger.debug(f"tiktoken unavailable, using character estimate: {e}")
+    return (len(text) + 3) // 4
+
+
+class PromptCompactor:
+    """Projects, deduplicates and budgets JSON payloads for prompts"""
+
+    def compact(self, data: Any, budget_tokens: int = 1500,
+                fields: Optional[Iterable[str]] = None) -> str:
+        """
+        Serialize data as compact JSON that fits within budget_tokens
+
+        Args:
+            data: JSON-like payload (dicts, lists, scalars)
+            budget_tokens: Maximum estimated tokens for the result
+            fields: Keys to keep, at any depth (containers included); None keeps all
+
+        Returns:
+            Compact JSON string; still valid JSON when elements had to be dropped
+        """
+        digests: Dict[int, Optional[str]] = {}
+        projected: Any = None
+        for max_items, max_str in COMPACTION_LEVELS:
+            projected = self.project(data, max_items=max_items, max_str=max_str,
+                                     fields=fields, digests=digests)
+            text = _dumps(projected)
+            if estimate_tokens(text) <= budget_tokens:
+                return text
+
+        # Still too large: keep the widest element count per container that fits
+        low, high = 0, _widest(projected)
+        while low < high:
+            width = (low + high + 1) // 2
+            if estimate_tokens(_dumps(self._truncate(projected, width))) <= budget_tokens:
+                low = width
+            else:
+                high = width - 1
+        text = _dumps(self._truncate(projected, low))
+        logger.debug(f"Prompt payload truncated to {low} elements per container "
+                     f"({estimate_tokens(text)} tokens)")
+        return text
+
+    def project(self, data: Any, max_items: int = 20, max_str: int = 80,
+                fields: Optional[Iterable[str]] = None,
+                digests: Optional[Dict[int, Optional[str]]] = None) -> Any:
+        """
+        Keep the requested fields, tabulate repeated records and dedupe subtrees
+
+        digests caches subtree hashes by object id so repeated projections of
+        the same data hash each subtree once.
+        """
+        seen: Dict[str, str] = {}
+        keep = frozenset(fields) if fields is not None else None
+        if digests is None:
+            digests = {}
+        return self._project(data, "$", seen, digests, max_items, max_str, keep)
+
+    def _project(self, value: Any, path: str, seen: Dict[str, str], digests: Dict[int, Optional[str]],
+                 max_items: int, max_str: int, keep: Optional[AbstractSet[str]]) -> Any:
+        if isinstance(value, dict):
+            ref = self._dedupe(value, path, seen, digests)
+            if ref:
+                return ref
+            result = {}
+            for key, item in value.items():
+                if (keep is not None and key not in keep) or item in (None, "", [], {}):
+                    continue
+                result[key] = self._project(item, f"{path}.{key}", seen, digests, max_items, max_str, keep)
+            return result
+
+        if isinstance(value, list):
+            ref = self._dedupe(value, path, seen, digests)
+            if ref:
+                return ref
+            return self._project_list(value, path, seen, digests, max_items, max_str, keep)
+
+        if isinstance(value, str) and len(value) > max_str:
+            return value[:max_str] + "..."
+
+        return value
+
+    def _project_list(self, items: List[Any], path: str, seen: Dict[str, str],
+                      digests: Dict[int, Optional[str]], max_items: int, max_str: int,
+                      keep: Optional[AbstractSet[str]]) -> Any:
+        kept = items[:max_items]
+        projected = [
+            self._project(item, f"{path}[{i}]", seen, digests, max_items, max_str, keep)
+            for i, item in enumerate(kept)
+        ]
+
+        # Homogeneous records (e.g. validators) become a table so keys are written once
+        if len(projected) >= 3 and all(isinstance(p, dict) for p in projected):
+            columns = list(projected[0].keys())
+            if columns and all(list(p.keys()) == columns for p in projected):
+                table: Dict[str, Any] = {
+                    "columns": columns,
+                    "rows": [[p[c] for c in columns] for p in projected],
+                }
+                if len(items) > len(kept):
+                    table["omitted"] = len(items) - len(kept)
+                return table
+
+        if len(items) > len(kept):
+            projected.append(f"... {len(items) - len(kept)} more")
+        return projected
+
+    def _dedupe(self, value: Any, path: str, seen: Dict[str, str],
+                digests: Dict[int, Optional[str]]) -> Optional[str]:
+        """Return a back-reference if an identical large subtree was already emitted"""
+        key = id(value)
+        if key not in digests:
+            digests[key] = _digest(value)
+        digest = digests[key]
+        if digest is None:
+            return None
+        if digest in seen:
+            return f"<same as {seen[digest]}>"
+        seen[digest] = path
+        return None
+
+    def _truncate(self, value: Any, width: int) -> Any:
+        """Keep the first width elements of every container, noting what was dropped"""
+        if isinstance(value, dict):
+            if isinstance(value.get("columns"), list) and isinstance(value.get("rows"), list):
+                # Table from _project_list: drop rows, never columns or cells
+                rows = value["rows"]
+                table: Dict[str, Any] = {
+                    "columns": value["columns"],
+                    "rows": [[self._truncate(cell, width) for cell in row] for row in rows[:width]],
+                }
+                omitted = value.get("omitted", 0) + len(rows) - len(table["rows"])
+                if omitted:
+                    table["omitted"] = omitted
+                return table
+            items = list(value.items())
+            result = {key: self._truncate(item, width) for key, item in items[:width]}
+            if len(items) > width:
+                result["..."] = f"{len(items) - width} more keys"
+            return result
+
+        if isinstance(value, list):
+            result_list = [self._truncate(item, width) for item in value[:width]]
+            if len(value) > width:
+                result_list.append(f"... {len(value) - width} more")
+            return result_list
+
+        return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _digest(value: Any) -> Optional[str]:
+    """Hash of a subtree, or None when it is too small to be worth referencing"""
+    try:
+        serialized = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        return None
+    if len(serialized) < 64:
+        return None
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def _widest(value: Any) -> int:
+    """Largest element count of any container in a projected payload"""
+    if isinstance(value, dict):
+        own = len(value["rows"]) if isinstance(value.get("rows"), list) else len(value)
+        return max([own] + [_widest(item) for item in value.values()])
+    if isinstance(value, list):
+        return max([len(value)] + [_widest(item) for item in value])
+    return 0
+
+
+# Global compactor instance
+_prompt_compactor = None
+
+
+def get_prompt_compactor() -> PromptCompactor:
+    """Get the global prompt compactor instance"""
+    global _prompt_compactor
+    if _prompt_compactor is None:
+        _prompt_compactor = PromptCompactor()
+    return _prompt_compactor
+
+
+def compact_for_prompt(data: Any, budget_tokens: int = 1500,
+                       fields: Optional[Iterable[str]] = None) -> str:
+    """
+    Compact a JSON payload for embedding in a prompt
+
+    Args:
+        data: JSON-like payload
+        budget_tokens: Maximum estimated tokens for the result
+        fields: Keys the calling analysis reads (containers included); None keeps all
+    """
+    return get_prompt_compactor().compact(data, budget_tokens=budget_tokens, fields=fields)
@@ -1,26 +1,42 @@
 """
 Direct RPC Service for Daodiseo Testnet
 Fetches real-time data from testnet-rpc.daodiseo.chaintools.tech
+Every getter has an async twin (aget_*) for the ASGI gateway; both share the
+same response shaping.
 """
 
+import asyncio
 import logging
+import os
 import requests
 import json
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from src.gateways.http_client import get_async_http_client
+from src.services.chain_indexer import get_chain_indexer
+from src.services.chain_snapshot import ChainSnapshotService, get_chain_snapshot
+
 logger = logging.getLogger(__name__)
 
 class DaodiseoRPCService:
     """Direct RPC service for fetching real blockchain data"""
     
-    def __init__(self):
+    def __init__(self, snapshot: Optional[ChainSnapshotService] = None):
         self.rpc_base = "https://testnet-rpc.daodiseo.chaintools.tech"
         self.session = requests.Session()
         self.session.timeout = 10
+        self.snapshot = snapshot or get_chain_snapshot()
         
+    def _snapshot_resource(self, endpoint: str, params: Dict = None) -> bool:
+        spec = self.snapshot.resources.get(endpoint)
+        return spec is not None and spec[0] == "rpc" and (params or None) == spec[2]
+    
     def _make_rpc_call(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        """Make RPC call to testnet"""
+        """Make RPC call to testnet (shared snapshot resources are served from memory)"""
+        if self._snapshot_resource(endpoint, params):
+            return self.snapshot.get(endpoint)
+        
         try:
             url = f"{self.rpc_base}/{endpoint}"
             if params:
@@ -35,103 +51,201 @@ class DaodiseoRPCService:
             logger.error(f"RPC call failed for {endpoint}: {e}")
             return None
     
+    async def _amake_rpc_call(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Async _make_rpc_call on the shared async HTTP client"""
+        if self._snapshot_resource(endpoint, params):
+            payload = self.snapshot.peek(endpoint)
+            if payload is not None:
+                return payload
+            # Missing or expired: one single-flight refresh, off the event loop
+            return await asyncio.to_thread(self.snapshot.get, endpoint)
+        
+        try:
+            response = await get_async_http_client().get(f"{self.rpc_base}/{endpoint}", params=params)
+            response.raise_for_status()
+            return response.json()
+            
+        except Exception as e:
+            logger.error(f"RPC call failed for {endpoint}: {e}")
+            return None
+    
     def get_network_status(self) -> Dict[str, Any]:
         """Get current network status and health"""
         try:
             status_data = self._make_rpc_call("status")
             health_data = self._make_rpc_call("health")
+            return self._network_status_result(status_data, health_data)
             
-            if not status_data or 'result' not in status_data:
-                return {"success": False, "error": "No status data available"}
-                
-            result = status_data['result']
-            node_info = result.get('node_info', {})
-            sync_info = result.get('sync_info', {})
-            
-            return {
-                "success": True,
-                "data": {
-                    "block_height": int(sync_info.get('latest_block_height', 0)),
-                    "block_time": sync_info.get('latest_block_time', ''),
-                    "network": node_info.get('network', 'ithaca-1'),
-                    "node_version": node_info.get('version', ''),
-                    "catching_up": sync_info.get('catching_up', False),
-                    "health_status": "healthy" if health_data else "unknown",
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+        except Exception as e:
+            logger.error(f"Failed to get network status: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_network_status(self) -> Dict[str, Any]:
+        """Async get_network_status"""
+        try:
+            status_data, health_data = await asyncio.gather(
+                self._amake_rpc_call("status"), self._amake_rpc_call("health")
+            )
+            return self._network_status_result(status_data, health_data)
             
         except Exception as e:
             logger.error(f"Failed to get network status: {e}")
             return {"success": False, "error": str(e)}
     
+    def _network_status_result(self, status_data, health_data) -> Dict[str, Any]:
+        if not status_data or 'result' not in status_data:
+            return {"success": False, "error": "No status data available"}
+            
+        result = status_data['result']
+        node_info = result.get('node_info', {})
+        sync_info = result.get('sync_info', {})
+        
+        return {
+            "success": True,
+            "data": {
+                "block_height": int(sync_info.get('latest_block_height', 0)),
+                "block_time": sync_info.get('latest_block_time', ''),
+                "network": node_info.get('network', 'ithaca-1'),
+                "node_version": node_info.get('version', ''),
+                "catching_up": sync_info.get('catching_up', False),
+                "health_status": "healthy" if health_data else "unknown",
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
     def get_validators(self, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
         """Get current validators"""
         try:
             params = {"page": page, "per_page": per_page}
             validators_data = self._make_rpc_call("validators", params)
+            return self._validators_result(validators_data)
             
-            if not validators_data or 'result' not in validators_data:
-                return {"success": False, "error": "No validators data available"}
-                
-            result = validators_data['result']
-            validators = result.get('validators', [])
-            
-            processed_validators = []
-            for validator in validators:
-                processed_validators.append({
-                    "address": validator.get('address', ''),
-                    "pub_key": validator.get('pub_key', {}).get('value', ''),
-                    "voting_power": int(validator.get('voting_power', 0)),
-                    "proposer_priority": int(validator.get('proposer_priority', 0))
-                })
-            
-            return {
-                "success": True,
-                "data": {
-                    "validators": processed_validators,
-                    "total": result.get('total', len(processed_validators)),
-                    "count": result.get('count', len(processed_validators)),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+        except Exception as e:
+            logger.error(f"Failed to get validators: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_validators(self, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
+        """Async get_validators"""
+        try:
+            validators_data = await self._amake_rpc_call("validators", {"page": page, "per_page": per_page})
+            return self._validators_result(validators_data)
             
         except Exception as e:
             logger.error(f"Failed to get validators: {e}")
             return {"success": False, "error": str(e)}
     
+    def _validators_result(self, validators_data) -> Dict[str, Any]:
+        if not validators_data or 'result' not in validators_data:
+            return {"success": False, "error": "No validators data available"}
+            
+        result = validators_data['result']
+        validators = result.get('validators', [])
+        
+        processed_validators = []
+        for validator in validators:
+            processed_validators.append({
+                "address": validator.get('address', ''),
+                "pub_key": validator.get('pub_key', {}).get('value', ''),
+                "voting_power": int(validator.get('voting_power', 0)),
+                "proposer_priority": int(validator.get('proposer_priority', 0))
+            })
+        
+        return {
+            "success": True,
+            "data": {
+                "validators": processed_validators,
+                "total": result.get('total', len(processed_validators)),
+                "count": result.get('count', len(processed_validators)),
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
     def get_latest_block(self) -> Dict[str, Any]:
         """Get latest block information"""
         try:
             block_data = self._make_rpc_call("block")
+            return self._latest_block_result(block_data)
             
-            if not block_data or 'result' not in block_data:
-                return {"success": False, "error": "No block data available"}
-                
-            result = block_data['result']
-            block = result.get('block', {})
-            header = block.get('header', {})
-            
-            return {
-                "success": True,
-                "data": {
-                    "height": int(header.get('height', 0)),
-                    "time": header.get('time', ''),
-                    "chain_id": header.get('chain_id', ''),
-                    "proposer_address": header.get('proposer_address', ''),
-                    "num_txs": len(block.get('data', {}).get('txs', [])),
-                    "block_hash": result.get('block_id', {}).get('hash', ''),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+        except Exception as e:
+            logger.error(f"Failed to get latest block: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_latest_block(self) -> Dict[str, Any]:
+        """Async get_latest_block"""
+        try:
+            block_data = await self._amake_rpc_call("block")
+            return self._latest_block_result(block_data)
             
         except Exception as e:
             logger.error(f"Failed to get latest block: {e}")
             return {"success": False, "error": str(e)}
     
+    def _latest_block_result(self, block_data) -> Dict[str, Any]:
+        if not block_data or 'result' not in block_data:
+            return {"success": False, "error": "No block data available"}
+            
+        result = block_data['result']
+        block = result.get('block', {})
+        header = block.get('header', {})
+        
+        return {
+            "success": True,
+            "data": {
+                "height": int(header.get('height', 0)),
+                "time": header.get('time', ''),
+                "chain_id": header.get('chain_id', ''),
+                "proposer_address": header.get('proposer_address', ''),
+                "num_txs": len(block.get('data', {}).get('txs', [])),
+                "block_hash": result.get('block_id', {}).get('hash', ''),
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
+    def get_recent_block_times(self, count: int = 20) -> Dict[str, Any]:
+        """Get header times of the most recent blocks"""
+        try:
+            chain_data = self._make_rpc_call("blockchain")
+            return self._recent_block_times_result(chain_data, count)
+            
+        except Exception as e:
+            logger.error(f"Failed to get recent block times: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_recent_block_times(self, count: int = 20) -> Dict[str, Any]:
+        """Async get_recent_block_times"""
+        try:
+            chain_data = await self._amake_rpc_call("blockchain")
+            return self._recent_block_times_result(chain_data, count)
+            
+        except Exception as e:
+            logger.error(f"Failed to get recent block times: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _recent_block_times_result(self, chain_data, count) -> Dict[str, Any]:
+        if not chain_data or 'result' not in chain_data:
+            return {"success": False, "error": "No blockchain data available"}
+            
+        block_metas = chain_data['result'].get('block_metas', [])[:count]
+        
+        return {
+            "success": True,
+            "data": {
+                "block_times": [
+                    meta.get('header', {}).get('time', '')
+                    for meta in block_metas
+                ],
+                "last_height": int(chain_data['result'].get('last_height', 0)),
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
     def search_transactions(self, query: str = "tx.height>0", page: int = 1, per_page: int = 30) -> Dict[str, Any]:
-        """Search for transactions"""
+        """Search for transactions (answered by the local chain index when it can)"""
         try:
+            indexed = self._search_index(query, page, per_page)
+            if indexed is not None:
+                return indexed
+            
             params = {
                 "query": query,
                 "page": page,
@@ -139,97 +253,174 @@ class DaodiseoRPCService:
                 "order_by": "desc"
             }
             tx_data = self._make_rpc_call("tx_search", params)
+            return self._search_transactions_result(tx_data)
             
-            if not tx_data or 'result' not in tx_data:
-                return {"success": False, "error": "No transaction data available"}
-                
-            result = tx_data['result']
-            txs = result.get('txs', [])
-            
-            processed_txs = []
-            for tx in txs:
-                tx_result = tx.get('tx_result', {})
-                processed_txs.append({
-                    "hash": tx.get('hash', ''),
-                    "height": int(tx.get('height', 0)),
-                    "index": int(tx.get('index', 0)),
-                    "tx": tx.get('tx', ''),
-                    "result_code": tx_result.get('code', 0),
-                    "gas_wanted": int(tx_result.get('gas_wanted', 0)),
-                    "gas_used": int(tx_result.get('gas_used', 0)),
-                    "events": tx_result.get('events', [])
-                })
-            
-            return {
-                "success": True,
-                "data": {
-                    "transactions": processed_txs,
-                    "total_count": int(result.get('total_count', 0)),
-                    "updated_at": datetime.now().isoformat()
-                }
+        except Exception as e:
+            logger.error(f"Failed to search transactions: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def asearch_transactions(self, query: str = "tx.height>0", page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+        """Async search_transactions"""
+        try:
+            indexed = await asyncio.to_thread(self._search_index, query, page, per_page)
+            if indexed is not None:
+                return indexed
+            
+            params = {
+                "query": query,
+                "page": page,
+                "per_page": per_page,
+                "order_by": "desc"
             }
+            tx_data = await self._amake_rpc_call("tx_search", params)
+            return self._search_transactions_result(tx_data)
             
         except Exception as e:
             logger.error(f"Failed to search transactions: {e}")
             return {"success": False, "error": str(e)}
     
+    def _search_index(self, query: str, page: int, per_page: int) -> Optional[Dict[str, Any]]:
+        if os.environ.get("CHAIN_INDEXER", "1") == "0":
+            return None
+        try:
+            found = get_chain_indexer().search(query, page, per_page)
+        except Exception as e:
+            logger.warning(f"Chain index search failed, using tx_search: {e}")
+            return None
+        if found is None:
+            return None
+        
+        txs, total = found
+        return {
+            "success": True,
+            "data": {
+                "transactions": [{
+                    "hash": tx["hash"],
+                    "height": tx["height"],
+                    "index": tx["idx"],
+                    "tx": tx["tx"],
+                    "result_code": tx["code"],
+                    "gas_wanted": tx["gas_wanted"],
+                    "gas_used": tx["gas_used"],
+                    "events": tx["events"]
+                } for tx in txs],
+                "total_count": total,
+                "source": "index",
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
+    def _search_transactions_result(self, tx_data) -> Dict[str, Any]:
+        if not tx_data or 'result' not in tx_data:
+            return {"success": False, "error": "No transaction data available"}
+            
+        result = tx_data['result']
+        txs = result.get('txs', [])
+        
+        processed_txs = []
+        for tx in txs:
+            tx_result = tx.get('tx_result', {})
+            processed_txs.append({
+                "hash": tx.get('hash', ''),
+                "height": int(tx.get('height', 0)),
+                "index": int(tx.get('index', 0)),
+                "tx": tx.get('tx', ''),
+                "result_code": tx_result.get('code', 0),
+                "gas_wanted": int(tx_result.get('gas_wanted', 0)),
+                "gas_used": int(tx_result.get('gas_used', 0)),
+                "events": tx_result.get('events', [])
+            })
+        
+        return {
+            "success": True,
+            "data": {
+                "transactions": processed_txs,
+                "total_count": int(result.get('total_count', 0)),
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
     def get_network_info(self) -> Dict[str, Any]:
         """Get network peer information"""
         try:
             net_info = self._make_rpc_call("net_info")
+            return self._network_info_result(net_info)
             
-            if not net_info or 'result' not in net_info:
-                return {"success": False, "error": "No network info available"}
-                
-            result = net_info['result']
-            peers = result.get('peers', [])
-            
-            return {
-                "success": True,
-                "data": {
-                    "listening": result.get('listening', False),
-                    "n_peers": int(result.get('n_peers', 0)),
-                    "peer_count": len(peers),
-                    "peers": [
-                        {
-                            "node_id": peer.get('node_info', {}).get('id', ''),
-                            "remote_ip": peer.get('remote_ip', ''),
-                            "network": peer.get('node_info', {}).get('network', '')
-                        }
-                        for peer in peers[:5]  # Limit to first 5 peers
-                    ],
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+        except Exception as e:
+            logger.error(f"Failed to get network info: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_network_info(self) -> Dict[str, Any]:
+        """Async get_network_info"""
+        try:
+            net_info = await self._amake_rpc_call("net_info")
+            return self._network_info_result(net_info)
             
         except Exception as e:
             logger.error(f"Failed to get network info: {e}")
             return {"success": False, "error": str(e)}
     
+    def _network_info_result(self, net_info) -> Dict[str, Any]:
+        if not net_info or 'result' not in net_info:
+            return {"success": False, "error": "No network info available"}
+            
+        result = net_info['result']
+        peers = result.get('peers', [])
+        
+        return {
+            "success": True,
+            "data": {
+                "listening": result.get('listening', False),
+                "n_peers": int(result.get('n_peers', 0)),
+                "peer_count": len(peers),
+                "peers": [
+                    {
+                        "node_id": peer.get('node_info', {}).get('id', ''),
+                        "remote_ip": peer.get('remote_ip', ''),
+                        "network": peer.get('node_info', {}).get('network', '')
+                    }
+                    for peer in peers[:5]  # Limit to first 5 peers
+                ],
+                "updated_at": datetime.now().isoformat()
+            }
+        }
+    
     def get_consensus_state(self) -> Dict[str, Any]:
         """Get consensus state information"""
         try:
             consensus_data = self._make_rpc_call("consensus_state")
+            return self._consensus_state_result(consensus_data)
             
-            if not consensus_data or 'result' not in consensus_data:
-                return {"success": False, "error": "No consensus data available"}
-                
-            result = consensus_data['result']
-            round_state = result.get('round_state', {})
-            
-            return {
-                "success": True,
-                "data": {
-                    "height": int(round_state.get('height', 0)),
-                    "round": int(round_state.get('round', 0)),
-                    "step": round_state.get('step', 0),
-                    "start_time": round_state.get('start_time', ''),
-                    "commit_time": round_state.get('commit_time', ''),
-                    "validators": round_state.get('validators', {}),
-                    "updated_at": datetime.now().isoformat()
-                }
-            }
+        except Exception as e:
+            logger.error(f"Failed to get consensus state: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def aget_consensus_state(self) -> Dict[str, Any]:
+        """Async get_consensus_state"""
+        try:
+            consensus_data = await self._amake_rpc_call("consensus_state")
+            return self._consensus_state_result(consensus_data)
             
         except Exception as e:
             logger.error(f"Failed to get consensus state: {e}")
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    def _consensus_state_result(self, consensus_data) -> Dict[str, Any]:
+        if not consensus_data or 'result' not in consensus_data:
+            return {"success": False, "error": "No consensus data available"}
+            
+        result = consensus_data['result']
+        round_state = result.get('round_state', {})
+        
+        return {
+            "success": True,
+            "data": {
+                "height": int(round_state.get('height', 0)),
+                "round": int(round_state.get('round', 0)),
+                "step": round_state.get('step', 0),
+                "start_time": round_state.get('start_time', ''),
+                "commit_time": round_state.get('commit_time', ''),
+                "validators": round_state.get('validators', {}),
+                "updated_at": datetime.now().isoformat()
+            }
+        }
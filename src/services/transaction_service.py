@@ -7,6 +7,8 @@ import json
 import logging
 import base64
 
+from src.services.account_state_cache import get_account_state_cache, signer_address
+
 
 class TransactionService:
     def __init__(self):
@@ -73,43 +75,17 @@ class TransactionService:
             self.logger.debug(f"Message data: {msg}")
             self.logger.debug(f"Account data: {account_data}")
 
-            # If account_data is not provided, fetch it from the chain
+            # If account_data is not provided, take it from the account state
+            # cache, which only goes to the chain on a miss
             if not account_data:
                 try:
-                    from cosmpy.crypto.address import Address
-
-                    addr = Address(sender_address)
-                    self.logger.debug(
-                        f"Fetching account data for address: {sender_address}"
-                    )
-                    account = self.client.query_account(addr)
-
-                    # Extract account data
-                    if hasattr(account, "sequence"):
-                        account_data = {
-                            "account_number": str(
-                                getattr(account, "account_number", "0")
-                            ),
-                            "sequence": str(account.sequence),
-                            "address": sender_address,
-                        }
-                    elif hasattr(account, "base_vesting_account"):
-                        base_account = account.base_vesting_account.base_account
-                        account_data = {
-                            "account_number": str(
-                                getattr(base_account, "account_number", "0")
-                            ),
-                            "sequence": str(getattr(base_account, "sequence", "0")),
-                            "address": sender_address,
-                        }
-                    else:
-                        # Default values if structure is unknown
-                        account_data = {
-                            "account_number": "0",
-                            "sequence": "0",
-                            "address": sender_address,
-                        }
-                    self.logger.debug(f"Fetched account data: {account_data}")
+                    state = get_account_state_cache().get(sender_address)
+                    account_data = {
+                        "account_number": state["account_number"],
+                        "sequence": state["sequence"],
+                        "address": sender_address,
+                    }
+                    self.logger.debug(f"Account data: {account_data}")
                 except Exception as account_error:
                     self.logger.error(
                         f"Error fetching account data: {str(account_error)}"
@@ -392,6 +368,10 @@ class TransactionService:
                 self.logger.debug(f"Broadcast response: {json.dumps(result, indent=2)}")
 
                 tx_response = result.get("tx_response", {})
+                signer = signer_address(tx["msg"])
+                if signer:
+                    get_account_state_cache().record_broadcast(signer, tx_response)
+
                 if tx_response.get("code", 0) != 0:
                     error_msg = f"Transaction broadcast failed: {tx_response.get('raw_log', 'Unknown error')}"
                     self.logger.error(error_msg)
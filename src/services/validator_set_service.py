@@ -0,0 +1,293 @@
+"""
+Validator Set Service
+The complete validator set at one block height. CometBFT /validators pages
+(consensus keys, voting power, proposer priority) and Cosmos SDK staking
+validator pages (operator, moniker, tokens, commission, jail status) are
+fetched in parallel at the same height, merged by consensus public key, and
+cached per height,
+so staking analytics see every validator without sequential page walks.
+"""
+
+import base64
+import hashlib
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest page CometBFT serves for /validators
+RPC_MAX_PER_PAGE = 100
+
+STAKING_VALIDATORS_PATH = "cosmos/staking/v1beta1/validators"
+
+# gRPC-gateway header that makes a REST query read state at a given height
+HEIGHT_HEADER = "x-cosmos-block-height"
+
+# (base, path, params[, headers]) -> JSON
+Fetcher = Callable[..., Dict[str, Any]]
+
+
+def consensus_address(pub_key: str) -> str:
+    """CometBFT address of an ed25519 consensus key (first 20 bytes of its SHA-256)"""
+    try:
+        return hashlib.sha256(base64.b64decode(pub_key)).hexdigest()[:40].upper()
+    except (ValueError, TypeError):
+        return ""
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def merge_validators(consensus: List[Dict[str, Any]], staking: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Join consensus and staking validators on the consensus public key
+
+    Args:
+        consensus: CometBFT /validators entries
+        staking: Cosmos SDK staking validator entries
+
+    Returns:
+        list: One record per validator, highest voting power (then tokens) first
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    for validator in consensus:
+        pub_key = validator.get("pub_key", {}).get("value", "")
+        merged[pub_key] = {
+            "address": validator.get("address", "") or consensus_address(pub_key),
+            "pub_key": pub_key,
+            "voting_power": _int(validator.get("voting_power")),
+            "proposer_priority": _int(validator.get("proposer_priority")),
+            "active": True,
+            "operator_address": None,
+            "moniker": None,
+            "status": None,
+            "jailed": None,
+            "tokens": None,
+            "delegator_shares": None,
+            "commission_rate": None,
+        }
+
+    for validator in staking:
+        pub_key = validator.get("consensus_pubkey", {}).get("key", "")
+        record = merged.get(pub_key)
+        if record is None:
+            # Bonded-but-outside-the-active-set, unbonding and unbonded validators
+            record = merged[pub_key] = {
+                "address": consensus_address(pub_key),
+                "pub_key": pub_key,
+                "voting_power": 0,
+                "proposer_priority": None,
+                "active": False,
+            }
+        record.update({
+            "operator_address": validator.get("operator_address", ""),
+            "moniker": validator.get("description", {}).get("moniker", "Unknown Validator"),
+            "status": validator.get("status", "BOND_STATUS_UNSPECIFIED"),
+            "jailed": bool(validator.get("jailed", False)),
+            "tokens": validator.get("tokens", "0"),
+            "delegator_shares": validator.get("delegator_shares", "0"),
+            "commission_rate": _float(
+                validator.get("commission", {}).get("commission_rates", {}).get("rate")
+            ),
+        })
+
+    return sorted(merged.values(), key=lambda v: (v["voting_power"], _int(v.get("tokens"))), reverse=True)
+
+
+class ValidatorSetService:
+    """Parallel, paginated validator fetching with a per-height cache"""
+
+    def __init__(
+        self,
+        fetcher: Optional[Fetcher] = None,
+        head_height: Optional[Callable[[], Optional[int]]] = None,
+        rest_page_size: int = 200,
+        max_pages: int = 50,
+        max_workers: int = 8,
+        cached_heights: int = 4,
+    ):
+        """
+        Initialize the service
+
+        Args:
+            fetcher: Callable(base, path, params[, headers]) -> JSON dict, base being
+                "rpc" or "rest"; REST calls pass headers pinning the height.
+                Defaults to the endpoint pools on the shared HTTP client
+            head_height: Callable returning the latest known block height, so a
+                cached set for that height is served without any upstream call
+            rest_page_size: Staking validators per REST page
+            max_pages: Upper bound on pages fetched per source
+            max_workers: Concurrent page fetches
+            cached_heights: Number of heights kept in the cache
+        """
+        self._fetch = fetcher or _pool_fetch
+        self._head_height = head_height or (lambda: None)
+        self.rest_page_size = rest_page_size
+        self.max_pages = max_pages
+        self.cached_heights = cached_heights
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="validator-set")
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "page_fetches": 0, "errors": 0}
+
+    def get_validator_set(self, height: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the merged validator set
+
+        Args:
+            height: Block height; defaults to the latest
+
+        Returns:
+            Dict: {"success", "data": {"height", "validators", "total", "count", ...}}
+        """
+        height = height or self._head_height()
+        cached = self._cached(height)
+        if cached is not None:
+            return {"success": True, "data": cached}
+
+        # One refresh at a time; callers that waited usually find it cached
+        with self._refresh_lock:
+            cached = self._cached(height, count=False)
+            if cached is not None:
+                return {"success": True, "data": cached}
+            try:
+                data = self._load(height)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Failed to load validator set: {e}")
+                return {"success": False, "error": str(e)}
+
+        with self._lock:
+            self._cache[data["height"]] = data
+            while len(self._cache) > self.cached_heights:
+                self._cache.popitem(last=False)
+        return {"success": True, "data": data}
+
+    def _cached(self, height: Optional[int], count: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._cache.get(height) if height is not None else None
+            if count:
+                self._stats["hits" if data is not None else "misses"] += 1
+            return data
+
+    def _load(self, height: Optional[int]) -> Dict[str, Any]:
+        # First pages of both sources together when the height is known; they
+        # carry the totals. Otherwise the first consensus page names the height
+        # the staking pages are pinned to.
+        staking_first = self._executor.submit(self._staking_page, 0, height) if height else None
+        consensus_first = self._consensus_page(1, height)
+        result = consensus_first.get("result", {})
+        height = _int(result.get("block_height")) or height
+        if staking_first is None:
+            staking_first = self._executor.submit(self._staking_page, 0, height)
+
+        consensus_pages = min(math.ceil(_int(result.get("total")) / RPC_MAX_PER_PAGE), self.max_pages)
+        consensus_rest = [self._executor.submit(self._consensus_page, page, height)
+                          for page in range(2, consensus_pages + 1)]
+
+        staking = []
+        staking_ok = True
+        try:
+            first = staking_first.result()
+            total = _int(first.get("pagination", {}).get("total"))
+            staking_pages = min(math.ceil(total / self.rest_page_size), self.max_pages)
+            staking_rest = [self._executor.submit(self._staking_page, page * self.rest_page_size, height)
+                            for page in range(1, staking_pages)]
+            staking = first.get("validators", [])
+            for future in staking_rest:
+                staking.extend(future.result().get("validators", []))
+        except Exception as e:
+            # The consensus set alone still serves voting-power analytics
+            staking_ok = False
+            self._stats["errors"] += 1
+            logger.warning(f"Staking validators unavailable, serving consensus set only: {e}")
+
+        consensus = list(result.get("validators", []))
+        for future in consensus_rest:
+            consensus.extend(future.result().get("result", {}).get("validators", []))
+
+        validators = merge_validators(consensus, staking)
+        return {
+            "height": height,
+            "validators": validators,
+            "total": len(validators),
+            "count": len(validators),
+            "active_count": len(consensus),
+            "total_voting_power": sum(v["voting_power"] for v in validators),
+            "sources": {"consensus": True, "staking": staking_ok},
+            "updated_at": datetime.now().isoformat(),
+        }
+
+    def _consensus_page(self, page: int, height: Optional[int]) -> Dict[str, Any]:
+        params = {"page": page, "per_page": RPC_MAX_PER_PAGE}
+        if height:
+            params["height"] = height
+        self._stats["page_fetches"] += 1
+        return self._fetch("rpc", "validators", params)
+
+    def _staking_page(self, offset: int, height: Optional[int]) -> Dict[str, Any]:
+        params = {
+            "pagination.limit": self.rest_page_size,
+            "pagination.offset": offset,
+            "pagination.count_total": "true",
+        }
+        # Same state as the consensus pages, so jail status and tokens match the voting power
+        headers = {HEIGHT_HEADER: str(height)} if height else None
+        self._stats["page_fetches"] += 1
+        return self._fetch("rest", STAKING_VALIDATORS_PATH, params, headers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "cached_heights": list(self._cache)}
+
+
+def _pool_fetch(base: str, path: str, params: Optional[Dict[str, Any]],
+                headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    from src.gateways.endpoint_pool import get_rest_endpoint_pool, get_rpc_endpoint_pool
+    from src.gateways.http_client import get_http_client
+
+    pool = get_rest_endpoint_pool() if base == "rest" else get_rpc_endpoint_pool()
+    http = get_http_client()
+    response, _ = pool.call(lambda base_url: http.get(f"{base_url}/{path}", params=params, headers=headers))
+    return response.json()
+
+
+def _snapshot_height() -> Optional[int]:
+    from src.services.chain_snapshot import get_chain_snapshot
+    return get_chain_snapshot().height
+
+
+# Global service instance
+_validator_set_service = None
+_validator_set_lock = threading.Lock()
+
+
+def get_validator_set_service() -> ValidatorSetService:
+    """Get the shared validator set service, keyed to the chain snapshot height"""
+    global _validator_set_service
+    with _validator_set_lock:
+        if _validator_set_service is None:
+            _validator_set_service = ValidatorSetService(
+                head_height=_snapshot_height,
+                max_workers=int(os.environ.get("VALIDATOR_SET_WORKERS", "8")),
+            )
+    return _validator_set_service
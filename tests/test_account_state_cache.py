@@ -0,0 +1,211 @@
+"""
+Tests for the account number / sequence cache used when preparing sign docs
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from src.services.account_state_cache import (
+    AccountStateCache,
+    broadcast_outcome,
+    is_sequence_mismatch,
+    parse_account,
+    signer_address,
+    tx_signer,
+)
+
+RECORDING = os.path.join(os.path.dirname(__file__), "fixtures", "chain_rpc_recording.json")
+
+ALICE = "odiseo1alice000000000000000000000000000000"
+BOB = "odiseo1bob0000000000000000000000000000000"
+
+
+class FakeAuth:
+    """Serves /cosmos/auth/v1beta1/accounts responses from an in-memory ledger"""
+
+    def __init__(self, delay=0.0, down=()):
+        self.ledger = {ALICE: (7, 3), BOB: (9, 0)}
+        self.delay = delay
+        self.down = set(down)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, address):
+        with self.lock:
+            self.calls.append(address)
+        time.sleep(self.delay)
+        if address in self.down:
+            raise ConnectionError("REST node down")
+        if address not in self.ledger:
+            return None
+        number, sequence = self.ledger[address]
+        return {"account": {
+            "@type": "/cosmos.auth.v1beta1.BaseAccount",
+            "address": address,
+            "account_number": str(number),
+            "sequence": str(sequence),
+        }}
+
+
+@pytest.fixture
+def auth():
+    return FakeAuth()
+
+
+@pytest.fixture
+def cache(auth):
+    return AccountStateCache(fetcher=auth)
+
+
+class TestParsing:
+    """Test account response and broadcast result parsing"""
+
+    def test_account_shapes(self):
+        """Base, vesting and module accounts all yield number and sequence"""
+        base = {"account": {"account_number": "5", "sequence": "2"}}
+        vesting = {"account": {"base_vesting_account": {"base_account": {"account_number": "6", "sequence": "1"}}}}
+        module = {"account": {"base_account": {"account_number": "8", "sequence": "0"}, "name": "fee"}}
+
+        assert parse_account(base) == {"account_number": "5", "sequence": "2"}
+        assert parse_account(vesting) == {"account_number": "6", "sequence": "1"}
+        assert parse_account(module)["account_number"] == "8"
+
+    def test_signer_and_mismatch(self):
+        """The signer comes from the first message; code 32 or its log is a mismatch"""
+        assert signer_address([{"type": "cosmos-sdk/MsgSend", "value": {"from_address": ALICE}}]) == ALICE
+        assert signer_address([{"typeUrl": "/cosmos.bank.v1beta1.MsgSend", "value": {"fromAddress": BOB}}]) == BOB
+        assert signer_address([]) is None
+
+        assert is_sequence_mismatch({"code": 32})
+        assert is_sequence_mismatch({"code": 4, "raw_log": "account sequence mismatch, expected 4, got 3"})
+        assert not is_sequence_mismatch({"code": 5, "raw_log": "insufficient funds"})
+
+    def test_proxy_payloads_and_responses(self):
+        """Signers come from JSON or raw TxRaw bodies; REST and RPC responses normalize alike"""
+        with open(RECORDING) as f:
+            tx_b64 = json.load(f)["block"]["101"]["result"]["block"]["data"]["txs"][0]
+
+        assert tx_signer({"tx": tx_b64}) == ALICE
+        assert tx_signer({"tx": {"msg": [{"type": "cosmos-sdk/MsgSend", "value": {"from_address": BOB}}]}}) == BOB
+        assert tx_signer({"tx": "not base64 at all"}) is None
+
+        rpc = broadcast_outcome({"jsonrpc": "2.0", "result": {"code": 32, "log": "account sequence mismatch"}})
+        assert rpc["code"] == 32
+        rest = broadcast_outcome({"tx_response": {"code": 0, "txhash": "AB", "height": "0"}})
+        assert rest["txhash"] == "AB"
+        assert broadcast_outcome("HTTP 500: boom") == {"code": None, "raw_log": "HTTP 500: boom"}
+
+
+class TestAccountStateCache:
+    """Test caching, local sequence tracking and bulk fetches"""
+
+    def test_repeat_lookups_skip_the_network(self, cache, auth):
+        """Only the first lookup for an address is fetched"""
+        first = cache.get(ALICE)
+        second = cache.get(ALICE)
+
+        assert first == {"address": ALICE, "account_number": "7", "sequence": "3",
+                         "exists": True, "cached": False}
+        assert second["cached"] is True
+        assert auth.calls == [ALICE]
+
+    def test_successful_broadcast_advances_sequence(self, cache, auth):
+        """Accepted transactions bump the sequence without a refetch"""
+        cache.get(ALICE)
+        cache.record_broadcast(ALICE, {"code": 0, "txhash": "AB"})
+        cache.record_broadcast(ALICE, {"code": 0, "txhash": "CD"})
+
+        assert cache.get(ALICE)["sequence"] == "5"
+        assert auth.calls == [ALICE]
+
+    def test_failed_in_block_still_consumes_sequence(self, cache):
+        """A transaction that failed after inclusion used up its sequence"""
+        cache.get(ALICE)
+        cache.record_broadcast(ALICE, {"code": 11, "height": "120", "raw_log": "out of gas"})
+        cache.record_broadcast(ALICE, {"code": 5, "height": "0", "raw_log": "insufficient funds"})
+
+        assert cache.get(ALICE)["sequence"] == "4"
+
+    def test_mismatch_refetches_sequence_but_keeps_account_number(self, cache, auth):
+        """A sequence mismatch drops only the sequence; the next lookup reloads it"""
+        cache.get(ALICE)
+        cache.record_broadcast(ALICE, {"code": 0})
+        auth.ledger[ALICE] = (7, 10)
+
+        cache.record_broadcast(ALICE, {"code": 32, "raw_log": "account sequence mismatch, expected 10, got 4"})
+        state = cache.get(ALICE)
+
+        assert state == {"address": ALICE, "account_number": "7", "sequence": "10",
+                         "exists": True, "cached": False}
+        assert cache.get_stats()["invalidations"] == 1
+
+    def test_stale_sequence_is_refetched(self, auth):
+        """A sequence older than the TTL is confirmed against the chain"""
+        cache = AccountStateCache(fetcher=auth, sequence_ttl=0.0)
+        cache.get(BOB)
+        cache.get(BOB)
+        assert auth.calls == [BOB, BOB]
+
+    def test_unknown_account_is_not_cached(self, cache, auth):
+        """Addresses the chain has never seen sign with zeros and are asked again later"""
+        carol = "odiseo1carol00000000000000000000000000000"
+        assert cache.get(carol)["exists"] is False
+        assert cache.get(carol)["sequence"] == "0"
+        assert auth.calls == [carol, carol]
+
+    def test_concurrent_lookups_share_one_fetch(self):
+        """Callers racing on one address wait for a single upstream request"""
+        auth = FakeAuth(delay=0.05)
+        cache = AccountStateCache(fetcher=auth)
+
+        threads = [threading.Thread(target=cache.get, args=(ALICE,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert auth.calls == [ALICE]
+
+    def test_bulk_fetch_is_concurrent_and_reports_errors(self):
+        """Many addresses load in parallel; failures are reported per address"""
+        auth = FakeAuth(delay=0.05, down={"odiseo1down"})
+        for i in range(16):
+            auth.ledger[f"odiseo1user{i}"] = (100 + i, i)
+        cache = AccountStateCache(fetcher=auth, max_workers=8)
+        addresses = [f"odiseo1user{i}" for i in range(16)] + ["odiseo1down", "odiseo1user0"]
+
+        started = time.monotonic()
+        result = cache.get_many(addresses)
+        elapsed = time.monotonic() - started
+
+        assert result["success"] is False
+        assert len(result["data"]) == 16
+        assert result["data"]["odiseo1user3"]["sequence"] == "3"
+        assert "odiseo1down" in result["errors"]
+        assert elapsed < 0.05 * 17 / 2
+
+    def test_response_without_code_needs_txhash(self, cache):
+        """Error bodies and other code-less responses do not advance the sequence"""
+        cache.get(ALICE)
+        cache.record_broadcast(ALICE, {"error": "bad request"})
+        cache.record_broadcast(ALICE, {"height": "12345"})
+        assert cache.get(ALICE)["sequence"] == "3"
+
+        cache.record_broadcast(ALICE, {"txhash": "AB", "height": "120"})
+        assert cache.get(ALICE)["sequence"] == "4"
+
+    def test_proxied_broadcasts_update_the_signer(self, cache, auth):
+        """Proxy responses advance the signer; a mismatch in error text drops the sequence"""
+        body = {"tx": {"msg": [{"type": "cosmos-sdk/MsgSend", "value": {"from_address": ALICE}}]}}
+        cache.get(ALICE)
+
+        assert cache.record_tx_broadcast(body, {"jsonrpc": "2.0", "result": {"code": 0, "hash": "AB"}}) == ALICE
+        assert cache.get(ALICE)["sequence"] == "4"
+
+        cache.record_tx_broadcast(body, 'HTTP 400: {"code": 32, "message": "account sequence mismatch"}')
+        assert cache.get(ALICE)["cached"] is False
+        assert auth.calls == [ALICE, ALICE]
@@ -0,0 +1,168 @@
+"""
+Tests for the ASGI gateway that serves async proxy routes in front of Flask
+"""
+
+import asyncio
+import json
+
+import pytest
+from flask import Flask
+
+from src.middleware.asgi_gateway import AsyncGateway, json_response
+from src.security_utils import rate_limiter
+
+
+@pytest.fixture
+def flask_app():
+    app = Flask(__name__)
+    app.secret_key = "test-secret"
+    return app
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    rate_limiter.requests.clear()
+    yield
+    rate_limiter.requests.clear()
+
+
+class FakeFallback:
+    """ASGI app standing in for the wrapped Flask app"""
+
+    def __init__(self):
+        self.paths = []
+
+    async def __call__(self, scope, receive, send):
+        self.paths.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"flask"})
+
+
+def session_cookie(app, data):
+    return app.session_interface.get_signing_serializer(app).dumps(data)
+
+
+async def request(app, method, path, body=b"", headers=None, query=b""):
+    """Drive one HTTP request through an ASGI app; returns (status, headers, body)"""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("10.0.0.1", 5000),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start, body_message = sent
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], response_headers, body_message["body"]
+
+
+class TestAsyncGateway:
+    """Test routing, security checks and the Flask fallback"""
+
+    @pytest.mark.asyncio
+    async def test_routes_with_path_params_and_query(self, flask_app):
+        """Async handlers get path params and typed query args"""
+        gateway = AsyncGateway(flask_app, fallback=FakeFallback())
+
+        @gateway.route("/api/items/<item_id>")
+        async def item(req):
+            return json_response({"id": req.path_params["item_id"], "page": req.arg("page", 1, type=int)})
+
+        status, headers, body = await request(gateway, "GET", "/api/items/42", query=b"page=3")
+        assert status == 200
+        assert json.loads(body) == {"id": "42", "page": 3}
+        assert headers["access-control-allow-origin"] == "*"
+        assert headers["x-content-type-options"] == "nosniff"
+
+    @pytest.mark.asyncio
+    async def test_unmatched_paths_fall_through_to_flask(self, flask_app):
+        """Anything without an async route is served by the fallback"""
+        fallback = FakeFallback()
+        gateway = AsyncGateway(flask_app, fallback=fallback)
+
+        status, _, body = await request(gateway, "GET", "/dashboard")
+        assert body == b"flask"
+        assert fallback.paths == ["/dashboard"]
+
+    @pytest.mark.asyncio
+    async def test_post_requires_session_csrf_token(self, flask_app):
+        """POSTs are checked against the csrf_token in the Flask session cookie"""
+        gateway = AsyncGateway(flask_app, fallback=FakeFallback())
+
+        @gateway.route("/api/blockchain-proxy/rpc", methods=("POST", "OPTIONS"))
+        async def rpc(req):
+            return json_response(req.get_json())
+
+        status, _, _ = await request(gateway, "POST", "/api/blockchain-proxy/rpc", b'{"method": "status"}')
+        assert status == 403
+
+        cookie = session_cookie(flask_app, {"csrf_token": "tok"})
+        status, _, body = await request(
+            gateway, "POST", "/api/blockchain-proxy/rpc", b'{"method": "status"}',
+            headers={"Cookie": f"session={cookie}", "X-CSRF-Token": "tok"},
+        )
+        assert status == 200
+        assert json.loads(body) == {"method": "status"}
+
+    @pytest.mark.asyncio
+    async def test_options_preflight_and_handler_errors(self, flask_app):
+        """OPTIONS answers CORS preflight; handler exceptions become a 500"""
+        gateway = AsyncGateway(flask_app, fallback=FakeFallback())
+
+        @gateway.route("/api/broken", methods=("GET", "OPTIONS"))
+        async def broken(req):
+            raise RuntimeError("upstream exploded")
+
+        status, headers, _ = await request(gateway, "OPTIONS", "/api/broken")
+        assert status == 200
+        assert "POST" in headers["access-control-allow-methods"]
+
+        status, _, body = await request(gateway, "GET", "/api/broken")
+        assert status == 500
+        assert "upstream exploded" in json.loads(body)["error"]
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_is_rejected(self, flask_app):
+        """Bodies over the limit get a 413 before the handler runs"""
+        gateway = AsyncGateway(flask_app, fallback=FakeFallback(), max_body=8)
+
+        @gateway.route("/api/upload", methods=("POST",), secure=False)
+        async def upload(req):
+            return json_response({})
+
+        status, _, _ = await request(gateway, "POST", "/api/upload", b"x" * 32)
+        assert status == 413
+
+    @pytest.mark.asyncio
+    async def test_lifespan_runs_shutdown_hooks(self, flask_app):
+        """Shutdown hooks (e.g. closing the async HTTP client) run on lifespan.shutdown"""
+        gateway = AsyncGateway(flask_app, fallback=FakeFallback())
+        closed = []
+
+        @gateway.on_shutdown
+        async def close():
+            closed.append(True)
+
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await asyncio.wait_for(gateway({"type": "lifespan"}, receive, send), timeout=1)
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert closed == [True]
@@ -0,0 +1,162 @@
+"""
+Tests for the async chain client and concurrent feed helper.
+Uses httpx.MockTransport so no network access is needed.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.gateways.async_chain_client import AsyncChainClient, FetchExecutor, gather_with_timeouts
+
+
+def make_client(handler):
+    return AsyncChainClient(
+        rpc_endpoint="https://rpc.test",
+        rest_endpoint="https://api.test",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+class TestAsyncChainClient:
+    """Test JSON fetching and error handling"""
+
+    @pytest.mark.asyncio
+    async def test_get_json_rpc_and_rest(self):
+        """RPC and REST paths go to their own base URLs"""
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, json={"result": {"ok": True}})
+
+        client = make_client(handler)
+        await client.get_json("status")
+        await client.get_json("cosmos/gov/v1/proposals", rest=True)
+        await client.aclose()
+
+        assert seen == ["https://rpc.test/status", "https://api.test/cosmos/gov/v1/proposals"]
+
+    @pytest.mark.asyncio
+    async def test_errors_return_empty_dict(self):
+        """HTTP errors keep the old {} contract of the fetch methods"""
+        client = make_client(lambda request: httpx.Response(503))
+
+        assert await client.get_json("validators") == {}
+        assert await client.health() is False
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_is_reused(self):
+        """Consecutive requests share one AsyncClient"""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+
+        await client.get_json("status")
+        first = client._client
+        await client.get_json("net_info")
+
+        assert client._client is first
+        await client.aclose()
+
+    def test_client_on_another_loop_is_closed(self):
+        """Moving to a new loop closes the pool left on the old one instead of leaking it"""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+        old_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(client.get_json("status"), old_loop).result(1)
+            stale = client._client
+
+            asyncio.run(client.get_json("status"))
+            deadline = time.monotonic() + 1
+            while not stale.is_closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert stale.is_closed
+            assert client.get_stats()["clients_retired"] == 1
+        finally:
+            old_loop.call_soon_threadsafe(old_loop.stop)
+            thread.join(1)
+            old_loop.close()
+
+
+class TestGatherWithTimeouts:
+    """Test concurrent execution with per-task timeouts"""
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently(self):
+        """Total time is the slowest task, not the sum"""
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "done"
+
+        started = time.monotonic()
+        results = await gather_with_timeouts({"a": slow, "b": slow, "c": slow}, timeout=1)
+        elapsed = time.monotonic() - started
+
+        assert results == {"a": "done", "b": "done", "c": "done"}
+        assert elapsed < 0.45
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_errors_are_isolated(self):
+        """A slow or failing task does not affect the others"""
+        async def fast():
+            return 1
+
+        async def hang():
+            await asyncio.sleep(5)
+
+        async def fail():
+            raise ValueError("bad feed")
+
+        results = await gather_with_timeouts({"fast": fast, "hang": hang, "fail": fail}, timeout=0.1)
+
+        assert results["fast"] == 1
+        assert isinstance(results["hang"], asyncio.TimeoutError)
+        assert isinstance(results["fail"], ValueError)
+
+
+class TestPoolMetrics:
+    """Test connection pool and executor saturation metrics"""
+
+    @pytest.mark.asyncio
+    async def test_client_counts_requests_and_saturation(self):
+        """Concurrent requests beyond the pool size are counted as saturated"""
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={})
+
+        client = AsyncChainClient(
+            rpc_endpoint="https://rpc.test",
+            rest_endpoint="https://api.test",
+            max_connections=2,
+            transport=httpx.MockTransport(handler),
+        )
+        await asyncio.gather(*(client.get_json("status") for _ in range(4)))
+        stats = client.get_stats()
+        await client.aclose()
+
+        assert stats["requests"] == 4
+        assert stats["in_flight"] == 0
+        assert stats["peak_in_flight"] == 4
+        assert stats["saturated"] == 2
+        assert stats["clients_created"] == 1
+
+    def test_executor_reports_saturation(self):
+        """Work submitted beyond max_workers is counted and still completes"""
+        executor = FetchExecutor(max_workers=2)
+        futures = [executor.submit(time.sleep, 0.05) for _ in range(4)]
+        for future in futures:
+            future.result()
+        stats = executor.get_stats()
+        executor.shutdown()
+
+        assert stats["submitted"] == 4
+        assert stats["completed"] == 4
+        assert stats["peak_active"] == 2
+        assert stats["saturated"] >= 1
+        assert stats["active"] == 0 and stats["queued"] == 0
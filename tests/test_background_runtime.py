@@ -0,0 +1,83 @@
+"""
+Tests for the shared background runtime.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.background_runtime import BackgroundRuntime
+
+
+@pytest.fixture
+def runtime():
+    rt = BackgroundRuntime(name="test-runtime", restart_delay=0.01)
+    yield rt
+    rt.shutdown(timeout=2)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+class TestBackgroundRuntime:
+    """Test the loop thread, task registry and shutdown"""
+
+    def test_call_runs_on_single_loop_thread(self, runtime):
+        """One-off coroutines from any thread share one loop"""
+        async def thread_name():
+            return threading.current_thread().name
+
+        names = {runtime.call(thread_name(), timeout=2) for _ in range(3)}
+
+        assert names == {"test-runtime"}
+        assert runtime.running
+
+    def test_registered_task_runs_and_cancels(self, runtime):
+        """Registered tasks are tracked and can be cancelled"""
+        ticks = []
+
+        async def worker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        assert runtime.register("worker", worker) is True
+        assert runtime.register("worker", worker) is False
+        wait_for(lambda: len(ticks) >= 3)
+        assert runtime.is_task_running("worker")
+
+        assert runtime.cancel("worker")
+        assert runtime.health()["tasks"]["worker"]["state"] == "cancelled"
+
+    def test_failed_task_is_restarted(self, runtime):
+        """Crashing tasks restart with backoff and report the error"""
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("boom")
+
+        runtime.register("flaky", flaky)
+        wait_for(lambda: runtime.health()["tasks"]["flaky"]["state"] == "finished")
+        info = runtime.health()["tasks"]["flaky"]
+
+        assert info["restarts"] == 2
+        assert "boom" in info["last_error"]
+
+    def test_shutdown_cancels_tasks(self, runtime):
+        """Shutdown stops every task and the loop thread"""
+        async def forever():
+            await asyncio.sleep(3600)
+
+        runtime.register("forever", forever)
+        runtime.shutdown(timeout=2)
+
+        assert not runtime.running
+        assert runtime.health()["tasks"]["forever"]["state"] == "cancelled"
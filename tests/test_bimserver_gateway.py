@@ -10,7 +10,8 @@ import io
 import logging
 import tempfile
 from unittest.mock import patch, MagicMock, mock_open
-from src.gateways.bim_gateways import BIMServerGateway
+from src.gateways.bim_gateways import TRANSFER_TIMEOUT, BIMServerGateway
+from src.gateways.http_client import LONG_TIMEOUT
 from src.gateways.storage_factory import StorageFactory
 from src.gateways.storage_gateway import LocalStorageGateway
 
@@ -63,7 +64,7 @@ class TestBIMServerGateway:
 
     def test_authentication_success(self, mock_successful_response):
         """Test successful authentication with BIMserver."""
-        with patch("requests.post", return_value=mock_successful_response):
+        with patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response):
             gateway = BIMServerGateway(
                 base_url=SAMPLE_BASE_URL,
                 username=SAMPLE_USERNAME,
@@ -75,7 +76,7 @@ class TestBIMServerGateway:
 
     def test_authentication_failure(self, mock_error_response):
         """Test authentication failure with BIMserver."""
-        with patch("requests.post", return_value=mock_error_response):
+        with patch("src.gateways.http_client.HttpClient.post", return_value=mock_error_response):
             with pytest.raises(Exception) as excinfo:
                 BIMServerGateway(
                     base_url=SAMPLE_BASE_URL,
@@ -89,7 +90,7 @@ class TestBIMServerGateway:
 
     def test_api_call_success(self, mock_bimserver_gateway, mock_successful_response):
         """Test successful API call to BIMserver."""
-        with patch("requests.post", return_value=mock_successful_response):
+        with patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response):
             result = mock_bimserver_gateway._call_api(
                 interface="TestInterface",
                 method="testMethod",
@@ -100,7 +101,7 @@ class TestBIMServerGateway:
 
     def test_create_project(self, mock_bimserver_gateway, mock_successful_response):
         """Test creating a project in BIMserver."""
-        with patch("requests.post", return_value=mock_successful_response):
+        with patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response):
             project_id = mock_bimserver_gateway.create_project("Test Project")
 
             assert project_id == "test-result"
@@ -108,7 +109,7 @@ class TestBIMServerGateway:
     def test_store_file(self, mock_bimserver_gateway, mock_successful_response):
         """Test storing a file in BIMserver."""
         with (
-            patch("requests.post", return_value=mock_successful_response),
+            patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response),
             patch.object(
                 mock_bimserver_gateway,
                 "_get_deserializer_by_name",
@@ -141,7 +142,7 @@ class TestBIMServerGateway:
     def test_retrieve_file(self, mock_bimserver_gateway, mock_successful_response):
         """Test retrieving a file from BIMserver."""
         with (
-            patch("requests.post", return_value=mock_successful_response),
+            patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response),
             patch.object(
                 mock_bimserver_gateway,
                 "_get_serializer_by_name",
@@ -160,6 +161,19 @@ class TestBIMServerGateway:
 
             assert file_content == b"test file content"
 
+    def test_file_transfers_use_long_read_timeout(self, mock_bimserver_gateway, mock_successful_response):
+        """Downloads wait longer for the server than ordinary API calls."""
+        with (
+            patch("src.gateways.http_client.HttpClient.post", return_value=mock_successful_response) as post,
+            patch.object(mock_bimserver_gateway, "_get_serializer_by_name", return_value="ifc-serializer"),
+            patch.object(mock_bimserver_gateway, "_decode_file_data", return_value=b""),
+        ):
+            mock_bimserver_gateway.create_project("Test Project")
+            mock_bimserver_gateway.retrieve_file(revision_id=SAMPLE_REVISION_ID)
+
+            assert [call.kwargs["timeout"] for call in post.call_args_list] == [LONG_TIMEOUT, TRANSFER_TIMEOUT]
+            assert TRANSFER_TIMEOUT[1] > LONG_TIMEOUT[1]
+
     def test_get_projects(self, mock_bimserver_gateway, mock_successful_response):
         """Test getting a list of projects from BIMserver."""
         with patch.object(
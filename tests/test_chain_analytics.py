@@ -0,0 +1,172 @@
+"""
+Tests for the local chain analytics engine and narrative cache.
+"""
+
+import threading
+
+import pytest
+
+from src.services.chain_analytics import (
+    ChainAnalyticsEngine,
+    NarrativeCache,
+    metrics_fingerprint,
+    parse_block_time,
+)
+
+
+def validators_result(powers):
+    return {
+        "success": True,
+        "data": {"validators": [{"address": f"V{i}", "voting_power": p} for i, p in enumerate(powers)]},
+    }
+
+
+@pytest.fixture
+def engine():
+    return ChainAnalyticsEngine(inflation_rate=0.10, bonded_ratio=0.5, community_tax=0.0)
+
+
+class TestChainAnalyticsEngine:
+    """Test deterministic metric calculations"""
+
+    def test_equal_power_is_decentralized(self, engine):
+        """Equal voting power gives Gini 0 and Nakamoto n/3 + 1"""
+        result = engine.voting_power_concentration(validators_result([10] * 9)["data"]["validators"])
+
+        assert result["gini_coefficient"] == 0.0
+        assert result["nakamoto_coefficient"] == 4
+        assert result["total_voting_power"] == 90
+
+    def test_dominant_validator(self, engine):
+        """One validator with most power halts the chain alone"""
+        result = engine.voting_power_concentration(validators_result([90, 5, 5])["data"]["validators"])
+
+        assert result["nakamoto_coefficient"] == 1
+        assert result["gini_coefficient"] > 0.5
+
+    def test_staking_apy(self, engine):
+        """APY is inflation net of tax divided by bonded ratio"""
+        result = engine.staking_metrics(validators_result([100, 100]))
+
+        assert result["staking_apy"] == 20.0
+        assert result["staking_apy_basis"] == "assumed"
+        assert result["total_voting_power"] == 200
+        assert result["validator_count"] == 2
+
+    def test_rewards_are_in_bonded_tokens(self, engine):
+        """Staked and daily rewards come from bonded tokens, not consensus power"""
+        validators = [
+            {"voting_power": 100, "status": "BOND_STATUS_BONDED", "tokens": "100000000"},
+            {"voting_power": 200, "status": "BOND_STATUS_BONDED", "tokens": "200000000"},
+            {"voting_power": 0, "status": "BOND_STATUS_UNBONDING", "tokens": "900000000"},
+        ]
+        result = engine.staking_metrics({"validators": validators})
+
+        assert result["total_staked"] == 300.0
+        assert result["daily_rewards"] == round(300.0 * 0.20 / 365.0, 2)
+
+        consensus_only = engine.staking_metrics(validators_result([100, 100]))
+        assert consensus_only["total_staked"] is None and consensus_only["daily_rewards"] is None
+
+    def test_block_time_stats(self, engine):
+        """Intervals are computed from RFC 3339 times in any order"""
+        times = [
+            "2025-01-01T00:00:12.000000000Z",
+            "2025-01-01T00:00:00.000000000Z",
+            "2025-01-01T00:00:06.000000000Z",
+        ]
+        result = engine.block_time_stats(times)
+
+        assert result["samples"] == 2
+        assert result["mean"] == 6.0
+        assert result["stddev"] == 0.0
+
+    def test_parse_block_time_nanoseconds(self):
+        """Nanosecond fractions are truncated rather than rejected"""
+        assert parse_block_time("2025-01-01T00:00:00.123456789Z") == pytest.approx(1735689600.123456)
+        assert parse_block_time("not a time") is None
+
+    def test_network_health_penalties(self, engine):
+        """Catching up and no peers reduce the health score"""
+        healthy = engine.network_health(
+            {"data": {"block_height": 10, "catching_up": False, "health_status": "healthy"}},
+            {"data": {"n_peers": 10, "listening": True}},
+        )
+        unhealthy = engine.network_health(
+            {"data": {"block_height": 10, "catching_up": True, "health_status": "unknown"}},
+            {"data": {"n_peers": 0}},
+        )
+
+        assert healthy["health_score"] == 100
+        assert healthy["network_status"] == "Healthy"
+        assert unhealthy["health_score"] == 10
+        assert unhealthy["peer_status"] == "isolated"
+
+    def test_token_metrics_without_price_feed(self, engine):
+        """Market figures stay empty when no price is configured"""
+        result = engine.token_metrics({"data": {"block_height": 42}}, {"data": {"num_txs": 12}},
+                                      ["2025-01-01T00:00:00Z", "2025-01-01T00:00:06Z"])
+
+        assert result["token_price"] is None
+        assert result["market_cap"] is None
+        assert result["block_height"] == 42
+        assert result["estimated_tps"] == 2.0
+
+
+class TestNarrativeCache:
+    """Test stale-while-revalidate narrative caching"""
+
+    def test_first_call_is_pending_then_ready(self):
+        """The first request schedules generation without waiting"""
+        cache = NarrativeCache(ttl=60)
+        release = threading.Event()
+
+        def generator():
+            release.wait(1)
+            return "narrative"
+
+        value, status = cache.get("token", generator)
+        assert (value, status) == (None, "pending")
+
+        release.set()
+        cache.wait("token", timeout=1)
+
+        assert cache.get("token", generator) == ("narrative", "ready")
+
+    def test_stale_value_served_while_refreshing(self):
+        """Expired narratives are returned while a refresh runs"""
+        cache = NarrativeCache(ttl=0)
+        cache.get("net", lambda: "first")
+        cache.wait("net", timeout=1)
+
+        value, status = cache.get("net", lambda: "second")
+
+        assert (value, status) == ("first", "stale")
+
+    def test_generator_errors_are_contained(self):
+        """A failing model call leaves the section pending"""
+        cache = NarrativeCache(ttl=60)
+
+        def failing():
+            raise RuntimeError("model down")
+
+        cache.get("stake", failing)
+        cache.wait("stake", timeout=1)
+
+        assert cache.get("stake", failing) == (None, "pending")
+
+    def test_changed_metrics_invalidate_the_narrative(self):
+        """A narrative generated for other numbers is stale until regenerated"""
+        cache = NarrativeCache(ttl=60)
+        before = metrics_fingerprint({"staking_apy": 20.04, "block_height": 120001})
+        cache.get("stake", lambda: "apy is 20%", fingerprint=before)
+        cache.wait("stake", timeout=1)
+
+        jitter = metrics_fingerprint({"staking_apy": 20.01, "block_height": 120009})
+        assert jitter == before
+        assert cache.get("stake", lambda: "unused", fingerprint=jitter) == ("apy is 20%", "ready")
+
+        after = metrics_fingerprint({"staking_apy": 35.0, "block_height": 120010})
+        assert cache.get("stake", lambda: "apy is 35%", fingerprint=after) == ("apy is 20%", "stale")
+        cache.wait("stake", timeout=1)
+        assert cache.get("stake", lambda: "unused", fingerprint=after) == ("apy is 35%", "ready")
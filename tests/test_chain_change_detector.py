@@ -0,0 +1,94 @@
+"""
+Tests for the chain brain change-detection gate.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.chain_change_detector import ChainChangeDetector
+from src.services.chain_timeseries import ChainTimeSeries
+
+
+@pytest.fixture
+def timeseries():
+    return ChainTimeSeries(capacity=100)
+
+
+@pytest.fixture
+def detector(timeseries):
+    return ChainChangeDetector(timeseries, cooldown_seconds=60)
+
+
+def feed(timeseries, detector, metrics, t, data_points=None):
+    timeseries.record(metrics, timestamp=t)
+    return detector.detect(metrics, data_points, now=t)
+
+
+def validators(*addresses):
+    return [SimpleNamespace(data_type="validator_status", value={"address": a, "voting_power": 10})
+            for a in addresses]
+
+
+class TestChainChangeDetector:
+    """Test the individual detectors and the cooldown"""
+
+    def test_quiet_chain_triggers_nothing(self, timeseries, detector):
+        """Steady blocks, peers and mempool produce no events"""
+        events = []
+        for i in range(20):
+            events += feed(timeseries, detector, {"height": 100 + i * 5, "peers": 8, "mempool_size": 3}, i * 30)
+
+        assert events == []
+
+    def test_block_stall_and_spike(self, timeseries, detector):
+        """A stalled height is critical; a slow block after steady ones is a spike"""
+        for i in range(8):
+            feed(timeseries, detector, {"height": 100 + i * 5}, i * 30)
+        spike = feed(timeseries, detector, {"height": 136}, 8 * 30)
+        feed(timeseries, detector, {"height": 136}, 9 * 30)
+        feed(timeseries, detector, {"height": 136}, 10 * 30)
+        stall = feed(timeseries, detector, {"height": 136}, 12 * 30)
+
+        assert [e.kind for e in spike] == ["block_time_spike"]
+        assert [e.kind for e in stall] == ["block_stall"]
+        assert stall[0].severity == "critical"
+
+    def test_validator_set_change(self, timeseries, detector):
+        """Addresses joining or leaving are detected"""
+        first = feed(timeseries, detector, {"validator_count": 2, "voting_power": 20}, 0, validators("a", "b"))
+        same = feed(timeseries, detector, {"validator_count": 2, "voting_power": 20}, 30, validators("a", "b"))
+        changed = feed(timeseries, detector, {"validator_count": 2, "voting_power": 20}, 60, validators("a", "c"))
+
+        assert first == [] and same == []
+        assert changed[0].kind == "validator_set_change"
+        assert "1 joined, 1 left" in changed[0].message
+
+    def test_peer_drop(self, timeseries, detector):
+        """Losing a large share of peers is a drop"""
+        feed(timeseries, detector, {"peers": 10}, 0)
+        events = feed(timeseries, detector, {"peers": 4}, 30)
+
+        assert events[0].kind == "peer_drop"
+        assert events[0].baseline == 10
+
+    def test_mempool_surge(self, timeseries, detector):
+        """A jump well above the recent mempool size is a surge"""
+        for i in range(6):
+            feed(timeseries, detector, {"mempool_size": 5 + i % 2}, i * 30)
+        events = feed(timeseries, detector, {"mempool_size": 60}, 6 * 30)
+
+        assert [e.kind for e in events] == ["mempool_surge"]
+
+    def test_cooldown_suppresses_repeats(self, timeseries, detector):
+        """The same kind of event does not fire again within the cooldown"""
+        feed(timeseries, detector, {"peers": 10}, 0)
+        first = feed(timeseries, detector, {"peers": 4}, 10)
+        feed(timeseries, detector, {"peers": 10}, 20)
+        repeat = feed(timeseries, detector, {"peers": 4}, 30)
+        later = feed(timeseries, detector, {"peers": 10}, 100) + feed(timeseries, detector, {"peers": 4}, 110)
+
+        assert len(first) == 1
+        assert repeat == []
+        assert len(later) == 1
+        assert detector.get_stats()["events_suppressed"] == 1
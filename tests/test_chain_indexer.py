@@ -0,0 +1,284 @@
+"""
+Tests for the SQLite block and transaction indexer, against a recorded RPC stand-in
+"""
+
+import json
+import os
+
+import pytest
+
+from src.services.chain_indexer import ChainIndexer, decode_tx, parse_memo_anchor, parse_memo_hash, summarize_tx
+
+RECORDING = os.path.join(os.path.dirname(__file__), "fixtures", "chain_rpc_recording.json")
+
+ALICE = "odiseo1alice000000000000000000000000000000"
+BOB = "odiseo1bob0000000000000000000000000000000"
+CAROL = "odiseo1carol00000000000000000000000000000"
+UPLOAD_HASH = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+SIGNED_HASH = "a665a45920422f9d417e4867efdc4fb8a04a1f3fff1fa07e998e86f7f7a27ae3"
+
+
+class RecordedRPC:
+    """Serves recorded status/blockchain/block/block_results responses for heights 100-105"""
+
+    def __init__(self, head=None, fail_heights=(), earliest=None):
+        with open(RECORDING) as f:
+            self.recording = json.load(f)
+        self.head = head
+        self.earliest = earliest
+        self.fail_heights = set(fail_heights)
+        self.calls = []
+
+    def __call__(self, method, params):
+        self.calls.append((method, params))
+        if method == "status":
+            status = json.loads(json.dumps(self.recording["status"]))
+            if self.head is not None:
+                status["result"]["sync_info"]["latest_block_height"] = str(self.head)
+            if self.earliest is not None:
+                status["result"]["sync_info"]["earliest_block_height"] = str(self.earliest)
+            return status
+        if method == "tx":
+            # Serve the MsgSend at height 101 as an upstream /tx lookup
+            block = self.recording["block"]["101"]["result"]["block"]
+            result = self.recording["block_results"]["101"]["result"]["txs_results"][0]
+            return {"result": {"hash": params["hash"][2:], "height": "101", "index": 0,
+                               "tx": block["data"]["txs"][0], "tx_result": result}}
+        if method == "tx_search":
+            # Only Alice's MsgSend at height 101 is served, for a sender search
+            if params["query"] != f'"message.sender=\'{ALICE}\'"':
+                return {"result": {"txs": [], "total_count": "0"}}
+            block = self.recording["block"]["101"]["result"]["block"]
+            result = self.recording["block_results"]["101"]["result"]["txs_results"][0]
+            return {"result": {"txs": [{"hash": "AB" * 32, "height": "101", "index": 0,
+                                        "tx": block["data"]["txs"][0], "tx_result": result}],
+                               "total_count": "1"}}
+        if method == "blockchain":
+            metas = [self.recording["blockchain"][str(h)]
+                     for h in range(params["maxHeight"], params["minHeight"] - 1, -1)]
+            return {"result": {"block_metas": metas}}
+        height = params["height"]
+        if height in self.fail_heights:
+            raise ConnectionError(f"node pruned height {height}")
+        return self.recording[method][str(height)]
+
+
+@pytest.fixture
+def rpc():
+    return RecordedRPC()
+
+
+@pytest.fixture
+def indexer(tmp_path, rpc):
+    return ChainIndexer(str(tmp_path / "index.db"), fetcher=rpc, start_height=100, batch_size=3)
+
+
+class TestDecoding:
+    """Test TxRaw decoding and memo parsing"""
+
+    def test_decode_msg_send(self):
+        """MsgSend fields and the memo come out of the raw protobuf"""
+        with open(RECORDING) as f:
+            tx_b64 = json.load(f)["block"]["101"]["result"]["block"]["data"]["txs"][0]
+        tx = decode_tx(tx_b64)
+
+        assert len(tx["hash"]) == 64 and tx["hash"].isupper()
+        assert tx["messages"][0]["from_address"] == ALICE
+        assert tx["messages"][0]["to_address"] == BOB
+        assert tx["messages"][0]["amount"] == [{"denom": "uodis", "amount": "1000"}]
+        assert parse_memo_hash(tx["memo"]) == UPLOAD_HASH
+
+    def test_memo_formats(self):
+        """JSON, pipe-separated and prefixed memos yield the content hash"""
+        assert parse_memo_hash(json.dumps({"hash": UPLOAD_HASH.upper()})) == UPLOAD_HASH
+        assert parse_memo_hash(f"tx:tx-1|hash:{UPLOAD_HASH}|role:owner") == UPLOAD_HASH
+        assert parse_memo_hash(f"ifc:{UPLOAD_HASH}") == UPLOAD_HASH
+        assert parse_memo_hash(f"tx-7:{UPLOAD_HASH}:owner") == UPLOAD_HASH
+        assert parse_memo_hash("thanks for lunch") is None
+        assert parse_memo_hash("") is None
+
+    def test_garbage_is_rejected(self):
+        """Bytes that are not a TxRaw raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_tx("/w==")
+
+
+class TestChainIndexer:
+    """Test catch-up, resumption and indexed lookups"""
+
+    def test_catch_up_in_batches_with_resumable_cursor(self, indexer, rpc):
+        """Each batch commits with its cursor; empty blocks skip /block fetches"""
+        assert indexer.sync_once() == 3
+        assert indexer.cursor() == 102
+        assert indexer.sync_once() == 3
+        assert indexer.cursor() == 105
+        assert indexer.sync_once() == 0
+
+        fetched = sorted(params["height"] for method, params in rpc.calls if method == "block")
+        assert fetched == [101, 103]
+        assert indexer.get_stats()["lag"] == 0
+
+    def test_restart_resumes_from_cursor(self, tmp_path):
+        """A new indexer on the same database continues after the last batch"""
+        path = str(tmp_path / "index.db")
+        ChainIndexer(path, fetcher=RecordedRPC(head=102), start_height=100).sync_once()
+
+        rpc = RecordedRPC()
+        resumed = ChainIndexer(path, fetcher=rpc, start_height=100)
+        resumed.sync_once()
+
+        first = next(params for method, params in rpc.calls if method == "blockchain")
+        assert first["minHeight"] == 103
+        assert resumed.cursor() == 105
+
+    def test_failed_batch_does_not_advance(self, tmp_path):
+        """An upstream error leaves the cursor where it was"""
+        indexer = ChainIndexer(str(tmp_path / "index.db"), fetcher=RecordedRPC(fail_heights={103}),
+                               start_height=100, batch_size=10)
+        with pytest.raises(ConnectionError):
+            indexer.sync_once()
+        assert indexer.cursor() is None
+        assert indexer.count_transactions() == 0
+
+    def test_lookups(self, indexer):
+        """Hash, address, height and memo hash queries hit the local index"""
+        while indexer.sync_once():
+            pass
+
+        recent = indexer.recent_transactions(10)
+        assert [tx["height"] for tx in recent] == [103, 103, 103, 101]
+
+        tx = indexer.get_transaction("0x" + recent[-1]["hash"].lower())
+        assert tx["sender"] == ALICE and tx["recipient"] == BOB
+
+        # Bob received at 101 and sent at 103 (found via base64 event attributes too)
+        assert len(indexer.transactions_by_address(BOB)) == 2
+        assert len(indexer.transactions_by_address(BOB, role="recipient")) == 1
+        assert indexer.count_transactions(address=CAROL) == 3
+
+        anchored = indexer.transactions_by_memo_hash(UPLOAD_HASH.upper())
+        assert [tx["height"] for tx in anchored] == [101]
+
+        failed = summarize_tx(recent[0])
+        assert failed["status"] == "failed"
+        assert summarize_tx(recent[1])["type"] == "Delegate"
+
+    def test_search_translates_tx_search_queries(self, indexer):
+        """Common tx_search queries are answered locally; others return None"""
+        while indexer.sync_once():
+            pass
+
+        txs, total = indexer.search("tx.height>0", page=1, per_page=2)
+        assert total == 4 and len(txs) == 2
+        assert indexer.search("tx.height=103")[1] == 3
+        assert indexer.search(f"transfer.recipient='{BOB}'")[1] == 1
+        assert indexer.search(f"message.sender='{CAROL}'")[1] == 2
+        assert indexer.search("message.action='/cosmos.gov.v1.MsgVote'") is None
+
+
+    def test_queries_outside_the_index_fall_back(self, tmp_path):
+        """With history before the indexed range, partial answers are left to upstream"""
+        indexer = ChainIndexer(str(tmp_path / "index.db"), fetcher=RecordedRPC(earliest=1), start_height=100)
+        while indexer.sync_once():
+            pass
+
+        assert indexer.covers_history() is False
+        assert indexer.search("tx.height>0") is None
+        assert indexer.search(f"message.sender='{CAROL}'") is None
+        assert indexer.search("tx.height=42") is None
+        assert indexer.search(f"tx.hash='{'0' * 64}'") is None
+        assert indexer.search("tx.height=103")[1] == 3
+
+    def test_lagging_index_does_not_answer_recent(self, tmp_path):
+        """An index far behind the head leaves recent queries to upstream"""
+        rpc = RecordedRPC(head=102)
+        indexer = ChainIndexer(str(tmp_path / "index.db"), fetcher=rpc, start_height=100, max_lag=2)
+        indexer.sync_once()
+        indexer._stats["head"] = 110  # the chain moved on since the last poll
+
+        assert indexer.search("tx.height>0") is None
+
+    def test_address_history_before_the_backfill_comes_from_upstream(self, tmp_path):
+        """An address whose only activity predates the index is still listed"""
+        rpc = RecordedRPC(earliest=1)
+        indexer = ChainIndexer(str(tmp_path / "index.db"), fetcher=rpc, start_height=102)
+        while indexer.sync_once():
+            pass
+        assert [tx["height"] for tx in indexer.transactions_by_address(ALICE)] == [103]
+
+        # The recorded node only answers with the height 101 send
+        txs = indexer.list_transactions(ALICE)
+        assert [(tx["height"], tx["sender"]) for tx in txs] == [(101, ALICE)]
+        assert indexer.list_transactions(ALICE, role="recipient") == []
+        assert [tx["height"] for tx in indexer.list_transactions(ALICE, role="sender")] == [101]
+        assert sum(method == "tx_search" for method, _ in rpc.calls) == 4
+
+    def test_disabled_index_lists_from_upstream(self, indexer, rpc):
+        """With the indexer flag off, a complete index is not consulted"""
+        while indexer.sync_once():
+            pass
+        assert indexer.covers_history()
+
+        assert len(indexer.list_transactions(BOB)) == 2
+        assert [tx["height"] for tx in indexer.list_transactions(BOB, use_index=False)] == []
+        assert ("tx_search", {"query": f'"message.sender=\'{BOB}\'"', "page": 1,
+                              "per_page": 30, "order_by": '"desc"'}) in rpc.calls
+
+    def test_fetch_transaction_from_upstream(self, indexer):
+        """Hashes missing from the index are fetched with /tx in the indexed row shape"""
+        tx = indexer.fetch_transaction("0x" + "ab" * 32)
+
+        assert tx["sender"] == ALICE and tx["recipient"] == BOB
+        assert tx["height"] == 101 and tx["idx"] == 0
+        assert summarize_tx(tx)["content_hash"] == UPLOAD_HASH
+        assert indexer.fetch_transaction("not-a-hash") is None
+
+
+class TestAnchorVerification:
+    """Test content-hash anchor lookups for IFC verification"""
+
+    def test_memo_anchor_fields(self):
+        """Kind, role, reference and metadata are read from each memo format"""
+        anchor = parse_memo_anchor(json.dumps({"hash": UPLOAD_HASH, "type": "ifc-upload",
+                                               "metadata": {"file": "tower.ifc"}}))
+        assert anchor["kind"] == "ifc-upload"
+        assert anchor["metadata"] == {"file": "tower.ifc"}
+
+        anchor = parse_memo_anchor(f"tx:tx-1|hash:{SIGNED_HASH}|role:owner")
+        assert (anchor["reference"], anchor["role"]) == ("tx-1", "owner")
+
+        anchor = parse_memo_anchor(f"tx-7:{UPLOAD_HASH}:auditor")
+        assert (anchor["reference"], anchor["role"]) == ("tx-7", "auditor")
+
+    def test_verify_reports_signer_height_and_range(self, indexer):
+        """Anchored hashes come back with tx hash, height, signer and time; others are absent"""
+        while indexer.sync_once():
+            pass
+
+        missing = "0" * 64
+        report = indexer.verify_content_hashes([UPLOAD_HASH.upper(), SIGNED_HASH, missing])
+        results = {r["content_hash"]: r for r in report["results"]}
+
+        upload = results[UPLOAD_HASH]["first_anchor"]
+        assert upload["height"] == 101
+        assert upload["signer"] == ALICE
+        assert upload["kind"] == "ifc-upload"
+        assert upload["timestamp"].startswith("2025-06-01T12:00:01")
+
+        assert results[SIGNED_HASH]["first_anchor"]["signer"] == BOB
+        assert results[SIGNED_HASH]["first_anchor"]["role"] == "owner"
+        assert results[missing]["anchored"] is False
+        assert report["indexed_range"] == {"from_height": 100, "to_height": 105}
+
+    def test_failed_transactions_are_not_anchors(self, indexer):
+        """A reverted tx carrying a hash in its memo does not prove anything"""
+        failed_hash = "1" * 64
+        indexer._write([], [{
+            "hash": "F" * 64, "height": 200, "index": 0, "time": None, "code": 11, "msg_types": [],
+            "sender": ALICE, "recipient": None, "amount": None, "denom": None,
+            "memo": failed_hash, "memo_hash": failed_hash, "gas_wanted": 0, "gas_used": 0,
+            "tx": "", "events": [], "addresses": [],
+        }], 200)
+
+        assert indexer.anchors([failed_hash]) == {failed_hash: []}
+        assert len(indexer.transactions_by_memo_hash(failed_hash)) == 1
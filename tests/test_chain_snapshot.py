@@ -0,0 +1,123 @@
+"""
+Tests for the shared chain-state snapshot.
+Uses an in-memory fetcher, so no RPC node is needed.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.services.chain_snapshot import ChainSnapshotService
+
+
+class CountingFetcher:
+    """Returns a status payload with an increasing height and counts calls"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, base, path, params):
+        with self.lock:
+            self.calls += 1
+            height = 100 + self.calls
+        time.sleep(self.delay)
+        return {"result": {"sync_info": {"latest_block_height": str(height)}}}
+
+
+def make_snapshot(fetcher, **kwargs):
+    return ChainSnapshotService(
+        resources={"status": ("rpc", "status", None)}, fetcher=fetcher, **kwargs
+    )
+
+
+class TestChainSnapshot:
+    """Test caching, revalidation and generations"""
+
+    def test_fresh_reads_share_one_fetch(self):
+        """Repeated reads within the refresh interval hit memory"""
+        fetcher = CountingFetcher()
+        snapshot = make_snapshot(fetcher, refresh_interval=60)
+
+        for _ in range(5):
+            snapshot.get("status")
+
+        assert fetcher.calls == 1
+        assert snapshot.get_stats()["hits"] == 4
+        assert snapshot.get("unknown") is None
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Callers waiting on a missing entry trigger a single upstream fetch"""
+        fetcher = CountingFetcher(delay=0.1)
+        snapshot = make_snapshot(fetcher)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(snapshot.get("status"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fetcher.calls == 1
+        assert len(results) == 5 and all(results)
+
+    def test_stale_entry_served_while_revalidating(self):
+        """A stale entry is returned immediately and refreshed in the background"""
+        fetcher = CountingFetcher(delay=0.05)
+        snapshot = make_snapshot(fetcher, refresh_interval=0.01, max_age=60)
+        first = snapshot.get("status")
+        time.sleep(0.02)
+
+        started = time.monotonic()
+        stale = snapshot.get("status")
+        elapsed = time.monotonic() - started
+        deadline = time.monotonic() + 1
+        while snapshot.generation < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert stale is first
+        assert elapsed < 0.04
+        assert snapshot.generation == 2
+        assert snapshot.height == 102
+
+    def test_new_block_marks_entries_stale(self):
+        """notify_new_block triggers revalidation of otherwise fresh entries"""
+        fetcher = CountingFetcher()
+        snapshot = make_snapshot(fetcher, refresh_interval=60)
+        snapshot.get("status")
+
+        snapshot.notify_new_block(101)  # not newer than what we have
+        snapshot.get("status")
+        assert snapshot.get_stats()["stale_hits"] == 0
+
+        snapshot.notify_new_block(150)
+        snapshot.get("status")
+        assert snapshot.get_stats()["stale_hits"] == 1
+
+    def test_failed_refresh_keeps_previous_entry(self):
+        """Upstream errors do not discard the last good payload"""
+        calls = []
+
+        def flaky(base, path, params):
+            calls.append(1)
+            if len(calls) > 1:
+                raise ConnectionError("node down")
+            return {"result": {"sync_info": {"latest_block_height": "7"}}}
+
+        snapshot = make_snapshot(flaky, refresh_interval=0, max_age=0)
+        good = snapshot.get("status")
+        snapshot.refresh()
+
+        assert snapshot.get("status") == good
+        assert snapshot.get_stats()["errors"] >= 1
+
+    def test_put_seeds_snapshot(self):
+        """Payloads fetched by other clients are shared"""
+        fetcher = CountingFetcher()
+        snapshot = make_snapshot(fetcher, refresh_interval=60)
+        snapshot.put("status", {"result": {"sync_info": {"latest_block_height": "500"}}})
+
+        assert snapshot.get("status")["result"]["sync_info"]["latest_block_height"] == "500"
+        assert fetcher.calls == 0
+        assert snapshot.height == 500
@@ -0,0 +1,86 @@
+"""
+Tests for the ring-buffered chain metric time series.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.chain_timeseries import ChainTimeSeries, metrics_from_data_points
+
+
+@pytest.fixture
+def series():
+    store = ChainTimeSeries(capacity=5)
+    for i in range(8):
+        store.record({"height": 100 + i * 2, "peers": 10}, timestamp=1000 + i * 6)
+    return store
+
+
+class TestChainTimeSeries:
+    """Test ring buffer storage and windowed aggregates"""
+
+    def test_ring_buffer_keeps_latest_samples(self, series):
+        """Capacity is fixed and the oldest samples are overwritten in order"""
+        timestamps, values = series.window("height")
+
+        assert list(values) == [106, 108, 110, 112, 114]
+        assert list(timestamps) == [1018, 1024, 1030, 1036, 1042]
+        assert series.latest("height") == 114
+
+    def test_time_window_and_last(self, series):
+        """Windows can be bounded by age or by sample count"""
+        _, by_age = series.window("height", seconds=12, now=1042)
+        _, by_count = series.window("height", last=2)
+
+        assert list(by_age) == [110, 112, 114]
+        assert list(by_count) == [112, 114]
+
+    def test_aggregates(self, series):
+        """Delta, rate and mean are computed over the window"""
+        stats = series.aggregates("height")
+
+        assert stats["count"] == 5
+        assert stats["delta"] == 8
+        assert stats["rate"] == pytest.approx(8 / 24)
+        assert stats["mean"] == 110
+        assert series.aggregates("peers")["zscore"] is None  # flat series
+
+    def test_zscore_flags_spike(self):
+        """A sample far from the window history has a large z-score"""
+        store = ChainTimeSeries(capacity=20)
+        for i, value in enumerate([5, 6, 5, 6, 5, 6, 50]):
+            store.record({"mempool_size": value}, timestamp=i)
+
+        assert store.aggregates("mempool_size")["zscore"] > 10
+
+    def test_rolling_mean(self, series):
+        """Moving average over consecutive samples"""
+        assert list(series.rolling_mean("height", 2)) == [107, 109, 111, 113]
+
+    def test_unknown_and_invalid_values_are_ignored(self):
+        """Only tracked numeric metrics are stored"""
+        store = ChainTimeSeries(capacity=3)
+        store.record({"height": "n/a", "unknown": 1, "peers": None})
+
+        assert store.summary() == {}
+        assert store.time_range() is None
+
+    def test_metrics_from_data_points(self):
+        """Chain brain data points map onto metric samples"""
+        points = [
+            SimpleNamespace(data_type="validator_status", value={"voting_power": 10}),
+            SimpleNamespace(data_type="validator_status", value={"voting_power": 5}),
+            SimpleNamespace(data_type="block_production", value={"height": 42, "tx_count": 3}),
+            SimpleNamespace(data_type="mempool_status", value={"unconfirmed_count": 7}),
+            SimpleNamespace(data_type="network_health", value={"peers": "4"}),
+        ]
+
+        assert metrics_from_data_points(points) == {
+            "voting_power": 15,
+            "validator_count": 2,
+            "height": 42,
+            "tx_count": 3,
+            "mempool_size": 7,
+            "peers": 4,
+        }
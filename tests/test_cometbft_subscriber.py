@@ -0,0 +1,171 @@
+"""
+Tests for the CometBFT websocket subscriber.
+Uses an in-process websocket stand-in, so no node or websockets package is needed.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.gateways.cometbft_subscriber import CometBFTSubscriber, parse_event, websocket_url
+
+
+def new_block(height):
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {
+            "query": "tm.event='NewBlock'",
+            "data": {
+                "type": "tendermint/event/NewBlock",
+                "value": {"block": {"header": {"height": str(height)}, "data": {"txs": []}}},
+            },
+        },
+    })
+
+
+class FakeWebSocket:
+    """Async context manager websocket that acks subscriptions, replays messages, then closes or fails"""
+
+    def __init__(self, messages, error=None, reject=()):
+        self.messages = messages
+        self.error = error
+        self.reject = set(reject)
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def __aiter__(self):
+        for request in self.sent:
+            if request["id"] in self.reject:
+                yield json.dumps({"jsonrpc": "2.0", "id": request["id"],
+                                  "error": {"code": -32603, "message": "subscription limit"}})
+            else:
+                yield json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {}})
+        for message in self.messages:
+            yield message
+            await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        await asyncio.sleep(3600)  # stay open until cancelled
+
+
+async def run_until(subscriber, condition, timeout=2.0):
+    task = asyncio.create_task(subscriber.run())
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition():
+            assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+            await asyncio.sleep(0.01)
+    finally:
+        subscriber.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestCometBFTSubscriber:
+    """Test subscription, dispatch and reconnect behaviour"""
+
+    def test_parse_helpers(self):
+        """URLs map to /websocket and acks are ignored"""
+        assert websocket_url("https://rpc.test/") == "wss://rpc.test/websocket"
+        assert websocket_url("http://localhost:26657") == "ws://localhost:26657/websocket"
+        assert parse_event('{"jsonrpc": "2.0", "id": 1, "result": {}}') is None
+        assert parse_event("not json") is None
+        assert parse_event(new_block(7)) == (
+            "NewBlock", {"block": {"header": {"height": "7"}, "data": {"txs": []}}}
+        )
+
+    @pytest.mark.asyncio
+    async def test_subscribes_and_dispatches_events(self):
+        """All queries are subscribed and events reach the handler"""
+        socket = FakeWebSocket(['{"jsonrpc": "2.0", "id": 1, "result": {}}', new_block(10), new_block(11)])
+        received = []
+
+        async def on_event(event_type, value):
+            received.append((event_type, value["block"]["header"]["height"]))
+
+        subscriber = CometBFTSubscriber("https://rpc.test", on_event, connect=lambda url: socket)
+        await run_until(subscriber, lambda: len(received) == 2)
+
+        assert [m["params"]["query"] for m in socket.sent] == [
+            "tm.event='NewBlock'", "tm.event='Tx'", "tm.event='ValidatorSetUpdates'"
+        ]
+        assert received == [("NewBlock", "10"), ("NewBlock", "11")]
+        assert subscriber.get_stats()["events"] == 2
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self):
+        """A dropped connection triggers on_disconnect and a reconnect"""
+        sockets = iter([
+            FakeWebSocket([new_block(1)], error=ConnectionError("reset")),
+            FakeWebSocket([new_block(2)]),
+        ])
+        heights = []
+        transitions = []
+
+        async def on_event(event_type, value):
+            heights.append(value["block"]["header"]["height"])
+
+        subscriber = CometBFTSubscriber(
+            "https://rpc.test", on_event,
+            on_connect=lambda: transitions.append("up"),
+            on_disconnect=lambda: transitions.append("down"),
+            connect=lambda url: next(sockets),
+            reconnect_initial=0.01,
+        )
+        await run_until(subscriber, lambda: heights == ["1", "2"])
+
+        assert transitions[:3] == ["up", "down", "up"]
+        assert subscriber.get_stats()["connects"] == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_socket(self):
+        """Events beyond the queue size drop the oldest instead of stalling reads"""
+        socket = FakeWebSocket([new_block(h) for h in range(10)])
+        gate = asyncio.Event()
+        received = []
+
+        async def on_event(event_type, value):
+            await gate.wait()
+            received.append(value["block"]["header"]["height"])
+
+        subscriber = CometBFTSubscriber("https://rpc.test", on_event, connect=lambda url: socket, queue_size=3)
+
+        def drained():
+            if subscriber.get_stats()["dropped"] >= 6:
+                gate.set()
+            return "9" in received
+
+        await run_until(subscriber, drained)
+
+        assert received[-1] == "9"
+        assert len(received) <= 4
+
+    @pytest.mark.asyncio
+    async def test_connected_only_after_every_ack(self):
+        """A rejected subscription keeps the subscriber disconnected, so polling continues"""
+        rejecting = FakeWebSocket([new_block(1)], reject={3})
+        transitions = []
+
+        async def on_event(event_type, value):
+            pass
+
+        subscriber = CometBFTSubscriber(
+            "https://rpc.test", on_event,
+            on_connect=lambda: transitions.append("up"),
+            connect=lambda url: rejecting,
+            reconnect_initial=0.01,
+        )
+        await run_until(subscriber, lambda: len(rejecting.sent) >= 6)
+
+        assert transitions == []
+        assert subscriber.connected is False
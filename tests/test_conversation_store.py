@@ -0,0 +1,130 @@
+"""
+Tests for the per-session conversation store.
+"""
+
+import threading
+
+from flask import Flask
+
+from src.security_utils import get_chat_session_id
+from src.services.conversation_store import ConversationStore
+
+
+class TestConversationStore:
+    """Test ring buffer, context budgeting, summarization and eviction"""
+
+    def test_sessions_are_independent(self):
+        """Messages in one session do not appear in another"""
+        store = ConversationStore()
+        store.append("alice", "user", "How many floors?")
+        store.append("bob", "user", "What is the APY?")
+
+        assert [m["content"] for m in store.get_context("alice")] == ["How many floors?"]
+        assert [m["content"] for m in store.get_context("bob")] == ["What is the APY?"]
+
+    def test_ring_buffer_is_bounded(self):
+        """A session never holds more than max_messages messages"""
+        store = ConversationStore(max_messages=10)
+        for i in range(100):
+            store.append("s1", "user", f"message {i}")
+
+        messages = store.get_session("s1").messages
+        assert len(messages) <= 10
+        assert messages[-1]["content"] == "message 99"
+
+    def test_context_respects_token_budget(self):
+        """Only the newest messages that fit the budget are returned"""
+        store = ConversationStore(max_messages=50)
+        for i in range(20):
+            store.append("s1", "user", f"{i:02d} " + "x" * 200)
+
+        context = store.get_context("s1", token_budget=200)
+
+        assert 0 < len(context) < 20
+        assert context[-1]["content"].startswith("19")
+
+    def test_dropped_messages_are_summarized(self):
+        """Messages leaving the buffer are folded into the rolling summary"""
+        calls = []
+
+        def summarizer(previous, dropped):
+            calls.append(len(dropped))
+            return f"{previous or ''}+{len(dropped)}"
+
+        store = ConversationStore(max_messages=4, summarizer=summarizer)
+        for i in range(9):
+            store.append("s1", "user", f"message {i}")
+        store.flush(timeout=1)
+
+        context = store.get_context("s1")
+        assert calls
+        assert context[0]["role"] == "system"
+        assert "Summary of earlier conversation" in context[0]["content"]
+
+    def test_summarization_is_off_the_request_path(self):
+        """Appending returns while a slow summarizer is still running"""
+        release = threading.Event()
+
+        def summarizer(previous, dropped):
+            release.wait(1)
+            return "summary"
+
+        store = ConversationStore(max_messages=2, summarizer=summarizer)
+        for i in range(3):
+            store.append("s1", "user", f"message {i}")
+
+        assert store.get_session("s1").summary is None
+        release.set()
+        store.flush(timeout=1)
+        assert store.get_session("s1").summary == "summary"
+
+    def test_summarizer_failure_is_contained(self):
+        """A failing summarizer does not break appending"""
+        def summarizer(previous, dropped):
+            raise RuntimeError("model down")
+
+        store = ConversationStore(max_messages=2, summarizer=summarizer)
+        for i in range(5):
+            store.append("s1", "user", f"message {i}")
+        store.flush(timeout=1)
+
+        assert store.get_session("s1").summary is None
+
+    def test_lru_eviction_spills_to_sqlite(self, tmp_path):
+        """Evicted sessions are restored from the SQLite spill"""
+        store = ConversationStore(max_sessions=2, db_path=str(tmp_path / "conversations.db"))
+        store.append("s1", "user", "first session")
+        store.append("s2", "user", "second session")
+        store.append("s3", "user", "third session")
+
+        assert store.stats()["sessions"] == 2
+
+        context = store.get_context("s1")
+        assert [m["content"] for m in context] == ["first session"]
+
+    def test_eviction_without_spill_forgets_session(self):
+        """Without a database evicted sessions start empty"""
+        store = ConversationStore(max_sessions=1)
+        store.append("s1", "user", "hello")
+        store.append("s2", "user", "hi")
+
+        assert store.get_context("s1") == []
+
+
+class TestChatSessionId:
+    """Test that chat session IDs are bound to the server-side session"""
+
+    def test_client_ids_are_namespaced_per_user(self):
+        """Two users sending the same session_id get different conversations"""
+        app = Flask(__name__)
+        app.secret_key = "test-secret"
+
+        with app.test_request_context():
+            first = get_chat_session_id("shared-conversation")
+            assert get_chat_session_id("shared-conversation") == first
+            assert get_chat_session_id("bad id!") != first
+        with app.test_request_context():
+            second = get_chat_session_id("shared-conversation")
+
+        assert first != second
+        assert first.endswith(":shared-conversation")
@@ -0,0 +1,235 @@
+"""
+Tests for latency-aware endpoint selection
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from src.gateways.endpoint_pool import (
+    CLOSED,
+    OPEN,
+    EndpointPool,
+    EndpointPoolExhausted,
+    is_read_only_rpc,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, text="ok"):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def pool():
+    return EndpointPool("test", ["https://a", "https://b", "https://c"],
+                        failure_threshold=2, open_seconds=30, max_height_lag=5)
+
+
+class TestEndpointPool:
+    """Test ranking, ejection and failover"""
+
+    def test_ranks_by_measured_latency(self, pool):
+        """Faster nodes are tried first; unmeasured nodes use the default latency"""
+        pool.record_success("https://a", 0.9)
+        pool.record_success("https://b", 0.1)
+        assert pool.ranked() == ["https://b", "https://c", "https://a"]
+
+    def test_lagging_node_is_deprioritized(self, pool):
+        """A node far behind the best height goes after healthy ones"""
+        pool.record_success("https://a", 0.1, height=100)
+        pool.record_success("https://b", 0.2, height=120)
+        pool.record_success("https://c", 0.3, height=119)
+        assert pool.ranked() == ["https://b", "https://c", "https://a"]
+
+    def test_failures_eject_node(self, pool):
+        """Consecutive failures open the breaker and drop the node from rotation"""
+        pool.record_failure("https://a")
+        pool.record_failure("https://a")
+        assert pool.get_stats()["https://a"]["state"] == OPEN
+        assert "https://a" not in pool.ranked()
+
+    def test_half_open_trial_readmits_node(self, pool):
+        """After the cool-off one trial is allowed; success closes the breaker"""
+        pool.record_failure("https://a")
+        pool.record_failure("https://a")
+        pool._endpoints["https://a"].opened_at = time.time() - 31
+
+        assert pool.ranked()[-1] == "https://a"
+        # Only one trial at a time
+        assert "https://a" not in pool.ranked()
+
+        pool.record_success("https://a", 0.05)
+        assert pool.get_stats()["https://a"]["state"] == CLOSED
+        assert pool.ranked()[0] == "https://a"
+
+    def test_call_fails_over_and_penalizes(self, pool):
+        """Connection errors and 5xx move on to the next node"""
+        def send(url):
+            if url == "https://a":
+                raise requests.ConnectionError("refused")
+            if url == "https://b":
+                return FakeResponse(503, "unavailable")
+            return FakeResponse(200)
+
+        response, url = pool.call(send)
+        assert url == "https://c"
+        assert response.status_code == 200
+        stats = pool.get_stats()
+        assert stats["https://a"]["failures"] == 1
+        assert stats["https://b"]["failures"] == 1
+        assert stats["https://c"]["failures"] == 0
+
+    def test_call_raises_when_exhausted(self, pool):
+        """The last error is reported when every node fails"""
+        with pytest.raises(EndpointPoolExhausted) as excinfo:
+            pool.call(lambda url: FakeResponse(500, "boom"))
+        assert "HTTP 500" in excinfo.value.last_error
+
+    def test_latency_quantile(self, pool):
+        """Quantiles come from the recorded latency samples"""
+        assert pool.latency_quantile("https://a") is None
+        for i in range(1, 101):
+            pool.record_success("https://a", i / 100)
+        assert pool.latency_quantile("https://a", 0.95) == pytest.approx(0.96)
+        assert pool.latency_quantile("https://a", 0.5) == pytest.approx(0.51)
+
+
+class TestHedgedCalls:
+    """Test hedging of read-only requests"""
+
+    def make_pool(self):
+        pool = EndpointPool("hedge", ["https://slow", "https://fast"],
+                            min_hedge_delay=0.01, max_hedge_delay=0.05, hedge_budget=1.0)
+        pool.record_success("https://slow", 0.01)
+        pool.record_success("https://fast", 0.02)
+        return pool
+
+    def test_slow_primary_is_hedged(self):
+        """The next-best node answers first when the primary stalls"""
+        pool = self.make_pool()
+        release = threading.Event()
+
+        def send(url):
+            if url == "https://slow":
+                release.wait(timeout=2)
+            return FakeResponse(200, url)
+
+        started = time.monotonic()
+        response, url = pool.hedged_call(send)
+        elapsed = time.monotonic() - started
+        release.set()
+
+        assert url == "https://fast"
+        assert elapsed < 1.0
+        stats = pool.get_hedge_stats()
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_fast_primary_is_not_hedged(self):
+        """A primary answering within its p95 never triggers a hedge"""
+        pool = self.make_pool()
+        calls = []
+
+        response, url = pool.hedged_call(lambda url: calls.append(url) or FakeResponse(200))
+        assert url == "https://slow"
+        assert calls == ["https://slow"]
+        assert pool.get_hedge_stats()["hedges"] == 0
+
+    def test_failed_primary_fails_over(self):
+        """A failing primary moves on immediately, without waiting for the hedge delay"""
+        pool = self.make_pool()
+
+        def send(url):
+            if url == "https://slow":
+                raise requests.ConnectionError("refused")
+            return FakeResponse(200)
+
+        response, url = pool.hedged_call(send)
+        assert url == "https://fast"
+
+    def test_busy_hedge_threads_do_not_queue_or_hedge(self):
+        """Concurrent calls beyond the hedge threads run inline, without spurious hedges"""
+        pool = EndpointPool("hedge", ["https://a", "https://b"], min_hedge_delay=0.15,
+                            max_hedge_delay=0.15, hedge_budget=1.0, hedge_workers=4)
+
+        def send(url):
+            time.sleep(0.1)
+            return FakeResponse(200)
+
+        threads = [threading.Thread(target=pool.hedged_call, args=(send,)) for _ in range(32)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        stats = pool.get_hedge_stats()
+        assert elapsed < 0.35
+        assert stats["hedges"] == 0 and stats["over_budget"] == 0
+        assert stats["inline"] > 0
+        assert stats["inline"] + stats["calls"] == 32
+
+    def test_only_reads_are_hedgeable(self):
+        """Broadcasts and unknown methods are never classified as read-only"""
+        assert is_read_only_rpc({"method": "status"})
+        assert is_read_only_rpc([{"method": "block"}, {"method": "validators"}])
+        assert not is_read_only_rpc({"method": "broadcast_tx_sync"})
+        assert not is_read_only_rpc([{"method": "status"}, {"method": "broadcast_tx_commit"}])
+        assert not is_read_only_rpc([])
+
+
+class TestAsyncHedgedCalls:
+    """Test the event-loop variants of call and hedged_call"""
+
+    def make_pool(self):
+        return TestHedgedCalls().make_pool()
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """The hedge wins and the stalled primary request is cancelled"""
+        pool = self.make_pool()
+        cancelled = []
+
+        async def send(url):
+            if url == "https://slow":
+                try:
+                    await asyncio.sleep(2)
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+            return FakeResponse(200, url)
+
+        response, url = await pool.ahedged_call(send)
+        await asyncio.sleep(0)
+
+        assert url == "https://fast"
+        assert cancelled == ["https://slow"]
+        assert pool.get_hedge_stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_acall_fails_over_and_raises_when_exhausted(self):
+        """Transport errors move on to the next node; no answer raises"""
+        pool = EndpointPool("async", ["https://a", "https://b"])
+
+        async def send(url):
+            if url == "https://a":
+                raise httpx.ConnectError("refused")
+            return FakeResponse(200)
+
+        response, url = await pool.acall(send)
+        assert url == "https://b"
+
+        async def down(url):
+            return FakeResponse(503, "unavailable")
+
+        with pytest.raises(EndpointPoolExhausted):
+            await pool.acall(down)
@@ -0,0 +1,98 @@
+"""
+Tests for the shared outbound HTTP client
+"""
+
+import httpx
+import pytest
+import requests
+
+from src.gateways.http_client import (
+    DEFAULT_TIMEOUT,
+    AsyncHttpClient,
+    HttpClient,
+    get_async_http_client,
+    get_http_client,
+)
+
+
+class FakeResponse:
+    status_code = 200
+
+
+class TestHttpClient:
+    """Test pooling configuration, defaults and counters"""
+
+    def test_adapters_are_pooled(self):
+        """HTTP and HTTPS share tuned per-host pools without adapter retries"""
+        client = HttpClient(pool_connections=4, pool_maxsize=8)
+        adapter = client.session.get_adapter("https://example.com")
+        assert adapter is client.session.get_adapter("http://example.com")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.total == 0
+
+    def test_default_timeout_and_headers(self, monkeypatch):
+        """Every request gets the default timeout unless overridden"""
+        client = HttpClient()
+        seen = []
+        monkeypatch.setattr(client.session, "request",
+                            lambda method, url, **kwargs: seen.append((method, kwargs)) or FakeResponse())
+
+        client.get("https://node.example/status")
+        client.post("https://node.example/", json={}, timeout=(1, 2))
+
+        assert seen[0] == ("GET", {"timeout": DEFAULT_TIMEOUT})
+        assert seen[1][1]["timeout"] == (1, 2)
+        assert "DAODISEO" in client.session.headers["User-Agent"]
+        assert client.get_stats()["hosts"]["node.example"] == {"requests": 2, "errors": 0}
+
+    def test_errors_are_counted_and_raised(self, monkeypatch):
+        """Connection errors propagate to callers such as the endpoint pool"""
+        client = HttpClient()
+
+        def fail(method, url, **kwargs):
+            raise requests.ConnectionError("refused")
+
+        monkeypatch.setattr(client.session, "request", fail)
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://down.example/")
+        assert client.get_stats()["hosts"]["down.example"]["errors"] == 1
+
+    def test_shared_instance(self):
+        """All call sites share one client"""
+        assert get_http_client() is get_http_client()
+
+
+class TestAsyncHttpClient:
+    """Test the pooled async client"""
+
+    @pytest.mark.asyncio
+    async def test_requests_use_defaults_and_count(self):
+        """Requests carry the default headers and are counted"""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        client = AsyncHttpClient(transport=httpx.MockTransport(handler))
+        response = await client.post("https://node.example/", json={"method": "status"})
+        await client.get("https://node.example/status", timeout=(1, 2))
+
+        assert response.json() == {"ok": True}
+        assert "DAODISEO" in seen[0].headers["User-Agent"]
+        assert client.get_stats()["requests"] == 2
+        assert client.get_stats()["in_flight"] == 0
+        await client.aclose()
+        assert client.get_stats()["loops"] == 0
+
+    @pytest.mark.asyncio
+    async def test_one_client_per_loop(self):
+        """The same loop reuses its client"""
+        client = AsyncHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        assert client.client is client.client
+        await client.aclose()
+
+    def test_async_singleton(self):
+        """get_async_http_client returns one shared instance"""
+        assert get_async_http_client() is get_async_http_client()
@@ -0,0 +1,123 @@
+"""
+Tests for the precomputed IFC model digest.
+Uses lightweight stand-ins for ifcopenshell entities.
+"""
+
+import pytest
+
+from src.gateways.ifc.ifc_digest import (
+    ModelDigestCache,
+    build_model_digest,
+    format_model_digest,
+)
+
+
+class FakeEntity:
+    """Minimal ifcopenshell entity: is_a() plus attributes"""
+
+    _next_id = 1
+
+    def __init__(self, ifc_class, **attributes):
+        self._class = ifc_class
+        self._id = FakeEntity._next_id
+        FakeEntity._next_id += 1
+        self.__dict__.update(attributes)
+
+    def is_a(self, name=None):
+        if name is None:
+            return self._class
+        return self._class == name
+
+    def id(self):
+        return self._id
+
+
+class FakeIfcFile:
+    schema = "IFC4"
+
+    def __init__(self, entities):
+        self.entities = entities
+
+    def by_type(self, ifc_class):
+        if ifc_class == "IfcElement":
+            return [e for e in self.entities if e.is_a() not in
+                    ("IfcSpace", "IfcBuildingStorey", "IfcBuilding", "IfcSite")]
+        return [e for e in self.entities if e.is_a() == ifc_class]
+
+
+def material(name):
+    return FakeEntity("IfcRelAssociatesMaterial", RelatingMaterial=FakeEntity("IfcMaterial", Name=name))
+
+
+def quantities(**values):
+    items = [FakeEntity("IfcQuantityArea", Name=name, AreaValue=value) for name, value in values.items()]
+    return FakeEntity("IfcRelDefinesByProperties",
+                      RelatingPropertyDefinition=FakeEntity("IfcElementQuantity", Quantities=items))
+
+
+@pytest.fixture
+def ifc_file():
+    wall = FakeEntity("IfcWall", Name="W1", GlobalId="a", HasAssociations=[material("Concrete")],
+                      IsDefinedBy=[quantities(NetSideArea=10.0)], ContainedInStructure=[object()])
+    wall2 = FakeEntity("IfcWall", Name="W2", GlobalId="b", HasAssociations=[material("Concrete")],
+                       IsDefinedBy=[quantities(NetSideArea=5.5)], ContainedInStructure=[object()])
+    door = FakeEntity("IfcDoor", Name=None, GlobalId="b", HasAssociations=[], IsDefinedBy=[],
+                      ContainedInStructure=[])
+    space = FakeEntity("IfcSpace", Name="Office", IsDefinedBy=[quantities(NetFloorArea=42.0)])
+    ground = FakeEntity("IfcBuildingStorey", Name="Ground", Elevation=0.0,
+                        ContainsElements=[FakeEntity("IfcRelContainedInSpatialStructure",
+                                                     RelatedElements=[wall, wall2])])
+    building = FakeEntity("IfcBuilding", Name="HQ")
+    return FakeIfcFile([wall, wall2, door, space, ground, building])
+
+
+class TestModelDigest:
+    """Test digest contents and caching"""
+
+    def test_digest_contents(self, ifc_file):
+        """Counts, storeys, quantities, materials and anomalies are collected"""
+        digest = build_model_digest(ifc_file, file_hash="abc")
+
+        assert digest["element_counts"] == {"IfcWall": 2, "IfcDoor": 1}
+        assert digest["storeys"] == [{"name": "Ground", "elevation": 0.0, "elements": 2}]
+        assert digest["quantities"]["IfcWall"]["NetSideArea"] == 15.5
+        assert digest["quantities"]["IfcSpace"]["NetFloorArea"] == 42.0
+        assert digest["materials"] == {"Concrete": 2}
+        assert "1 duplicate GlobalIds" in digest["anomalies"]
+        assert "1 elements not assigned to a storey" in digest["anomalies"]
+        assert digest["building_name"] == "HQ"
+
+    def test_format_is_compact(self, ifc_file):
+        """The prompt text is a handful of lines"""
+        text = format_model_digest(build_model_digest(ifc_file))
+
+        assert text.count("\n") <= 6
+        assert "Storeys: Ground (0.0m, 2 elements)" in text
+        assert "Materials: Concrete 2" in text
+
+    def test_cache_reuses_digest_for_same_content(self, ifc_file, tmp_path):
+        """Files with identical content share one digest build"""
+        first = tmp_path / "a.ifc"
+        second = tmp_path / "b.ifc"
+        first.write_bytes(b"ISO-10303-21; same content")
+        second.write_bytes(b"ISO-10303-21; same content")
+        cache = ModelDigestCache()
+
+        digest_a = cache.get_or_build(ifc_file, str(first))
+        digest_b = cache.get_or_build(ifc_file, str(second))
+
+        assert digest_a is digest_b
+        assert digest_a["file_hash"]
+        assert "text" in digest_a
+
+    def test_cache_rebuilds_for_changed_content(self, ifc_file, tmp_path):
+        """Editing the file produces a new digest version"""
+        path = tmp_path / "model.ifc"
+        path.write_bytes(b"version 1")
+        cache = ModelDigestCache()
+        digest_v1 = cache.get_or_build(ifc_file, str(path))
+
+        path.write_bytes(b"version 2")
+        digest_v2 = cache.get_or_build(ifc_file, str(path))
+
+        assert digest_v1["file_hash"] != digest_v2["file_hash"]
@@ -0,0 +1,110 @@
+"""
+Tests for the IFC element retrieval index.
+Uses plain element documents so ifcopenshell is not required.
+"""
+
+import pytest
+
+from src.gateways.ifc.ifc_index import IFCElementIndex, tokenize
+
+
+@pytest.fixture
+def documents():
+    docs = [
+        {
+            "id": "1",
+            "name": "Entrance Door",
+            "ifc_class": "IfcDoor",
+            "properties": {"Pset_DoorCommon": {"FireRating": "EI60", "IsExternal": True}},
+            "materials": ["Oak"],
+        },
+        {
+            "id": "2",
+            "name": "Office Door",
+            "ifc_class": "IfcDoor",
+            "properties": {"Pset_DoorCommon": {"FireRating": "EI30", "IsExternal": False}},
+            "materials": ["Steel"],
+        },
+        {
+            "id": "3",
+            "name": "Basic Wall 200mm",
+            "ifc_class": "IfcWallStandardCase",
+            "properties": {"Pset_WallCommon": {"LoadBearing": True}},
+            "materials": ["Concrete"],
+        },
+        {
+            "id": "4",
+            "name": "Window W1",
+            "ifc_class": "IfcWindow",
+            "properties": {"Pset_WindowCommon": {"ThermalTransmittance": 1.1}},
+            "materials": ["Glass", "Aluminium"],
+        },
+    ]
+    # Filler elements so IDF reflects a realistic model
+    for i in range(50):
+        docs.append({"id": str(100 + i), "name": f"Slab {i}", "ifc_class": "IfcSlab",
+                     "properties": {}, "materials": ["Concrete"]})
+    return docs
+
+
+class TestIFCElementIndex:
+    """Test element retrieval ranking and filtering"""
+
+    def test_tokenize_splits_ifc_class_names(self):
+        """CamelCase IFC classes become searchable words"""
+        assert tokenize("IfcWallStandardCase") == ["wall", "standard", "case"]
+
+    def test_search_by_material(self, documents):
+        """Material names are indexed"""
+        index = IFCElementIndex()
+        index.build(documents)
+
+        results = index.search("which elements are made of glass", k=3)
+
+        assert results[0]["id"] == "4"
+        assert results[0]["materials"] == ["Glass", "Aluminium"]
+
+    def test_search_by_property_value(self, documents):
+        """Property values such as fire ratings are indexed"""
+        index = IFCElementIndex(use_embeddings=False)
+        index.build(documents)
+
+        results = index.search("door with EI60 fire rating", k=2)
+
+        assert results[0]["id"] == "1"
+        assert results[0]["properties"]["FireRating"] == "EI60"
+
+    def test_type_filter(self, documents):
+        """ifc_class restricts results to one element type"""
+        index = IFCElementIndex()
+        index.build(documents)
+
+        results = index.search("concrete", k=5, ifc_class="WallStandardCase")
+
+        assert [r["id"] for r in results] == ["3"]
+
+    def test_results_are_bounded(self, documents):
+        """Only k results come back even when many elements match"""
+        index = IFCElementIndex()
+        index.build(documents)
+
+        results = index.search("concrete slab", k=5)
+
+        assert len(results) == 5
+        assert all(r["ifc_class"] == "IfcSlab" for r in results)
+
+    def test_embeddings_match_partial_words(self, documents):
+        """Hashed character features give credit to near matches"""
+        index = IFCElementIndex(use_embeddings=True)
+        index.build(documents)
+
+        results = index.search("aluminum window", k=1)
+
+        assert results[0]["id"] == "4"
+
+    def test_empty_index(self):
+        """Searching an empty index returns no results"""
+        index = IFCElementIndex()
+        index.build([])
+
+        assert index.search("door") == []
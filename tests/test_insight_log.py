@@ -0,0 +1,61 @@
+"""
+Tests for the bounded chain brain insight log.
+"""
+
+import pytest
+
+from src.services.insight_log import InsightLog
+
+
+@pytest.fixture
+def log():
+    insight_log = InsightLog(max_entries=3)
+    for i in range(5):
+        insight_log.append({"feed_name": f"feed-{i}"})
+    return insight_log
+
+
+class TestInsightLog:
+    """Test ids, eviction and cursor reads"""
+
+    def test_ids_are_monotonic_and_unique(self):
+        """Insights appended in the same second get distinct ids"""
+        insight_log = InsightLog()
+        ids = [insight_log.append({"timestamp": "same"}) for _ in range(3)]
+
+        assert ids == [1, 2, 3]
+        assert len(insight_log) == 3
+
+    def test_eviction_keeps_newest(self, log):
+        """Only max_entries insights are retained"""
+        assert len(log) == 3
+        assert [i["id"] for i in log.recent(10)] == [5, 4, 3]
+        assert log.latest_id == 5
+
+    def test_since_cursor(self, log):
+        """Reads after a cursor return only newer insights, oldest first"""
+        assert [i["id"] for i in log.since(3)[0]] == [4, 5]
+        assert [i["id"] for i in log.since(0)[0]] == [3, 4, 5]
+        assert [i["id"] for i in log.since(0, limit=1)[0]] == [3]
+        assert log.since(5) == ([], 5)
+
+    def test_cursor_pages_through_a_large_backlog(self):
+        """With more new insights than the limit, the cursor stops at the last one returned"""
+        insight_log = InsightLog(max_entries=100)
+        for i in range(120):
+            insight_log.append({"feed_name": f"feed-{i}"})
+
+        first, cursor = insight_log.since(0, limit=50)
+        assert [first[0]["id"], first[-1]["id"], cursor] == [21, 70, 70]
+
+        second, cursor = insight_log.since(cursor, limit=50)
+        assert [second[0]["id"], second[-1]["id"], cursor] == [71, 120, 120]
+        assert insight_log.since(cursor, limit=50) == ([], 120)
+
+    def test_empty_log(self):
+        """An empty log has cursor 0 and no insights"""
+        insight_log = InsightLog()
+
+        assert insight_log.latest_id == 0
+        assert insight_log.recent(3) == []
+        assert insight_log.since(0) == ([], 0)
@@ -0,0 +1,228 @@
+"""
+Tests for the shared OpenAI gateway.
+These tests use fake clients so no network access or API key is needed.
+"""
+
+import asyncio
+import gc
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.gateways.llm_gateway import OpenAIGateway
+
+
+class FakeStatusError(Exception):
+    """Error carrying an HTTP status code like openai.APIStatusError"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeCompletions:
+    """Records calls and optionally fails the first few"""
+
+    def __init__(self, failures=None, delay=0.0):
+        self.calls = 0
+        self.failures = list(failures or [])
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if self.failures:
+                raise self.failures.pop(0)
+            return {"model": kwargs.get("model"), "content": "ok"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeAsyncCompletions:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"model": kwargs.get("model"), "content": "ok"}
+
+
+def make_client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+class TestOpenAIGateway:
+    """Test retry, coalescing and concurrency behaviour"""
+
+    def test_chat_completion_passes_through(self):
+        """A plain call reaches the client and is recorded in stats"""
+        completions = FakeCompletions()
+        gateway = OpenAIGateway(client=make_client(completions))
+
+        result = gateway.chat_completion(model="gpt-4o", messages=[])
+
+        assert result["content"] == "ok"
+        assert completions.calls == 1
+        assert gateway.get_stats()["gpt-4o"]["calls"] == 1
+
+    def test_retries_rate_limit_errors(self):
+        """429 responses are retried until success"""
+        completions = FakeCompletions(failures=[FakeStatusError(429, "0"), FakeStatusError(503)])
+        gateway = OpenAIGateway(client=make_client(completions), base_delay=0.001)
+
+        result = gateway.chat_completion(model="gpt-4o", messages=[])
+
+        assert result["content"] == "ok"
+        assert completions.calls == 3
+        assert gateway.get_stats()["gpt-4o"]["retries"] == 2
+
+    def test_does_not_retry_client_errors(self):
+        """4xx errors other than 408/409/429 fail immediately"""
+        completions = FakeCompletions(failures=[FakeStatusError(400)])
+        gateway = OpenAIGateway(client=make_client(completions), base_delay=0.001)
+
+        with pytest.raises(FakeStatusError):
+            gateway.chat_completion(model="gpt-4o", messages=[])
+        assert completions.calls == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Retries are bounded by max_retries"""
+        completions = FakeCompletions(failures=[FakeStatusError(500)] * 5)
+        gateway = OpenAIGateway(client=make_client(completions), max_retries=2, base_delay=0.001)
+
+        with pytest.raises(FakeStatusError):
+            gateway.chat_completion(model="gpt-4o", messages=[])
+        assert completions.calls == 3
+
+    def test_identical_requests_are_coalesced(self):
+        """Concurrent identical requests share one upstream call"""
+        completions = FakeCompletions(delay=0.2)
+        gateway = OpenAIGateway(client=make_client(completions))
+        results = []
+
+        def worker():
+            results.append(gateway.chat_completion(model="gpt-4o", messages=[{"role": "user", "content": "hi"}]))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 5
+        assert completions.calls == 1
+        assert gateway.get_stats()["gpt-4o"]["coalesced"] == 4
+
+    def test_concurrency_limited_per_model(self):
+        """No more than max_concurrency calls run at once for a model"""
+        completions = FakeCompletions(delay=0.05)
+        gateway = OpenAIGateway(client=make_client(completions), max_concurrency=2)
+
+        threads = [
+            threading.Thread(
+                target=gateway.chat_completion,
+                kwargs={"model": "gpt-4o", "messages": [{"role": "user", "content": str(i)}]},
+            )
+            for i in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert completions.calls == 6
+        assert completions.max_active <= 2
+
+    @pytest.mark.asyncio
+    async def test_async_requests_are_coalesced(self):
+        """Identical async requests on one loop share one upstream call"""
+        completions = FakeAsyncCompletions(delay=0.05)
+        gateway = OpenAIGateway(async_client=make_client(completions))
+
+        results = await asyncio.gather(
+            *[gateway.achat_completion(model="gpt-4o", messages=[]) for _ in range(4)]
+        )
+
+        assert all(r["content"] == "ok" for r in results)
+        assert completions.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """A caller going away leaves the shared call running for the others"""
+        completions = FakeAsyncCompletions(delay=0.05)
+        gateway = OpenAIGateway(async_client=make_client(completions))
+
+        leader = asyncio.ensure_future(gateway.achat_completion(model="gpt-4o", messages=[]))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(gateway.achat_completion(model="gpt-4o", messages=[]))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert (await follower)["content"] == "ok"
+        assert leader.cancelled()
+        assert completions.calls == 1
+
+    def test_interrupted_sync_leader_hands_over(self):
+        """A follower retries as leader instead of re-raising the leader's interrupt"""
+        gateway = OpenAIGateway(client=make_client(FakeCompletions()))
+        started, release = threading.Event(), threading.Event()
+        outcome = {}
+
+        def interrupted():
+            started.set()
+            release.wait(1)
+            raise KeyboardInterrupt
+
+        def leader():
+            try:
+                gateway._call_coalesced("gpt-4o", {"messages": []}, interrupted)
+            except KeyboardInterrupt:
+                outcome["leader"] = "interrupted"
+
+        def follower():
+            outcome["follower"] = gateway._call_coalesced("gpt-4o", {"messages": []}, lambda: "ok")
+
+        threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+        threads[0].start()
+        started.wait(1)
+        threads[1].start()
+        time.sleep(0.02)
+        release.set()
+        for thread in threads:
+            thread.join(1)
+
+        assert outcome == {"leader": "interrupted", "follower": "ok"}
+
+    def test_async_semaphores_are_released_with_their_loop(self):
+        """Short-lived event loops (asyncio.run per request) do not accumulate semaphores"""
+        gateway = OpenAIGateway(async_client=make_client(FakeAsyncCompletions()))
+
+        for i in range(5):
+            asyncio.run(gateway.achat_completion(model="gpt-4o", messages=[{"content": str(i)}]))
+        gc.collect()
+
+        assert len(gateway._async_semaphores) == 0
+
+    def test_unavailable_client_raises(self):
+        """Calling without a client gives a clear error"""
+        gateway = OpenAIGateway()
+        gateway._client = None
+        gateway._create_client = lambda async_mode: None
+
+        with pytest.raises(RuntimeError):
+            gateway.chat_completion(model="gpt-4o", messages=[])
@@ -0,0 +1,116 @@
+"""
+Tests for compaction of chain data embedded in LLM prompts.
+"""
+
+import json
+
+from src.services.prompt_compaction import (
+    PromptCompactor,
+    compact_for_prompt,
+    estimate_tokens,
+)
+
+VALIDATOR_FIELDS = ("success", "data", "validators", "total", "address", "voting_power")
+
+
+def make_validators(count):
+    return {
+        "success": True,
+        "data": {
+            "validators": [
+                {
+                    "address": f"ADDR{i:036d}",
+                    "pub_key": "A" * 44,
+                    "voting_power": 1000 - i,
+                    "proposer_priority": -i,
+                }
+                for i in range(count)
+            ],
+            "total": count,
+            "updated_at": "2025-01-01T00:00:00",
+        },
+    }
+
+
+class TestPromptCompaction:
+    """Test projection, deduplication and budgeting"""
+
+    def test_keeps_only_requested_fields_and_no_indentation(self):
+        """Keys outside the caller's projection are removed; output has no whitespace padding"""
+        text = compact_for_prompt(make_validators(2), fields=VALIDATOR_FIELDS)
+        data = json.loads(text)
+
+        assert "updated_at" not in data["data"]
+        assert "pub_key" not in data["data"]["validators"][0]
+        assert "\n" not in text and ": " not in text
+
+    def test_projection_is_per_call(self):
+        """A field one analysis drops is still available to another"""
+        payload = {"network_info": {"n_peers": 4, "peers": [{"node_id": "abc", "remote_ip": "10.0.0.1"}]}}
+
+        health = json.loads(compact_for_prompt(payload, fields=("network_info", "n_peers", "peers", "remote_ip")))
+        token = json.loads(compact_for_prompt(payload, fields=("network_info", "n_peers")))
+
+        assert health["network_info"]["peers"] == [{"remote_ip": "10.0.0.1"}]
+        assert token["network_info"] == {"n_peers": 4}
+        assert json.loads(compact_for_prompt(payload)) == payload
+
+    def test_repeated_records_become_table(self):
+        """Lists of same-shaped records are written as columns plus rows"""
+        data = json.loads(compact_for_prompt(make_validators(5), fields=VALIDATOR_FIELDS))
+        table = data["data"]["validators"]
+
+        assert table["columns"] == ["address", "voting_power"]
+        assert len(table["rows"]) == 5
+
+    def test_duplicate_subtrees_are_referenced(self):
+        """An identical payload included twice is emitted once"""
+        status = {"block_height": 123456, "network": "ithaca-1", "catching_up": False, "health_status": "healthy"}
+        data = json.loads(compact_for_prompt({"network_status": status, "network_data": dict(status)}))
+
+        assert data["network_status"]["block_height"] == 123456
+        assert data["network_data"] == "<same as $.network_status>"
+
+    def test_budget_is_enforced(self):
+        """Large payloads are shrunk to fit the token budget"""
+        payload = make_validators(500)
+        raw = json.dumps(payload, indent=2)
+
+        text = compact_for_prompt(payload, budget_tokens=300)
+
+        assert estimate_tokens(text) <= 300
+        assert estimate_tokens(text) < estimate_tokens(raw) / 10
+
+    def test_last_resort_truncation_keeps_valid_json(self):
+        """A payload too wide for every level is cut per element and still parses"""
+        payload = {f"metric_{i}": {"value": i, "label": f"label {i}"} for i in range(400)}
+
+        text = compact_for_prompt(payload, budget_tokens=100)
+        data = json.loads(text)
+
+        assert estimate_tokens(text) <= 100
+        assert data["metric_0"] == {"value": 0, "label": "label 0"}
+        assert data["..."].endswith("more keys")
+
+    def test_subtrees_are_hashed_once_across_levels(self, monkeypatch):
+        """Compaction levels reuse subtree hashes instead of re-serializing them"""
+        import src.services.prompt_compaction as module
+
+        calls = []
+        original = module._digest
+        monkeypatch.setattr(module, "_digest", lambda value: calls.append(id(value)) or original(value))
+
+        compact_for_prompt(make_validators(500), budget_tokens=300)
+
+        assert calls and len(calls) == len(set(calls))
+
+    def test_truncated_lists_report_omitted_count(self):
+        """Shortened lists say how many entries were dropped"""
+        projected = PromptCompactor().project(make_validators(30), max_items=10)
+
+        assert projected["data"]["validators"]["omitted"] == 20
+
+    def test_estimate_tokens_is_positive(self):
+        """Token estimate grows with text length"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("a" * 400) > estimate_tokens("a" * 40)
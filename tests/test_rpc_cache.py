@@ -0,0 +1,134 @@
+"""
+Tests for the method-aware proxy response cache
+"""
+
+import time
+
+import pytest
+
+from src.gateways.rpc_cache import (
+    HEAD,
+    IMMUTABLE,
+    UNCACHEABLE,
+    ProxyResponseCache,
+    classify_rest,
+    classify_rpc,
+)
+
+
+class Head:
+    """Settable chain head for head-dependent entries"""
+
+    def __init__(self, height=100):
+        self.height = height
+
+    def __call__(self):
+        return self.height
+
+
+@pytest.fixture
+def head():
+    return Head()
+
+
+@pytest.fixture
+def cache(head):
+    return ProxyResponseCache(max_entries=3, head_ttl=60, head_height=head)
+
+
+def rpc(method, params=None, request_id=1):
+    return {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": request_id}
+
+
+class TestClassification:
+    """Test cache classes for RPC methods and REST paths"""
+
+    def test_rpc_methods(self):
+        """Pinned heights and hashes are immutable; latest state follows the head"""
+        assert classify_rpc("block", {"height": "42"}) == IMMUTABLE
+        assert classify_rpc("block", {}) == HEAD
+        assert classify_rpc("validators", ["42"]) == IMMUTABLE
+        assert classify_rpc("tx", {"hash": "0xAB"}) == IMMUTABLE
+        assert classify_rpc("status") == HEAD
+        assert classify_rpc("broadcast_tx_sync", {"tx": "..."}) == UNCACHEABLE
+        assert classify_rpc("unconfirmed_txs") == UNCACHEABLE
+
+    def test_rest_paths(self):
+        """Fixed blocks and tx hashes are immutable; module queries follow the head"""
+        assert classify_rest("/cosmos/base/tendermint/v1beta1/blocks/42") == IMMUTABLE
+        assert classify_rest("cosmos/base/tendermint/v1beta1/blocks/latest") == HEAD
+        assert classify_rest("cosmos/tx/v1beta1/txs/" + "A" * 64) == IMMUTABLE
+        assert classify_rest("cosmos/bank/v1beta1/balances/odiseo1abc") == HEAD
+        assert classify_rest("cosmos/base/tendermint/v1beta1/syncing") == UNCACHEABLE
+
+
+class TestProxyResponseCache:
+    """Test lookups, invalidation and eviction"""
+
+    def test_rpc_hit_uses_request_id(self, cache):
+        """Cached results are returned under the caller's JSON-RPC id"""
+        cache.store_rpc(rpc("block", {"height": "42"}), {"jsonrpc": "2.0", "id": 1, "result": {"h": 42}})
+        hit = cache.lookup_rpc(rpc("block", {"height": "42"}, request_id=7))
+        assert hit == {"jsonrpc": "2.0", "id": 7, "result": {"h": 42}}
+        assert cache.get_stats()["hits"][IMMUTABLE] == 1
+
+    def test_errors_and_uncacheable_are_not_stored(self, cache):
+        """Error responses and broadcasts always go upstream"""
+        cache.store_rpc(rpc("tx", {"hash": "0xAB"}), {"jsonrpc": "2.0", "id": 1, "error": {"code": -32603}})
+        cache.store_rpc(rpc("broadcast_tx_sync"), {"jsonrpc": "2.0", "id": 1, "result": {}})
+        assert len(cache) == 0
+        assert cache.lookup_rpc(rpc("broadcast_tx_sync")) is None
+        assert cache.get_stats()["uncacheable"] == 1
+
+    def test_head_entries_expire_on_new_block(self, cache, head):
+        """Head-dependent entries are dropped once the chain advances"""
+        cache.store_rest("cosmos/bank/v1beta1/balances/odiseo1abc", None, {"balances": []})
+        assert cache.lookup_rest("cosmos/bank/v1beta1/balances/odiseo1abc") == {"balances": []}
+
+        head.height = 101
+        assert cache.lookup_rest("cosmos/bank/v1beta1/balances/odiseo1abc") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_head_entries_expire_after_ttl(self, head):
+        """Without a height change, head entries still age out"""
+        cache = ProxyResponseCache(head_ttl=0.01, head_height=head)
+        cache.store_rpc(rpc("status"), {"result": {"ok": True}})
+        time.sleep(0.02)
+        assert cache.lookup_rpc(rpc("status")) is None
+
+    def test_immutable_entries_survive_new_blocks(self, cache, head):
+        """Immutable entries are not affected by the head moving"""
+        cache.store_rest("cosmos/base/tendermint/v1beta1/blocks/42", None, {"block": 42})
+        head.height = 500
+        cache.invalidate_head()
+        assert cache.lookup_rest("cosmos/base/tendermint/v1beta1/blocks/42") == {"block": 42}
+
+    def test_lru_eviction(self, cache):
+        """The least recently used entry is evicted at capacity"""
+        for height in (1, 2, 3):
+            cache.store_rpc(rpc("block", {"height": str(height)}), {"result": height})
+        cache.lookup_rpc(rpc("block", {"height": "1"}))
+        cache.store_rpc(rpc("block", {"height": "4"}), {"result": 4})
+
+        assert cache.lookup_rpc(rpc("block", {"height": "2"})) is None
+        assert cache.lookup_rpc(rpc("block", {"height": "1"}))["result"] == 1
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_budget_eviction(self, head):
+        """Large payloads evict by serialized size; ones over the budget are not kept"""
+        cache = ProxyResponseCache(max_entries=100, head_height=head, max_bytes=1000)
+        block = {"txs": ["A" * 390]}
+        for height in (1, 2, 3):
+            cache.store_rpc(rpc("block", {"height": str(height)}), {"result": block})
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2 and stats["evictions"] == 1
+        assert stats["bytes"] <= 1000
+        assert cache.lookup_rpc(rpc("block", {"height": "1"})) is None
+
+        cache.store_rpc(rpc("block", {"height": "4"}), {"result": {"txs": ["A" * 2000]}})
+        assert cache.lookup_rpc(rpc("block", {"height": "4"})) is None
+        assert cache.get_stats()["oversize"] == 1
+
+        cache.clear()
+        assert cache.get_stats()["bytes"] == 0
@@ -0,0 +1,270 @@
+"""
+Tests for JSON-RPC batch forwarding and request coalescing
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.gateways.endpoint_pool import EndpointPool
+from src.gateways.request_coalescer import AsyncRequestCoalescer, RequestCoalescer
+from src.gateways.rpc_cache import ProxyResponseCache
+from src.gateways.rpc_forwarder import (
+    COALESCED,
+    HIT,
+    MISS,
+    PARTIAL,
+    AsyncJsonRpcForwarder,
+    JsonRpcForwarder,
+    validate_rpc_payload,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+class FakeNode:
+    """Answers JSON-RPC calls with the method name and records every upstream post"""
+
+    def __init__(self, delay=0.0):
+        self.posts = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def answer(self, call):
+        return {"jsonrpc": "2.0", "id": call["id"], "result": {"method": call["method"], "params": call.get("params")}}
+
+    def __call__(self, base_url, payload):
+        with self.lock:
+            self.posts.append(payload)
+        time.sleep(self.delay)
+        if isinstance(payload, list):
+            return FakeResponse([self.answer(call) for call in payload])
+        return FakeResponse(self.answer(payload))
+
+
+def make_forwarder(node):
+    return JsonRpcForwarder(
+        EndpointPool("rpc", ["https://node"]), ProxyResponseCache(head_height=lambda: 100),
+        RequestCoalescer(), node
+    )
+
+
+def call(method, request_id, **params):
+    return {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+
+
+class TestRequestCoalescer:
+    """Test single-flight behaviour"""
+
+    def test_concurrent_identical_calls_share_one_upstream_call(self):
+        """Only the leader calls upstream; followers get its result"""
+        coalescer = RequestCoalescer()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"ok": True}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(coalescer.do("status", fetch)))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result == {"ok": True} for result, _ in results)
+        assert sum(shared for _, shared in results) == 9
+        assert coalescer.get_stats()["in_flight"] == 0
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """Followers see the leader's error; the next call tries again"""
+        coalescer = RequestCoalescer()
+        with pytest.raises(RuntimeError):
+            coalescer.do("status", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+        assert coalescer.do("status", lambda: 1) == (1, False)
+
+
+class TestJsonRpcForwarder:
+    """Test single calls, batches and fan-out"""
+
+    def test_validation(self):
+        """Batches must be non-empty arrays of complete calls"""
+        assert validate_rpc_payload(call("status", 1)) is None
+        assert validate_rpc_payload([call("status", 1), call("block", 2)]) is None
+        assert validate_rpc_payload([]) == "Empty batch"
+        assert validate_rpc_payload([call("status", 1), {"method": "block"}]).startswith("Missing required field")
+        assert validate_rpc_payload("status") is not None
+
+    def test_batch_is_forwarded_as_one_upstream_batch(self):
+        """Uncached calls go upstream together and keep the client's ids"""
+        node = FakeNode()
+        forwarder = make_forwarder(node)
+
+        body, status = forwarder.forward([call("status", "a"), call("block", "b", height="5")])
+        assert status == MISS
+        assert len(node.posts) == 1 and isinstance(node.posts[0], list)
+        assert [item["id"] for item in body] == ["a", "b"]
+        assert body[1]["result"]["method"] == "block"
+
+    def test_batch_serves_cached_calls_locally(self):
+        """Only cache misses are sent upstream"""
+        node = FakeNode()
+        forwarder = make_forwarder(node)
+        forwarder.forward(call("block", 1, height="5"))
+
+        body, status = forwarder.forward([call("block", 7, height="5"), call("validators", 8, height="5")])
+        assert status == PARTIAL
+        assert [c["method"] for c in node.posts[-1]] == ["validators"]
+        assert [item["id"] for item in body] == [7, 8]
+
+        body, status = forwarder.forward([call("block", 9, height="5")])
+        assert status == HIT
+
+    def test_missing_batch_entries_become_errors(self):
+        """A node that drops calls from a batch yields per-call errors"""
+        def drop_second(base_url, payload):
+            return FakeResponse([{"jsonrpc": "2.0", "id": 0, "result": {}}])
+
+        forwarder = make_forwarder(drop_second)
+        body, _ = forwarder.forward([call("status", 1), call("net_info", 2)])
+        assert "result" in body[0]
+        assert body[1]["error"]["code"] == -32603
+
+    def test_identical_concurrent_reads_are_coalesced(self):
+        """Many browsers asking for status at once cause one upstream call"""
+        node = FakeNode(delay=0.05)
+        forwarder = make_forwarder(node)
+        results = []
+
+        def ask(request_id):
+            results.append(forwarder.forward(call("status", request_id)))
+
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(node.posts) == 1
+        assert sorted(body["id"] for body, _ in results) == list(range(8))
+        assert any(status == COALESCED for _, status in results)
+
+    def test_broadcasts_are_forwarded_untouched(self):
+        """Writes keep the caller's payload and are never coalesced"""
+        node = FakeNode()
+        forwarder = make_forwarder(node)
+        tx = call("broadcast_tx_sync", 42, tx="abc")
+
+        forwarder.forward(tx)
+        forwarder.forward(tx)
+        assert node.posts == [tx, tx]
+
+
+class AsyncFakeNode(FakeNode):
+    """FakeNode for the async forwarder"""
+
+    async def __call__(self, base_url, payload):
+        self.posts.append(payload)
+        await asyncio.sleep(self.delay)
+        if isinstance(payload, list):
+            return FakeResponse([self.answer(call) for call in payload])
+        return FakeResponse(self.answer(payload))
+
+
+def make_async_forwarder(node):
+    return AsyncJsonRpcForwarder(
+        EndpointPool("rpc", ["https://node"]), ProxyResponseCache(head_height=lambda: 100),
+        AsyncRequestCoalescer(), node
+    )
+
+
+class TestAsyncRequestCoalescer:
+    """Test single-flight on the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_task(self):
+        """Only the leader awaits upstream; followers get its result"""
+        coalescer = AsyncRequestCoalescer()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"ok": True}
+
+        results = await asyncio.gather(*(coalescer.do("status", fetch) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert sum(shared for _, shared in results) == 9
+        assert coalescer.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_flight(self):
+        """A disconnecting leader leaves the upstream call running for followers"""
+        coalescer = AsyncRequestCoalescer()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "block"
+
+        leader = asyncio.ensure_future(coalescer.do("block", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(coalescer.do("block", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("block", True)
+
+
+class TestAsyncJsonRpcForwarder:
+    """Test the async forwarder against the sync forwarder's behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_reads_are_coalesced(self):
+        """Concurrent status calls cause one upstream post and keep their ids"""
+        node = AsyncFakeNode(delay=0.02)
+        forwarder = make_async_forwarder(node)
+
+        results = await asyncio.gather(*(forwarder.forward(call("status", i)) for i in range(8)))
+
+        assert len(node.posts) == 1
+        assert sorted(body["id"] for body, _ in results) == list(range(8))
+        assert any(status == COALESCED for _, status in results)
+
+    @pytest.mark.asyncio
+    async def test_batch_serves_cached_calls_locally(self):
+        """Only cache misses go upstream, as one batch"""
+        node = AsyncFakeNode()
+        forwarder = make_async_forwarder(node)
+        await forwarder.forward(call("block", 1, height="5"))
+
+        body, status = await forwarder.forward([call("block", 7, height="5"), call("validators", 8, height="5")])
+        assert status == PARTIAL
+        assert [c["method"] for c in node.posts[-1]] == ["validators"]
+        assert [item["id"] for item in body] == [7, 8]
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_are_forwarded_untouched(self):
+        """Writes keep the caller's payload and are never cached"""
+        node = AsyncFakeNode()
+        forwarder = make_async_forwarder(node)
+        tx = call("broadcast_tx_sync", 42, tx="abc")
+
+        assert (await forwarder.forward(tx))[1] == MISS
+        await forwarder.forward(tx)
+        assert node.posts == [tx, tx]
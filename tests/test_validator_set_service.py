@@ -0,0 +1,173 @@
+"""
+Tests for the paginated, merged validator set service
+"""
+
+import base64
+import threading
+import time
+
+import pytest
+
+from src.services.validator_set_service import ValidatorSetService, consensus_address, merge_validators
+
+
+def pub_key(index):
+    return base64.b64encode(index.to_bytes(2, "big") * 16).decode()
+
+
+class FakeChain:
+    """Serves paginated CometBFT /validators and staking validator pages"""
+
+    def __init__(self, active=250, bonded=320, height=1000, delay=0.0, staking_down=False):
+        self.active = active
+        self.bonded = bonded
+        self.height = height
+        self.delay = delay
+        self.staking_down = staking_down
+        self.calls = []
+        self.headers = []
+        self.lock = threading.Lock()
+        self.concurrent = 0
+        self.peak_concurrency = 0
+
+    def __call__(self, base, path, params, headers=None):
+        with self.lock:
+            self.calls.append((base, dict(params)))
+            if headers:
+                self.headers.append(dict(headers))
+            self.concurrent += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.concurrent)
+        try:
+            time.sleep(self.delay)
+            if base == "rpc":
+                return self.consensus_page(params)
+            if self.staking_down:
+                raise ConnectionError("REST node down")
+            return self.staking_page(params)
+        finally:
+            with self.lock:
+                self.concurrent -= 1
+
+    def consensus_page(self, params):
+        start = (params["page"] - 1) * params["per_page"]
+        indexes = range(start, min(start + params["per_page"], self.active))
+        return {"result": {
+            "block_height": str(params.get("height", self.height)),
+            "total": str(self.active),
+            "count": str(len(indexes)),
+            "validators": [{
+                "address": consensus_address(pub_key(i)),
+                "pub_key": {"type": "tendermint/PubKeyEd25519", "value": pub_key(i)},
+                "voting_power": str(1000 - i),
+                "proposer_priority": "0",
+            } for i in indexes],
+        }}
+
+    def staking_page(self, params):
+        offset, limit = params["pagination.offset"], params["pagination.limit"]
+        indexes = range(offset, min(offset + limit, self.bonded))
+        return {"pagination": {"total": str(self.bonded)}, "validators": [{
+            "operator_address": f"odiseovaloper{i}",
+            "consensus_pubkey": {"@type": "/cosmos.crypto.ed25519.PubKey", "key": pub_key(i)},
+            "description": {"moniker": f"validator-{i}"},
+            "status": "BOND_STATUS_BONDED" if i < self.active else "BOND_STATUS_UNBONDING",
+            "jailed": i >= self.active,
+            "tokens": str((1000 - i) * 1000000),
+            "commission": {"commission_rates": {"rate": "0.050000000000000000"}},
+        } for i in indexes]}
+
+
+class TestValidatorSetService:
+    """Test pagination, merging and per-height caching"""
+
+    def test_fetches_every_page_and_merges_by_pubkey(self):
+        """All consensus and staking pages are read and joined on the consensus key"""
+        chain = FakeChain()
+        service = ValidatorSetService(fetcher=chain, rest_page_size=100)
+
+        result = service.get_validator_set()
+        data = result["data"]
+
+        assert result["success"]
+        assert data["height"] == 1000
+        assert data["total"] == 320
+        assert data["active_count"] == 250
+        assert sum(1 for base, _ in chain.calls if base == "rpc") == 3
+        assert sum(1 for base, _ in chain.calls if base == "rest") == 4
+
+        top = data["validators"][0]
+        assert top["moniker"] == "validator-0"
+        assert top["voting_power"] == 1000
+        assert top["commission_rate"] == pytest.approx(0.05)
+        inactive = [v for v in data["validators"] if not v["active"]]
+        assert len(inactive) == 70
+        assert all(v["voting_power"] == 0 for v in inactive)
+
+    def test_later_pages_are_pinned_to_one_height(self):
+        """Pages after the first ask for the height the first page reported"""
+        chain = FakeChain()
+        ValidatorSetService(fetcher=chain).get_validator_set()
+
+        later = [params for base, params in chain.calls if base == "rpc" and params["page"] > 1]
+        assert later and all(params["height"] == 1000 for params in later)
+
+    def test_staking_pages_are_pinned_to_the_consensus_height(self):
+        """Staking REST pages read state at the height of the consensus pages"""
+        chain = FakeChain(height=1000)
+        ValidatorSetService(fetcher=chain).get_validator_set()
+        assert chain.headers == [{"x-cosmos-block-height": "1000"}] * 2
+
+        pinned = FakeChain()
+        ValidatorSetService(fetcher=pinned, head_height=lambda: 990).get_validator_set()
+        assert pinned.headers and all(h == {"x-cosmos-block-height": "990"} for h in pinned.headers)
+
+    def test_pages_are_fetched_in_parallel(self):
+        """Remaining pages overlap instead of running one after another"""
+        chain = FakeChain(active=500, bonded=500, delay=0.05)
+        service = ValidatorSetService(fetcher=chain, rest_page_size=100, max_workers=8)
+
+        started = time.monotonic()
+        service.get_validator_set()
+        elapsed = time.monotonic() - started
+
+        assert chain.peak_concurrency > 2
+        assert elapsed < 0.05 * len(chain.calls) / 2
+
+    def test_cached_per_height(self):
+        """A known head height is served from cache; a new height refetches"""
+        chain = FakeChain()
+        head = {"height": 1000}
+        service = ValidatorSetService(fetcher=chain, head_height=lambda: head["height"])
+
+        service.get_validator_set()
+        calls = len(chain.calls)
+        service.get_validator_set()
+        assert len(chain.calls) == calls
+        assert service.get_stats()["hits"] == 1
+
+        head["height"] = 1001
+        assert service.get_validator_set()["data"]["height"] == 1001
+        assert len(chain.calls) > calls
+
+    def test_staking_outage_serves_consensus_set(self):
+        """Without the REST node the consensus validators are still returned"""
+        chain = FakeChain(staking_down=True)
+        data = ValidatorSetService(fetcher=chain).get_validator_set()["data"]
+
+        assert data["total"] == 250
+        assert data["sources"] == {"consensus": True, "staking": False}
+        assert data["validators"][0]["moniker"] is None
+
+    def test_rpc_outage_reports_failure(self):
+        """No consensus set means no validator set"""
+        def down(base, path, params):
+            raise ConnectionError("RPC node down")
+
+        result = ValidatorSetService(fetcher=down).get_validator_set()
+        assert result["success"] is False
+
+    def test_consensus_address_matches_cometbft(self):
+        """Merged records without an RPC address get the derived consensus address"""
+        merged = merge_validators([], [{"consensus_pubkey": {"key": pub_key(7)}, "tokens": "5"}])
+        assert merged[0]["address"] == consensus_address(pub_key(7))
+        assert len(merged[0]["address"]) == 40